@@ -0,0 +1,53 @@
+"""Add chat_jobs table for background chat pipelines.
+
+Revision ID: c3d9e1f2a7b4
+Revises: b7a52b4fdc56
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, JSON
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d9e1f2a7b4"
+down_revision: Union[str, None] = "b7a52b4fdc56"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create chat_jobs table."""
+    op.create_table(
+        'chat_jobs',
+        sa.Column('id', UUID(as_uuid=False), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=False), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('project_id', UUID(as_uuid=False), sa.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('conversation_id', UUID(as_uuid=False), nullable=False),
+
+        # interactive, question, action
+        sa.Column('kind', sa.String(20), nullable=False),
+        # queued, running, completed, failed, interrupted
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+
+        sa.Column('payload', JSON, nullable=True),
+        sa.Column('error', sa.Text, nullable=True),
+
+        sa.Column('created_at', sa.DateTime, nullable=False, server_default=sa.func.now()),
+        sa.Column('started_at', sa.DateTime, nullable=True),
+        sa.Column('finished_at', sa.DateTime, nullable=True),
+    )
+
+    op.create_index('ix_chat_jobs_status', 'chat_jobs', ['status'])
+    op.create_index('ix_chat_jobs_user_status', 'chat_jobs', ['user_id', 'status'])
+    op.create_index('ix_chat_jobs_conversation', 'chat_jobs', ['conversation_id'])
+
+
+def downgrade() -> None:
+    """Drop chat_jobs table."""
+    op.drop_index('ix_chat_jobs_conversation', table_name='chat_jobs')
+    op.drop_index('ix_chat_jobs_user_status', table_name='chat_jobs')
+    op.drop_index('ix_chat_jobs_status', table_name='chat_jobs')
+    op.drop_table('chat_jobs')
@@ -0,0 +1,32 @@
+"""Add signature to project_issues for deduplicated scanner issues.
+
+Revision ID: d4e8f1a2b6c9
+Revises: c3d9e1f2a7b4
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e8f1a2b6c9"
+down_revision: Union[str, None] = "c3d9e1f2a7b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add project_issues.signature with a per-project unique index."""
+    op.add_column('project_issues', sa.Column('signature', sa.String(40), nullable=True))
+    # Existing rows keep NULL signatures, which never conflict
+    op.create_index(
+        'uq_project_issues_signature', 'project_issues', ['project_id', 'signature'], unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Drop project_issues.signature."""
+    op.drop_index('uq_project_issues_signature', table_name='project_issues')
+    op.drop_column('project_issues', 'signature')
@@ -0,0 +1,49 @@
+"""Add scan_jobs table for offloaded project scans.
+
+Revision ID: e5f9a2b3c7d1
+Revises: d4e8f1a2b6c9
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f9a2b3c7d1"
+down_revision: Union[str, None] = "d4e8f1a2b6c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create scan_jobs table."""
+    op.create_table(
+        'scan_jobs',
+        sa.Column('id', UUID(as_uuid=False), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=False), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('project_id', UUID(as_uuid=False), sa.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False),
+
+        # queued, running, completed, failed, cancelled, interrupted
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+        sa.Column('progress', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('message', sa.String(500), nullable=True),
+        sa.Column('error', sa.Text, nullable=True),
+        sa.Column('host', sa.String(255), nullable=True),
+
+        sa.Column('created_at', sa.DateTime, nullable=False, server_default=sa.func.now()),
+        sa.Column('started_at', sa.DateTime, nullable=True),
+        sa.Column('finished_at', sa.DateTime, nullable=True),
+    )
+
+    op.create_index('ix_scan_jobs_status', 'scan_jobs', ['status'])
+    op.create_index('ix_scan_jobs_project_status', 'scan_jobs', ['project_id', 'status'])
+
+
+def downgrade() -> None:
+    """Drop scan_jobs table."""
+    op.drop_index('ix_scan_jobs_project_status', table_name='scan_jobs')
+    op.drop_index('ix_scan_jobs_status', table_name='scan_jobs')
+    op.drop_table('scan_jobs')
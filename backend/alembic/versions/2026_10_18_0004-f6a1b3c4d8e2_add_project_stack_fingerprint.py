@@ -0,0 +1,27 @@
+"""Add stack_fingerprint to projects for memoised stack detection.
+
+Revision ID: f6a1b3c4d8e2
+Revises: e5f9a2b3c7d1
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a1b3c4d8e2"
+down_revision: Union[str, None] = "e5f9a2b3c7d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add projects.stack_fingerprint."""
+    op.add_column('projects', sa.Column('stack_fingerprint', sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop projects.stack_fingerprint."""
+    op.drop_column('projects', 'stack_fingerprint')
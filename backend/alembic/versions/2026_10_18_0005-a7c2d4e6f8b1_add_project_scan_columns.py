@@ -0,0 +1,27 @@
+"""Add scan_columns to projects for columnar per-file scan results.
+
+Revision ID: a7c2d4e6f8b1
+Revises: f6a1b3c4d8e2
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c2d4e6f8b1"
+down_revision: Union[str, None] = "f6a1b3c4d8e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add projects.scan_columns."""
+    op.add_column('projects', sa.Column('scan_columns', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop projects.scan_columns."""
+    op.drop_column('projects', 'scan_columns')
@@ -0,0 +1,46 @@
+"""Allow one queued or running chat job per conversation.
+
+Revision ID: b8d3e5f7a9c2
+Revises: a7c2d4e6f8b1
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d3e5f7a9c2"
+down_revision: Union[str, None] = "a7c2d4e6f8b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Interrupt duplicate active jobs, then add the unique partial index."""
+    # Keep the newest active job of each conversation
+    op.execute(
+        """
+        UPDATE chat_jobs SET status = 'interrupted', finished_at = now(),
+            error = 'Superseded by a newer job for the conversation'
+        WHERE status IN ('queued', 'running')
+          AND id NOT IN (
+            SELECT DISTINCT ON (conversation_id) id FROM chat_jobs
+            WHERE status IN ('queued', 'running')
+            ORDER BY conversation_id, created_at DESC
+          )
+        """
+    )
+    op.create_index(
+        'uq_chat_jobs_active_conversation',
+        'chat_jobs',
+        ['conversation_id'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the unique partial index."""
+    op.drop_index('uq_chat_jobs_active_conversation', table_name='chat_jobs')
@@ -0,0 +1,29 @@
+"""Add a lease heartbeat to scan_jobs.
+
+Revision ID: c9e4f6a8b2d3
+Revises: b8d3e5f7a9c2
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c9e4f6a8b2d3"
+down_revision: Union[str, None] = "b8d3e5f7a9c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add scan_jobs.heartbeat_at and an index for per-host running counts."""
+    op.add_column('scan_jobs', sa.Column('heartbeat_at', sa.DateTime, nullable=True))
+    op.create_index('ix_scan_jobs_host_status', 'scan_jobs', ['host', 'status'])
+
+
+def downgrade() -> None:
+    """Drop scan_jobs.heartbeat_at and its index."""
+    op.drop_index('ix_scan_jobs_host_status', table_name='scan_jobs')
+    op.drop_column('scan_jobs', 'heartbeat_at')
@@ -458,6 +458,11 @@ CRITICAL RULES—Violation causes plan failure:
 - Respect existing patterns visible in the codebase context
 </critical_rules>"""
 
+# Project info block - stable per project index version, sent as a cached prefix
+BLUEPRINT_PROJECT_PROMPT = """<project_info>
+{project_context}
+</project_info>"""
+
 # User prompt template - filled with dynamic content per request
 BLUEPRINT_USER_PROMPT = """<task_context>
 <user_request>{user_input}</user_request>
@@ -480,10 +485,6 @@ Tables: {entity_tables}
 </extracted_entities>
 </task_context>
 
-<project_info>
-{project_context}
-</project_info>
-
 <codebase_context>
 The following code chunks were retrieved by Scout as relevant to this request.
 You MUST ground your plan in these chunks—reference existing patterns and only mark files as "modify" if they appear here.
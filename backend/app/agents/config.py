@@ -36,6 +36,12 @@ class AgentConfig:
     ABORT_ON_SCORE_DEGRADATION: bool = True
     REQUIRE_EXPLICIT_CONFIRMATION_FOR_DESTRUCTIVE: bool = True
 
+    # Model Routing
+    ENABLE_MODEL_ROUTING: bool = True  # Pick Haiku/Sonnet/Opus per call from local signals
+
+    # UI Pacing
+    FAST_MODE: bool = False  # Emit thinking/handoff events without cosmetic delays
+
     @classmethod
     def from_env(cls) -> "AgentConfig":
         """Load configuration from environment variables."""
@@ -53,6 +59,8 @@ class AgentConfig:
             ENABLE_AUTO_FIX_CRITICAL=os.getenv("AGENT_ENABLE_AUTO_FIX_CRITICAL", "true").lower() == "true",
             CRITICAL_FAILURE_THRESHOLD=int(os.getenv("AGENT_CRITICAL_FAILURE_THRESHOLD", "10")),
             REGENERATE_ON_DELETION=os.getenv("AGENT_REGENERATE_ON_DELETION", "true").lower() == "true",
+            ENABLE_MODEL_ROUTING=os.getenv("AGENT_ENABLE_MODEL_ROUTING", "true").lower() == "true",
+            FAST_MODE=os.getenv("AGENT_FAST_MODE", "false").lower() == "true",
         )
 
 
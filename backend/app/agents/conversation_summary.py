@@ -17,25 +17,91 @@ ENHANCEMENTS:
 - Group D: Integration helpers for chat flow
 - Group E: Working memory pattern with entity extraction
 """
+import asyncio
+import heapq
 import json
 import logging
 import re
+from collections import Counter
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from enum import Enum
+from functools import lru_cache
 from typing import Optional, List, Dict, Any, Tuple
 
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+    tiktoken = None
+
 logger = logging.getLogger(__name__)
 
-# Token estimation (avg 4 chars per token for English)
+# Fallback token estimation when no tokenizer is available (avg 4 chars per token for English)
 CHARS_PER_TOKEN = 4
 
+# Tokenizer used for counting; close enough to Claude's for budgeting
+TOKEN_ENCODING = "cl100k_base"
+
+# Distinct strings whose token counts are memoised
+TOKEN_CACHE_SIZE = 4096
+
 # Token budgets (configurable)
 DEFAULT_TOKEN_BUDGET = 4000
 MAX_TOKEN_BUDGET = 8000
 MIN_TOKEN_BUDGET = 1000
 
 
+_encoding = None
+_encoding_loaded = False
+
+
+def load_encoding():
+    """
+    Load the tokenizer once; None when tiktoken or its data is unavailable.
+
+    The first load may download the BPE file (unless it is already in
+    TIKTOKEN_CACHE_DIR), so call this off the event loop - the app does
+    it in a thread at startup.
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        if TIKTOKEN_AVAILABLE:
+            try:
+                _encoding = tiktoken.get_encoding(TOKEN_ENCODING)
+            except Exception as e:
+                logger.warning(f"[SUMMARY] tiktoken unavailable, estimating tokens from length: {e}")
+        _encoding_loaded = True
+        # Drop estimates counted before the tokenizer was ready
+        count_tokens.cache_clear()
+    return _encoding
+
+
+def _get_encoding():
+    """The tokenizer if loaded; never loads it from inside the event loop."""
+    if _encoding_loaded:
+        return _encoding
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # Scripts and worker threads may block on the download
+        return load_encoding()
+    return None
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def count_tokens(text: str) -> int:
+    """Token count of a string, memoised so unchanged items are never re-encoded."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
 class ContextPriority(int, Enum):
     """Priority levels for context retention during truncation."""
     CRITICAL = 1
@@ -73,9 +139,35 @@ class RecentMessage:
         return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
 
     def estimate_tokens(self, use_summary: bool = False) -> int:
-        """Estimate token count for this message."""
-        text = self.to_prompt_text(use_summary)
-        return len(text) // CHARS_PER_TOKEN
+        """Token count for this message."""
+        return count_tokens(self.to_prompt_text(use_summary))
+
+
+# Removal order for truncate_to_budget (LOW priority = remove first), with
+# how many of the newest entries each list always keeps
+_REMOVAL_ORDER: List[Tuple[str, int]] = [
+    ("completed_tasks", 3),     # 1. Old completed tasks
+    ("history_summary", 0),     # 2. History summary (compress further)
+    ("known_methods", 5),       # 3. Known entities (keep only most recent)
+    ("known_tables", 5),
+    ("known_routes", 5),
+    ("known_classes", 5),
+    ("known_files", 10),        # 4. Known files (keep more of these)
+    ("decisions", 3),           # 5. Old decisions
+    ("pending_tasks", 2),       # 6. Pending tasks (risky but necessary)
+]
+
+# Newest entries of each list that to_prompt_text renders
+_RENDERED_ITEMS: Dict[str, int] = {
+    "completed_tasks": 5,
+    "decisions": 5,
+    "pending_tasks": 3,
+    "known_files": 10,
+    "known_classes": 10,
+    "known_routes": 5,
+    "known_tables": 5,
+    "known_methods": 0,
+}
 
 
 @dataclass
@@ -253,9 +345,8 @@ class ConversationSummary:
     # =========================================================================
 
     def estimate_tokens(self) -> int:
-        """Estimate total token count of the summary."""
-        text = self.to_prompt_text()
-        tokens = len(text) // CHARS_PER_TOKEN
+        """Token count of the summary as rendered for the prompt."""
+        tokens = count_tokens(self.to_prompt_text())
         self.last_token_count = tokens
         return tokens
 
@@ -265,52 +356,64 @@ class ConversationSummary:
         return self.estimate_tokens() <= budget
 
     def truncate_to_budget(self, budget: Optional[int] = None) -> None:
-        """Truncate summary to fit within token budget using priority-based removal."""
+        """
+        Truncate summary to fit within token budget using priority-based removal.
+
+        Evicts in batches against a running total instead of re-rendering the
+        summary after every item; the rendered text is recounted once per
+        batch to correct for section headers and separators.
+        """
         budget = budget or self.token_budget
 
-        while not self.fits_budget(budget):
-            removed = self._remove_lowest_priority_item()
-            if not removed:
+        total = self.estimate_tokens()
+        while total > budget:
+            if not self._remove_lowest_priority_items(total - budget):
                 break
+            total = self.estimate_tokens()
+
+        logger.debug(f"[SUMMARY] Truncated to {total} tokens (budget: {budget})")
+
+    def _remove_lowest_priority_items(self, tokens_to_free: int) -> bool:
+        """
+        Remove lowest-priority items until about ``tokens_to_free`` tokens are freed.
+
+        Candidates go on a heap ordered by (removal rank, age); each carries
+        the tokens it contributes to the rendered prompt, which is zero for
+        entries older than the window to_prompt_text shows. Returns True if
+        something was removed.
+        """
+        heap = []
+        for rank, (attr, keep) in enumerate(_REMOVAL_ORDER):
+            if attr == "history_summary":
+                # Compress further rather than dropping it
+                if self.history_summary and len(self.history_summary) > 200:
+                    freed = count_tokens(self.history_summary) - count_tokens(self.history_summary[-200:])
+                    heap.append((rank, 0, attr, freed))
+                continue
+
+            items = getattr(self, attr)
+            first_rendered = len(items) - _RENDERED_ITEMS[attr]
+            for index in range(len(items) - keep):
+                # +1 for the separator joining it to its neighbours
+                cost = count_tokens(items[index]) + 1 if index >= first_rendered else 0
+                heap.append((rank, index, attr, cost))
+
+        heapq.heapify(heap)
+        removals: Counter = Counter()
+        freed = 0
+        while heap and freed < tokens_to_free:
+            _, _, attr, cost = heapq.heappop(heap)
+            removals[attr] += 1
+            freed += cost
+
+        for attr, count in removals.items():
+            if attr == "history_summary":
+                self.history_summary = self.history_summary[-200:]
+            else:
+                # Oldest first, so one slice per list
+                del getattr(self, attr)[:count]
 
-        logger.debug(f"[SUMMARY] Truncated to {self.estimate_tokens()} tokens (budget: {budget})")
-
-    def _remove_lowest_priority_item(self) -> bool:
-        """Remove one item of lowest priority. Returns True if something was removed."""
-        # Priority order for removal (LOW priority = remove first)
-        # 1. Old completed tasks
-        if len(self.completed_tasks) > 3:
-            self.completed_tasks.pop(0)
-            return True
-
-        # 2. History summary (compress further)
-        if self.history_summary and len(self.history_summary) > 200:
-            self.history_summary = self.history_summary[-200:]
-            return True
-
-        # 3. Known entities (keep only most recent)
-        for attr in ['known_methods', 'known_tables', 'known_routes', 'known_classes']:
-            lst = getattr(self, attr)
-            if len(lst) > 5:
-                lst.pop(0)
-                return True
-
-        # 4. Known files (keep more of these)
-        if len(self.known_files) > 10:
-            self.known_files.pop(0)
-            return True
-
-        # 5. Old decisions
-        if len(self.decisions) > 3:
-            self.decisions.pop(0)
-            return True
-
-        # 6. Pending tasks (risky but necessary)
-        if len(self.pending_tasks) > 2:
-            self.pending_tasks.pop(0)
-            return True
-
-        return False
+        return bool(removals)
 
     # =========================================================================
     # GROUP A: Persistence Layer
@@ -5,18 +5,28 @@ Defines all event types for real-time communication with the frontend,
 including agent messages, thinking states, planning, execution, and validation.
 """
 
+import hashlib
 import json
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Dict, Any, Optional, List
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 
 class EventType(str, Enum):
     """SSE event type constants."""
 
     # Connection Events
     CONNECTED = "connected"
+    JOB_QUEUED = "job_queued"  # Waiting for a free pipeline slot
     COMPLETE = "complete"
     ERROR = "error"
 
@@ -97,7 +107,35 @@ class SSEEvent:
             **self.data,
             "timestamp": self.timestamp.isoformat(),
         }
-        return f"event: {self.event.value}\ndata: {json.dumps(data_with_timestamp)}\n\n"
+        return encode_sse(self.event.value, data_with_timestamp)
+
+
+# ============== SSE Encoding ==============
+
+# "event: <type>\ndata: " is the same for every event of a type
+_EVENT_PREFIXES: Dict[str, str] = {t.value: f"event: {t.value}\ndata: " for t in EventType}
+
+
+def encode_json(data: Any) -> str:
+    """Serialise event data, with orjson when installed and json otherwise."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # Types orjson refuses (e.g. ints beyond 64 bits): let json try
+            pass
+    return json.dumps(data)
+
+
+def encode_sse(event_type: str, data: Dict[str, Any]) -> str:
+    """Format already-complete event data as an SSE string."""
+    prefix = _EVENT_PREFIXES.get(event_type) or f"event: {event_type}\ndata: "
+    return prefix + encode_json(data) + "\n\n"
+
+
+def content_digest(content: str) -> str:
+    """Hash identifying file content the client has already received in chunks."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
 # ============== Event Builder Functions ==============
@@ -108,7 +146,7 @@ def create_sse_event(event_type: str, data: dict) -> str:
         **data,
         "timestamp": datetime.now().isoformat(),
     }
-    return f"event: {event_type}\ndata: {json.dumps(data_with_timestamp)}\n\n"
+    return encode_sse(event_type, data_with_timestamp)
 
 
 # --- Agent Events ---
@@ -432,6 +470,7 @@ def step_code_chunk(
         done: bool,
         action: str = "create",
         content: Optional[str] = None,
+        content_hash: Optional[str] = None,
 ) -> str:
     """
     Emit a code chunk during step execution for real-time streaming.
@@ -445,6 +484,8 @@ def step_code_chunk(
         done: Whether this is the final chunk
         action: Action type (create, modify, delete)
         content: Full content (only sent when done=True)
+        content_hash: With done=True, stands in for content the client
+            already has from the chunks (see content_digest)
     """
     data = {
         "step_index": step_index,
@@ -455,13 +496,15 @@ def step_code_chunk(
         "done": done,
         "action": action,
         "progress": accumulated_length / total_length if total_length > 0 else 1.0,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now().isoformat(),
     }
 
-    if done and content:
+    if done and content_hash:
+        data["content_hash"] = content_hash
+    elif done and content:
         data["content"] = content
 
-    return create_sse_event(EventType.STEP_CODE_CHUNK, data)
+    return encode_sse(EventType.STEP_CODE_CHUNK.value, data)
 
 
 def step_progress(
@@ -641,6 +684,15 @@ def connected(conversation_id: str, message: str = "Connected to chat stream") -
     })
 
 
+def job_queued(job_id: str, position: int) -> str:
+    """Pipeline is waiting for a free slot in the job runner."""
+    return create_sse_event(EventType.JOB_QUEUED.value, {
+        "job_id": job_id,
+        "position": position,
+        "message": "Waiting for a free slot...",
+    })
+
+
 def complete(
         success: bool,
         answer: Optional[str] = None,
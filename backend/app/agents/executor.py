@@ -559,6 +559,7 @@ class Executor:
             current_file_content: Optional[str] = None,
             project_context: str = "",
             enable_self_verification: bool = True,
+            model: Optional[ClaudeModel] = None,
     ) -> ExecutionResult:
         """
         Execute a plan step with enhanced pipeline.
@@ -568,8 +569,11 @@ class Executor:
         2. Generate reasoning for the task (Group B)
         3. Execute with precision (Group D)
         4. Verify and fix if needed
+
+        ``model`` is the ModelRouter's pick for this step (Sonnet if omitted).
         """
-        logger.info(f"[FORGE] Executing step {step.order}: [{step.action}] {step.file}")
+        model = model or ClaudeModel.SONNET
+        logger.info(f"[FORGE] Executing step {step.order}: [{step.action}] {step.file} ({model.name})")
 
         # Validate file exists for modify actions
         if step.action == "modify" and self.config.REQUIRE_FILE_EXISTS_FOR_MODIFY:
@@ -600,6 +604,7 @@ class Executor:
                 patterns=patterns,
                 context=context,
                 current_content=current_file_content or "",
+                model=model,
             )
             logger.info(f"[FORGE] Reasoning complete: {len(reasoning.implementation_steps)} steps planned")
 
@@ -608,16 +613,16 @@ class Executor:
 
             if step.action == "create":
                 result = await self._execute_create(
-                    step, context, prev_results_str, patterns, reasoning
+                    step, context, prev_results_str, patterns, reasoning, model=model
                 )
             elif step.action == "modify":
                 result = await self._execute_modify(
                     step, context, prev_results_str, current_file_content or "",
-                    patterns, reasoning
+                    patterns, reasoning, model=model
                 )
             elif step.action == "delete":
                 result = await self._execute_delete(
-                    step, context, current_file_content or ""
+                    step, context, current_file_content or "", model=model
                 )
             else:
                 return ExecutionResult(
@@ -632,17 +637,17 @@ class Executor:
 
             # STEP 4: Verify and fix if needed
             if enable_self_verification and result.content:
-                passes, issues = await self._verify_result(result, current_file_content)
+                passes, issues = await self._verify_result(result, current_file_content, model=model)
                 if not passes and issues:
                     logger.info(f"[FORGE] Fixing {len(issues)} verification issues")
-                    result = await self._fix_execution(result, issues, context, patterns)
+                    result = await self._fix_execution(result, issues, context, patterns, model=model)
 
             logger.info(f"[FORGE] Step {step.order} completed successfully")
             return result
 
         except json.JSONDecodeError as e:
             logger.error(f"[FORGE] JSON parse error: {e}")
-            return await self._recover_from_error(step, "json_parse", str(e), "")
+            return await self._recover_from_error(step, "json_parse", str(e), "", model=model)
 
         except Exception as e:
             logger.error(f"[FORGE] Step {step.order} failed: {e}")
@@ -806,6 +811,7 @@ class Executor:
             patterns: CodePatterns,
             context: RetrievedContext,
             current_content: str,
+            model: ClaudeModel = ClaudeModel.SONNET,
     ) -> ExecutionReasoning:
         """
         Generate chain-of-thought reasoning before code generation.
@@ -828,7 +834,7 @@ class Executor:
 
         try:
             response = await self.claude.chat_async(
-                model=ClaudeModel.SONNET,
+                model=model,
                 messages=[{"role": "user", "content": user_prompt}],
                 system=REASONING_SYSTEM_PROMPT,
                 temperature=0.2,
@@ -867,6 +873,7 @@ class Executor:
             previous_results: str,
             patterns: CodePatterns,
             reasoning: ExecutionReasoning,
+            model: ClaudeModel = ClaudeModel.SONNET,
     ) -> ExecutionResult:
         """Execute CREATE action with pattern awareness and reasoning."""
 
@@ -888,7 +895,7 @@ class Executor:
             previous_results=previous_results,
         )
 
-        response = await self._call_claude(user_prompt, EXECUTION_SYSTEM_CREATE)
+        response = await self._call_claude(user_prompt, EXECUTION_SYSTEM_CREATE, model=model)
         data = self._parse_response(response)
         content = data.get("content", "")
 
@@ -910,6 +917,7 @@ class Executor:
             current_content: str,
             patterns: CodePatterns,
             reasoning: ExecutionReasoning,
+            model: ClaudeModel = ClaudeModel.SONNET,
     ) -> ExecutionResult:
         """Execute MODIFY action with precision insertion."""
 
@@ -932,7 +940,7 @@ class Executor:
             previous_results=previous_results,
         )
 
-        response = await self._call_claude(user_prompt, EXECUTION_SYSTEM_MODIFY)
+        response = await self._call_claude(user_prompt, EXECUTION_SYSTEM_MODIFY, model=model)
         data = self._parse_response(response)
         content = data.get("content", "")
 
@@ -959,6 +967,7 @@ class Executor:
             step: PlanStep,
             context: RetrievedContext,
             current_content: str,
+            model: ClaudeModel = ClaudeModel.SONNET,
     ) -> ExecutionResult:
         """Execute DELETE action with safety verification."""
         user_prompt = safe_format(
@@ -968,7 +977,7 @@ class Executor:
             current_content=current_content,
         )
 
-        response = await self._call_claude(user_prompt, EXECUTION_SYSTEM_DELETE)
+        response = await self._call_claude(user_prompt, EXECUTION_SYSTEM_DELETE, model=model)
         data = self._parse_response(response)
         diff = self._generate_diff(current_content, "", step.file)
 
@@ -988,6 +997,7 @@ class Executor:
             self,
             result: ExecutionResult,
             original_content: Optional[str] = None,
+            model: ClaudeModel = ClaudeModel.SONNET,
     ) -> Tuple[bool, List[str]]:
         """Verify generated code passes quality checks."""
         if result.action == "delete" or not result.content:
@@ -1009,7 +1019,7 @@ class Executor:
 
         try:
             response = await self.claude.chat_async(
-                model=ClaudeModel.SONNET,
+                model=model,
                 messages=[{"role": "user", "content": user_prompt}],
                 system=SELF_VERIFICATION_SYSTEM,
                 temperature=0.1,
@@ -1041,6 +1051,7 @@ class Executor:
             issues: List[str],
             context: RetrievedContext,
             patterns: CodePatterns,
+            model: ClaudeModel = ClaudeModel.SONNET,
     ) -> ExecutionResult:
         """Fix identified issues in generated code."""
         logger.info(f"[FORGE] Fixing execution for {result.file}")
@@ -1085,7 +1096,7 @@ CRITICAL: This is the ORIGINAL content that MUST be preserved:
 </output_format>"""
 
         try:
-            response = await self._call_claude(user_prompt, FIX_SYSTEM_PROMPT)
+            response = await self._call_claude(user_prompt, FIX_SYSTEM_PROMPT, model=model)
             data = self._parse_response(response)
             content = data.get("content", "")
             diff = self._generate_diff(result.original_content, content, result.file)
@@ -1110,6 +1121,7 @@ CRITICAL: This is the ORIGINAL content that MUST be preserved:
             error_type: str,
             error_message: str,
             partial_output: str,
+            model: ClaudeModel = ClaudeModel.SONNET,
     ) -> ExecutionResult:
         """Attempt recovery from code generation error."""
         logger.info(f"[FORGE] Attempting error recovery for {step.file}")
@@ -1137,7 +1149,7 @@ CRITICAL: This is the ORIGINAL content that MUST be preserved:
 </output_format>"""
 
         try:
-            response = await self._call_claude(user_prompt, FIX_SYSTEM_PROMPT)
+            response = await self._call_claude(user_prompt, FIX_SYSTEM_PROMPT, model=model)
             data = self._parse_response(response)
             content = data.get("content", "")
 
@@ -1173,12 +1185,13 @@ CRITICAL: This is the ORIGINAL content that MUST be preserved:
             self,
             user_prompt: str,
             system_prompt: Optional[str] = None,
+            model: ClaudeModel = ClaudeModel.SONNET,
     ) -> str:
         """Call Claude with caching-optimized system prompt."""
         messages = [{"role": "user", "content": user_prompt}]
 
         return await self.claude.chat_async(
-            model=ClaudeModel.SONNET,
+            model=model,
             messages=messages,
             system=system_prompt,
             temperature=0.3,
@@ -1284,10 +1297,11 @@ CRITICAL: This is the ORIGINAL content that MUST be preserved:
             result: ExecutionResult,
             issues: List[str],
             context: RetrievedContext,
+            model: Optional[ClaudeModel] = None,
     ) -> ExecutionResult:
         """Legacy method - wraps _fix_execution with default patterns."""
         patterns = CodePatterns()
-        return await self._fix_execution(result, issues, context, patterns)
+        return await self._fix_execution(result, issues, context, patterns, model=model or ClaudeModel.SONNET)
 
     async def recover_from_error(
             self,
@@ -7,12 +7,14 @@ Provides deep Laravel knowledge for Models, Controllers, Migrations, Routes, etc
 This module enhances Forge's code generation with Laravel-specific patterns,
 conventions, and best practices.
 """
+import hashlib
 import logging
 import re
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -403,7 +405,6 @@ class ModelAnalyzer:
             return match.group(1)
 
         # Convention: snake_case plural
-        import re
         # Convert CamelCase to snake_case
         s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', class_name)
         snake = re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
@@ -716,6 +717,34 @@ class LaravelCodeGenerator:
         return route_info.to_code()
 
 
+# =============================================================================
+# FILE ANALYSIS CACHE
+# =============================================================================
+
+# Analyzer output keyed by (file type, path, content hash). Seeded from the
+# persisted project profile so unchanged files are never re-analyzed.
+FILE_INFO_CACHE_SIZE = 4096
+_file_info_cache: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+
+
+def content_hash(content: str) -> str:
+    """Stable hash of file content for analysis cache keys."""
+    return hashlib.sha1(content.encode("utf-8", errors="replace")).hexdigest()
+
+
+def _cache_file_info(key: Tuple[str, str, str], info: Dict[str, Any]) -> None:
+    _file_info_cache[key] = info
+    _file_info_cache.move_to_end(key)
+    while len(_file_info_cache) > FILE_INFO_CACHE_SIZE:
+        _file_info_cache.popitem(last=False)
+
+
+def seed_file_info(entries: Iterable[Dict[str, Any]]) -> None:
+    """Load precomputed analyses ({file_type, path, hash, info} dicts) into the cache."""
+    for entry in entries:
+        _cache_file_info((entry["file_type"], entry["path"], entry["hash"]), entry["info"])
+
+
 # =============================================================================
 # LARAVEL CONTEXT ENHANCER
 # =============================================================================
@@ -791,6 +820,57 @@ class LaravelContextEnhancer:
 
         return enhanced
 
+    def analyze_file(
+            self,
+            file_type: LaravelFileType,
+            file_path: str,
+            content: str,
+    ) -> Dict[str, Any]:
+        """
+        Run the analyzers for a file (cached by content hash).
+
+        Returns the ``file_info`` dict for models, controllers, migrations
+        and routes; other file types have no analyzer output.
+        """
+        key = (file_type.value, file_path, content_hash(content))
+        cached = _file_info_cache.get(key)
+        if cached is not None:
+            _file_info_cache.move_to_end(key)
+            return cached
+
+        class_name = file_path.split("/")[-1].replace(".php", "")
+        info: Dict[str, Any] = {}
+
+        if file_type == LaravelFileType.MODEL and content:
+            info = {
+                "class_name": class_name,
+                "table_name": self.model_analyzer.extract_table_name(content, class_name),
+                "fillable": self.model_analyzer.extract_fillable(content),
+                "casts": self.model_analyzer.extract_casts(content),
+                "relationships": self.model_analyzer.extract_relationships(content),
+            }
+        elif file_type == LaravelFileType.CONTROLLER:
+            info = {
+                "class_name": class_name,
+                "is_api": self.controller_analyzer.is_api_controller(file_path, content),
+                "is_resource": self.controller_analyzer.is_resource_controller(content),
+                "model_name": self.controller_analyzer.extract_model_name(content, class_name),
+                "existing_methods": self.controller_analyzer.extract_methods(content),
+            }
+        elif file_type == LaravelFileType.MIGRATION and content:
+            info = {
+                "table_name": self.migration_analyzer.extract_table_name(content),
+                "columns": self.migration_analyzer.extract_columns(content),
+            }
+        elif file_type == LaravelFileType.ROUTE and content:
+            info = {
+                "existing_routes": self.route_analyzer.extract_routes(content),
+                "route_groups": self.route_analyzer.extract_route_groups(content),
+            }
+
+        _cache_file_info(key, info)
+        return info
+
     def _get_conventions(self, file_type: LaravelFileType) -> Dict[str, str]:
         """Get Laravel conventions for file type."""
         conventions = {
@@ -844,18 +924,9 @@ class LaravelContextEnhancer:
         """Enhance context for model files."""
         enhanced = {"file_info": {}, "suggestions": [], "code_snippets": {}}
 
-        # Extract class name from path
-        class_name = file_path.split("/")[-1].replace(".php", "")
-
         if current_content:
             # Analyze existing model
-            enhanced["file_info"] = {
-                "class_name": class_name,
-                "table_name": self.model_analyzer.extract_table_name(current_content, class_name),
-                "fillable": self.model_analyzer.extract_fillable(current_content),
-                "casts": self.model_analyzer.extract_casts(current_content),
-                "relationships": self.model_analyzer.extract_relationships(current_content),
-            }
+            enhanced["file_info"] = self.analyze_file(LaravelFileType.MODEL, file_path, current_content)
 
         # Detect if adding relationship from description
         if "relationship" in description.lower() or any(
@@ -889,16 +960,8 @@ class LaravelContextEnhancer:
         """Enhance context for controller files."""
         enhanced = {"file_info": {}, "suggestions": [], "code_snippets": {}}
 
-        class_name = file_path.split("/")[-1].replace(".php", "")
-        is_api = self.controller_analyzer.is_api_controller(file_path, current_content)
-
-        enhanced["file_info"] = {
-            "class_name": class_name,
-            "is_api": is_api,
-            "is_resource": self.controller_analyzer.is_resource_controller(current_content),
-            "model_name": self.controller_analyzer.extract_model_name(current_content, class_name),
-            "existing_methods": self.controller_analyzer.extract_methods(current_content),
-        }
+        enhanced["file_info"] = self.analyze_file(LaravelFileType.CONTROLLER, file_path, current_content)
+        is_api = enhanced["file_info"]["is_api"]
 
         # Suggest resource methods if applicable
         model_name = enhanced["file_info"]["model_name"]
@@ -937,10 +1000,7 @@ class LaravelContextEnhancer:
         enhanced = {"file_info": {}, "suggestions": [], "code_snippets": {}}
 
         if current_content:
-            enhanced["file_info"] = {
-                "table_name": self.migration_analyzer.extract_table_name(current_content),
-                "columns": self.migration_analyzer.extract_columns(current_content),
-            }
+            enhanced["file_info"] = self.analyze_file(LaravelFileType.MIGRATION, file_path, current_content)
 
         # Generate timestamp for new migrations
         if not current_content:
@@ -974,10 +1034,7 @@ class LaravelContextEnhancer:
         enhanced = {"file_info": {}, "suggestions": [], "code_snippets": {}}
 
         if current_content:
-            enhanced["file_info"] = {
-                "existing_routes": self.route_analyzer.extract_routes(current_content),
-                "route_groups": self.route_analyzer.extract_route_groups(current_content),
-            }
+            enhanced["file_info"] = self.analyze_file(LaravelFileType.ROUTE, file_path, current_content)
 
             # Find best insertion point
             enhanced["suggestions"].append(
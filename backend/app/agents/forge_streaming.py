@@ -15,8 +15,10 @@ Usage:
 import asyncio
 import json
 import logging
+import re
 from dataclasses import dataclass, field
 from enum import Enum
+from json.decoder import scanstring
 from typing import Optional, List, AsyncGenerator, Callable, Any, Dict
 
 from app.agents.config import AgentConfig
@@ -108,20 +110,51 @@ class StreamEvent:
 # STREAMING CODE BUFFER
 # =============================================================================
 
+# An escape cut off at the end of a chunk ("\", "\u", "\u00", ...)
+_PARTIAL_ESCAPE = re.compile(r'\\(?:u[0-9a-fA-F]{0,3})?$')
+# A trailing high surrogate, which needs the next \uXXXX to form a pair
+_HIGH_SURROGATE = re.compile(r'\\u[dD][89abAB][0-9a-fA-F]{2}$')
+# Any escape sequence, for repairing ones the JSON decoder rejects
+_ANY_ESCAPE = re.compile(r'\\(u[0-9a-fA-F]{4}|.)', re.DOTALL)
+
+
+def _is_escaped(text: str, index: int) -> bool:
+    """Whether the character at ``index`` is preceded by an odd run of backslashes."""
+    run = index - len(text[:index].rstrip('\\'))
+    return run % 2 == 1
+
+
+def _repair_escape(match: "re.Match") -> str:
+    # Keep valid escapes; drop the backslash from unknown ones ("\q" -> "q")
+    body = match.group(1)
+    if len(body) > 1 or body in '"\\/bfnrt':
+        return match.group(0)
+    return body
+
+
 class CodeBuffer:
     """
     Buffers streamed code and extracts complete segments.
 
     Handles the challenge of streaming JSON responses where the code
-    content is embedded in a JSON string.
+    content is embedded in a JSON string. Decoding is incremental: chunks
+    without escapes pass straight through, anything else is decoded by the
+    stdlib's C string scanner, and escapes split across chunks (including
+    ``\\uXXXX`` and surrogate pairs) are held back until complete. The
+    result matches ``json.loads`` for any chunking.
     """
 
     def __init__(self):
         self.buffer = ""
         self.in_content = False
+        self.done = False
         self.content_key = '"content":'
-        self.escape_next = False
-        self.extracted_content = ""
+        self._search_from = 0
+        self._parts: List[str] = []
+
+    @property
+    def extracted_content(self) -> str:
+        return self.get_full_content()
 
     def add_chunk(self, chunk: str) -> List[str]:
         """
@@ -129,73 +162,76 @@ class CodeBuffer:
 
         Returns list of code segments ready for streaming to UI.
         """
+        if self.done:
+            return []
+
         self.buffer += chunk
-        segments = []
 
         # Look for the start of content field
         if not self.in_content:
-            content_start = self.buffer.find(self.content_key)
-            if content_start != -1:
-                # Find the opening quote after "content":
-                quote_start = self.buffer.find('"', content_start + len(self.content_key))
-                if quote_start != -1:
-                    self.in_content = True
-                    self.buffer = self.buffer[quote_start + 1:]  # Start after opening quote
-
-        if self.in_content:
-            # Process character by character to handle escapes
-            new_content = ""
-            i = 0
-            while i < len(self.buffer):
-                char = self.buffer[i]
-
-                if self.escape_next:
-                    # Handle escape sequences
-                    if char == 'n':
-                        new_content += '\n'
-                    elif char == 't':
-                        new_content += '\t'
-                    elif char == 'r':
-                        new_content += '\r'
-                    elif char == '"':
-                        new_content += '"'
-                    elif char == '\\':
-                        new_content += '\\'
-                    else:
-                        new_content += char
-                    self.escape_next = False
-                elif char == '\\':
-                    self.escape_next = True
-                elif char == '"':
-                    # End of content string
-                    self.in_content = False
-                    self.buffer = self.buffer[i + 1:]
-                    break
-                else:
-                    new_content += char
-
-                i += 1
-
-            if new_content:
-                self.extracted_content += new_content
-                segments.append(new_content)
-
-            # Clear processed buffer if still in content
-            if self.in_content:
-                self.buffer = ""
-
-        return segments
+            content_start = self.buffer.find(self.content_key, self._search_from)
+            if content_start == -1:
+                # The key may straddle the next chunk boundary
+                self._search_from = max(len(self.buffer) - len(self.content_key), 0)
+                return []
+            # Find the opening quote after "content":
+            quote_start = self.buffer.find('"', content_start + len(self.content_key))
+            if quote_start == -1:
+                self._search_from = content_start
+                return []
+            self.in_content = True
+            self.buffer = self.buffer[quote_start + 1:]  # Start after opening quote
+
+        segment = self._decode()
+        if not segment:
+            return []
+        self._parts.append(segment)
+        return [segment]
+
+    def _decode(self) -> str:
+        """Decode as much of the buffered string body as is complete."""
+        buf = self.buffer
+
+        # Common case: plain code with nothing to unescape
+        if '\\' not in buf and '"' not in buf:
+            self.buffer = ""
+            return buf
+
+        # Hold back an escape that continues in the next chunk
+        cut = len(buf)
+        for pattern in (_PARTIAL_ESCAPE, _HIGH_SURROGATE):
+            match = pattern.search(buf, max(cut - 6, 0), cut)
+            if match and not _is_escaped(buf, match.start()):
+                cut = match.start()
+        body, self.buffer = buf[:cut], buf[cut:]
+
+        # The appended quote ends the scan unless the real closing quote comes first
+        try:
+            text, end = scanstring(body + '"', 0, False)
+        except json.JSONDecodeError:
+            body = _ANY_ESCAPE.sub(_repair_escape, body)
+            text, end = scanstring(body + '"', 0, False)
+
+        if end <= len(body):
+            # End of content string
+            self.in_content = False
+            self.done = True
+            self.buffer = ""
+        return text
 
     def get_full_content(self) -> str:
         """Get all extracted content so far."""
-        return self.extracted_content
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
 
     def reset(self):
         """Reset the buffer state."""
         self.buffer = ""
         self.in_content = False
-        self.escape_next = False
-        self.extracted_content = ""
+        self.done = False
+        self._search_from = 0
+        self._parts = []
 
 
 # =============================================================================
@@ -250,19 +286,22 @@ class StreamingExecutor(Executor):
             current_file_content: Optional[str] = None,
             project_context: str = "",
             enable_self_verification: bool = True,
+            model: Optional[ClaudeModel] = None,
     ) -> AsyncGenerator[StreamEvent, None]:
         """
         Execute a plan step with streaming output.
 
         Yields StreamEvents as code is generated, allowing real-time
-        display in the UI.
+        display in the UI. ``model`` is the ModelRouter's pick for this
+        step (Sonnet if omitted).
 
         Usage:
             async for event in executor.execute_step_streaming(...):
                 if event.event_type == StreamEventType.CODE_CHUNK:
                     display_code_chunk(event.content)
         """
-        logger.info(f"[FORGE:STREAMING] Starting step {step.order}: [{step.action}] {step.file}")
+        model = model or ClaudeModel.SONNET
+        logger.info(f"[FORGE:STREAMING] Starting step {step.order}: [{step.action}] {step.file} ({model.name})")
 
         # Emit start event
         yield StreamEvent(
@@ -301,7 +340,7 @@ class StreamingExecutor(Executor):
             )
 
             reasoning = None
-            async for event in self._stream_reasoning(step, patterns, context, current_file_content or ""):
+            async for event in self._stream_reasoning(step, patterns, context, current_file_content or "", model):
                 yield event
                 if event.event_type == StreamEventType.REASONING_COMPLETED:
                     reasoning = event.data.get("reasoning")
@@ -321,20 +360,20 @@ class StreamingExecutor(Executor):
             prev_results_str = self._format_previous_results(previous_results)
 
             if step.action == "create":
-                async for event in self._stream_create(step, context, prev_results_str, patterns, reasoning):
+                async for event in self._stream_create(step, context, prev_results_str, patterns, reasoning, model):
                     yield event
                     if event.event_type == StreamEventType.CODE_COMPLETED:
                         result = event.data.get("result")
             elif step.action == "modify":
                 async for event in self._stream_modify(
-                        step, context, prev_results_str, current_file_content or "", patterns, reasoning
+                        step, context, prev_results_str, current_file_content or "", patterns, reasoning, model
                 ):
                     yield event
                     if event.event_type == StreamEventType.CODE_COMPLETED:
                         result = event.data.get("result")
             elif step.action == "delete":
                 # Delete doesn't need streaming
-                result = await self._execute_delete(step, context, current_file_content or "")
+                result = await self._execute_delete(step, context, current_file_content or "", model=model)
                 yield StreamEvent(
                     event_type=StreamEventType.CODE_COMPLETED,
                     file_path=step.file,
@@ -358,7 +397,7 @@ class StreamingExecutor(Executor):
                     progress=0.85,
                 )
 
-                passes, issues = await self._verify_result(result, current_file_content)
+                passes, issues = await self._verify_result(result, current_file_content, model=model)
 
                 yield StreamEvent(
                     event_type=StreamEventType.VERIFY_COMPLETED,
@@ -374,7 +413,7 @@ class StreamingExecutor(Executor):
                         progress=0.92,
                     )
 
-                    async for event in self._stream_fix(result, issues, context, patterns):
+                    async for event in self._stream_fix(result, issues, context, patterns, model):
                         yield event
                         if event.event_type == StreamEventType.FIX_COMPLETED:
                             result = event.data.get("result", result)
@@ -400,12 +439,32 @@ class StreamingExecutor(Executor):
                 data={"error": str(e)},
             )
 
+    async def fix_execution_streaming(
+            self,
+            result: ExecutionResult,
+            issues: List[str],
+            context: RetrievedContext,
+            model: Optional[ClaudeModel] = None,
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """
+        Streaming counterpart of ``fix_execution``.
+
+        Yields FIX_CHUNK events as the fixed file is generated, then a
+        FIX_COMPLETED event whose ``data["result"]`` is the fixed result
+        (the original result if the fix failed).
+        """
+        async for event in self._stream_fix(
+                result, issues, context, CodePatterns(), model or ClaudeModel.SONNET
+        ):
+            yield event
+
     async def _stream_reasoning(
             self,
             step: PlanStep,
             patterns: CodePatterns,
             context: RetrievedContext,
             current_content: str,
+            model: ClaudeModel = ClaudeModel.SONNET,
     ) -> AsyncGenerator[StreamEvent, None]:
         """Stream the reasoning phase."""
 
@@ -423,7 +482,7 @@ class StreamingExecutor(Executor):
             full_response = ""
 
             async for chunk in self.claude.stream_cached(
-                    model=ClaudeModel.SONNET,
+                    model=model,
                     messages=[{"role": "user", "content": user_prompt}],
                     system=REASONING_SYSTEM_PROMPT,
                     temperature=0.2,
@@ -473,12 +532,14 @@ class StreamingExecutor(Executor):
             previous_results: str,
             patterns: CodePatterns,
             reasoning: ExecutionReasoning,
+            model: ClaudeModel = ClaudeModel.SONNET,
     ) -> AsyncGenerator[StreamEvent, None]:
         """Stream CREATE action with real-time code output."""
 
         from app.agents.executor import EXECUTION_USER_CREATE
 
         reasoning_str = json.dumps(reasoning.to_dict(), indent=2)
+        laravel_context = self._get_laravel_context(step.file, step.description, "", context)
 
         user_prompt = safe_format(
             EXECUTION_USER_CREATE,
@@ -486,7 +547,7 @@ class StreamingExecutor(Executor):
             patterns=patterns.to_prompt_string(),
             file_path=step.file,
             description=step.description,
-            context=context.to_prompt_string(),
+            context=context.to_prompt_string() + laravel_context,
             previous_results=previous_results,
         )
 
@@ -495,7 +556,7 @@ class StreamingExecutor(Executor):
 
         try:
             async for chunk in self.claude.stream_cached(
-                    model=ClaudeModel.SONNET,
+                    model=model,
                     messages=[{"role": "user", "content": user_prompt}],
                     system=EXECUTION_SYSTEM_CREATE,
                     temperature=0.3,
@@ -550,12 +611,14 @@ class StreamingExecutor(Executor):
             current_content: str,
             patterns: CodePatterns,
             reasoning: ExecutionReasoning,
+            model: ClaudeModel = ClaudeModel.SONNET,
     ) -> AsyncGenerator[StreamEvent, None]:
         """Stream MODIFY action with real-time code output."""
 
         from app.agents.executor import EXECUTION_USER_MODIFY
 
         reasoning_str = json.dumps(reasoning.to_dict(), indent=2)
+        laravel_context = self._get_laravel_context(step.file, step.description, current_content, context)
 
         user_prompt = safe_format(
             EXECUTION_USER_MODIFY,
@@ -564,7 +627,7 @@ class StreamingExecutor(Executor):
             file_path=step.file,
             description=step.description,
             current_content=current_content,
-            context=context.to_prompt_string(),
+            context=context.to_prompt_string() + laravel_context,
             previous_results=previous_results,
         )
 
@@ -573,7 +636,7 @@ class StreamingExecutor(Executor):
 
         try:
             async for chunk in self.claude.stream_cached(
-                    model=ClaudeModel.SONNET,
+                    model=model,
                     messages=[{"role": "user", "content": user_prompt}],
                     system=EXECUTION_SYSTEM_MODIFY,
                     temperature=0.3,
@@ -633,6 +696,7 @@ class StreamingExecutor(Executor):
             issues: List[str],
             context: RetrievedContext,
             patterns: CodePatterns,
+            model: ClaudeModel = ClaudeModel.SONNET,
     ) -> AsyncGenerator[StreamEvent, None]:
         """Stream the fix phase."""
 
@@ -681,7 +745,7 @@ class StreamingExecutor(Executor):
 
         try:
             async for chunk in self.claude.stream_cached(
-                    model=ClaudeModel.SONNET,
+                    model=model,
                     messages=[{"role": "user", "content": user_prompt}],
                     system=FIX_SYSTEM_PROMPT,
                     temperature=0.3,
@@ -709,6 +773,8 @@ class StreamingExecutor(Executor):
                 content=content,
                 diff=diff,
                 original_content=result.original_content,
+                reasoning=result.reasoning,
+                patterns_used=result.patterns_used,
             )
 
             yield StreamEvent(
@@ -38,7 +38,8 @@ from app.agents.intent_schema import (
     get_intent_json_schema,
 )
 from app.agents.nova_system_prompt import NOVA_SYSTEM_PROMPT
-from app.services.claude import ClaudeService, ClaudeModel, get_claude_service
+from app.services.claude import ClaudeService, ClaudeModel, get_claude_service, prefixed_user_message
+from app.services.response_memo import get_response_memo
 
 logger = logging.getLogger(__name__)
 
@@ -178,20 +179,28 @@ class IntentAnalyzer:
 
         logger.info(f"[{self.identity.name.upper()}] Initialized with Sonnet + Structured Outputs")
 
+    def _build_context_prefix(self, project_context: Optional[str] = None) -> str:
+        """
+        Build the project context block sent ahead of the per-request prompt.
+
+        It is identical for every request against the same project index
+        version, so it is sent as a cacheable prefix.
+        """
+        if project_context:
+            return f"<project_context>\n{project_context}\n</project_context>"
+        return "<project_context>Laravel project (no scan data available)</project_context>"
+
     def _build_user_prompt(
             self,
             user_input: str,
-            project_context: Optional[str] = None,
             conversation_summary: Optional[ConversationSummary] = None,
             recent_messages: Optional[list[RecentMessage]] = None,
     ) -> str:
         """
-        Build the user prompt with all context layers.
+        Build the per-request part of the user prompt.
 
         Args:
             user_input: Current user message
-            project_context: Rich project context from Orchestrator.build_project_context()
-                            Already includes: stack, file_stats, structure, ai_context
             conversation_summary: Rolling summary of conversation (decisions, tasks, entities)
             recent_messages: Last 4 messages for immediate context
 
@@ -200,25 +209,19 @@ class IntentAnalyzer:
         """
         parts = []
 
-        # 1. Project context (from Orchestrator - includes Laravel info)
-        if project_context:
-            parts.append(f"<project_context>\n{project_context}\n</project_context>")
-        else:
-            parts.append("<project_context>Laravel project (no scan data available)</project_context>")
-
-        # 2. Conversation summary (rolling context)
+        # 1. Conversation summary (rolling context)
         if conversation_summary:
             parts.append(conversation_summary.to_prompt_text())
         else:
             parts.append("<conversation_context>No prior conversation context.</conversation_context>")
 
-        # 3. Recent messages (last 4)
+        # 2. Recent messages (last 4)
         if recent_messages:
             parts.append(format_recent_messages(recent_messages, max_messages=4))
         else:
             parts.append("<recent_messages>No recent messages.</recent_messages>")
 
-        # 4. Current request
+        # 3. Current request
         parts.append(f"<current_request>\n{user_input}\n</current_request>")
 
         return "\n\n".join(parts)
@@ -229,6 +232,7 @@ class IntentAnalyzer:
             project_context: Optional[str] = None,
             conversation_summary: Optional[ConversationSummary] = None,
             recent_messages: Optional[list[RecentMessage]] = None,
+            model: Optional[ClaudeModel] = None,
     ) -> Intent:
         """
         Analyze user input to extract intent.
@@ -239,6 +243,7 @@ class IntentAnalyzer:
                             (Already includes Laravel version, stack, file stats, etc.)
             conversation_summary: Rolling context from prior interactions
             recent_messages: Last 4 messages for immediate context
+            model: Model chosen by the ModelRouter (defaults to NOVA_MODEL)
 
         Returns:
             Intent object with extracted information
@@ -252,10 +257,10 @@ class IntentAnalyzer:
         logger.info(f"[{self.identity.name.upper()}] {self.identity.get_random_greeting()}")
         logger.info(f"[{self.identity.name.upper()}] Analyzing: {user_input[:100]}...")
 
-        # Build prompt with all context layers
+        # Build prompt with all context layers (project context as a cacheable prefix)
+        context_prefix = self._build_context_prefix(project_context)
         user_prompt = self._build_user_prompt(
             user_input=user_input,
-            project_context=project_context,
             conversation_summary=conversation_summary,
             recent_messages=recent_messages,
         )
@@ -267,6 +272,8 @@ class IntentAnalyzer:
                 intent = await self._call_claude_structured(
                     user_prompt=user_prompt,
                     attempt=attempt,
+                    model=model,
+                    context_prefix=context_prefix,
                 )
 
                 # Calculate timing
@@ -300,7 +307,13 @@ class IntentAnalyzer:
 
         return fallback
 
-    async def _call_claude_structured(self, user_prompt: str, attempt: int) -> Intent:
+    async def _call_claude_structured(
+            self,
+            user_prompt: str,
+            attempt: int,
+            model: Optional[ClaudeModel] = None,
+            context_prefix: Optional[str] = None,
+    ) -> Intent:
         """
         Call Claude with structured output expectations.
 
@@ -310,27 +323,36 @@ class IntentAnalyzer:
         Args:
             user_prompt: The formatted user prompt
             attempt: Current attempt number (for logging)
+            model: Model override (defaults to the configured agent model)
+            context_prefix: Stable project context, sent as a cached block
 
         Returns:
             Validated Intent object
         """
         logger.debug(f"[{self.identity.name.upper()}] {self.identity.get_random_thinking()}")
 
-        messages = [{"role": "user", "content": user_prompt}]
+        messages = [prefixed_user_message(context_prefix, user_prompt)]
+
+        model = model or MODEL_MAP.get(NOVA_MODEL, ClaudeModel.OPUS)
 
         # Use existing Claude service
         response = await self.claude.chat_async(
-            model=MODEL_MAP.get(NOVA_MODEL, ClaudeModel.OPUS),
+            model=model,
             messages=messages,
             system=NOVA_SYSTEM_PROMPT,
-            temperature=0.2,  # Low temperature for consistent classification
+            temperature=0.0,  # Deterministic classification (memoised on repeat)
             max_tokens=2048,
             request_type="intent",
             use_cache=True,  # Cache the static system prompt
         )
 
         # Parse and validate response
-        intent_output = self._parse_and_validate(response)
+        try:
+            intent_output = self._parse_and_validate(response)
+        except ValueError:
+            # Don't let the retry replay the same unusable response
+            get_response_memo().discard(model, NOVA_SYSTEM_PROMPT, messages)
+            raise
         return Intent.from_output(intent_output)
 
     def _parse_and_validate(self, response: str) -> IntentOutput:
@@ -14,6 +14,7 @@ import logging
 import random
 from dataclasses import dataclass
 from typing import Optional, Callable, Any, List, Dict
+from uuid import uuid4
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -50,6 +51,7 @@ from app.agents.events import (
     execution_started,
     step_started,
     step_code_chunk,
+    content_digest,
     step_completed,
     execution_completed,
     validation_started,
@@ -60,16 +62,20 @@ from app.agents.events import (
     error,
 )
 from app.agents.exceptions import InsufficientContextError
-from app.agents.executor import Executor
+from app.agents.executor import ExecutionResult
+from app.agents.forge_streaming import StreamingExecutor, StreamEventType
 from app.agents.intent_analyzer import IntentAnalyzer, Intent
+from app.agents.laravel_profile import get_profile_store, render_project_context
+from app.agents.model_router import ModelRouter
 from app.agents.orchestrator import ProcessPhase, ProcessEvent, ProcessResult
-from app.agents.orchestrator_context import ConversationContextManager
+from app.agents.orchestrator_context import ConversationContext, ConversationContextManager
 from app.agents.planner import Planner, Plan, PlanStep
-from app.agents.validator import Validator
-from app.models.models import Project
-from app.services.claude import ClaudeService, get_claude_service
+from app.agents.validator import Validator, ProjectSymbolTable, group_issues_by_result
+from app.models.models import Project, IndexedFile
+from app.services.claude import ClaudeService, ClaudeModel, get_claude_service
 from app.services.conversation_logger import ConversationLogger
 from app.services.file_access import FileAccessService
+from app.services.plan_approval import PlanApprovalBackend, PlanDecision, get_plan_approval_backend
 
 logger = logging.getLogger(__name__)
 
@@ -108,6 +114,10 @@ class InteractiveOrchestrator:
             require_plan_approval: bool = True,
             step_by_step_mode: bool = False,
             conversation_id: Optional[str] = None,
+            fast_mode: Optional[bool] = None,
+            approval_id: Optional[str] = None,
+            approval_backend: Optional[PlanApprovalBackend] = None,
+            conversation_context: Optional[ConversationContext] = None,
     ):
         """
         Initialize the interactive orchestrator.
@@ -121,6 +131,15 @@ class InteractiveOrchestrator:
             require_plan_approval: If True, pauses for user plan approval
             step_by_step_mode: If True, pauses between execution steps
             conversation_id: Optional conversation ID for context management
+            fast_mode: Skip cosmetic delays between UI events and leave animation
+                to the frontend (defaults to config.FAST_MODE)
+            approval_id: Key plan decisions are delivered under (the chat
+                conversation id; defaults to conversation_id or a random id)
+            approval_backend: Where plan decisions arrive (defaults to the
+                configured backend, shared across workers when Redis-backed)
+            conversation_context: Context already loaded for this request; it
+                only primes the context cache, so summary loading and
+                persistence still need an explicit conversation_id
         """
         self.db = db
         self.event_callback = event_callback
@@ -128,23 +147,25 @@ class InteractiveOrchestrator:
         self.config = config or agent_config
         self.require_plan_approval = require_plan_approval
         self.step_by_step_mode = step_by_step_mode
+        self.fast_mode = self.config.FAST_MODE if fast_mode is None else fast_mode
 
         # Conversation context management
-        self.context_manager = ConversationContextManager(db)
+        self.context_manager = ConversationContextManager(db, context=conversation_context)
         self.conversation_id = conversation_id
         self._conversation_summary: Optional[ConversationSummary] = None
         self._recent_messages: List[RecentMessage] = []
 
         # Plan approval state
         self.plan_approval = PlanApprovalState()
-        self._plan_approval_event = asyncio.Event()
+        self.approval_id = approval_id or conversation_id or str(uuid4())
+        self.approval_backend = approval_backend or get_plan_approval_backend()
 
         # Initialize agents with the Claude service and config
         self.claude = claude_service or get_claude_service()
         self.intent_analyzer = IntentAnalyzer(self.claude)
         self.context_retriever = ContextRetriever(db, config=self.config)
         self.planner = Planner(self.claude)
-        self.executor = Executor(self.claude, config=self.config)
+        self.executor = StreamingExecutor(self.claude, config=self.config)
         self.validator = Validator(self.claude, config=self.config)
 
         # Timeline tracker
@@ -168,6 +189,12 @@ class InteractiveOrchestrator:
             except Exception as e:
                 logger.error(f"[INTERACTIVE_ORCHESTRATOR] Event callback error: {e}")
 
+    async def _pace(self, seconds: float) -> None:
+        """Cosmetic pause between UI events; skipped entirely in fast mode."""
+        if self.fast_mode or seconds <= 0:
+            return
+        await asyncio.sleep(seconds)
+
     async def _emit_legacy_event(
             self,
             phase: ProcessPhase,
@@ -232,7 +259,7 @@ class InteractiveOrchestrator:
                 progress,
             ))
             self.timeline.add_thought(thought)
-            await asyncio.sleep(delay)
+            await self._pace(delay)
 
     async def _handoff(
             self,
@@ -263,61 +290,147 @@ class InteractiveOrchestrator:
 
         await self._set_active_agent(to_agent)
 
-    async def _stream_code_content(
+    async def _emit_code_chunk(
             self,
             step_index: int,
             file_path: str,
-            content: str,
+            chunk: str,
+            accumulated_length: int,
             action: str,
-            chunk_size: int = 150,
-            delay: float = 0.05,
-    ) -> None:
+    ) -> int:
         """
-        Stream code content in chunks for real-time display.
+        Forward a live code chunk to the UI.
 
-        Args:
-            step_index: Index of the current step
-            file_path: Path of the file being generated
-            content: Full content to stream
-            action: Action type (create, modify, delete)
-            chunk_size: Size of each chunk in characters
-            delay: Delay between chunks in seconds
+        The final length is unknown while the model is still generating, so
+        total_length is 0 until the done event. Returns the new accumulated length.
         """
-        if not content:
-            return
-
-        total_length = len(content)
-        accumulated = ""
-
-        # Stream in chunks
-        for i in range(0, total_length, chunk_size):
-            chunk = content[i:i + chunk_size]
-            accumulated += chunk
-
-            await self._emit_event(step_code_chunk(
-                step_index=step_index,
-                file_path=file_path,
-                chunk=chunk,
-                accumulated_length=len(accumulated),
-                total_length=total_length,
-                done=False,
-                action=action,
-            ))
+        accumulated_length += len(chunk)
+        await self._emit_event(step_code_chunk(
+            step_index=step_index,
+            file_path=file_path,
+            chunk=chunk,
+            accumulated_length=accumulated_length,
+            total_length=0,
+            done=False,
+            action=action,
+        ))
+        return accumulated_length
 
-            await asyncio.sleep(delay)
+    async def _emit_code_done(
+            self,
+            step_index: int,
+            file_path: str,
+            content: str,
+            action: str,
+            streamed: str = "",
+    ) -> None:
+        """
+        Emit the final code event.
 
-        # Emit final done event with full content
+        When the chunks already added up to the final content, the event
+        only carries its hash; otherwise (e.g. after a self-verification
+        fix) it carries the complete content.
+        """
+        already_sent = streamed == content
         await self._emit_event(step_code_chunk(
             step_index=step_index,
             file_path=file_path,
             chunk="",
-            accumulated_length=total_length,
-            total_length=total_length,
+            accumulated_length=len(content),
+            total_length=len(content),
             done=True,
             action=action,
-            content=content,
+            content=None if already_sent else content,
+            content_hash=content_digest(content) if already_sent else None,
         ))
 
+    async def _execute_step_streaming(
+            self,
+            step_index: int,
+            step: PlanStep,
+            context: RetrievedContext,
+            previous_results: List[ExecutionResult],
+            current_content: Optional[str],
+            project_context: str,
+            model: ClaudeModel,
+    ) -> ExecutionResult:
+        """
+        Execute a step, forwarding Forge's code tokens to the UI as they arrive.
+
+        Self-verification fixes are not forwarded chunk by chunk; the done
+        event carries the final content when it differs from what was streamed.
+        """
+        exec_result: Optional[ExecutionResult] = None
+        error_message: Optional[str] = None
+        accumulated = 0
+        streamed: List[str] = []
+
+        async for event in self.executor.execute_step_streaming(
+                step=step,
+                context=context,
+                previous_results=previous_results,
+                current_file_content=current_content,
+                project_context=project_context,
+                model=model,
+        ):
+            if event.event_type == StreamEventType.CODE_CHUNK:
+                streamed.append(event.content)
+                accumulated = await self._emit_code_chunk(
+                    step_index, step.file, event.content, accumulated, step.action
+                )
+            elif event.event_type in (StreamEventType.CODE_COMPLETED, StreamEventType.FIX_COMPLETED):
+                exec_result = event.data.get("result", exec_result)
+            elif event.event_type == StreamEventType.STEP_FAILED:
+                error_message = error_message or event.message or "Code generation failed"
+
+        if error_message or exec_result is None:
+            return ExecutionResult(
+                file=step.file,
+                action=step.action,
+                content="",
+                success=False,
+                error=error_message or "No result from streaming execution",
+            )
+
+        if exec_result.success and exec_result.content:
+            await self._emit_code_done(
+                step_index, step.file, exec_result.content, step.action, "".join(streamed)
+            )
+
+        return exec_result
+
+    async def _fix_execution_streaming(
+            self,
+            step_index: int,
+            exec_result: ExecutionResult,
+            issues: List[str],
+            context: RetrievedContext,
+            model: ClaudeModel,
+    ) -> ExecutionResult:
+        """Fix a file, forwarding the regenerated code to the UI as it arrives."""
+        fixed = exec_result
+        accumulated = 0
+        streamed: List[str] = []
+
+        async for event in self.executor.fix_execution_streaming(
+                result=exec_result,
+                issues=issues,
+                context=context,
+                model=model,
+        ):
+            if event.event_type == StreamEventType.FIX_CHUNK:
+                streamed.append(event.content)
+                accumulated = await self._emit_code_chunk(
+                    step_index, exec_result.file, event.content, accumulated, "modify"
+                )
+            elif event.event_type == StreamEventType.FIX_COMPLETED:
+                fixed = event.data.get("result", exec_result)
+
+        if fixed.success and fixed.content:
+            await self._emit_code_done(step_index, fixed.file, fixed.content, "modify", "".join(streamed))
+
+        return fixed
+
     async def approve_plan(
             self,
             approved: bool = True,
@@ -327,8 +440,21 @@ class InteractiveOrchestrator:
         """
         Approve, modify, or reject the current plan.
 
-        Called by the frontend when user makes a decision on the plan.
+        Goes through the approval backend, so it reaches this orchestrator
+        the same way a decision from another worker would.
         """
+        await self.approval_backend.submit(self.approval_id, PlanDecision(
+            approved=approved,
+            modified_plan=modified_plan,
+            rejection_reason=rejection_reason,
+        ))
+
+    def _apply_plan_decision(self, decision: PlanDecision) -> None:
+        """Record the user's decision in the approval state."""
+        approved = decision.approved
+        modified_plan = decision.modified_plan
+        rejection_reason = decision.rejection_reason
+
         self.plan_approval.approved = approved
         self.plan_approval.rejected = not approved and rejection_reason is not None
         self.plan_approval.rejection_reason = rejection_reason
@@ -349,8 +475,6 @@ class InteractiveOrchestrator:
                 steps=steps,
             )
 
-        self._plan_approval_event.set()
-
     async def process_request(
             self,
             project_id: str,
@@ -371,9 +495,9 @@ class InteractiveOrchestrator:
         logger.info(f"[INTERACTIVE_ORCHESTRATOR] User input: {user_input[:200]}...")
 
         result = ProcessResult(success=False, events=[])
+        router = ModelRouter(self.config)
         self.validator.clear_history()
         self.plan_approval = PlanApprovalState()
-        self._plan_approval_event.clear()
 
         try:
             # ============== CONDUCTOR INTRO ==============
@@ -384,7 +508,7 @@ class InteractiveOrchestrator:
                 CONDUCTOR.get_random_greeting(),
                 "greeting",
             ))
-            await asyncio.sleep(0.3)
+            await self._pace(0.3)
 
             # ============== FETCH PROJECT ==============
             project = await self._get_project(project_id)
@@ -393,7 +517,8 @@ class InteractiveOrchestrator:
                 await self._emit_event(error("Project not found"))
                 return result
 
-            project_context = self.build_project_context(project)
+            project_context = await self._load_project_context(project)
+            symbol_table = await self._load_symbol_table(project_id)
 
             # ============== LOAD CONVERSATION CONTEXT ==============
             conv_id = conversation_id or self.conversation_id
@@ -435,6 +560,7 @@ class InteractiveOrchestrator:
                 project_context=project_context,
                 conversation_summary=self._conversation_summary,
                 recent_messages=self._recent_messages,
+                model=router.route_intent(user_input),
             )
 
             result.intent = intent
@@ -510,7 +636,7 @@ class InteractiveOrchestrator:
                     chunk.score,
                     chunk.content[:100] + "..." if len(chunk.content) > 100 else chunk.content,
                 ))
-                await asyncio.sleep(0.2)
+                await self._pace(0.2)
 
             if self.conversation_logger:
                 chunks_data = [
@@ -585,7 +711,10 @@ class InteractiveOrchestrator:
             )
             result.events.append(event)
 
-            plan = await self.planner.plan(user_input, intent, context, project_context)
+            plan = await self.planner.plan(
+                user_input, intent, context, project_context,
+                model=router.route_planning(intent),
+            )
             result.plan = plan
 
             # Emit steps one by one (for animation)
@@ -595,7 +724,7 @@ class InteractiveOrchestrator:
                     step.to_dict(),
                     len(plan.steps),
                 ))
-                await asyncio.sleep(0.3)
+                await self._pace(0.3)
 
             if self.conversation_logger:
                 self.conversation_logger.log_plan(plan.to_dict())
@@ -622,22 +751,25 @@ class InteractiveOrchestrator:
 
             # ============== PLAN APPROVAL GATEWAY ==============
             if self.require_plan_approval:
-                await self._emit_event(plan_ready(
-                    plan.to_dict(),
-                    "Plan ready for review. Please approve to continue.",
-                    True,
-                ))
-
+                # Open before announcing the plan so an immediate decision is not lost
+                await self.approval_backend.open(self.approval_id)
                 try:
-                    await asyncio.wait_for(
-                        self._plan_approval_event.wait(),
-                        timeout=300.0,
-                    )
-                except asyncio.TimeoutError:
+                    await self._emit_event(plan_ready(
+                        plan.to_dict(),
+                        "Plan ready for review. Please approve to continue.",
+                        True,
+                    ))
+                    decision = await self.approval_backend.wait(self.approval_id, timeout=300.0)
+                finally:
+                    await self.approval_backend.close(self.approval_id)
+
+                if decision is None:
                     result.error = "Plan approval timed out"
                     await self._emit_event(error("Plan approval timed out"))
                     return result
 
+                self._apply_plan_decision(decision)
+
                 if self.plan_approval.rejected:
                     await self._emit_event(agent_message(
                         BLUEPRINT.agent_type.value,
@@ -729,26 +861,17 @@ class InteractiveOrchestrator:
                 if step.action in ["modify", "delete"]:
                     current_content = await self._get_file_content(project_id, step.file)
 
-                # Execute the step
-                exec_result = await self.executor.execute_step(
+                # Execute the step, streaming code to the UI as it is generated
+                exec_result = await self._execute_step_streaming(
+                    step_index=i,
                     step=step,
                     context=context,
                     previous_results=execution_results,
-                    current_file_content=current_content,
+                    current_content=current_content,
                     project_context=project_context,
+                    model=router.route_execution(step, intent, total_steps, current_content),
                 )
 
-                # Stream the generated code content
-                if exec_result.success and exec_result.content:
-                    await self._stream_code_content(
-                        step_index=i,
-                        file_path=step.file,
-                        content=exec_result.content,
-                        action=step.action,
-                        chunk_size=200,
-                        delay=0.03,
-                    )
-
                 execution_results.append(exec_result)
 
                 if self.conversation_logger:
@@ -835,6 +958,8 @@ class InteractiveOrchestrator:
                 intent=intent,
                 results=execution_results,
                 context=context,
+                symbol_table=symbol_table,
+                model=router.route_validation(execution_results, intent),
             )
             result.validation = validation
 
@@ -846,7 +971,7 @@ class InteractiveOrchestrator:
                     issue.line,
                     None,
                 ))
-                await asyncio.sleep(0.2)
+                await self._pace(0.2)
 
             if self.conversation_logger:
                 self.conversation_logger.log_validation(validation.to_dict())
@@ -879,6 +1004,24 @@ class InteractiveOrchestrator:
                         ))
                         break
 
+                # Only files with open errors are re-executed; the rest keep
+                # their content so Guardian can reuse their cached verdicts.
+                issues_by_result, unmatched_issues = group_issues_by_result(
+                    validation.errors, execution_results,
+                )
+                files_to_fix = {
+                    idx for idx in issues_by_result
+                    if execution_results[idx].success
+                }
+                if not files_to_fix:
+                    await self._emit_event(agent_message(
+                        GUARDIAN.agent_type.value,
+                        GUARDIAN.name,
+                        "Remaining issues are not tied to any generated file. Manual review required.",
+                        "error",
+                    ))
+                    break
+
                 if is_critical_failure and retry_count == 1:
                     await self._emit_event(agent_message(
                         GUARDIAN.agent_type.value,
@@ -888,6 +1031,7 @@ class InteractiveOrchestrator:
                     ))
 
                 previous_score = validation.score
+                router.record_failed_validation()
 
                 await self._emit_event(validation_fix_started(
                     len(validation.errors),
@@ -916,51 +1060,12 @@ class InteractiveOrchestrator:
 
                 all_issues = [i.message for i in validation.errors]
 
-                def normalize_path(path: str) -> str:
-                    if not path:
-                        return ""
-                    path = path.strip().replace("\\", "/")
-                    if path.startswith("./"):
-                        path = path[2:]
-                    return path.lower()
-
-                exec_result_paths = {
-                    normalize_path(r.file): i
-                    for i, r in enumerate(execution_results)
-                }
-
-                files_to_fix = set()
-
-                for issue in validation.errors:
-                    issue_file_norm = normalize_path(issue.file)
-                    if issue_file_norm in exec_result_paths:
-                        files_to_fix.add(exec_result_paths[issue_file_norm])
-                    elif issue.file:
-                        for norm_path, idx in exec_result_paths.items():
-                            if issue_file_norm in norm_path or norm_path.endswith(issue_file_norm):
-                                files_to_fix.add(idx)
-                                break
-
-                if not files_to_fix and validation.errors:
-                    files_to_fix = set(range(len(execution_results)))
+                # Errors without a file can't be targeted; pass them along as context
+                unmatched_messages = [i.message for i in unmatched_issues]
 
-                for idx in files_to_fix:
+                for idx in sorted(files_to_fix):
                     exec_result = execution_results[idx]
-                    if not exec_result.success:
-                        continue
-
-                    exec_file_norm = normalize_path(exec_result.file)
-                    file_issues = [
-                        issue.message
-                        for issue in validation.errors
-                        if normalize_path(issue.file) == exec_file_norm
-                           or not issue.file
-                           or normalize_path(issue.file) in exec_file_norm
-                           or exec_file_norm.endswith(normalize_path(issue.file))
-                    ]
-
-                    if not file_issues:
-                        file_issues = all_issues
+                    file_issues = [i.message for i in issues_by_result[idx]] + unmatched_messages
 
                     if file_issues:
                         file_was_deleted = (
@@ -993,10 +1098,12 @@ class InteractiveOrchestrator:
                                 "Regenerate the complete file with proper styling changes as requested.",
                             ]
 
-                            fixed = await self.executor.fix_execution(
-                                result=exec_result,
+                            fixed = await self._fix_execution_streaming(
+                                step_index=idx,
+                                exec_result=exec_result,
                                 issues=regeneration_issues,
                                 context=context,
+                                model=router.route_fix(exec_result),
                             )
                         else:
                             await self._emit_thinking_sequence(
@@ -1007,21 +1114,12 @@ class InteractiveOrchestrator:
                                 file_path=exec_result.file,
                             )
 
-                            fixed = await self.executor.fix_execution(
-                                result=exec_result,
+                            fixed = await self._fix_execution_streaming(
+                                step_index=idx,
+                                exec_result=exec_result,
                                 issues=file_issues,
                                 context=context,
-                            )
-
-                        # Stream the fixed code
-                        if fixed.success and fixed.content:
-                            await self._stream_code_content(
-                                step_index=idx,
-                                file_path=fixed.file,
-                                content=fixed.content,
-                                action="modify",
-                                chunk_size=200,
-                                delay=0.03,
+                                model=router.route_fix(exec_result),
                             )
 
                         execution_results[idx] = fixed
@@ -1057,6 +1155,8 @@ class InteractiveOrchestrator:
                     intent=intent,
                     results=execution_results,
                     context=context,
+                    symbol_table=symbol_table,
+                    model=router.route_validation(execution_results, intent),
                 )
                 result.validation = validation
 
@@ -1064,6 +1164,7 @@ class InteractiveOrchestrator:
                     self.conversation_logger.log_validation(validation.to_dict())
 
             # ============== FINAL RESULT ==============
+            logger.info(f"[INTERACTIVE_ORCHESTRATOR] Model routing: {router.get_stats()}")
             await self._emit_event(validation_result(
                 validation.to_dict(),
                 "Validation complete",
@@ -1169,11 +1270,28 @@ class InteractiveOrchestrator:
             logger.debug(f"[INTERACTIVE_ORCHESTRATOR] Error fetching file content: {e}")
             return None
 
+    async def _load_symbol_table(self, project_id: str) -> Optional[ProjectSymbolTable]:
+        """Build the tier 1 symbol table from indexed file paths."""
+        try:
+            stmt = select(IndexedFile.file_path).where(IndexedFile.project_id == project_id)
+            rows = await self.db.execute(stmt)
+            return ProjectSymbolTable.from_file_paths(rows.scalars().all())
+        except Exception as e:
+            logger.debug(f"[INTERACTIVE_ORCHESTRATOR] Symbol table unavailable: {e}")
+            return None
+
     def build_project_context(self, project: Project) -> str:
         """Build rich project context from scan data."""
-        from app.agents.orchestrator import Orchestrator
-        temp = Orchestrator.__new__(Orchestrator)
-        return Orchestrator.build_project_context(temp, project)
+        return render_project_context(project)
+
+    async def _load_project_context(self, project: Project) -> str:
+        """Project context from the cached per-index Laravel profile."""
+        try:
+            profile = await get_profile_store().load(self.db, project)
+            return profile.project_context
+        except Exception as e:
+            logger.warning(f"[INTERACTIVE_ORCHESTRATOR] Laravel profile unavailable, rebuilding context: {e}")
+            return self.build_project_context(project)
 
     async def process_question(
             self,
@@ -1191,7 +1309,7 @@ class InteractiveOrchestrator:
         project = await self._get_project(project_id)
         project_context = ""
         if project:
-            project_context = self.build_project_context(project)
+            project_context = await self._load_project_context(project)
 
         # Load conversation context if available
         conv_summary = None
@@ -0,0 +1,305 @@
+"""
+Laravel Project Profile - derived project artefacts cached per index version.
+
+The project context string (stack, health, conventions) and the Laravel
+analyzer output for models, controllers, migrations and routes only change
+when the project is re-scanned or re-indexed. The profile is built once per
+index version, persisted under ``Project.ai_context["laravel_profile"]`` and
+kept in memory, so requests reuse it instead of rebuilding it.
+
+The rendered context is byte-stable for a given version, which lets agents
+send it as a cached prompt prefix.
+"""
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any
+
+from sqlalchemy import select, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.forge_laravel import (
+    LaravelContextEnhancer,
+    LaravelFileDetector,
+    LaravelFileType,
+    content_hash,
+    seed_file_info,
+)
+from app.core.database import async_session_factory
+from app.models.models import Project, IndexedFile
+
+logger = logging.getLogger(__name__)
+
+# Bump when the profile layout or rendering changes
+PROFILE_SCHEMA_VERSION = 1
+
+# Key under Project.ai_context
+PROFILE_KEY = "laravel_profile"
+
+# Files whose analyzer output is precomputed
+PROFILED_FILE_TYPES = {
+    LaravelFileType.MODEL,
+    LaravelFileType.CONTROLLER,
+    LaravelFileType.MIGRATION,
+    LaravelFileType.ROUTE,
+}
+PROFILED_PATH_PREFIXES = ("app/Models/", "app/Http/Controllers/", "database/migrations/", "routes/")
+MAX_PROFILED_FILES = 500
+
+
+def _as_dict(value: Any) -> dict:
+    """JSON columns may hold a dict or a serialized string."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return {}
+    return value if isinstance(value, dict) else {}
+
+
+def profile_version(project: Project) -> str:
+    """Version string that changes whenever the project is re-scanned or re-indexed."""
+    parts = [
+        str(PROFILE_SCHEMA_VERSION),
+        project.last_indexed_at.isoformat() if project.last_indexed_at else "-",
+        project.scanned_at.isoformat() if project.scanned_at else "-",
+        str(project.indexed_files_count or 0),
+    ]
+    return "|".join(parts)
+
+
+# =============================================================================
+# PROJECT CONTEXT RENDERING
+# =============================================================================
+
+def render_project_context(project: Project, file_analyses: Optional[List[Dict[str, Any]]] = None) -> str:
+    """Build rich project context from scan data (and model analyses, if any)."""
+    parts = []
+
+    def safe_get(obj, key, default=None):
+        if obj is None:
+            return default
+        if isinstance(obj, str):
+            try:
+                obj = json.loads(obj)
+            except (json.JSONDecodeError, TypeError):
+                return default
+        if isinstance(obj, dict):
+            return obj.get(key, default)
+        return default
+
+    parts.append(f"## Project: {project.repo_full_name}")
+    parts.append("")
+
+    # Technology Stack
+    stack = project.stack
+    if stack:
+        if isinstance(stack, str):
+            try:
+                stack = json.loads(stack)
+            except:
+                stack = {}
+
+        if isinstance(stack, dict):
+            parts.append("### Technology Stack")
+            backend = safe_get(stack, "backend", {})
+            if isinstance(backend, dict) and backend:
+                framework = safe_get(backend, "framework", "unknown")
+                version = safe_get(backend, "version", "")
+                php_version = safe_get(backend, "php_version", "")
+                parts.append(f"- **Backend:** {framework} {version}".strip())
+                if php_version:
+                    parts.append(f"- **PHP:** {php_version}")
+
+            frontend = safe_get(stack, "frontend", {})
+            if isinstance(frontend, dict) and frontend:
+                parts.append(
+                    f"- **Frontend:** {safe_get(frontend, 'framework', '')} {safe_get(frontend, 'version', '')}".strip())
+
+            database = safe_get(stack, "database", {})
+            if isinstance(database, dict):
+                db_type = safe_get(database, "type", "")
+                if db_type:
+                    parts.append(f"- **Database:** {db_type}")
+
+            packages = safe_get(stack, "packages", [])
+            if isinstance(packages, list) and packages:
+                parts.append(f"- **Packages:** {', '.join(str(p) for p in packages[:10])}")
+
+            parts.append("")
+
+    # Health Score
+    if project.health_score is not None:
+        try:
+            parts.append(f"### Health: {float(project.health_score):.0f}/100")
+        except:
+            parts.append(f"### Health: {project.health_score}/100")
+        parts.append("")
+
+    # AI Context
+    ai_context = project.ai_context
+    if ai_context:
+        if isinstance(ai_context, str):
+            try:
+                ai_context = json.loads(ai_context)
+            except:
+                ai_context = {}
+
+        if isinstance(ai_context, dict):
+            claude_md = safe_get(ai_context, "claude_md_content", "")
+            if claude_md:
+                parts.append("### Conventions (CLAUDE.md)")
+                parts.append(claude_md[:1500] + "..." if len(claude_md) > 1500 else claude_md)
+                parts.append("")
+
+            patterns = safe_get(ai_context, "key_patterns", [])
+            if isinstance(patterns, list) and patterns:
+                parts.append("### Patterns")
+                for p in patterns[:5]:
+                    parts.append(f"- {p}")
+                parts.append("")
+
+    # Eloquent models (from the precomputed analyses)
+    models = [
+        a for a in (file_analyses or [])
+        if a["file_type"] == LaravelFileType.MODEL.value and a["info"]
+    ]
+    if models:
+        parts.append("### Models")
+        for analysis in sorted(models, key=lambda a: a["path"])[:30]:
+            info = analysis["info"]
+            relations = ", ".join(
+                f"{r['type']} {r['related_model']}" for r in info.get("relationships", [])
+            )
+            line = f"- {info['class_name']} ({info['table_name']})"
+            parts.append(f"{line}: {relations}" if relations else line)
+        parts.append("")
+
+    return "\n".join(parts)
+
+
+# =============================================================================
+# PROFILE
+# =============================================================================
+
+@dataclass
+class LaravelProfile:
+    """Derived artefacts for one project index version."""
+    project_id: str
+    version: str
+    project_context: str
+    file_analyses: List[Dict[str, Any]] = field(default_factory=list)  # {file_type, path, hash, info}
+
+    def to_dict(self) -> dict:
+        return {
+            "project_id": self.project_id,
+            "version": self.version,
+            "project_context": self.project_context,
+            "file_analyses": self.file_analyses,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LaravelProfile":
+        return cls(
+            project_id=data.get("project_id", ""),
+            version=data.get("version", ""),
+            project_context=data.get("project_context", ""),
+            file_analyses=data.get("file_analyses", []),
+        )
+
+
+class LaravelProfileStore:
+    """
+    Two-level profile cache: in-process by project id, then the persisted
+    copy in Project.ai_context. Either is used only if its version matches.
+
+    New profiles are persisted in a session of their own, so loading a
+    profile never commits or rolls back the caller's session.
+    """
+
+    def __init__(self, session_factory=async_session_factory):
+        self.session_factory = session_factory
+        self._profiles: Dict[str, LaravelProfile] = {}
+
+    async def load(self, db: AsyncSession, project: Project) -> LaravelProfile:
+        """Return the current profile, building and persisting it if stale."""
+        project_id = str(project.id)
+        version = profile_version(project)
+
+        profile = self._profiles.get(project_id)
+        if profile and profile.version == version:
+            return profile
+
+        persisted = _as_dict(project.ai_context).get(PROFILE_KEY)
+        if isinstance(persisted, dict) and persisted.get("version") == version:
+            profile = LaravelProfile.from_dict(persisted)
+            logger.info(f"[PROFILE] Loaded persisted profile for project={project_id}")
+        else:
+            profile = await self._build(db, project, version)
+            await self._persist(project, profile)
+
+        seed_file_info(profile.file_analyses)
+        self._profiles[project_id] = profile
+        return profile
+
+    def invalidate(self, project_id: str) -> None:
+        """Drop the in-process copy (the persisted one is versioned)."""
+        self._profiles.pop(str(project_id), None)
+
+    async def _build(self, db: AsyncSession, project: Project, version: str) -> LaravelProfile:
+        file_analyses = []
+        try:
+            stmt = (
+                select(IndexedFile.file_path, IndexedFile.content)
+                .where(IndexedFile.project_id == str(project.id))
+                .where(or_(*[IndexedFile.file_path.startswith(p) for p in PROFILED_PATH_PREFIXES]))
+                .limit(MAX_PROFILED_FILES)
+            )
+            rows = (await db.execute(stmt)).all()
+
+            enhancer = LaravelContextEnhancer()
+            for file_path, content in rows:
+                if not content:
+                    continue
+                file_type = LaravelFileDetector.detect_from_path(file_path)
+                if file_type not in PROFILED_FILE_TYPES:
+                    continue
+                file_analyses.append({
+                    "file_type": file_type.value,
+                    "path": file_path,
+                    "hash": content_hash(content),
+                    "info": enhancer.analyze_file(file_type, file_path, content),
+                })
+        except Exception as e:
+            logger.warning(f"[PROFILE] File analysis unavailable for project={project.id}: {e}")
+
+        logger.info(f"[PROFILE] Built profile for project={project.id} ({len(file_analyses)} files analyzed)")
+        return LaravelProfile(
+            project_id=str(project.id),
+            version=version,
+            project_context=render_project_context(project, file_analyses),
+            file_analyses=file_analyses,
+        )
+
+    async def _persist(self, project: Project, profile: LaravelProfile) -> None:
+        ai_context = {**_as_dict(project.ai_context), PROFILE_KEY: profile.to_dict()}
+        try:
+            async with self.session_factory() as session:
+                await session.execute(
+                    update(Project).where(Project.id == str(project.id)).values(ai_context=ai_context)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"[PROFILE] Failed to persist profile for project={project.id}: {e}")
+
+
+# Singleton instance
+_profile_store: Optional[LaravelProfileStore] = None
+
+
+def get_profile_store() -> LaravelProfileStore:
+    """Get or create the process-wide profile store."""
+    global _profile_store
+    if _profile_store is None:
+        _profile_store = LaravelProfileStore()
+    return _profile_store
@@ -0,0 +1,252 @@
+"""
+Model Router - picks Haiku, Sonnet or Opus per agent call.
+
+Routing uses only cheap local signals (request wording, intent complexity,
+plan size, estimated diff size and Laravel file type), so trivial requests
+don't pay Opus latency for intent analysis or Sonnet for a one-line change.
+Forge escalates one tier each time Guardian rejects its output.
+"""
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict
+
+from app.agents.config import AgentConfig, agent_config
+from app.agents.executor import ExecutionResult
+from app.agents.intent_analyzer import Intent, NOVA_MODEL, MODEL_MAP
+from app.agents.planner import PlanStep
+from app.core.config import settings
+from app.services.claude import ClaudeModel
+
+# File type detection (Phase 2 Laravel intelligence)
+try:
+    from app.agents.forge_laravel import LaravelFileDetector, LaravelFileType
+
+    FILE_TYPE_ROUTING_AVAILABLE = True
+except ImportError:
+    FILE_TYPE_ROUTING_AVAILABLE = False
+    LaravelFileDetector = None
+    LaravelFileType = None
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# ROUTING TABLES
+# =============================================================================
+
+# Cheapest to most capable
+MODEL_TIERS: List[ClaudeModel] = [ClaudeModel.HAIKU, ClaudeModel.SONNET, ClaudeModel.OPUS]
+
+# Agents whose calls are routed
+NOVA = "nova"
+BLUEPRINT = "blueprint"
+FORGE = "forge"
+GUARDIAN = "guardian"
+
+# Mostly declarative files where a small model does fine
+SIMPLE_FILE_TYPES = {
+    "migration", "request", "resource", "factory", "seeder",
+    "route", "event", "mail", "notification", "interface",
+}
+
+# Files that usually carry business logic
+COMPLEX_FILE_TYPES = {"service", "repository", "provider", "middleware", "policy", "job"}
+
+TRIVIAL_REQUEST_PATTERN = re.compile(
+    r"\b(rename|typo|spelling|fillable|casts?|add (?:a |the )?(?:field|column|attribute)|"
+    r"change (?:the )?(?:label|text|title|name|color|colour))\b",
+    re.IGNORECASE,
+)
+
+COMPLEX_REQUEST_PATTERN = re.compile(
+    r"\b(architecture|redesign|restructure|payments?|billing|security|multi-?tenan\w*|"
+    r"across (?:the |all )|entire (?:app|application|codebase)|every (?:controller|model|service))\b",
+    re.IGNORECASE,
+)
+
+
+def _tier_index(model: ClaudeModel) -> int:
+    return MODEL_TIERS.index(model) if model in MODEL_TIERS else 1
+
+
+def _file_type(file_path: str) -> str:
+    """Laravel file type for a path, or 'unknown'."""
+    if not FILE_TYPE_ROUTING_AVAILABLE or not file_path:
+        return "unknown"
+    return LaravelFileDetector.detect_from_path(file_path).value
+
+
+def _changed_lines(result: ExecutionResult) -> int:
+    """Estimate diff size from the unified diff, falling back to content length."""
+    if result.diff:
+        return sum(
+            1 for line in result.diff.splitlines()
+            if line[:1] in ("+", "-") and not line.startswith(("+++", "---"))
+        )
+    return result.content.count("\n") + 1 if result.content else 0
+
+
+# =============================================================================
+# ROUTING STATS
+# =============================================================================
+
+@dataclass
+class AgentRoutingStats:
+    """Per-agent routing counters reported through PipelineMetrics."""
+    calls: Dict[str, int] = field(default_factory=dict)  # model id -> calls
+    escalations: int = 0
+    last_reason: str = ""
+
+    def record(self, model: ClaudeModel, reason: str) -> None:
+        self.calls[model.value] = self.calls.get(model.value, 0) + 1
+        self.last_reason = reason
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": dict(self.calls),
+            "escalations": self.escalations,
+            "last_reason": self.last_reason,
+        }
+
+
+# =============================================================================
+# MODEL ROUTER
+# =============================================================================
+
+class ModelRouter:
+    """
+    Chooses a model tier per call from local signals.
+
+    Each agent has a ceiling (its configured model, or Opus for Forge and
+    Guardian) that routing never exceeds. With routing disabled every call
+    gets the agent's previous fixed model.
+    """
+
+    def __init__(
+            self,
+            config: Optional[AgentConfig] = None,
+            stats: Optional[Dict[str, AgentRoutingStats]] = None,
+    ):
+        self.config = config or agent_config
+        self.enabled = self.config.ENABLE_MODEL_ROUTING
+        self.stats: Dict[str, AgentRoutingStats] = stats if stats is not None else {}
+        self._forge_escalation = 0
+
+        self.defaults: Dict[str, ClaudeModel] = {
+            NOVA: MODEL_MAP.get(NOVA_MODEL, ClaudeModel.OPUS),
+            BLUEPRINT: MODEL_MAP.get(settings.blueprint_model, ClaudeModel.SONNET),
+            FORGE: ClaudeModel.SONNET,
+            GUARDIAN: ClaudeModel.SONNET,
+        }
+        self.ceilings: Dict[str, ClaudeModel] = {
+            NOVA: self.defaults[NOVA],
+            BLUEPRINT: self.defaults[BLUEPRINT],
+            FORGE: ClaudeModel.OPUS,
+            GUARDIAN: ClaudeModel.OPUS,
+        }
+
+    def _pick(self, agent: str, tier: int, reason: str) -> ClaudeModel:
+        """Clamp a tier to the agent's ceiling, record it and return the model."""
+        if not self.enabled:
+            model = self.defaults[agent]
+            reason = "routing disabled"
+        else:
+            tier = max(0, min(tier, _tier_index(self.ceilings[agent])))
+            model = MODEL_TIERS[tier]
+
+        self.stats.setdefault(agent, AgentRoutingStats()).record(model, reason)
+        logger.info(f"[ROUTER] {agent} -> {model.name} ({reason})")
+        return model
+
+    # -------------------------------------------------------------------------
+    # Per-agent routing
+    # -------------------------------------------------------------------------
+
+    def route_intent(self, user_input: str) -> ClaudeModel:
+        """Nova: only the request text is known at this point."""
+        text = user_input.strip()
+        if COMPLEX_REQUEST_PATTERN.search(text) or len(text) > 600 or text.count("\n") > 5:
+            return self._pick(NOVA, 2, "complex or long request")
+        if TRIVIAL_REQUEST_PATTERN.search(text) and len(text) < 160:
+            return self._pick(NOVA, 0, "trivial request")
+        return self._pick(NOVA, 1, "default")
+
+    def route_planning(self, intent: Intent) -> ClaudeModel:
+        """Blueprint: intent complexity."""
+        score = {"single_file": 0, "feature": 1, "cross_domain": 2}.get(intent.scope, 1)
+        if intent.requires_migration:
+            score += 1
+        if len(intent.domains_affected) > 2:
+            score += 1
+        if intent.task_type == "refactor" or intent.priority == "critical":
+            score += 1
+
+        if score == 0:
+            return self._pick(BLUEPRINT, 0, "single-file change")
+        if score >= 3:
+            return self._pick(BLUEPRINT, 2, f"complexity score {score}")
+        return self._pick(BLUEPRINT, 1, f"complexity score {score}")
+
+    def route_execution(
+            self,
+            step: PlanStep,
+            intent: Optional[Intent] = None,
+            plan_steps: int = 1,
+            current_content: Optional[str] = None,
+    ) -> ClaudeModel:
+        """Forge: file type, estimated diff size and plan size."""
+        if step.action == "delete":
+            return self._pick(FORGE, 0, "delete")
+
+        file_type = _file_type(step.file)
+        file_lines = current_content.count("\n") + 1 if current_content else 0
+        small = step.estimated_lines <= 30 and file_lines <= 200
+        large = step.estimated_lines > 200 or file_lines > 600
+
+        if file_type in SIMPLE_FILE_TYPES and small:
+            return self._pick(FORGE, 0, f"small {file_type} change")
+
+        tier = 1
+        reason = f"{file_type} change"
+        if large and (file_type in COMPLEX_FILE_TYPES or file_type == "controller"):
+            tier, reason = 2, f"large {file_type} change"
+        elif intent is not None and intent.scope == "cross_domain" and plan_steps > 6:
+            tier, reason = 2, f"cross-domain plan with {plan_steps} steps"
+        return self._pick(FORGE, tier, reason)
+
+    def route_fix(self, result: ExecutionResult) -> ClaudeModel:
+        """Forge fixes: the execution tier plus one per rejected validation."""
+        base = 0 if _file_type(result.file) in SIMPLE_FILE_TYPES else 1
+        tier = base + self._forge_escalation
+        return self._pick(FORGE, tier, f"fix after {self._forge_escalation} failed validation(s)")
+
+    def route_validation(
+            self,
+            results: List[ExecutionResult],
+            intent: Optional[Intent] = None,
+    ) -> ClaudeModel:
+        """Guardian: total diff size and file types under review."""
+        changed = sum(_changed_lines(r) for r in results)
+        file_types = {_file_type(r.file) for r in results}
+
+        if changed > 600 or (intent is not None and intent.scope == "cross_domain"):
+            return self._pick(GUARDIAN, 2, f"{changed} changed lines")
+        if changed <= 40 and file_types <= SIMPLE_FILE_TYPES:
+            return self._pick(GUARDIAN, 0, f"{changed} changed lines in simple files")
+        return self._pick(GUARDIAN, 1, f"{changed} changed lines")
+
+    # -------------------------------------------------------------------------
+    # Escalation
+    # -------------------------------------------------------------------------
+
+    def record_failed_validation(self) -> None:
+        """Escalate Forge one tier for the next fix attempt."""
+        if not self.enabled:
+            return
+        self._forge_escalation += 1
+        self.stats.setdefault(FORGE, AgentRoutingStats()).escalations += 1
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Routing stats per agent."""
+        return {agent: s.to_dict() for agent, s in self.stats.items()}
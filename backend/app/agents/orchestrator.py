@@ -34,10 +34,19 @@ from app.agents.exceptions import (
 )
 from app.agents.executor import Executor, ExecutionResult
 from app.agents.intent_analyzer import IntentAnalyzer, Intent
-from app.agents.orchestrator_context import ConversationContextManager
+from app.agents.laravel_profile import get_profile_store, render_project_context
+from app.agents.model_router import ModelRouter, AgentRoutingStats
+from app.agents.orchestrator_context import ConversationContext, ConversationContextManager
 from app.agents.planner import Planner, Plan
-from app.agents.validator import Validator, ValidationResult, ValidationIssue
-from app.models.models import Project
+from app.agents.validator import (
+    Validator,
+    ValidationResult,
+    ValidationTier,
+    ProjectSymbolTable,
+    group_issues_by_result,
+    normalize_file_path,
+)
+from app.models.models import Project, IndexedFile
 from app.services.claude import ClaudeService, get_claude_service
 from app.services.conversation_logger import ConversationLogger
 from app.services.file_access import FileAccessService
@@ -127,6 +136,7 @@ class PipelineMetrics:
     total_tokens: int = 0
     final_score: int = 0
     success: bool = False
+    routing: Dict[str, AgentRoutingStats] = field(default_factory=dict)  # filled by ModelRouter
 
     def start_agent(self, agent: str) -> AgentMetrics:
         """Start tracking an agent."""
@@ -165,6 +175,7 @@ class PipelineMetrics:
             "total_tokens": self.total_tokens,
             "final_score": self.final_score,
             "success": self.success,
+            "routing": {k: v.to_dict() for k, v in self.routing.items()},
         }
 
 
@@ -485,8 +496,9 @@ class Orchestrator:
             conversation_logger: Optional[ConversationLogger] = None,
             config: Optional[AgentConfig] = None,
             conversation_id: Optional[str] = None,
+            conversation_context: Optional[ConversationContext] = None,
     ):
-        """Initialize the orchestrator."""
+        """Initialize the orchestrator; a preloaded conversation_context saves re-reading it."""
         self.db = db
         self.event_callback = event_callback
         self.conversation_logger = conversation_logger
@@ -494,7 +506,7 @@ class Orchestrator:
         self.retry_config = RetryConfig(max_attempts=self.config.MAX_FIX_ATTEMPTS)
 
         # Conversation context management
-        self.context_manager = ConversationContextManager(db)
+        self.context_manager = ConversationContextManager(db, context=conversation_context)
         self.conversation_id = conversation_id
         self._conversation_summary: Optional[ConversationSummary] = None
         self._recent_messages: List[RecentMessage] = []
@@ -625,6 +637,7 @@ class Orchestrator:
         metrics = PipelineMetrics(request_id=request_id)
         context = AccumulatedContext(project_id=project_id)
         retry_state = RetryState()
+        router = ModelRouter(self.config, stats=metrics.routing)
 
         # Clear validator history
         self.validator.clear_history()
@@ -640,9 +653,11 @@ class Orchestrator:
                 result.metrics = metrics
                 return result
 
-            context.project_context = self.build_project_context(project)
+            context.project_context = await self._load_project_context(project)
             logger.info(f"[CONDUCTOR] Built project context ({len(context.project_context)} chars)")
 
+            symbol_table = await self._load_symbol_table(project_id)
+
             conv_id = conversation_id or self.conversation_id
             if conv_id:
                 self._conversation_summary, self._recent_messages = (
@@ -670,6 +685,7 @@ class Orchestrator:
             result.events.append(event)
 
             try:
+                nova_model = router.route_intent(user_input)
                 intent = await self._execute_with_retry(
                     AgentName.NOVA,
                     lambda: self.intent_analyzer.analyze(
@@ -677,6 +693,7 @@ class Orchestrator:
                         project_context=context.project_context,
                         conversation_summary=self._conversation_summary,
                         recent_messages=self._recent_messages,
+                        model=nova_model,
                     ),
                     metrics,
                 )
@@ -795,10 +812,12 @@ class Orchestrator:
             result.events.append(event)
 
             try:
+                blueprint_model = router.route_planning(intent)
                 plan = await self._execute_with_retry(
                     AgentName.BLUEPRINT,
                     lambda: self.planner.plan(
-                        user_input, intent, context.retrieved_context, context.project_context
+                        user_input, intent, context.retrieved_context, context.project_context,
+                        model=blueprint_model,
                     ),
                     metrics,
                 )
@@ -864,6 +883,7 @@ class Orchestrator:
                         previous_results=execution_results,
                         current_file_content=current_content,
                         project_context=context.project_context,
+                        model=router.route_execution(step, intent, total_steps, current_content),
                     )
                     execution_results.append(exec_result)
                     context.add_execution(exec_result)
@@ -925,6 +945,8 @@ class Orchestrator:
                 intent=intent,
                 results=execution_results,
                 context=context.retrieved_context,
+                symbol_table=symbol_table,
+                model=router.route_validation(execution_results, intent),
             )
             result.validation = validation
             context.add_validation(validation)
@@ -950,10 +972,15 @@ class Orchestrator:
                     result.events.append(event)
                     break
 
-                # Exponential backoff
-                delay = retry_state.get_backoff_delay(self.retry_config)
-                logger.info(f"[CONDUCTOR] Retry {retry_state.attempt + 1} after {delay:.2f}s delay")
-                await asyncio.sleep(delay)
+                # Exponential backoff (local-tier verdicts cost no API call, so no wait)
+                if validation.tier == ValidationTier.LLM.value:
+                    delay = retry_state.get_backoff_delay(self.retry_config)
+                    logger.info(f"[CONDUCTOR] Retry {retry_state.attempt + 1} after {delay:.2f}s delay")
+                    await asyncio.sleep(delay)
+                else:
+                    logger.info(
+                        f"[CONDUCTOR] Retry {retry_state.attempt + 1} straight after {validation.tier} tier failure"
+                    )
 
                 event = await self._emit_event(
                     ProcessPhase.FIXING,
@@ -965,8 +992,9 @@ class Orchestrator:
                 result.events.append(event)
 
                 # Smart fix: prioritize unfixed issues, skip recurring ones
+                router.record_failed_validation()
                 execution_results = await self._smart_fix(
-                    execution_results, validation, context, retry_state
+                    execution_results, validation, context, retry_state, router
                 )
                 result.execution_results = execution_results
 
@@ -976,6 +1004,8 @@ class Orchestrator:
                     intent=intent,
                     results=execution_results,
                     context=context.retrieved_context,
+                    symbol_table=symbol_table,
+                    model=router.route_validation(execution_results, intent),
                 )
                 result.validation = validation
                 context.add_validation(validation)
@@ -1061,43 +1091,29 @@ class Orchestrator:
             validation: ValidationResult,
             context: AccumulatedContext,
             retry_state: RetryState,
+            router: Optional[ModelRouter] = None,
     ) -> List[ExecutionResult]:
         """
         Intelligent fix strategy that:
-        - Prioritizes issues by severity and fixability
+        - Re-executes only files with open error signatures
         - Skips recurring unfixable issues
         - Deduplicates similar issues
         - Provides accumulated context to fixes
+        - Escalates the fix model through the router after failed validations
+
+        Files without errors are left untouched so the validator can
+        reuse their cached verdicts on the next pass.
         """
-        # Group issues by file
-        issues_by_file: Dict[str, List[ValidationIssue]] = {}
-        for issue in validation.errors:
-            file_key = self._normalize_path(issue.file)
-            if file_key not in issues_by_file:
-                issues_by_file[file_key] = []
-            issues_by_file[file_key].append(issue)
-
-        # Map execution results by file
-        results_by_file = {
-            self._normalize_path(r.file): i
-            for i, r in enumerate(execution_results)
-        }
+        open_errors = [
+            issue for issue in validation.errors
+            if (getattr(issue, 'signature', None) or issue.message[:50]) not in retry_state.unfixable_issues
+        ]
+        issues_by_result, unmatched = group_issues_by_result(open_errors, execution_results)
+        if unmatched:
+            logger.info(f"[CONDUCTOR] {len(unmatched)} errors not tied to a generated file, skipping")
 
         # Fix each file with issues
-        for file_key, issues in issues_by_file.items():
-            # Skip if no matching result
-            if file_key not in results_by_file:
-                # Try partial match
-                matched = False
-                for result_key, idx in results_by_file.items():
-                    if file_key in result_key or result_key.endswith(file_key):
-                        file_key = result_key
-                        matched = True
-                        break
-                if not matched:
-                    continue
-
-            idx = results_by_file[file_key]
+        for idx, issues in issues_by_result.items():
             exec_result = execution_results[idx]
 
             if not exec_result.success:
@@ -1139,6 +1155,7 @@ class Orchestrator:
                 result=exec_result,
                 issues=issue_messages,
                 context=context.retrieved_context,
+                model=router.route_fix(exec_result) if router else None,
             )
             execution_results[idx] = fixed
 
@@ -1151,12 +1168,7 @@ class Orchestrator:
 
     def _normalize_path(self, path: str) -> str:
         """Normalize file path for comparison."""
-        if not path:
-            return ""
-        path = path.strip().replace("\\", "/")
-        if path.startswith("./"):
-            path = path[2:]
-        return path.lower()
+        return normalize_file_path(path)
 
     # =========================================================================
     # DATABASE HELPERS
@@ -1177,98 +1189,34 @@ class Orchestrator:
             logger.debug(f"[CONDUCTOR] Error fetching file content: {e}")
             return None
 
+    async def _load_symbol_table(self, project_id: str) -> Optional[ProjectSymbolTable]:
+        """Build the tier 1 symbol table from indexed file paths."""
+        try:
+            stmt = select(IndexedFile.file_path).where(IndexedFile.project_id == project_id)
+            rows = await self.db.execute(stmt)
+            table = ProjectSymbolTable.from_file_paths(rows.scalars().all())
+            logger.info(f"[CONDUCTOR] Loaded symbol table ({len(table.symbols)} symbols)")
+            return table
+        except Exception as e:
+            logger.debug(f"[CONDUCTOR] Symbol table unavailable: {e}")
+            return None
+
     # =========================================================================
     # PROJECT CONTEXT BUILDER
     # =========================================================================
 
     def build_project_context(self, project: Project) -> str:
         """Build rich project context from scan data."""
-        parts = []
-
-        def safe_get(obj, key, default=None):
-            if obj is None:
-                return default
-            if isinstance(obj, str):
-                try:
-                    obj = json.loads(obj)
-                except (json.JSONDecodeError, TypeError):
-                    return default
-            if isinstance(obj, dict):
-                return obj.get(key, default)
-            return default
-
-        parts.append(f"## Project: {project.repo_full_name}")
-        parts.append("")
-
-        # Technology Stack
-        stack = project.stack
-        if stack:
-            if isinstance(stack, str):
-                try:
-                    stack = json.loads(stack)
-                except:
-                    stack = {}
-
-            if isinstance(stack, dict):
-                parts.append("### Technology Stack")
-                backend = safe_get(stack, "backend", {})
-                if isinstance(backend, dict) and backend:
-                    framework = safe_get(backend, "framework", "unknown")
-                    version = safe_get(backend, "version", "")
-                    php_version = safe_get(backend, "php_version", "")
-                    parts.append(f"- **Backend:** {framework} {version}".strip())
-                    if php_version:
-                        parts.append(f"- **PHP:** {php_version}")
-
-                frontend = safe_get(stack, "frontend", {})
-                if isinstance(frontend, dict) and frontend:
-                    parts.append(
-                        f"- **Frontend:** {safe_get(frontend, 'framework', '')} {safe_get(frontend, 'version', '')}".strip())
-
-                database = safe_get(stack, "database", {})
-                if isinstance(database, dict):
-                    db_type = safe_get(database, "type", "")
-                    if db_type:
-                        parts.append(f"- **Database:** {db_type}")
-
-                packages = safe_get(stack, "packages", [])
-                if isinstance(packages, list) and packages:
-                    parts.append(f"- **Packages:** {', '.join(str(p) for p in packages[:10])}")
-
-                parts.append("")
-
-        # Health Score
-        if project.health_score is not None:
-            try:
-                parts.append(f"### Health: {float(project.health_score):.0f}/100")
-            except:
-                parts.append(f"### Health: {project.health_score}/100")
-            parts.append("")
-
-        # AI Context
-        ai_context = project.ai_context
-        if ai_context:
-            if isinstance(ai_context, str):
-                try:
-                    ai_context = json.loads(ai_context)
-                except:
-                    ai_context = {}
-
-            if isinstance(ai_context, dict):
-                claude_md = safe_get(ai_context, "claude_md_content", "")
-                if claude_md:
-                    parts.append("### Conventions (CLAUDE.md)")
-                    parts.append(claude_md[:1500] + "..." if len(claude_md) > 1500 else claude_md)
-                    parts.append("")
-
-                patterns = safe_get(ai_context, "key_patterns", [])
-                if isinstance(patterns, list) and patterns:
-                    parts.append("### Patterns")
-                    for p in patterns[:5]:
-                        parts.append(f"- {p}")
-                    parts.append("")
+        return render_project_context(project)
 
-        return "\n".join(parts)
+    async def _load_project_context(self, project: Project) -> str:
+        """Project context from the cached per-index Laravel profile."""
+        try:
+            profile = await get_profile_store().load(self.db, project)
+            return profile.project_context
+        except Exception as e:
+            logger.warning(f"[CONDUCTOR] Laravel profile unavailable, rebuilding context: {e}")
+            return self.build_project_context(project)
 
     # =========================================================================
     # QUESTION PROCESSING
@@ -1284,7 +1232,7 @@ class Orchestrator:
         logger.info(f"[CONDUCTOR] Processing question for project={project_id}")
 
         project = await self._get_project(project_id)
-        project_context = self.build_project_context(project) if project else ""
+        project_context = await self._load_project_context(project) if project else ""
 
         # Load conversation context if available
         conv_summary = None
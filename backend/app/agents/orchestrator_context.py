@@ -3,11 +3,19 @@ Orchestrator Context Integration Module.
 
 Handles loading, updating, and persisting conversation summaries.
 Bridges Database <-> ConversationSummary <-> Agents.
+
+A chat request loads its context once with ``load_context``: the summary
+and the last N messages come back from a single column-projected query,
+and the result is handed to the orchestrator instead of being re-read.
+Parsed summaries are cached across requests and refreshed on ``persist``.
 """
 import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
 from typing import Optional, List, Tuple, Any
 
-from sqlalchemy import select, update, desc
+from sqlalchemy import Text, case, cast, desc, func, null, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.conversation_summary import (
@@ -19,13 +27,175 @@ from app.models.models import Conversation, Message
 
 logger = logging.getLogger(__name__)
 
+# Longest message prefix any consumer uses (RecentMessage keeps 2000 chars)
+HISTORY_CONTENT_CHARS = 2000
+
+# Conversations whose parsed summary is kept across requests
+SUMMARY_CACHE_SIZE = 256
+
+
+@dataclass
+class ConversationContext:
+    """Conversation state loaded once per chat request."""
+    conversation_id: str
+    project_id: Optional[str] = None
+    summary: ConversationSummary = field(default_factory=ConversationSummary)
+    # Chronological; each item has role, content (truncated), has_code_changes, created_at
+    history: List[dict] = field(default_factory=list)
+
+
+class _SummaryCache:
+    """
+    Process-wide LRU of summaries, keyed by conversation.
+
+    Entries carry the ``updated_at`` they were read or written with, so the
+    context query only ships ``summary_data`` when the row has changed since
+    (e.g. another worker persisted it). Summaries are stored as dicts and
+    rebuilt per request, so one request's edits never leak into another.
+    """
+
+    def __init__(self, max_size: int = SUMMARY_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[datetime, dict]]" = OrderedDict()
+
+    def stamp(self, conversation_id: str) -> Optional[datetime]:
+        entry = self._entries.get(conversation_id)
+        return entry[0] if entry else None
+
+    def get(self, conversation_id: str) -> Optional[ConversationSummary]:
+        entry = self._entries.get(conversation_id)
+        if entry is None:
+            return None
+        self._entries.move_to_end(conversation_id)
+        return ConversationSummary.from_dict(entry[1])
+
+    def put(self, conversation_id: str, updated_at: datetime, summary: ConversationSummary) -> None:
+        self._entries[conversation_id] = (updated_at, summary.to_dict())
+        self._entries.move_to_end(conversation_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, conversation_id: Optional[str] = None) -> None:
+        if conversation_id:
+            self._entries.pop(conversation_id, None)
+        else:
+            self._entries.clear()
+
+
+_summary_cache = _SummaryCache()
+
 
 class ConversationContextManager:
     """Manages conversation context lifecycle."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, context: Optional[ConversationContext] = None):
         self.db = db
         self._cache: dict[str, ConversationSummary] = {}
+        self._history: dict[str, List[dict]] = {}
+        if context is not None:
+            self.prime(context)
+
+    def prime(self, context: ConversationContext) -> None:
+        """Use an already loaded context instead of querying for it again."""
+        self._cache[context.conversation_id] = context.summary
+        self._history[context.conversation_id] = context.history
+
+    async def load_context(
+            self,
+            conversation_id: str,
+            history_limit: int = 10,
+    ) -> ConversationContext:
+        """
+        Load the summary and recent history in one query.
+
+        Only the columns the prompts use are selected: role, a content
+        prefix and a has-code-changes flag, never the ``code_changes`` JSON.
+        ``summary_data`` is skipped when the cached copy is still current.
+        The loaded context also primes this manager.
+        """
+        cached_stamp = _summary_cache.stamp(conversation_id)
+        summary_col = Conversation.summary_data
+        if cached_stamp is not None:
+            summary_col = case(
+                (Conversation.updated_at == cached_stamp, null()),
+                else_=Conversation.summary_data,
+            )
+
+        recent = (
+            select(
+                Message.role,
+                func.substr(Message.content, 1, HISTORY_CONTENT_CHARS).label("content"),
+                func.coalesce(cast(Message.code_changes, Text), "null")
+                .notin_(["null", "{}", "[]"])
+                .label("has_code_changes"),
+                Message.created_at,
+            )
+            .where(Message.conversation_id == Conversation.id)
+            .order_by(desc(Message.created_at))
+            .limit(history_limit)
+            .lateral("recent")
+        )
+        stmt = (
+            select(
+                Conversation.project_id,
+                Conversation.updated_at,
+                summary_col.label("summary_data"),
+                recent.c.role,
+                recent.c.content,
+                recent.c.has_code_changes,
+                recent.c.created_at,
+            )
+            .select_from(Conversation)
+            .outerjoin(recent, true())
+            .where(Conversation.id == conversation_id)
+            .order_by(desc(recent.c.created_at))
+        )
+        rows = (await self.db.execute(stmt)).all()
+
+        context = ConversationContext(conversation_id=conversation_id)
+        if rows:
+            first = rows[0]
+            context.project_id = first.project_id
+            context.summary = self._resolve_summary(conversation_id, first.updated_at, first.summary_data)
+            context.history = [
+                {
+                    "role": row.role,
+                    "content": row.content or "",
+                    "has_code_changes": bool(row.has_code_changes),
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                }
+                for row in reversed(rows)
+                if row.role is not None
+            ]
+        context.summary.project_id = context.project_id
+
+        self.prime(context)
+        return context
+
+    @staticmethod
+    def _resolve_summary(
+            conversation_id: str,
+            updated_at: Optional[datetime],
+            summary_data: Optional[str],
+    ) -> ConversationSummary:
+        """Parse fresh ``summary_data``, or rebuild the cached summary when it was skipped."""
+        if summary_data is None:
+            cached = _summary_cache.get(conversation_id)
+            if cached is not None and updated_at == _summary_cache.stamp(conversation_id):
+                return cached
+            _summary_cache.invalidate(conversation_id)
+            return ConversationSummary()
+
+        try:
+            summary = ConversationSummary.from_json(summary_data)
+            logger.debug(f"[CTX_MGR] Loaded summary for conversation={conversation_id}")
+        except Exception as e:
+            logger.warning(f"[CTX_MGR] Failed to load summary: {e}")
+            return ConversationSummary()
+
+        if updated_at is not None:
+            _summary_cache.put(conversation_id, updated_at, summary)
+        return summary
 
     async def load_or_create(
             self,
@@ -33,29 +203,12 @@ class ConversationContextManager:
             project_name: Optional[str] = None,
     ) -> ConversationSummary:
         """Load existing summary or create new one."""
-        if conversation_id in self._cache:
-            return self._cache[conversation_id]
-
-        stmt = select(Conversation).where(Conversation.id == conversation_id)
-        result = await self.db.execute(stmt)
-        conversation = result.scalar_one_or_none()
-
-        if conversation and hasattr(conversation, 'summary_data') and conversation.summary_data:
-            try:
-                summary = ConversationSummary.from_json(conversation.summary_data)
-                logger.debug(f"[CTX_MGR] Loaded summary for conversation={conversation_id}")
-            except Exception as e:
-                logger.warning(f"[CTX_MGR] Failed to load summary: {e}")
-                summary = ConversationSummary()
-        else:
-            summary = ConversationSummary()
+        if conversation_id not in self._cache:
+            await self.load_context(conversation_id)
 
+        summary = self._cache[conversation_id]
         if project_name:
             summary.project_name = project_name
-        if conversation:
-            summary.project_id = conversation.project_id
-
-        self._cache[conversation_id] = summary
         return summary
 
     async def get_context_for_agents(
@@ -65,40 +218,16 @@ class ConversationContextManager:
             recent_limit: int = 4,
     ) -> Tuple[ConversationSummary, List[RecentMessage]]:
         """Get complete context for agent consumption."""
-        summary = await self.load_or_create(conversation_id)
-        history = await self._get_message_history(conversation_id, history_limit)
+        if conversation_id not in self._history:
+            await self.load_context(conversation_id, history_limit)
+
         summary, recent_messages = build_conversation_context(
-            summary=summary,
-            history=history,
+            summary=self._cache[conversation_id],
+            history=self._history[conversation_id][-history_limit:],
             max_recent=recent_limit,
         )
         return summary, recent_messages
 
-    async def _get_message_history(
-            self,
-            conversation_id: str,
-            limit: int = 10,
-    ) -> List[dict]:
-        """Fetch message history from database."""
-        stmt = (
-            select(Message)
-            .where(Message.conversation_id == conversation_id)
-            .order_by(desc(Message.created_at))
-            .limit(limit)
-        )
-        result = await self.db.execute(stmt)
-        messages = result.scalars().all()
-
-        history = []
-        for msg in reversed(messages):
-            history.append({
-                "role": msg.role,
-                "content": msg.content,
-                "has_code_changes": bool(msg.code_changes),
-                "created_at": msg.created_at.isoformat() if msg.created_at else None,
-            })
-        return history
-
     async def update_after_execution(
             self,
             conversation_id: str,
@@ -158,14 +287,18 @@ class ConversationContextManager:
         try:
             summary.truncate_to_budget()
             json_data = summary.to_json()
+            updated_at = datetime.utcnow()
 
+            # Drop the cached copy first so a failed write never leaves it stale
+            _summary_cache.invalidate(conversation_id)
             stmt = (
                 update(Conversation)
                 .where(Conversation.id == conversation_id)
-                .values(summary_data=json_data)
+                .values(summary_data=json_data, updated_at=updated_at)
             )
             await self.db.execute(stmt)
             await self.db.commit()
+            _summary_cache.put(conversation_id, updated_at, summary)
 
             logger.debug(
                 f"[CTX_MGR] Persisted summary for conversation={conversation_id} "
@@ -179,8 +312,10 @@ class ConversationContextManager:
         """Clear cached summaries."""
         if conversation_id:
             self._cache.pop(conversation_id, None)
+            self._history.pop(conversation_id, None)
         else:
             self._cache.clear()
+            self._history.clear()
 
 
 def get_context_manager(db: AsyncSession) -> ConversationContextManager:
@@ -28,6 +28,7 @@ from app.agents.agent_identity import AgentType, get_agent
 from app.agents.blueprint_system_prompt import (
     BLUEPRINT_SYSTEM_PROMPT,
     BLUEPRINT_USER_PROMPT,
+    BLUEPRINT_PROJECT_PROMPT,
 )
 from app.agents.context_retriever import RetrievedContext
 from app.agents.intent_analyzer import Intent
@@ -41,7 +42,7 @@ from app.agents.plan_schema import (
     validate_dependency_order,
 )
 from app.core.config import settings
-from app.services.claude import ClaudeService, ClaudeModel, get_claude_service
+from app.services.claude import ClaudeService, ClaudeModel, get_claude_service, prefixed_user_message
 
 logger = logging.getLogger(__name__)
 
@@ -384,21 +385,26 @@ class Planner:
 
         logger.info(f"[{self.identity.name.upper()}] Initialized with Sonnet + Structured Outputs")
 
+    def _build_context_prefix(self, project_context: str = "") -> str:
+        """Build the project info block sent as a cacheable prefix."""
+        return safe_format(
+            BLUEPRINT_PROJECT_PROMPT,
+            project_context=project_context or "No project context available",
+        )
+
     def _build_user_prompt(
             self,
             user_input: str,
             intent: Intent,
             context: RetrievedContext,
-            project_context: str = "",
     ) -> str:
         """
-        Build the user prompt with all context.
+        Build the per-request part of the user prompt.
 
         Args:
             user_input: Original user request
             intent: Analyzed intent from Nova
             context: Retrieved codebase context from Scout
-            project_context: Rich project context
 
         Returns:
             Formatted user prompt
@@ -420,7 +426,6 @@ class Planner:
             entity_methods=", ".join(entities.get("methods", [])) or "None specified",
             entity_routes=", ".join(entities.get("routes", [])) or "None specified",
             entity_tables=", ".join(entities.get("tables", [])) or "None specified",
-            project_context=project_context or "No project context available",
             retrieved_context=context.to_prompt_string(),
         )
 
@@ -430,6 +435,7 @@ class Planner:
             intent: Intent,
             context: RetrievedContext,
             project_context: str = "",
+            model: Optional[ClaudeModel] = None,
     ) -> Plan:
         """
         Create an execution plan.
@@ -439,6 +445,7 @@ class Planner:
             intent: Analyzed intent from Nova
             context: Retrieved codebase context from Scout
             project_context: Rich project context (stack, conventions, etc.)
+            model: Model chosen by the ModelRouter (defaults to settings.blueprint_model)
 
         Returns:
             Plan with ordered steps
@@ -452,12 +459,12 @@ class Planner:
         logger.info(f"[{self.identity.name.upper()}] {self.identity.get_random_greeting()}")
         logger.info(f"[{self.identity.name.upper()}] Creating plan for: {user_input[:100]}...")
 
-        # Build the user prompt
+        # Build the user prompt (project context as a cacheable prefix)
+        context_prefix = self._build_context_prefix(project_context)
         user_prompt = self._build_user_prompt(
             user_input=user_input,
             intent=intent,
             context=context,
-            project_context=project_context,
         )
 
         # Attempt planning with retries
@@ -467,6 +474,8 @@ class Planner:
                 plan = await self._call_claude_structured(
                     user_prompt=user_prompt,
                     attempt=attempt,
+                    model=model,
+                    context_prefix=context_prefix,
                 )
 
                 # Calculate timing
@@ -518,30 +527,43 @@ class Planner:
 
         return fallback
 
-    async def _call_claude_structured(self, user_prompt: str, attempt: int) -> Plan:
+    async def _call_claude_structured(
+            self,
+            user_prompt: str,
+            attempt: int,
+            model: Optional[ClaudeModel] = None,
+            context_prefix: Optional[str] = None,
+    ) -> Plan:
         """
         Call Claude with structured output expectations.
 
         Args:
             user_prompt: The formatted user prompt
             attempt: Current attempt number (for logging)
+            model: Model override (defaults to the configured agent model)
+            context_prefix: Stable project info, sent as a cached block
 
         Returns:
             Validated Plan object
         """
         logger.debug(f"[{self.identity.name.upper()}] {self.identity.get_random_thinking()}")
 
-        messages = [{"role": "user", "content": user_prompt}]
+        messages = [prefixed_user_message(context_prefix, user_prompt)]
+
+        model = model or MODEL_MAP.get(settings.blueprint_model, ClaudeModel.SONNET)
 
         # Use Claude service with caching for system prompt
         response = await self.claude.chat_async(
-            model=MODEL_MAP.get(settings.blueprint_model, ClaudeModel.SONNET),
+            model=model,
             messages=messages,
             system=BLUEPRINT_SYSTEM_PROMPT,
             temperature=0.5,  # Slightly higher for creative planning
             max_tokens=4096,
             request_type="planning",
             use_cache=True,  # Cache the static system prompt
+            # Not memoized: a re-sent message (e.g. after rejecting a plan)
+            # should get a fresh plan
+            memoize=False,
         )
 
         # Parse and validate response
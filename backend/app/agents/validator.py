@@ -10,6 +10,8 @@ ENHANCEMENTS:
 - Grounded issues with evidence citations
 - Improved contradiction detection with issue signatures
 - Enhanced quick checks for PHP/Blade/Routes
+- Tiered validation: local syntax (tier 0) and symbol resolution (tier 1)
+  run before the LLM review, which only sees files that pass
 """
 import hashlib
 import json
@@ -17,13 +19,23 @@ import logging
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional, List, Dict, Set, Tuple
+from typing import Optional, List, Dict, Set, Tuple, Iterable
 
 from app.agents.config import AgentConfig, agent_config
 from app.agents.context_retriever import RetrievedContext
 from app.agents.executor import ExecutionResult
 from app.agents.intent_analyzer import Intent
 from app.services.claude import ClaudeService, ClaudeModel, get_claude_service
+from app.services.response_memo import get_response_memo
+
+# tree-sitter-php powers the tier 0 syntax check (shared with PHPParser)
+try:
+    from app.services.parsers.php_parser import PHPParser
+
+    PHP_SYNTAX_CHECK_AVAILABLE = True
+except ImportError:
+    PHP_SYNTAX_CHECK_AVAILABLE = False
+    PHPParser = None
 
 logger = logging.getLogger(__name__)
 
@@ -460,6 +472,7 @@ class ValidationResult:
     summary: str = ""
     reasoning: str = ""  # Chain-of-thought reasoning
     patterns_matched: bool = True  # Whether code matches codebase patterns
+    tier: str = "llm"  # ValidationTier that produced this verdict
 
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -469,6 +482,7 @@ class ValidationResult:
             "issues": [issue.to_dict() for issue in self.issues],
             "suggestions": self.suggestions,
             "summary": self.summary,
+            "tier": self.tier,
         }
 
     @classmethod
@@ -516,6 +530,65 @@ class ValidationResult:
         return {i.signature for i in self.issues if i.signature}
 
 
+# =============================================================================
+# PER-FILE VERDICTS
+# =============================================================================
+
+def normalize_file_path(path: str) -> str:
+    """Normalize file path for comparison."""
+    if not path:
+        return ""
+    path = path.strip().replace("\\", "/")
+    if path.startswith("./"):
+        path = path[2:]
+    return path.lower()
+
+
+def match_result_index(file: str, results: List[ExecutionResult]) -> Optional[int]:
+    """Find the execution result an issue's file refers to (exact, then suffix match)."""
+    file_key = normalize_file_path(file)
+    if not file_key:
+        return None
+
+    normalized = [normalize_file_path(r.file) for r in results]
+    if file_key in normalized:
+        return normalized.index(file_key)
+    for idx, result_key in enumerate(normalized):
+        if file_key in result_key or result_key.endswith(file_key):
+            return idx
+    return None
+
+
+def group_issues_by_result(
+        issues: List[ValidationIssue],
+        results: List[ExecutionResult],
+) -> Tuple[Dict[int, List[ValidationIssue]], List[ValidationIssue]]:
+    """Group issues by the index of the result they belong to; also return unmatched ones."""
+    grouped: Dict[int, List[ValidationIssue]] = {}
+    unmatched: List[ValidationIssue] = []
+    for issue in issues:
+        idx = match_result_index(issue.file, results)
+        if idx is None:
+            unmatched.append(issue)
+        else:
+            grouped.setdefault(idx, []).append(issue)
+    return grouped, unmatched
+
+
+def result_fingerprint(result: ExecutionResult) -> str:
+    """Hash of everything the LLM sees for one result."""
+    payload = f"{result.action}\0{result.success}\0{result.error or ''}\0{result.content}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class FileVerdict:
+    """LLM verdict for one file, reusable while its content is unchanged."""
+    fingerprint: str
+    score: int
+    issues: List[ValidationIssue] = field(default_factory=list)
+
+
 # =============================================================================
 # CONTRADICTION TRACKER
 # =============================================================================
@@ -712,26 +785,8 @@ class QuickValidator:
             return issues
 
         # Check for balanced Blade directives
-        directive_pairs = [
-            ("@if", "@endif"),
-            ("@foreach", "@endforeach"),
-            ("@for", "@endfor"),
-            ("@while", "@endwhile"),
-            ("@switch", "@endswitch"),
-            ("@section", "@endsection"),
-            ("@push", "@endpush"),
-            ("@once", "@endonce"),
-            ("@php", "@endphp"),
-        ]
-
-        for start, end in directive_pairs:
-            start_count = content.count(start)
-            end_count = content.count(end)
-            # Account for @section with @show or @yield
-            if start == "@section":
-                end_count += content.count("@show")
-            if start_count > end_count:
-                issues.append(f"Unclosed {start} directive ({start_count} opens, {end_count} closes)")
+        for _, message in check_blade_directives(content):
+            issues.append(message)
 
         # Check for unescaped output with user data patterns
         dangerous_patterns = [
@@ -826,6 +881,368 @@ class QuickValidator:
         return issues
 
 
+# =============================================================================
+# LOCAL VALIDATION TIERS
+# =============================================================================
+
+class ValidationTier(str, Enum):
+    """Validation tiers, cheapest first. Later tiers only see files that passed."""
+    SYNTAX = "syntax"  # Tier 0: tree-sitter parse + Blade directive balance
+    SYMBOLS = "symbols"  # Tier 1: project imports resolved against the symbol table
+    LLM = "llm"  # Tier 2: Guardian review
+
+
+# Block directives and the directives that close them
+BLADE_BLOCK_DIRECTIVES: Dict[str, Tuple[str, ...]] = {
+    "if": ("endif",),
+    "unless": ("endunless",),
+    "isset": ("endisset",),
+    "empty": ("endempty",),
+    "auth": ("endauth",),
+    "guest": ("endguest",),
+    "can": ("endcan",),
+    "cannot": ("endcannot",),
+    "canany": ("endcanany",),
+    "env": ("endenv",),
+    "production": ("endproduction",),
+    "error": ("enderror",),
+    "foreach": ("endforeach",),
+    "forelse": ("endforelse",),
+    "for": ("endfor",),
+    "while": ("endwhile",),
+    "switch": ("endswitch",),
+    "section": ("endsection", "show", "stop", "append", "overwrite"),
+    "push": ("endpush",),
+    "prepend": ("endprepend",),
+    "once": ("endonce",),
+    "php": ("endphp",),
+    "component": ("endcomponent",),
+    "slot": ("endslot",),
+    "fragment": ("endfragment",),
+}
+
+BLADE_CLOSING_DIRECTIVES: Dict[str, str] = {
+    closer: opener
+    for opener, closers in BLADE_BLOCK_DIRECTIVES.items()
+    for closer in closers
+}
+
+# Directives that are single-line when called with a second argument
+BLADE_INLINE_WITH_VALUE = {"section", "slot"}
+
+_BLADE_DIRECTIVE_RE = re.compile(r"(?<![\w@])@(\w+)")
+_BLADE_COMMENT_RE = re.compile(r"\{\{--.*?--\}\}", re.DOTALL)
+_BLADE_VERBATIM_RE = re.compile(r"@verbatim\b.*?@endverbatim", re.DOTALL)
+
+
+def _blank_preserving_lines(match: re.Match) -> str:
+    """Replace a matched region with its newlines so line numbers stay stable."""
+    return "\n" * match.group(0).count("\n")
+
+
+def _read_directive_args(content: str, pos: int) -> Optional[str]:
+    """Return the parenthesised argument string starting at pos, if any."""
+    i = pos
+    while i < len(content) and content[i] in " \t":
+        i += 1
+    if i >= len(content) or content[i] != "(":
+        return None
+
+    depth = 0
+    quote = None
+    start = i + 1
+    while i < len(content):
+        char = content[i]
+        if quote:
+            if char == "\\":
+                i += 2
+                continue
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return content[start:i]
+        i += 1
+    return content[start:]
+
+
+def _has_top_level_comma(args: str) -> bool:
+    """Check whether a directive argument string holds more than one argument."""
+    depth = 0
+    quote = None
+    i = 0
+    while i < len(args):
+        char = args[i]
+        if quote:
+            if char == "\\":
+                i += 2
+                continue
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def check_blade_directives(content: str) -> List[Tuple[int, str]]:
+    """
+    Stack-based Blade directive balance check.
+
+    Returns (line, message) pairs for unclosed, stray and mismatched directives.
+    """
+    content = _BLADE_COMMENT_RE.sub(_blank_preserving_lines, content)
+    content = _BLADE_VERBATIM_RE.sub(_blank_preserving_lines, content)
+
+    problems: List[Tuple[int, str]] = []
+    stack: List[Tuple[str, int]] = []
+
+    for match in _BLADE_DIRECTIVE_RE.finditer(content):
+        name = match.group(1)
+        line = content.count("\n", 0, match.start()) + 1
+
+        if name in BLADE_BLOCK_DIRECTIVES:
+            args = _read_directive_args(content, match.end())
+            # @php(...) is inline, @empty without args is the @forelse separator
+            if name == "php" and args is not None:
+                continue
+            if name == "empty" and args is None:
+                continue
+            if name in BLADE_INLINE_WITH_VALUE and args and _has_top_level_comma(args):
+                continue
+            stack.append((name, line))
+
+        elif name in BLADE_CLOSING_DIRECTIVES:
+            opener = BLADE_CLOSING_DIRECTIVES[name]
+            if not any(open_name == opener for open_name, _ in stack):
+                problems.append((line, f"Unexpected @{name} on line {line} (no matching @{opener})"))
+                continue
+            # Anything still open above the matching opener was never closed
+            while stack[-1][0] != opener:
+                open_name, open_line = stack.pop()
+                problems.append((
+                    open_line,
+                    f"Unclosed @{open_name} directive (opened on line {open_line}, "
+                    f"before @{name} on line {line})",
+                ))
+            stack.pop()
+
+    for name, line in stack:
+        problems.append((line, f"Unclosed @{name} directive (opened on line {line})"))
+
+    return problems
+
+
+class SyntaxChecker:
+    """Tier 0: real syntax checks on generated files, no LLM involved."""
+
+    MAX_ERRORS_PER_FILE = 5
+
+    def __init__(self):
+        self._php_parser = PHPParser() if PHP_SYNTAX_CHECK_AVAILABLE else None
+
+    def check_php(self, content: str) -> List[Tuple[int, str]]:
+        """Parse PHP with tree-sitter and report ERROR / MISSING nodes."""
+        if not self._php_parser:
+            return []
+
+        source = content.encode("utf-8")
+        tree = self._php_parser.parser.parse(source)
+        if not tree.root_node.has_error:
+            return []
+
+        problems: List[Tuple[int, str]] = []
+
+        def walk(node) -> None:
+            if len(problems) >= self.MAX_ERRORS_PER_FILE:
+                return
+            line = node.start_point[0] + 1
+            if node.is_missing:
+                problems.append((line, f"Syntax error on line {line}: missing '{node.type}'"))
+                return
+            if node.type == "ERROR":
+                snippet = source[node.start_byte:node.end_byte].decode("utf-8", errors="replace")
+                snippet = snippet.strip().split("\n")[0][:60]
+                problems.append((line, f"Syntax error on line {line}: unexpected '{snippet}'"))
+                return
+            if node.has_error:
+                for child in node.children:
+                    walk(child)
+
+        walk(tree.root_node)
+        return problems
+
+    def check(self, result: ExecutionResult) -> List[ValidationIssue]:
+        """Run the syntax checks that apply to one execution result."""
+        if not result.success or result.action == "delete" or not result.content:
+            return []
+
+        file_path = result.file.lower()
+        if file_path.endswith(".blade.php"):
+            problems = check_blade_directives(result.content)
+        elif file_path.endswith(".php"):
+            problems = self.check_php(result.content)
+        else:
+            return []
+
+        return [
+            ValidationIssue(
+                severity="error",
+                file=result.file,
+                message=message,
+                line=line,
+                category=IssueCategory.SYNTAX.value,
+            )
+            for line, message in problems
+        ]
+
+
+# Composer PSR-4 roots of a default Laravel application
+LARAVEL_PSR4_ROOTS: Dict[str, str] = {
+    "app/": "App\\",
+    "database/factories/": "Database\\Factories\\",
+    "database/seeders/": "Database\\Seeders\\",
+    "tests/": "Tests\\",
+}
+
+_PHP_NAMESPACE_RE = re.compile(r"^\s*namespace\s+([\w\\]+)\s*;", re.MULTILINE)
+_PHP_DECLARATION_RE = re.compile(
+    r"^\s*(?:(?:abstract|final|readonly)\s+)*(?:class|interface|trait|enum)\s+(\w+)",
+    re.MULTILINE,
+)
+_PHP_USE_RE = re.compile(
+    r"^use\s+(?!function\b|const\b)\\?([\w\\]+?)(?:\\\{([^}]*)\})?(?:\s+as\s+\w+)?\s*;",
+    re.MULTILINE,
+)
+
+
+@dataclass
+class ProjectSymbolTable:
+    """Classes and namespaces a project defines, for tier 1 import resolution."""
+
+    symbols: Set[str] = field(default_factory=set)  # lowercased FQCNs and namespaces
+    roots: Set[str] = field(default_factory=set)  # lowercased namespace roots we can vouch for
+
+    @classmethod
+    def from_file_paths(cls, paths: Iterable[str]) -> "ProjectSymbolTable":
+        """Derive FQCNs from indexed file paths using Laravel's PSR-4 layout."""
+        table = cls()
+        for path in paths:
+            fqcn = cls.fqcn_for_path(path)
+            if fqcn:
+                table.add_class(fqcn)
+        return table
+
+    @staticmethod
+    def fqcn_for_path(path: str) -> Optional[str]:
+        """Map a project-relative PHP path to its PSR-4 class name."""
+        normalized = path.replace("\\", "/").lstrip("./")
+        if not normalized.endswith(".php") or normalized.endswith(".blade.php"):
+            return None
+        for prefix, namespace in LARAVEL_PSR4_ROOTS.items():
+            if normalized.startswith(prefix):
+                relative = normalized[len(prefix):-len(".php")]
+                return namespace + relative.replace("/", "\\")
+        return None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.symbols
+
+    def add_class(self, fqcn: str) -> None:
+        """Register a class and every namespace above it."""
+        parts = fqcn.strip("\\").lower().split("\\")
+        for i in range(1, len(parts) + 1):
+            self.symbols.add("\\".join(parts[:i]))
+        for namespace in LARAVEL_PSR4_ROOTS.values():
+            root = namespace.lower()
+            if fqcn.lower().lstrip("\\").startswith(root):
+                self.roots.add(root)
+
+    def add_source(self, content: str) -> None:
+        """Register the classes declared in a PHP source string."""
+        namespace_match = _PHP_NAMESPACE_RE.search(content)
+        namespace = namespace_match.group(1) if namespace_match else ""
+        for name in _PHP_DECLARATION_RE.findall(content):
+            self.add_class(f"{namespace}\\{name}" if namespace else name)
+
+    def covers(self, fqcn: str) -> bool:
+        """Whether fqcn lives under a namespace root this table knows about."""
+        lowered = fqcn.lower().lstrip("\\")
+        return any(lowered.startswith(root) for root in self.roots)
+
+    def resolves(self, fqcn: str) -> bool:
+        return fqcn.lower().strip("\\") in self.symbols
+
+
+def extract_use_statements(content: str) -> List[Tuple[int, str]]:
+    """Return (line, FQCN) for each top-level class import, expanding group uses."""
+    imports: List[Tuple[int, str]] = []
+    for match in _PHP_USE_RE.finditer(content):
+        line = content.count("\n", 0, match.start()) + 1
+        prefix, group = match.group(1), match.group(2)
+        if group is None:
+            imports.append((line, prefix))
+            continue
+        for member in group.split(","):
+            name = member.strip().split(" as ")[0].strip()
+            if name:
+                imports.append((line, f"{prefix}\\{name}"))
+    return imports
+
+
+def check_symbols(
+        results: List[ExecutionResult],
+        context: RetrievedContext,
+        symbol_table: ProjectSymbolTable,
+) -> List[ValidationIssue]:
+    """
+    Tier 1: every project-namespace import must exist in the index, the
+    retrieved context, or the batch of generated files itself.
+    """
+    table = ProjectSymbolTable(symbols=set(symbol_table.symbols), roots=set(symbol_table.roots))
+    for chunk in context.chunks:
+        if chunk.content:
+            table.add_source(chunk.content)
+    for result in results:
+        if result.success and result.action != "delete" and result.content:
+            fqcn = ProjectSymbolTable.fqcn_for_path(result.file)
+            if fqcn:
+                table.add_class(fqcn)
+            table.add_source(result.content)
+
+    issues = []
+    for result in results:
+        if not result.success or result.action == "delete" or not result.content:
+            continue
+        if not result.file.lower().endswith(".php") or result.file.lower().endswith(".blade.php"):
+            continue
+        for line, fqcn in extract_use_statements(result.content):
+            if table.covers(fqcn) and not table.resolves(fqcn):
+                issues.append(ValidationIssue(
+                    severity="error",
+                    file=result.file,
+                    message=(
+                        f"Undefined class: '{fqcn}' is imported on line {line} but does not exist "
+                        f"in the project or in the generated changes"
+                    ),
+                    line=line,
+                    category=IssueCategory.IMPORT_MISSING.value,
+                ))
+    return issues
+
+
 # =============================================================================
 # MAIN VALIDATOR CLASS
 # =============================================================================
@@ -851,6 +1268,8 @@ class Validator:
         self.config = config or agent_config
         self.contradiction_tracker = ContradictionTracker()
         self.quick_validator = QuickValidator()
+        self.syntax_checker = SyntaxChecker()
+        self._verdict_cache: Dict[str, FileVerdict] = {}  # normalized path -> last LLM verdict
         logger.info("[GUARDIAN] Initialized with enhanced validation")
 
     async def validate(
@@ -859,15 +1278,23 @@ class Validator:
             intent: Intent,
             results: List[ExecutionResult],
             context: RetrievedContext,
+            symbol_table: Optional[ProjectSymbolTable] = None,
+            model: Optional[ClaudeModel] = None,
     ) -> ValidationResult:
         """
         Validate execution results with chain-of-thought reasoning.
 
+        Runs the local tiers first: syntax failures return immediately without
+        an LLM call, and files with unresolved imports are kept out of the LLM
+        review.
+
         Args:
             user_input: Original user request
             intent: Analyzed intent
             results: Execution results to validate
             context: Codebase context for reference
+            symbol_table: Project symbols for tier 1 (skipped when None or empty)
+            model: Model chosen by the ModelRouter for the LLM tier (Sonnet if omitted)
 
         Returns:
             ValidationResult with approval status and issues
@@ -886,55 +1313,97 @@ class Validator:
                     line=1,
                 ))
 
-        # If quick checks found critical issues, return early
+        # Tier 0: syntax. Failures go straight back to the fix loop.
         critical_quick_issues = [i for i in quick_issues if "Unbalanced" in i.message or "empty" in i.message.lower()]
-        if critical_quick_issues:
-            logger.warning(f"[GUARDIAN] Quick check found {len(critical_quick_issues)} critical issues")
+        syntax_issues = []
+        for result in results:
+            syntax_issues.extend(self.syntax_checker.check(result))
+        # Blade balance problems are also reported by the quick check
+        syntax_keys = {(i.file, i.message) for i in syntax_issues}
+        quick_issues = [i for i in quick_issues if (i.file, i.message) not in syntax_keys]
+
+        if critical_quick_issues or syntax_issues:
+            blocking = syntax_issues + [i for i in critical_quick_issues if i in quick_issues]
+            failed_files = {i.file for i in blocking}
+            logger.warning(
+                f"[GUARDIAN] Tier 0 found {len(blocking)} syntax issues in {len(failed_files)} files, "
+                f"skipping LLM review"
+            )
             return ValidationResult(
                 approved=False,
                 score=20,
-                issues=critical_quick_issues,
+                issues=blocking,
                 summary="Quick validation found critical syntax issues that must be fixed before full review.",
+                tier=ValidationTier.SYNTAX.value,
             )
 
-        # Step 2: Extract patterns from context
-        patterns = extract_patterns_from_context(context)
-
-        # Step 3: Format changes for review
-        changes_str = self._format_changes(results)
+        # Tier 1: imports must resolve against the project symbol table
+        symbol_issues = []
+        if symbol_table is not None and not symbol_table.is_empty:
+            symbol_issues = check_symbols(results, context, symbol_table)
+
+        unresolved_files = {i.file for i in symbol_issues}
+        llm_results = [r for r in results if r.file not in unresolved_files]
+        if symbol_issues:
+            logger.warning(
+                f"[GUARDIAN] Tier 1 found {len(symbol_issues)} unresolved imports in "
+                f"{len(unresolved_files)} files"
+            )
 
-        # Step 4: Build prompt with patterns
-        user_prompt = safe_format(
-            VALIDATION_USER_PROMPT,
-            user_input=user_input,
-            task_type=intent.task_type,
-            scope=intent.scope,
-            domains=", ".join(intent.domains_affected) or "general",
-            patterns=patterns.to_prompt_string(),
-            changes=changes_str,
-            context=context.to_prompt_string()[:12000],  # Limit context
-        )
+        if not llm_results:
+            return ValidationResult(
+                approved=False,
+                score=50,
+                issues=symbol_issues + quick_issues,
+                summary="Generated code imports classes that do not exist in the project.",
+                tier=ValidationTier.SYMBOLS.value,
+            )
 
-        messages = [{"role": "user", "content": user_prompt}]
+        # Reuse verdicts for files unchanged since their last LLM review
+        cached_verdicts: List[FileVerdict] = []
+        review_results: List[ExecutionResult] = []
+        for exec_result in llm_results:
+            verdict = self._verdict_cache.get(normalize_file_path(exec_result.file))
+            if verdict and verdict.fingerprint == result_fingerprint(exec_result):
+                cached_verdicts.append(verdict)
+            else:
+                review_results.append(exec_result)
+
+        if cached_verdicts:
+            logger.info(
+                f"[GUARDIAN] Reusing {len(cached_verdicts)} cached verdicts, "
+                f"reviewing {len(review_results)} changed files"
+            )
 
         try:
-            response = await self.claude.chat_async(
-                model=ClaudeModel.SONNET,
-                messages=messages,
-                system=VALIDATION_SYSTEM_PROMPT,
-                temperature=0.2,  # Lower for more consistent validation
-                max_tokens=4096,
-                request_type="validation",
-            )
+            if review_results:
+                result = await self._review_with_llm(
+                    user_input, intent, review_results, context, model=model or ClaudeModel.SONNET,
+                )
+            else:
+                result = ValidationResult(
+                    approved=True,
+                    score=100,
+                    summary="No files changed since their last review.",
+                )
 
-            # Parse response - extract reasoning and JSON
-            result = self._parse_response(response)
+            for verdict in cached_verdicts:
+                result.issues.extend(verdict.issues)
+                result.score = min(result.score, verdict.score)
+                if any(i.severity == "error" for i in verdict.issues):
+                    result.approved = False
 
             # Add any non-critical quick check issues
             for qi in quick_issues:
                 if qi not in result.issues:
                     result.issues.append(qi)
 
+            # Unresolved imports block approval even if the reviewed files pass
+            if symbol_issues:
+                result.issues.extend(symbol_issues)
+                result.approved = False
+                result.score = min(result.score, 69)
+
             # Check for contradictions
             if self.config.ENABLE_CONTRADICTION_DETECTION:
                 contradictions = self.contradiction_tracker.detect_contradictions(result)
@@ -976,6 +1445,62 @@ class Validator:
             logger.error(f"[GUARDIAN] Validation failed: {e}")
             raise
 
+    async def _review_with_llm(
+            self,
+            user_input: str,
+            intent: Intent,
+            results: List[ExecutionResult],
+            context: RetrievedContext,
+            model: ClaudeModel = ClaudeModel.SONNET,
+    ) -> ValidationResult:
+        """Tier 2: Guardian review of the given results, caching per-file verdicts."""
+        # Extract patterns from context
+        patterns = extract_patterns_from_context(context)
+
+        # Build prompt with patterns
+        user_prompt = safe_format(
+            VALIDATION_USER_PROMPT,
+            user_input=user_input,
+            task_type=intent.task_type,
+            scope=intent.scope,
+            domains=", ".join(intent.domains_affected) or "general",
+            patterns=patterns.to_prompt_string(),
+            changes=self._format_changes(results),
+            context=context.to_prompt_string()[:12000],  # Limit context
+        )
+
+        messages = [{"role": "user", "content": user_prompt}]
+
+        response = await self.claude.chat_async(
+            model=model,
+            messages=messages,
+            system=VALIDATION_SYSTEM_PROMPT,
+            temperature=0.0,  # Deterministic validation (memoised on repeat)
+            max_tokens=4096,
+            request_type="validation",
+        )
+
+        # Parse response - extract reasoning and JSON
+        try:
+            result = self._parse_response(response)
+        except json.JSONDecodeError:
+            # Don't let a re-validation replay the same unparseable response
+            get_response_memo().discard(model, VALIDATION_SYSTEM_PROMPT, messages)
+            raise
+
+        # Issues we cannot pin to a file make per-file verdicts unreliable
+        grouped, unmatched = group_issues_by_result(result.issues, results)
+        if not unmatched:
+            for idx, exec_result in enumerate(results):
+                file_issues = grouped.get(idx, [])
+                self._verdict_cache[normalize_file_path(exec_result.file)] = FileVerdict(
+                    fingerprint=result_fingerprint(exec_result),
+                    score=result.score if file_issues else 100,
+                    issues=file_issues,
+                )
+
+        return result
+
     def _parse_response(self, response: str) -> ValidationResult:
         """Parse LLM response, extracting reasoning and JSON."""
         response_text = response.strip()
@@ -1066,8 +1591,9 @@ class Validator:
         )
 
     def clear_history(self) -> None:
-        """Clear validation history (call at start of new request)."""
+        """Clear validation history and cached verdicts (call at start of new request)."""
         self.contradiction_tracker.clear()
+        self._verdict_cache.clear()
 
     # Legacy compatibility
     @property
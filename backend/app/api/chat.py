@@ -3,28 +3,30 @@ AI chat routes with Server-Sent Events (SSE) streaming.
 
 Provides endpoints for AI-powered code assistance with real-time updates.
 """
-import json
 import logging
 import asyncio
 from typing import List, Optional, AsyncGenerator
 from datetime import datetime
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.core.prompts import CHAT_SYSTEM_PROMPT, CHAT_SYSTEM_PROMPT_SIMPLE
-from app.models.models import Project, User, ProjectStatus, Conversation, Message
+from app.models.models import Project, User, ProjectStatus, Conversation, Message, ChatJob
 from app.agents.orchestrator import Orchestrator, ProcessEvent, ProcessPhase
 from app.agents.interactive_orchestrator import InteractiveOrchestrator
+from app.agents.orchestrator_context import ConversationContextManager
 from app.agents.agent_identity import get_all_agents
-from app.agents.events import EventType as AgentEventType
+from app.agents.config import agent_config
+from app.agents.events import EventType as AgentEventType, encode_sse
 from app.services.claude import get_claude_service, create_tracked_claude_service, ClaudeModel
 from app.services.usage_tracker import UsageTracker
 from app.services.conversation_logger import (
@@ -33,6 +35,10 @@ from app.services.conversation_logger import (
     ConversationLogger,
 )
 from app.services.ai_operations_logger import get_operations_logger, OperationType
+from app.services.plan_approval import PlanDecision, get_plan_approval_backend
+from app.services.event_log import get_chat_event_log, parse_last_event_id
+from app.services.sse_multiplexer import multiplex, HEARTBEAT
+from app.services.job_runner import ChatJobConflict, get_chat_job_runner
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +83,7 @@ class ChatRequest(BaseModel):
     conversation_id: Optional[str] = None
     interactive_mode: bool = False  # Enable interactive multi-agent experience
     require_plan_approval: bool = True  # Pause for plan approval in interactive mode
+    fast_mode: Optional[bool] = None  # Skip cosmetic pacing; None uses AGENT_FAST_MODE
 
 
 class PlanApprovalRequest(BaseModel):
@@ -109,7 +116,7 @@ class SSEEvent(BaseModel):
 
     def to_sse(self) -> str:
         """Format as SSE string."""
-        return f"event: {self.event}\ndata: {json.dumps(self.data)}\n\n"
+        return encode_sse(self.event, self.data)
 
 
 # ============== SSE Event Types ==============
@@ -133,7 +140,7 @@ class EventType:
 
 def create_sse_event(event_type: str, data: dict) -> str:
     """Create an SSE formatted event string."""
-    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+    return encode_sse(event_type, data)
 
 
 async def verify_project_access(
@@ -195,44 +202,6 @@ async def get_or_create_conversation(
     return conversation
 
 
-async def get_conversation_history(
-    db: AsyncSession,
-    conversation_id: str,
-    limit: int = 10,
-) -> list[dict]:
-    """
-    Fetch recent conversation history for context.
-
-    Args:
-        db: Database session
-        conversation_id: The conversation ID
-        limit: Maximum number of messages to fetch (default 10)
-
-    Returns:
-        List of message dicts with role and content
-    """
-    stmt = (
-        select(Message)
-        .where(Message.conversation_id == conversation_id)
-        .order_by(desc(Message.created_at))
-        .limit(limit)
-    )
-    result = await db.execute(stmt)
-    messages = result.scalars().all()
-
-    # Reverse to get chronological order and format for Claude
-    history = []
-    for msg in reversed(messages):
-        history.append({
-            "role": msg.role,
-            "content": msg.content,
-            # Include summary of code changes if present
-            "has_code_changes": bool(msg.code_changes),
-        })
-
-    return history
-
-
 def format_conversation_history(history: list[dict], max_chars: int = 8000) -> str:
     """
     Format conversation history for inclusion in prompts.
@@ -341,8 +310,9 @@ async def stream_chat_response(
         user_id=user_id,
     )
 
-    # Fetch conversation history BEFORE saving current message
-    history = await get_conversation_history(db, conversation.id, limit=10)
+    # Load summary and history once, BEFORE saving current message
+    conv_context = await ConversationContextManager(db).load_context(conversation.id, history_limit=10)
+    history = conv_context.history
     conversation_context = format_conversation_history(history)
 
     # Count messages for logging
@@ -358,19 +328,6 @@ async def stream_chat_response(
     # Now save the user message
     await save_message(db, conversation.id, "user", message)
 
-    # Build message with conversation context
-    if conversation_context:
-        message_with_context = f"""{conversation_context}
-
-<current_request>
-{message}
-</current_request>
-
-IMPORTANT: Consider the conversation history above when processing this request. The user may be referring to previous messages, code changes, or context from earlier in the conversation."""
-        logger.info(f"[CHAT] Including {len(history)} previous messages in context")
-    else:
-        message_with_context = message
-
     # Track events for the orchestrator callback
     event_queue: asyncio.Queue = asyncio.Queue()
 
@@ -399,38 +356,25 @@ IMPORTANT: Consider the conversation history above when processing this request.
             event_callback=event_callback,
             claude_service=claude_service,
             conversation_logger=conv_logger,
+            conversation_id=conversation.id,
+            conversation_context=conv_context,
         )
 
-        # Start processing in background with conversation context
+        # The orchestrator gives the agents the conversation summary and recent messages
         process_task = asyncio.create_task(
-            orchestrator.process_request(project_id, message_with_context)
+            orchestrator.process_request(project_id, message)
         )
 
-        # Stream events as they come
-        while not process_task.done():
-            try:
-                # Wait for event with timeout
-                event = await asyncio.wait_for(event_queue.get(), timeout=0.5)
-
-                # Map orchestrator phases to SSE events
-                sse_event = map_phase_to_sse_event(event)
-                if sse_event:
-                    yield sse_event
-
-            except asyncio.TimeoutError:
-                # No event yet, continue waiting
-                continue
+        # Stream events as they come, one write per burst
+        async for batch in multiplex(event_queue, process_task):
+            # Map orchestrator phases to SSE events
+            chunk = "".join(filter(None, map(map_phase_to_sse_event, batch)))
+            if chunk:
+                yield chunk
 
         # Get final result
         result = await process_task
 
-        # Drain any remaining events
-        while not event_queue.empty():
-            event = await event_queue.get()
-            sse_event = map_phase_to_sse_event(event)
-            if sse_event:
-                yield sse_event
-
         # Build assistant response content
         if result.success:
             # Check if this was classified as a question (no plan/execution)
@@ -658,8 +602,9 @@ async def stream_question_response(
         user_id=user_id,
     )
 
-    # Fetch conversation history BEFORE saving current message
-    history = await get_conversation_history(db, conversation.id, limit=10)
+    # Load summary and history once, BEFORE saving current message
+    conv_context = await ConversationContextManager(db).load_context(conversation.id, history_limit=10)
+    history = conv_context.history
     conversation_context = format_conversation_history(history)
 
     # Count messages for logging
@@ -690,20 +635,20 @@ async def stream_question_response(
         )
 
         # Create orchestrator for context retrieval with tracked Claude service and logger
-        orchestrator = Orchestrator(db=db, claude_service=claude_service, conversation_logger=conv_logger)
-
-        # Get intent, context, and project context (include conversation history in question)
-        question_with_context = question
-        if conversation_context:
-            question_with_context = f"{conversation_context}\n\n<current_question>\n{question}\n</current_question>"
-            logger.info(f"[CHAT] Including {len(history)} previous messages in question context")
+        orchestrator = Orchestrator(
+            db=db,
+            claude_service=claude_service,
+            conversation_logger=conv_logger,
+            conversation_id=conversation.id,
+            conversation_context=conv_context,
+        )
 
         yield create_sse_event(EventType.INTENT_ANALYZED, {
             "message": "Analyzing your question...",
             "progress": 0.1,
         })
 
-        intent, context, project_context = await orchestrator.process_question(project_id, question_with_context)
+        intent, context, project_context = await orchestrator.process_question(project_id, question)
 
         yield create_sse_event(EventType.INTENT_ANALYZED, {
             "message": f"Identified as: {intent.task_type}",
@@ -808,6 +753,7 @@ async def stream_interactive_chat_response(
     user_id: str,
     db: AsyncSession,
     require_plan_approval: bool = True,
+    fast_mode: Optional[bool] = None,
 ) -> AsyncGenerator[str, None]:
     """
     Generate SSE stream for interactive chat response with named agents.
@@ -837,8 +783,9 @@ async def stream_interactive_chat_response(
         user_id=user_id,
     )
 
-    # Fetch conversation history
-    history = await get_conversation_history(db, conversation.id, limit=10)
+    # Load summary and history once for this request
+    conv_context = await ConversationContextManager(db).load_context(conversation.id, history_limit=10)
+    history = conv_context.history
     conversation_context = format_conversation_history(history)
     message_count = len(history) + 1
 
@@ -852,18 +799,6 @@ async def stream_interactive_chat_response(
     # Save user message
     await save_message(db, conversation.id, "user", message)
 
-    # Build message with context
-    if conversation_context:
-        message_with_context = f"""{conversation_context}
-
-<current_request>
-{message}
-</current_request>
-
-IMPORTANT: Consider the conversation history above when processing this request."""
-    else:
-        message_with_context = message
-
     # Event queue for the orchestrator
     event_queue: asyncio.Queue = asyncio.Queue()
 
@@ -877,6 +812,7 @@ IMPORTANT: Consider the conversation history above when processing this request.
         "conversation_id": conversation.id,
         "message": "Connected to interactive chat stream",
         "interactive_mode": True,
+        "fast_mode": agent_config.FAST_MODE if fast_mode is None else fast_mode,
         "agents": agents_info,
     })
 
@@ -896,35 +832,24 @@ IMPORTANT: Consider the conversation history above when processing this request.
             claude_service=claude_service,
             conversation_logger=conv_logger,
             require_plan_approval=require_plan_approval,
+            fast_mode=fast_mode,
+            approval_id=conversation.id,
+            conversation_id=conversation.id,
+            conversation_context=conv_context,
         )
 
-        # Store orchestrator for plan approval
-        _active_orchestrators[conversation.id] = orchestrator
-
-        # Start processing in background
+        # The orchestrator gives the agents the conversation summary and recent messages
         process_task = asyncio.create_task(
-            orchestrator.process_request(project_id, message_with_context)
+            orchestrator.process_request(project_id, message)
         )
 
-        # Stream events as they come
-        while not process_task.done():
-            try:
-                event_str = await asyncio.wait_for(event_queue.get(), timeout=0.1)
-                yield event_str
-            except asyncio.TimeoutError:
-                continue
+        # Stream events as they come, one write per burst
+        async for batch in multiplex(event_queue, process_task):
+            yield "".join(batch)
 
         # Get final result
         result = await process_task
 
-        # Drain remaining events
-        while not event_queue.empty():
-            event_str = await event_queue.get()
-            yield event_str
-
-        # Remove from active orchestrators
-        _active_orchestrators.pop(conversation.id, None)
-
         # Build response content
         if result.success:
             if not result.plan and not result.execution_results:
@@ -1027,7 +952,6 @@ Answer based on this project's specific technology stack, conventions, and patte
 
     except Exception as e:
         logger.exception(f"[CHAT] Interactive stream error: {e}")
-        _active_orchestrators.pop(conversation.id, None)
         _ops_logger.log(
             operation_type=OperationType.ERROR,
             message=f"Interactive stream error: {str(e)}",
@@ -1046,6 +970,74 @@ Answer based on this project's specific technology stack, conventions, and patte
         yield create_sse_event(EventType.ERROR, {"message": str(e)})
 
 
+# ============== Resumable Streams ==============
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+async def tail_event_log(conversation_id: str, last_event_id: int = 0) -> AsyncGenerator[bytes, None]:
+    """
+    Yield logged events after ``last_event_id`` until the run ends.
+
+    Events logged together go out as one write, already encoded; a
+    heartbeat is sent only when nothing was logged for a whole heartbeat
+    interval.
+    """
+    batches = get_chat_event_log().subscribe_batches(
+        conversation_id,
+        after_id=last_event_id,
+        idle_timeout=settings.chat_sse_heartbeat_seconds,
+    )
+    async for batch in batches:
+        yield ("".join(event.to_sse() for event in batch) if batch else HEARTBEAT).encode()
+
+
+# ============== Chat Jobs ==============
+# Pipelines run in the job runner with a session it owns; the handlers just
+# rebuild the stream generator from the job record.
+
+def _interactive_job(db: AsyncSession, job: ChatJob) -> AsyncGenerator[str, None]:
+    return stream_interactive_chat_response(
+        project_id=job.project_id,
+        message=job.payload["message"],
+        conversation_id=job.conversation_id,
+        user_id=job.user_id,
+        db=db,
+        require_plan_approval=job.payload.get("require_plan_approval", True),
+        fast_mode=job.payload.get("fast_mode"),
+    )
+
+
+def _question_job(db: AsyncSession, job: ChatJob) -> AsyncGenerator[str, None]:
+    return stream_question_response(
+        project_id=job.project_id,
+        question=job.payload["message"],
+        conversation_id=job.conversation_id,
+        user_id=job.user_id,
+        db=db,
+    )
+
+
+def _action_job(db: AsyncSession, job: ChatJob) -> AsyncGenerator[str, None]:
+    return stream_chat_response(
+        project_id=job.project_id,
+        message=job.payload["message"],
+        conversation_id=job.conversation_id,
+        user_id=job.user_id,
+        db=db,
+    )
+
+
+_job_runner = get_chat_job_runner()
+_job_runner.register("interactive", _interactive_job)
+_job_runner.register("question", _question_job)
+_job_runner.register("action", _action_job)
+
+
 # ============== API Endpoints ==============
 
 @router.get("/agents")
@@ -1079,22 +1071,19 @@ async def approve_plan(
     """
     logger.info(f"[CHAT] POST /projects/{project_id}/chat/approve-plan - conversation_id={request.conversation_id}")
 
-    # Get the active orchestrator
-    orchestrator = _active_orchestrators.get(request.conversation_id)
+    # Deliver the decision to whichever worker is waiting on this conversation
+    delivered = await get_plan_approval_backend().submit(request.conversation_id, PlanDecision(
+        approved=request.approved,
+        modified_plan=request.modified_plan,
+        rejection_reason=request.rejection_reason,
+    ))
 
-    if not orchestrator:
+    if not delivered:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No active plan awaiting approval for this conversation",
         )
 
-    # Apply the approval
-    await orchestrator.approve_plan(
-        approved=request.approved,
-        modified_plan=request.modified_plan,
-        rejection_reason=request.rejection_reason,
-    )
-
     return {
         "success": True,
         "message": "Plan approval received" if request.approved else "Plan rejected",
@@ -1421,7 +1410,10 @@ async def chat_with_project(
     """
     Chat with AI about a project.
 
-    Returns Server-Sent Events (SSE) stream with progress updates.
+    Returns Server-Sent Events (SSE) stream with progress updates. Every event
+    carries an `id:`; after a dropped connection, call
+    `GET /{project_id}/chat/{conversation_id}/stream` with `Last-Event-ID`
+    to replay what was missed and keep following the same run.
 
     Set `interactive_mode: true` to enable the full interactive multi-agent experience
     with named agents, thinking animations, and plan approval gateway.
@@ -1461,64 +1453,112 @@ async def chat_with_project(
 
     logger.info(f"[CHAT] Processing message: {request.message[:100]}...")
 
-    # Check for interactive mode
+    # Interactive multi-agent mode, or standard mode split into question / action
     if request.interactive_mode:
-        # Stream interactive response with named agents
-        return StreamingResponse(
-            stream_interactive_chat_response(
-                project_id=project_id,
-                message=request.message,
-                conversation_id=conversation_id,
-                user_id=current_user.id,
-                db=db,
-                require_plan_approval=request.require_plan_approval,
-            ),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Accel-Buffering": "no",
+        kind = "interactive"
+    elif request.message.strip().endswith("?"):
+        kind = "question"
+    else:
+        kind = "action"
+
+    # The pipeline runs as a background job writing to the event log;
+    # the response only follows the log, so clients can reconnect.
+    try:
+        job = await get_chat_job_runner().submit(
+            user_id=current_user.id,
+            project_id=project_id,
+            conversation_id=conversation_id,
+            kind=kind,
+            payload={
+                "message": request.message,
+                "require_plan_approval": request.require_plan_approval,
+                "fast_mode": request.fast_mode,
             },
         )
+    except ChatJobConflict:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request is already running for this conversation; reconnect to its stream instead",
+        )
 
-    # Standard mode - determine if this is a question or action request
-    is_likely_question = request.message.strip().endswith("?")
-
-    if is_likely_question:
-        # Stream question response
-        return StreamingResponse(
-            stream_question_response(
-                project_id=project_id,
-                question=request.message,
-                conversation_id=conversation_id,
-                user_id=current_user.id,
-                db=db,
-            ),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Accel-Buffering": "no",
-            },
+    return StreamingResponse(
+        tail_event_log(conversation_id),
+        media_type="text/event-stream",
+        headers={**SSE_HEADERS, "X-Chat-Job-ID": job.id},
+    )
+
+
+@router.get("/{project_id}/chat/jobs/{job_id}")
+async def get_chat_job(
+    project_id: str,
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the status of a background chat job."""
+    stmt = select(ChatJob).where(
+        ChatJob.id == job_id,
+        ChatJob.project_id == project_id,
+        ChatJob.user_id == current_user.id,
+    )
+    result = await db.execute(stmt)
+    job = result.scalar_one_or_none()
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chat job not found",
         )
-    else:
-        # Stream action response (full orchestration)
-        return StreamingResponse(
-            stream_chat_response(
-                project_id=project_id,
-                message=request.message,
-                conversation_id=conversation_id,
-                user_id=current_user.id,
-                db=db,
-            ),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Accel-Buffering": "no",
-            },
+
+    return {
+        "id": job.id,
+        "conversation_id": job.conversation_id,
+        "kind": job.kind,
+        "status": job.status,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+@router.get("/{project_id}/chat/{conversation_id}/stream")
+async def resume_chat_stream(
+    project_id: str,
+    conversation_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Reconnect to a conversation's chat stream.
+
+    Replays every event after the ``Last-Event-ID`` header (all events of
+    the latest run when absent), then follows the run if it is still in
+    progress. The pipeline is not restarted.
+    """
+    logger.info(f"[CHAT] GET /projects/{project_id}/chat/{conversation_id}/stream - last_event_id={last_event_id}")
+
+    await verify_project_access(project_id, current_user, db)
+
+    stmt = select(Conversation.id).where(
+        Conversation.id == conversation_id,
+        Conversation.user_id == current_user.id,
+        Conversation.project_id == project_id,
+    )
+    result = await db.execute(stmt)
+    if result.scalar_one_or_none() is None or not await get_chat_event_log().exists(conversation_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No stream available for this conversation",
         )
 
+    return StreamingResponse(
+        tail_event_log(conversation_id, parse_last_event_id(last_event_id)),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
 
 @router.post("/{project_id}/chat/sync", response_model=ChatResponse)
 async def chat_sync(
@@ -1557,8 +1597,9 @@ async def chat_sync(
         user_id=str(current_user.id),
     )
 
-    # Fetch conversation history for context logging
-    history = await get_conversation_history(db, conversation.id, limit=10)
+    # Load summary and history once for this request
+    conv_context = await ConversationContextManager(db).load_context(conversation.id, history_limit=10)
+    history = conv_context.history
     conversation_context = format_conversation_history(history)
 
     # Log user message
@@ -1581,7 +1622,13 @@ async def chat_sync(
         )
 
         # Create orchestrator with tracked Claude service and logger
-        orchestrator = Orchestrator(db=db, claude_service=claude_service, conversation_logger=conv_logger)
+        orchestrator = Orchestrator(
+            db=db,
+            claude_service=claude_service,
+            conversation_logger=conv_logger,
+            conversation_id=conversation.id,
+            conversation_context=conv_context,
+        )
 
         # Check if question or action
         is_question = request.message.strip().endswith("?")
@@ -1941,9 +1988,6 @@ class BatchStatusResponse(BaseModel):
 _batch_processor = None
 _batch_jobs: dict = {}
 
-# Store active interactive orchestrators for plan approval
-_active_orchestrators: dict = {}
-
 
 def _get_batch_processor():
     """Get or create batch processor."""
@@ -5,7 +5,8 @@ import logging
 from typing import List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 logger = logging.getLogger(__name__)
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
@@ -17,7 +18,7 @@ from github import Github, GithubException
 from app.core.database import get_db
 from app.core.config import settings
 from app.core.security import get_current_user, decrypt_token
-from app.models.models import Project, ProjectStatus, User, IndexedFile, ProjectIssue
+from app.models.models import Project, ProjectStatus, User, IndexedFile, ProjectIssue, ScanJob, ScanJobStatus
 from app.services.git_service import GitService, GitServiceError
 from app.services.indexer import (
     ProjectIndexer,
@@ -31,9 +32,21 @@ from app.services.stack_detector import StackDetector
 from app.services.file_scanner import FileScanner
 from app.services.health_checker import HealthChecker
 from app.services.ai_context_generator import AIContextGenerator
+from app.services.file_snapshot import get_file_snapshot
+from app.services.file_tree import load_file_tree
+from app.services.scan_columns import ScanColumns
+from app.services.issue_store import store_issues
+from app.services.event_log import get_scan_event_log, parse_last_event_id
+from app.services.scan_job_runner import get_scan_job_runner, tail_scan_events
 
 router = APIRouter()
 
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
 
 class ProjectCreate(BaseModel):
     """Request model for creating a project."""
@@ -226,9 +239,16 @@ async def clone_and_index_project_task(
                 project.scan_message = "Detecting technology stack..."
                 await db.commit()
 
-                stack_detector = StackDetector(project.clone_path)
+                snapshot = get_file_snapshot(project.clone_path)
+                stack_detector = StackDetector(
+                    project.clone_path,
+                    snapshot=snapshot,
+                    previous=project.stack,
+                    previous_fingerprint=project.stack_fingerprint,
+                )
                 stack = stack_detector.detect()
                 project.stack = stack
+                project.stack_fingerprint = stack_detector.fingerprint
                 project.scan_progress = 15
                 await db.commit()
 
@@ -246,9 +266,10 @@ async def clone_and_index_project_task(
                 project.scan_message = "Scanning files..."
                 await db.commit()
 
-                file_scanner = FileScanner(project.clone_path)
+                file_scanner = FileScanner(project.clone_path, snapshot=snapshot)
                 file_stats = file_scanner.scan()
                 project.file_stats = file_stats
+                project.scan_columns = file_scanner.columns.to_bytes()
 
                 # Get structure analysis
                 structure = file_scanner.get_structure_analysis()
@@ -267,7 +288,9 @@ async def clone_and_index_project_task(
                 project.scan_message = "Running health checks..."
                 await db.commit()
 
-                health_checker = HealthChecker(project.clone_path, stack, file_stats)
+                health_checker = HealthChecker(
+                    project.clone_path, stack, file_stats, snapshot=snapshot, previous=project.health_check,
+                )
                 health_result = health_checker.check()
 
                 project.health_score = health_result.get("score")
@@ -275,7 +298,10 @@ async def clone_and_index_project_task(
                 project.scan_progress = 75
                 await db.commit()
 
-                logger.info(f"[CLONE_INDEX_TASK] Health check complete: score={health_result.get('score')}")
+                logger.info(
+                    f"[CLONE_INDEX_TASK] Health check complete: score={health_result.get('score')}, "
+                    f"recomputed={health_checker.recomputed}"
+                )
 
                 # 3.4: Save Issues
                 logger.info(f"[CLONE_INDEX_TASK] Phase 3.4: Saving issues")
@@ -283,30 +309,14 @@ async def clone_and_index_project_task(
                 project.scan_message = "Saving issues..."
                 await db.commit()
 
-                # Delete existing issues
-                from sqlalchemy import delete
-                await db.execute(
-                    delete(ProjectIssue).where(ProjectIssue.project_id == project_id)
+                # Upsert issues by signature, dropping ones not found again
+                stored = await store_issues(
+                    db,
+                    project_id,
+                    ({**issue.to_dict(), "signature": issue.signature} for issue in health_checker.get_issues()),
                 )
-
-                # Save new issues
-                issues = health_checker.get_issues()
-                for issue in issues:
-                    db_issue = ProjectIssue(
-                        project_id=project_id,
-                        category=issue.category,
-                        severity=issue.severity.value,
-                        title=issue.title,
-                        description=issue.description,
-                        file_path=issue.file_path,
-                        line_number=issue.line_number,
-                        suggestion=issue.suggestion,
-                        auto_fixable=issue.auto_fixable,
-                    )
-                    db.add(db_issue)
-
                 await db.commit()
-                logger.info(f"[CLONE_INDEX_TASK] Saved {len(issues)} issues")
+                logger.info(f"[CLONE_INDEX_TASK] Saved {stored} issues")
 
                 # 3.5: Generate AI Context
                 logger.info(f"[CLONE_INDEX_TASK] Phase 3.5: Generating AI context")
@@ -314,7 +324,7 @@ async def clone_and_index_project_task(
                 project.scan_message = "Generating AI context..."
                 await db.commit()
 
-                ai_generator = AIContextGenerator(project.clone_path, stack, file_stats, structure)
+                ai_generator = AIContextGenerator(project.clone_path, stack, file_stats, structure, snapshot=snapshot)
                 ai_context = ai_generator.generate()
                 project.ai_context = ai_context
                 project.scan_progress = 95
@@ -860,6 +870,12 @@ class FileContentResponse(BaseModel):
 @router.get("/{project_id}/files", response_model=List[FileNode])
 async def get_project_files(
     project_id: str,
+    request: Request,
+    response: Response,
+    path: Optional[str] = Query(None, description="Directory to list, relative to the repo root"),
+    depth: Optional[int] = Query(None, ge=1, description="Directory levels to expand; all when omitted"),
+    offset: int = Query(0, ge=0, description="Entries of the listed directory to skip"),
+    limit: Optional[int] = Query(None, ge=1, le=5000, description="Maximum entries of the listed directory"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -867,8 +883,11 @@ async def get_project_files(
     Get the file tree structure for a project.
 
     Returns a hierarchical list of files and directories in the cloned repo.
+    Pass ``path`` and ``depth`` to expand one directory at a time; directories
+    that were not expanded have ``children`` set to null. The tree is cached
+    per commit, and the ETag lets clients revalidate with If-None-Match.
     """
-    logger.info(f"[API] GET /projects/{project_id}/files - user_id={current_user.id}")
+    logger.info(f"[API] GET /projects/{project_id}/files - user_id={current_user.id} path={path}")
 
     # Fetch project
     stmt = select(Project).where(
@@ -890,57 +909,41 @@ async def get_project_files(
             detail="Project has not been cloned yet.",
         )
 
-    import os
+    # Built off the event loop; cached per commit
+    tree = await asyncio.to_thread(load_file_tree, project.clone_path)
+
+    if tree.sha:
+        # Indexed flags change when the project is re-indexed at the same commit
+        indexed_at = int(project.last_indexed_at.timestamp()) if project.last_indexed_at else 0
+        etag = f'"{tree.sha}-{indexed_at}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    directory = (path or "").strip("/")
+    if not tree.has_directory(directory):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Directory not found.",
+        )
 
     # Get indexed file paths for marking
     stmt = select(IndexedFile.file_path).where(IndexedFile.project_id == project_id)
     result = await db.execute(stmt)
     indexed_paths = set(row[0] for row in result.fetchall())
 
-    def build_tree(dir_path: str, relative_base: str = "") -> List[dict]:
-        """Recursively build the file tree."""
-        items = []
+    nodes = tree.nodes(directory, depth=depth, indexed_paths=indexed_paths, offset=offset, limit=limit)
+    logger.info(f"[API] Returning file tree with {len(nodes)} items under '{directory or '/'}'")
+    return nodes
 
-        try:
-            entries = sorted(os.listdir(dir_path), key=lambda x: (not os.path.isdir(os.path.join(dir_path, x)), x.lower()))
-        except PermissionError:
-            return items
-
-        for entry in entries:
-            # Skip hidden files and common non-essential directories
-            if entry.startswith('.') or entry in ['node_modules', 'vendor', '__pycache__', '.git']:
-                continue
-
-            full_path = os.path.join(dir_path, entry)
-            relative_path = os.path.join(relative_base, entry) if relative_base else entry
-
-            if os.path.isdir(full_path):
-                children = build_tree(full_path, relative_path)
-                # Only include directories that have children
-                if children:
-                    items.append({
-                        "name": entry,
-                        "path": relative_path,
-                        "type": "directory",
-                        "children": children,
-                        "indexed": False,
-                    })
-            else:
-                # Include PHP, Blade, JS, CSS, JSON, and config files
-                ext = entry.split('.')[-1].lower() if '.' in entry else ''
-                if ext in ['php', 'blade', 'js', 'ts', 'vue', 'jsx', 'tsx', 'css', 'scss', 'json', 'yaml', 'yml', 'md', 'env', 'sql']:
-                    items.append({
-                        "name": entry,
-                        "path": relative_path,
-                        "type": "file",
-                        "indexed": relative_path in indexed_paths,
-                    })
-
-        return items
-
-    tree = build_tree(project.clone_path)
-    logger.info(f"[API] Returning file tree with {len(tree)} root items")
-    return tree
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers the ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
 
 
 @router.get("/{project_id}/files/{file_path:path}", response_model=FileContentResponse)
@@ -1020,199 +1023,24 @@ async def get_file_content(
 
 # ========== Project Scanning Endpoints ==========
 
-async def scan_project_task(
-    project_id: str,
-) -> None:
-    """
-    Background task to scan a project for stack detection, file stats, and health check.
-
-    Args:
-        project_id: The project's UUID
-    """
-    logger.info(f"[SCAN_TASK] Starting scan task for project_id={project_id}")
-
-    # Create a new database session for background task
-    engine = create_async_engine(settings.database_url)
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-
-    async with async_session() as db:
-        try:
-            # Fetch project
-            stmt = select(Project).where(Project.id == project_id)
-            result = await db.execute(stmt)
-            project = result.scalar_one_or_none()
-
-            if not project:
-                logger.error(f"[SCAN_TASK] Project not found: {project_id}")
-                await engine.dispose()
-                return
-
-            if not project.clone_path:
-                logger.error(f"[SCAN_TASK] Project has no clone_path: {project_id}")
-                project.status = ProjectStatus.ERROR.value
-                project.error_message = "Project has not been cloned yet"
-                await db.commit()
-                await engine.dispose()
-                return
-
-            logger.info(f"[SCAN_TASK] Scanning project: {project.repo_full_name}")
-
-            # Update status to scanning
-            project.status = ProjectStatus.SCANNING.value
-            project.scan_progress = 0
-            project.scan_message = "Starting scan..."
-            await db.commit()
-
-            # ========== PHASE 1: Stack Detection (10%) ==========
-            logger.info(f"[SCAN_TASK] Phase 1: Stack detection")
-            project.scan_progress = 5
-            project.scan_message = "Detecting technology stack..."
-            await db.commit()
-
-            stack_detector = StackDetector(project.clone_path)
-            stack = stack_detector.detect()
-            project.stack = stack
-            project.scan_progress = 10
-            await db.commit()
-
-            # Extract Laravel version from stack
-            backend = stack.get("backend", {})
-            if backend.get("framework") == "laravel":
-                project.laravel_version = backend.get("version")
-                project.php_version = backend.get("php_version")
-
-            logger.info(f"[SCAN_TASK] Stack detected: {backend.get('framework', 'unknown')}")
-
-            # ========== PHASE 2: File Scanning (40%) ==========
-            logger.info(f"[SCAN_TASK] Phase 2: File scanning")
-            project.status = ProjectStatus.SCANNING.value
-            project.scan_progress = 15
-            project.scan_message = "Scanning files..."
-            await db.commit()
-
-            def update_scan_progress(count: int, message: str):
-                # This is called synchronously, so we can't update DB here
-                pass
-
-            file_scanner = FileScanner(project.clone_path)
-            file_stats = file_scanner.scan(progress_callback=update_scan_progress)
-            project.file_stats = file_stats
-
-            # Get structure analysis
-            structure = file_scanner.get_structure_analysis()
-            project.structure = structure
-
-            project.scan_progress = 50
-            project.scan_message = f"Scanned {file_stats.get('total_files', 0)} files"
-            await db.commit()
-
-            logger.info(f"[SCAN_TASK] File scan complete: {file_stats.get('total_files', 0)} files")
-
-            # ========== PHASE 3: Health Check (80%) ==========
-            logger.info(f"[SCAN_TASK] Phase 3: Health check")
-            project.status = ProjectStatus.ANALYZING.value
-            project.scan_progress = 60
-            project.scan_message = "Running health checks..."
-            await db.commit()
-
-            health_checker = HealthChecker(project.clone_path, stack, file_stats)
-            health_result = health_checker.check()
-
-            project.health_score = health_result.get("score")
-            project.health_check = health_result
-            project.scan_progress = 80
-            await db.commit()
-
-            logger.info(f"[SCAN_TASK] Health check complete: score={health_result.get('score')}")
-
-            # ========== PHASE 4: Save Issues (90%) ==========
-            logger.info(f"[SCAN_TASK] Phase 4: Saving issues")
-            project.scan_progress = 85
-            project.scan_message = "Saving issues..."
-            await db.commit()
-
-            # Delete existing issues
-            from sqlalchemy import delete
-            await db.execute(
-                delete(ProjectIssue).where(ProjectIssue.project_id == project_id)
-            )
-
-            # Save new issues
-            issues = health_checker.get_issues()
-            for issue in issues:
-                db_issue = ProjectIssue(
-                    project_id=project_id,
-                    category=issue.category,
-                    severity=issue.severity.value,
-                    title=issue.title,
-                    description=issue.description,
-                    file_path=issue.file_path,
-                    line_number=issue.line_number,
-                    suggestion=issue.suggestion,
-                    auto_fixable=issue.auto_fixable,
-                )
-                db.add(db_issue)
-
-            await db.commit()
-            logger.info(f"[SCAN_TASK] Saved {len(issues)} issues")
-
-            # ========== PHASE 5: Generate AI Context (95%) ==========
-            logger.info(f"[SCAN_TASK] Phase 5: Generating AI context")
-            project.scan_progress = 90
-            project.scan_message = "Generating AI context..."
-            await db.commit()
-
-            ai_generator = AIContextGenerator(project.clone_path, stack, file_stats, structure)
-            ai_context = ai_generator.generate()
-            project.ai_context = ai_context
-            project.scan_progress = 95
-            await db.commit()
-
-            logger.info(f"[SCAN_TASK] AI context generated")
-
-            # ========== COMPLETE ==========
-            project.scan_progress = 100
-            project.scan_message = "Scan complete"
-            project.scanned_at = datetime.utcnow()
-            project.status = ProjectStatus.READY.value
-            project.error_message = None
-            await db.commit()
-
-            logger.info(f"[SCAN_TASK] Scan completed for project_id={project_id}")
-
-        except Exception as e:
-            logger.exception(f"[SCAN_TASK] Error scanning project {project_id}: {str(e)}")
-            # Update project with error
-            stmt = select(Project).where(Project.id == project_id)
-            result = await db.execute(stmt)
-            project = result.scalar_one_or_none()
-            if project:
-                project.status = ProjectStatus.ERROR.value
-                project.error_message = f"Scan failed: {str(e)}"
-                project.scan_progress = 0
-                await db.commit()
-
-    await engine.dispose()
-    logger.info(f"[SCAN_TASK] Scan task completed for project_id={project_id}")
-
-
 @router.post("/{project_id}/scan", response_model=ProjectResponse)
 async def start_scan(
     project_id: str,
-    background_tasks: BackgroundTasks,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Start a project scan for stack detection, file analysis, and health check.
 
-    This will trigger a background job to:
+    This will submit a scan job, run in a worker process, to:
     1. Detect technology stack (frameworks, versions, packages)
     2. Scan all files and collect statistics
     3. Run health checks for production readiness
     4. Save issues found during analysis
+
+    The job ID is returned in the ``X-Scan-Job-ID`` header; follow its
+    progress at ``GET /{project_id}/scan/jobs/{job_id}/stream``.
     """
     logger.info(f"[API] POST /projects/{project_id}/scan - user_id={current_user.id}")
 
@@ -1233,7 +1061,11 @@ async def start_scan(
 
     logger.info(f"[API] Project found: {project.repo_full_name}, current status={project.status}")
 
-    if project.status in [ProjectStatus.SCANNING.value, ProjectStatus.ANALYZING.value]:
+    scan_runner = get_scan_job_runner()
+    if (
+        project.status in [ProjectStatus.SCANNING.value, ProjectStatus.ANALYZING.value]
+        or scan_runner.is_active(project_id)
+    ):
         logger.warning(f"[API] Project {project_id} is already being scanned")
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -1263,12 +1095,10 @@ async def start_scan(
     await db.refresh(project)
     logger.info(f"[API] Project status updated to SCANNING")
 
-    # Trigger background scan job
-    logger.info(f"[API] Triggering background scan task for project_id={project.id}")
-    background_tasks.add_task(
-        scan_project_task,
-        str(project.id),
-    )
+    # Submit the scan to the worker pool
+    job = await scan_runner.submit(str(current_user.id), str(project.id))
+    response.headers["X-Scan-Job-ID"] = job.id
+    logger.info(f"[API] Submitted scan job={job.id} for project_id={project.id}")
 
     logger.info(f"[API] POST /projects/{project_id}/scan completed")
     return project
@@ -1326,6 +1156,142 @@ async def get_scan_status(
     )
 
 
+@router.get("/{project_id}/scan/files/stats")
+async def get_scan_file_stats(
+    project_id: str,
+    top: int = Query(20, ge=1, le=500, description="Number of largest files to return"),
+    by: str = Query("lines", pattern="^(lines|size)$", description="Column the largest files are ranked by"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get file statistics computed from the last scan's per-file columns.
+
+    Returns totals, counts and line sums per categorical column, the
+    largest files, and size and line-count histograms.
+    """
+    logger.debug(f"[API] GET /projects/{project_id}/scan/files/stats - user_id={current_user.id}")
+
+    stmt = select(Project.scan_columns).where(
+        Project.id == project_id,
+        Project.user_id == current_user.id,
+    )
+    data = (await db.execute(stmt)).scalar_one_or_none()
+
+    if not data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No file statistics found. Run a scan first.",
+        )
+
+    return ScanColumns.from_bytes(data).summary(top=top, by=by)
+
+
+async def _get_scan_job(project_id: str, job_id: str, db: AsyncSession, user: User) -> ScanJob:
+    """The user's scan job for this project, or 404."""
+    stmt = select(ScanJob).where(
+        ScanJob.id == job_id,
+        ScanJob.project_id == project_id,
+        ScanJob.user_id == user.id,
+    )
+    result = await db.execute(stmt)
+    job = result.scalar_one_or_none()
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scan job not found.",
+        )
+    return job
+
+
+def _scan_job_dict(job: ScanJob) -> dict:
+    return {
+        "id": job.id,
+        "project_id": job.project_id,
+        "status": job.status,
+        "progress": job.progress,
+        "message": job.message,
+        "error": job.error,
+        "host": job.host,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+@router.get("/{project_id}/scan/jobs/{job_id}")
+async def get_scan_job(
+    project_id: str,
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the status of a scan job."""
+    job = await _get_scan_job(project_id, job_id, db, current_user)
+    return _scan_job_dict(job)
+
+
+@router.post("/{project_id}/scan/jobs/{job_id}/cancel")
+async def cancel_scan_job(
+    project_id: str,
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Cancel a queued or running scan job.
+
+    A running scan stops at its next progress report; the outcome is
+    streamed to the job's event stream.
+    """
+    logger.info(f"[API] POST /projects/{project_id}/scan/jobs/{job_id}/cancel - user_id={current_user.id}")
+    job = await _get_scan_job(project_id, job_id, db, current_user)
+
+    if job.status not in [ScanJobStatus.QUEUED.value, ScanJobStatus.RUNNING.value]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Scan job is already {job.status}.",
+        )
+
+    if not await get_scan_job_runner().cancel(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Scan job is running on another worker.",
+        )
+
+    return {"id": job_id, "cancelled": True}
+
+
+@router.get("/{project_id}/scan/jobs/{job_id}/stream")
+async def stream_scan_job(
+    project_id: str,
+    job_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Follow a scan job's progress over SSE.
+
+    Replays every event after the ``Last-Event-ID`` header, then follows
+    the job until it completes, fails or is cancelled.
+    """
+    await _get_scan_job(project_id, job_id, db, current_user)
+
+    if not await get_scan_event_log().exists(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No stream available for this scan job.",
+        )
+
+    return StreamingResponse(
+        tail_scan_events(job_id, parse_last_event_id(last_event_id)),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
 @router.get("/{project_id}/issues", response_model=List[ProjectIssueResponse])
 async def get_project_issues(
     project_id: str,
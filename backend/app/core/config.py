@@ -99,6 +99,36 @@ class Settings(BaseSettings):
     prompt_caching_enabled: bool = True
     prompt_cache_min_tokens: int = 1024  # Minimum tokens to cache
 
+    # Response Memoisation (deterministic calls answered from memory)
+    claude_memo_enabled: bool = True
+    claude_memo_ttl_seconds: int = 600
+    claude_memo_max_entries: int = 512
+
+    # Plan Approval (memory: single worker; redis: shared across workers)
+    plan_approval_backend: str = "memory"
+    plan_approval_ttl_seconds: int = 600
+
+    # Chat Event Log (replay on reconnect; memory: single worker, redis: shared)
+    chat_event_log_backend: str = "memory"
+    chat_event_log_max_events: int = 1000
+    chat_event_log_ttl_seconds: int = 3600
+    chat_sse_heartbeat_seconds: int = 15  # Keepalive only after this long without events
+
+    # Chat Job Runner (pipelines run in the background, bounded per worker)
+    chat_job_pool_size: int = 8
+    chat_job_max_per_user: int = 2
+    chat_job_max_per_project: int = 2
+    chat_job_stale_after_seconds: int = 3600  # Running longer than this after a restart = interrupted
+
+    # File snapshot (file bytes shared by indexing, scanning and health checks)
+    file_snapshot_max_bytes: int = 256 * 1024 * 1024
+    file_snapshot_max_file_bytes: int = 2 * 1024 * 1024  # Larger files are read through, never cached
+    scan_walker_workers: int = 8  # Threads for listing, stat, hashing and line counts during scans
+
+    # Scan Job Runner (scans run in worker processes, progress over the scan event log)
+    scan_job_max_per_host: int = 2  # Scans running at once on this host, across API processes
+    scan_job_lease_seconds: int = 60  # Running job whose lease was not renewed for this long = interrupted
+
     # Subagents
     subagents_enabled: bool = True
     subagents_enable_caching: bool = True
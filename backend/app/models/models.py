@@ -10,7 +10,7 @@ from app.models.github_models import GitHubIssue, GitHubAction, GitHubProject, G
 from app.models.team_models import Team, TeamMember
 from sqlalchemy import (
     Boolean, DateTime, ForeignKey, Integer, String, Text,
-    Enum as SQLEnum, Index, JSON, Float, Numeric, Date
+    Enum as SQLEnum, Index, JSON, Float, Numeric, Date, LargeBinary, text
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -135,10 +135,15 @@ class Project(Base):
     # Stack Detection (detected framework, versions, packages)
     stack: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     # Example: {"backend": {"framework": "laravel", "version": "12.0"}, "frontend": {"framework": "vue", "version": "3.5"}}
+    # Fingerprint of the files detection read; unchanged inputs reuse the stored stack
+    stack_fingerprint: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
 
     # File Statistics
     file_stats: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     # Example: {"total_files": 1020, "total_lines": 150000, "by_type": {...}, "by_category": {...}}
+    # Per-file path, size, lines and type codes in ScanColumns.to_bytes() form;
+    # deferred so project loads don't pull it in
+    scan_columns: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, deferred=True)
 
     # Structure Analysis
     structure: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
@@ -287,6 +292,9 @@ class Conversation(Base):
 
     title: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
+    # Serialized ConversationSummary (see app/agents/orchestrator_context.py)
+    summary_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow
@@ -466,6 +474,9 @@ class ProjectIssue(Base):
     suggestion: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     auto_fixable: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    # Hash of (file, line, rule) for scanner issues, so re-scans upsert them
+    signature: Mapped[Optional[str]] = mapped_column(String(40), nullable=True)
+
     # Status tracking
     status: Mapped[str] = mapped_column(
         String(20), default=IssueStatus.OPEN.value
@@ -485,6 +496,7 @@ class ProjectIssue(Base):
     __table_args__ = (
         Index("ix_project_issues_project_category", "project_id", "category"),
         Index("ix_project_issues_severity", "severity"),
+        Index("uq_project_issues_signature", "project_id", "signature", unique=True),
     )
 
 
@@ -629,4 +641,121 @@ class AIUsageSummary(Base):
             "user_id", "date", "provider", "model",
             unique=True
         ),
-    )
\ No newline at end of file
+    )
+
+class ChatJobStatus(str, Enum):
+    """Lifecycle of a background chat pipeline."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    INTERRUPTED = "interrupted"  # Worker stopped while the job was running
+
+
+class ChatJob(Base):
+    """
+    A chat pipeline run submitted to the background job runner.
+
+    The record outlives the HTTP request (and the worker), so queued work
+    is picked up again after a restart and clients can look up the outcome.
+    """
+
+    __tablename__ = "chat_jobs"
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), primary_key=True, default=generate_uuid
+    )
+    user_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), ForeignKey("users.id", ondelete="CASCADE")
+    )
+    project_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), ForeignKey("projects.id", ondelete="CASCADE")
+    )
+    conversation_id: Mapped[str] = mapped_column(UUID(as_uuid=False))
+
+    kind: Mapped[str] = mapped_column(String(20))  # interactive, question, action
+    status: Mapped[str] = mapped_column(
+        String(20), default=ChatJobStatus.QUEUED.value
+    )
+
+    # Everything needed to (re)start the pipeline
+    payload: Mapped[dict] = mapped_column(JSON, default=dict)
+    # e.g., {"message": "...", "require_plan_approval": true, "fast_mode": null}
+
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_chat_jobs_status", "status"),
+        Index("ix_chat_jobs_user_status", "user_id", "status"),
+        Index("ix_chat_jobs_conversation", "conversation_id"),
+        # One queued or running job per conversation, across workers
+        Index(
+            "uq_chat_jobs_active_conversation",
+            "conversation_id",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+
+class ScanJobStatus(str, Enum):
+    """Lifecycle of a project scan run in the scan worker pool."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    INTERRUPTED = "interrupted"  # Worker stopped while the job was running
+
+
+class ScanJob(Base):
+    """
+    A project scan submitted to the scan job runner.
+
+    Progress is mirrored here so clients that missed the SSE stream can
+    still see how far a scan got and how it ended.
+    """
+
+    __tablename__ = "scan_jobs"
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), primary_key=True, default=generate_uuid
+    )
+    user_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), ForeignKey("users.id", ondelete="CASCADE")
+    )
+    project_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), ForeignKey("projects.id", ondelete="CASCADE")
+    )
+
+    status: Mapped[str] = mapped_column(
+        String(20), default=ScanJobStatus.QUEUED.value
+    )
+    progress: Mapped[int] = mapped_column(Integer, default=0)
+    message: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Host whose worker pool ran the scan
+    host: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # Lease renewed by the API process running the scan
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_scan_jobs_status", "status"),
+        Index("ix_scan_jobs_project_status", "project_id", "status"),
+        Index("ix_scan_jobs_host_status", "host", "status"),
+    )
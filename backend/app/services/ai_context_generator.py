@@ -9,6 +9,8 @@ import os
 import json
 from typing import Dict, Any, Optional, List
 
+from app.services.file_snapshot import FileSnapshot, get_file_snapshot
+
 
 class AIContextGenerator:
     """Generate CLAUDE.md and AI context - INTERNAL USE ONLY."""
@@ -19,8 +21,10 @@ class AIContextGenerator:
         stack: dict,
         file_stats: dict,
         structure: dict,
+        snapshot: Optional[FileSnapshot] = None,
     ):
         self.path = project_path
+        self.snapshot = snapshot or get_file_snapshot(project_path)
         self.stack = stack or {}
         self.file_stats = file_stats or {}
         self.structure = structure or {}
@@ -186,8 +190,9 @@ class AIContextGenerator:
     def _analyze_model(self, model_path: str) -> Optional[Dict[str, Any]]:
         """Analyze a model file for key information."""
         try:
-            with open(model_path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
+            content = self.snapshot.read_text(model_path)
+            if content is None:
+                return None
 
             info = {
                 "file": model_path.replace(self.path + "/", ""),
@@ -223,8 +228,9 @@ class AIContextGenerator:
     def _analyze_routes(self, route_path: str) -> Dict[str, Any]:
         """Analyze a route file for key information."""
         try:
-            with open(route_path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
+            content = self.snapshot.read_text(route_path)
+            if content is None:
+                return {}
 
             import re
 
@@ -377,14 +383,7 @@ class AIContextGenerator:
 
     def _read_file(self, filename: str) -> Optional[str]:
         """Read a text file."""
-        filepath = os.path.join(self.path, filename)
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                    return f.read()
-            except Exception:
-                return None
-        return None
+        return self.snapshot.read_text(filename)
 
     def _file_exists(self, filename: str) -> bool:
         """Check if a file exists."""
@@ -10,6 +10,7 @@ from enum import Enum
 from anthropic import Anthropic, AsyncAnthropic
 
 from app.core.config import settings
+from app.services.response_memo import get_response_memo
 
 if TYPE_CHECKING:
     from app.services.usage_tracker import UsageTracker
@@ -38,6 +39,25 @@ class ClaudeModel(str, Enum):
     HAIKU = "claude-haiku-4-5-20251001"
 
 
+def prefixed_user_message(prefix: Optional[str], content: str) -> dict:
+    """
+    Build a user message whose leading block is marked for prompt caching.
+
+    The prefix must be byte-stable across requests (e.g. the per-project
+    Laravel profile) so the cached system prompt + prefix is reused and only
+    the request-specific content is billed at full rate.
+    """
+    if not prefix:
+        return {"role": "user", "content": content}
+    return {
+        "role": "user",
+        "content": [
+            {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": content},
+        ],
+    }
+
+
 class ClaudeService:
     """
     Wrapper for Anthropic's Claude API.
@@ -279,6 +299,8 @@ class ClaudeService:
         temperature: float = 0.7,
         request_type: str = "chat",
         use_cache: bool = True,
+        memoize: Optional[bool] = None,
+        schema: Optional[dict] = None,
     ) -> str:
         """
         Send an async chat request and get a response with automatic tracking.
@@ -291,11 +313,27 @@ class ClaudeService:
             temperature: Sampling temperature (0-1)
             request_type: Type of request for tracking (intent, planning, execution, validation, chat)
             use_cache: Enable prompt caching for system prompt (default: True)
+            memoize: Answer identical requests from the response memo.
+                None (default) memoises temperature-0 calls only; False opts out.
+            schema: Optional JSON schema the response follows (part of the memo key)
 
         Returns:
             The assistant's response text
         """
         model_id = model.value if isinstance(model, ClaudeModel) else model
+
+        # Identical deterministic requests are answered without an API call
+        memo_key = None
+        if memoize is None:
+            memoize = temperature == 0
+        if memoize and settings.claude_memo_enabled:
+            memo = get_response_memo()
+            memo_key = memo.make_key(model_id, system, messages, schema)
+            memoised = memo.get(memo_key)
+            if memoised is not None:
+                logger.info(f"[CLAUDE] Memoised response - model={model_id}, type={request_type}")
+                return memoised
+
         logger.info(f"[CLAUDE] Async chat request - model={model_id}, messages={len(messages)}, type={request_type}, cache={use_cache}")
 
         start_time = time.time()
@@ -342,6 +380,9 @@ class ClaudeService:
 
             logger.info(f"[CLAUDE] Response received - tokens: input={input_tokens}, output={output_tokens}, cache_read={cache_read_input_tokens}, cache_write={cache_creation_input_tokens}")
 
+            if memo_key:
+                get_response_memo().set(memo_key, content)
+
             return content
 
         except Exception as e:
@@ -0,0 +1,331 @@
+"""
+Chat Event Log.
+
+Every SSE event a chat pipeline produces is appended to a bounded log keyed
+by conversation, with monotonically increasing integer IDs. The HTTP
+response only tails that log, so a client that drops can reconnect with
+``Last-Event-ID``, get the events it missed and keep following the run
+that is still in progress.
+
+- InMemoryEventLog: ring buffer per conversation (single worker, tests)
+- RedisEventLog: one Redis stream per conversation, shared by all workers
+
+Scan jobs stream their progress through a second log of the same backend,
+keyed by job ID.
+"""
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+try:
+    import redis.asyncio as aioredis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoggedEvent:
+    """An SSE event string with its position in the log."""
+    id: int
+    data: str
+
+    def to_sse(self) -> str:
+        """Format with an ``id:`` line so the browser tracks Last-Event-ID."""
+        return f"id: {self.id}\n{self.data}"
+
+
+def parse_last_event_id(value: Optional[str]) -> int:
+    """Parse a Last-Event-ID header; anything unusable means 'from the start'."""
+    try:
+        return max(int(value), 0) if value else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+class EventLog(ABC):
+    """
+    Bounded, replayable event log per conversation.
+
+    A run calls ``begin`` (drops the previous run's events, IDs keep
+    increasing), ``append`` for each event and ``end`` when finished.
+    Readers use ``subscribe`` to replay and then follow the run.
+    """
+
+    def __init__(self, max_events: int = 1000, ttl_seconds: int = 3600):
+        self.max_events = max_events
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    async def begin(self, key: str) -> None:
+        """Start a new run for this key."""
+
+    @abstractmethod
+    async def append(self, key: str, data: str) -> int:
+        """Append an event and return its ID."""
+
+    @abstractmethod
+    async def end(self, key: str) -> None:
+        """Mark the current run as finished and wake readers."""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Whether a run (finished or not) is retained for this key."""
+
+    @abstractmethod
+    async def read(self, key: str, after_id: int) -> Tuple[List[LoggedEvent], bool]:
+        """Events with ID > after_id, and whether the run has ended."""
+
+    @abstractmethod
+    async def wait(self, key: str, after_id: int, timeout: float) -> bool:
+        """Wait for an event newer than after_id or the end of the run; False on timeout."""
+
+    async def subscribe_batches(
+        self,
+        key: str,
+        after_id: int = 0,
+        idle_timeout: float = 15.0,
+    ) -> AsyncIterator[List[LoggedEvent]]:
+        """
+        Replay events after ``after_id`` and follow the run until it ends.
+
+        Yields everything available per wake-up as one batch; an empty batch
+        means nothing was logged for ``idle_timeout`` seconds.
+        """
+        while True:
+            events, ended = await self.read(key, after_id)
+            if events:
+                after_id = events[-1].id
+                yield events
+                continue
+            if ended:
+                return
+            if not await self.wait(key, after_id, idle_timeout):
+                yield []
+
+    async def subscribe(self, key: str, after_id: int = 0) -> AsyncIterator[LoggedEvent]:
+        """Replay events after ``after_id`` and follow the run until it ends."""
+        async for batch in self.subscribe_batches(key, after_id):
+            for event in batch:
+                yield event
+
+
+# =============================================================================
+# IN-MEMORY BACKEND
+# =============================================================================
+
+@dataclass
+class _MemoryRun:
+    """State of one conversation's log."""
+    events: Deque[LoggedEvent]
+    last_id: int = 0
+    ended: bool = False
+    ended_at: float = 0.0
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def notify(self) -> None:
+        # Wake everyone waiting on the current event, then hand out a fresh one
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+
+class InMemoryEventLog(EventLog):
+    """Ring buffer per conversation; finished runs are dropped after the TTL."""
+
+    def __init__(self, max_events: int = 1000, ttl_seconds: int = 3600):
+        super().__init__(max_events, ttl_seconds)
+        self._runs: Dict[str, _MemoryRun] = {}
+
+    def _evict_expired(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [k for k, run in self._runs.items() if run.ended and run.ended_at < cutoff]
+        for key in expired:
+            del self._runs[key]
+
+    async def begin(self, key: str) -> None:
+        self._evict_expired()
+        run = self._runs.get(key)
+        if run is None:
+            self._runs[key] = _MemoryRun(events=deque(maxlen=self.max_events))
+            return
+        run.events.clear()
+        run.ended = False
+        run.notify()
+
+    async def append(self, key: str, data: str) -> int:
+        run = self._runs.get(key)
+        if run is None:
+            run = self._runs[key] = _MemoryRun(events=deque(maxlen=self.max_events))
+        run.last_id += 1
+        run.events.append(LoggedEvent(id=run.last_id, data=data))
+        run.notify()
+        return run.last_id
+
+    async def end(self, key: str) -> None:
+        run = self._runs.get(key)
+        if run is None:
+            return
+        run.ended = True
+        run.ended_at = time.monotonic()
+        run.notify()
+
+    async def exists(self, key: str) -> bool:
+        return key in self._runs
+
+    async def read(self, key: str, after_id: int) -> Tuple[List[LoggedEvent], bool]:
+        run = self._runs.get(key)
+        if run is None:
+            return [], True
+        if not run.events:
+            return [], run.ended
+        # IDs in the ring are contiguous, so the offset is arithmetic
+        start = max(after_id - run.events[0].id + 1, 0)
+        return list(islice(run.events, start, None)), run.ended
+
+    async def wait(self, key: str, after_id: int, timeout: float) -> bool:
+        run = self._runs.get(key)
+        if run is None or run.ended:
+            return True
+        # Only a retained newer event counts: after begin() the counter has
+        # moved past after_id while the ring is still empty
+        if run.events and run.events[-1].id > after_id:
+            return True
+        try:
+            await asyncio.wait_for(run.changed.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+# =============================================================================
+# REDIS BACKEND
+# =============================================================================
+
+class RedisEventLog(EventLog):
+    """
+    One Redis stream per conversation, trimmed with MAXLEN.
+
+    Entry IDs are ``<n>-0`` where n comes from a per-conversation counter,
+    so the SSE id and the stream id are the same number. The run state
+    lives in its own key; ``end`` also adds a marker entry so blocked
+    XREADs wake up immediately.
+    """
+
+    KEY_PREFIX = "chat_events"
+
+    def __init__(
+        self,
+        redis_url: str,
+        max_events: int = 1000,
+        ttl_seconds: int = 3600,
+        key_prefix: Optional[str] = None,
+    ):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("redis package is required for the Redis event log")
+        super().__init__(max_events, ttl_seconds)
+        self.redis = aioredis.from_url(redis_url, decode_responses=True)
+        self.key_prefix = key_prefix or self.KEY_PREFIX
+
+    def _stream_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}:stream"
+
+    def _seq_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}:seq"
+
+    def _state_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}:state"
+
+    async def begin(self, key: str) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._stream_key(key))
+            pipe.set(self._state_key(key), "open", ex=self.ttl_seconds)
+            pipe.expire(self._seq_key(key), self.ttl_seconds)
+            await pipe.execute()
+
+    async def _add(self, key: str, fields: dict) -> int:
+        event_id = await self.redis.incr(self._seq_key(key))
+        stream = self._stream_key(key)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xadd(stream, fields, id=f"{event_id}-0", maxlen=self.max_events, approximate=True)
+            pipe.expire(stream, self.ttl_seconds)
+            pipe.expire(self._seq_key(key), self.ttl_seconds)
+            await pipe.execute()
+        return event_id
+
+    async def append(self, key: str, data: str) -> int:
+        return await self._add(key, {"data": data})
+
+    async def end(self, key: str) -> None:
+        await self.redis.set(self._state_key(key), "ended", ex=self.ttl_seconds)
+        await self._add(key, {"end": "1"})
+
+    async def exists(self, key: str) -> bool:
+        return bool(await self.redis.exists(self._state_key(key)))
+
+    async def read(self, key: str, after_id: int) -> Tuple[List[LoggedEvent], bool]:
+        entries = await self.redis.xrange(self._stream_key(key), min=f"{after_id + 1}-0", max="+")
+        state = await self.redis.get(self._state_key(key))
+        events = [
+            LoggedEvent(id=int(entry_id.split("-", 1)[0]), data=fields["data"])
+            for entry_id, fields in entries
+            if "data" in fields
+        ]
+        # A missing state key means the run expired (or its worker died long ago)
+        return events, state != "open"
+
+    async def wait(self, key: str, after_id: int, timeout: float) -> bool:
+        entries = await self.redis.xread(
+            {self._stream_key(key): f"{after_id}-0"},
+            count=1,
+            block=max(int(timeout * 1000), 1),
+        )
+        return bool(entries)
+
+
+def _create_event_log(key_prefix: str) -> EventLog:
+    """Event log with the configured backend and limits."""
+    if settings.chat_event_log_backend == "redis":
+        return RedisEventLog(
+            settings.redis_url,
+            max_events=settings.chat_event_log_max_events,
+            ttl_seconds=settings.chat_event_log_ttl_seconds,
+            key_prefix=key_prefix,
+        )
+    return InMemoryEventLog(
+        max_events=settings.chat_event_log_max_events,
+        ttl_seconds=settings.chat_event_log_ttl_seconds,
+    )
+
+
+# Singleton instances
+_chat_event_log: Optional[EventLog] = None
+_scan_event_log: Optional[EventLog] = None
+
+
+def get_chat_event_log() -> EventLog:
+    """Get or create the configured chat event log."""
+    global _chat_event_log
+    if _chat_event_log is None:
+        _chat_event_log = _create_event_log(RedisEventLog.KEY_PREFIX)
+        logger.info(f"[EVENT_LOG] Using {type(_chat_event_log).__name__}")
+    return _chat_event_log
+
+
+def get_scan_event_log() -> EventLog:
+    """Get or create the event log for scan job progress, keyed by job ID."""
+    global _scan_event_log
+    if _scan_event_log is None:
+        _scan_event_log = _create_event_log("scan_events")
+        logger.info(f"[EVENT_LOG] Using {type(_scan_event_log).__name__} for scan jobs")
+    return _scan_event_log
@@ -7,7 +7,9 @@ Categorizes files by type and purpose.
 import os
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Callable
-from collections import defaultdict
+
+from app.services.file_snapshot import FileSnapshot, get_file_snapshot
+from app.services.scan_columns import ScanColumns, ScanColumnsBuilder
 
 
 class FileScanner:
@@ -131,30 +133,43 @@ class FileScanner:
         ".env": "env",
     }
 
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, snapshot: Optional[FileSnapshot] = None):
         self.path = project_path
-        self.files: List[Dict[str, Any]] = []
-        self.stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"count": 0, "lines": 0})
-        self.categories: Dict[str, int] = defaultdict(int)
+        self.snapshot = snapshot or get_file_snapshot(project_path)
+        # One row per file: path, size, lines and type/category codes
+        self.builder = ScanColumnsBuilder(("type", "category"))
+        self.columns: Optional[ScanColumns] = None
+        self.categories: Dict[str, int] = {}
         self.directories: List[str] = []
 
     def scan(self, progress_callback: Optional[Callable[[int, str], None]] = None) -> Dict[str, Any]:
         """Run full scan."""
         self._scan_directory(self.path, progress_callback)
 
-        # Calculate summary
-        total_files = len(self.files)
-        total_lines = sum(f["lines"] for f in self.files)
+        # Calculate summary over the columns
+        files = self.columns = self.builder.build()
+        self.categories = files.count_by("category")
+        lines_by_type = files.sum_by("type", "lines")
 
         return {
-            "total_files": total_files,
-            "total_lines": total_lines,
-            "by_type": dict(self.stats),
-            "by_category": dict(self.categories),
+            "total_files": len(files),
+            "total_lines": files.total("lines"),
+            "by_type": {
+                file_type: {"count": count, "lines": lines_by_type[file_type]}
+                for file_type, count in files.count_by("type").items()
+            },
+            "by_category": self.categories,
             "directories": self.directories[:100],  # Top 100 directories
-            "largest_files": sorted(
-                self.files, key=lambda x: x.get("lines", 0), reverse=True
-            )[:20],  # Top 20 largest files
+            "largest_files": [
+                {
+                    "path": f["path"],
+                    "type": f["type"],
+                    "lines": f["lines"],
+                    "category": f["category"],
+                    "size": f["size"],
+                }
+                for f in files.largest(20, by="lines")
+            ],  # Top 20 largest files
         }
 
     def _scan_directory(
@@ -194,16 +209,15 @@ class FileScanner:
             if os.path.isdir(entry_path):
                 self._scan_directory(entry_path, progress_callback, depth + 1)
             else:
-                file_info = self._analyze_file(entry_path, rel_path)
-                if file_info:
-                    self.files.append(file_info)
-
+                path_id = self._analyze_file(entry_path, rel_path)
+                if path_id is not None:
                     # Progress callback
-                    if progress_callback and len(self.files) % 100 == 0:
-                        progress_callback(len(self.files), f"Scanned {len(self.files)} files...")
+                    scanned = path_id + 1
+                    if progress_callback and scanned % 100 == 0:
+                        progress_callback(scanned, f"Scanned {scanned} files...")
 
-    def _analyze_file(self, filepath: str, rel_path: str) -> Optional[Dict[str, Any]]:
-        """Analyze a single file."""
+    def _analyze_file(self, filepath: str, rel_path: str) -> Optional[int]:
+        """Analyze a single file and return its path ID."""
         ext = Path(filepath).suffix.lower()
 
         # Handle .blade.php
@@ -215,36 +229,14 @@ class FileScanner:
         if not file_type:
             return None
 
-        # Count lines
-        lines = 0
-        try:
-            with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                lines = sum(1 for _ in f)
-        except Exception:
-            pass
-
-        # Get file size
-        try:
-            size = os.path.getsize(filepath)
-        except Exception:
-            size = 0
-
-        # Update stats
-        self.stats[file_type]["count"] += 1
-        self.stats[file_type]["lines"] += lines
+        # Count lines and get file size
+        lines = self.snapshot.line_count(filepath)
+        size = self.snapshot.size(filepath) or 0
 
         # Categorize
         category = self._categorize_file(rel_path, file_type)
-        if category:
-            self.categories[category] += 1
 
-        return {
-            "path": rel_path,
-            "type": file_type,
-            "lines": lines,
-            "category": category,
-            "size": size,
-        }
+        return self.builder.append(rel_path, size, lines, type=file_type, category=category)
 
     def _categorize_file(self, rel_path: str, file_type: str) -> Optional[str]:
         """Categorize file based on path."""
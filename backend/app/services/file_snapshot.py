@@ -0,0 +1,264 @@
+"""
+File Snapshot.
+
+One project onboarding reads the same files many times: the indexer hashes,
+reads and parses them, the scanners count lines and run checks, and stack
+detection, health checks and AI context generation each re-read
+composer.json, package.json and config files. FileSnapshot gives all of
+them one cached view of a clone.
+
+Entries are keyed by (mtime_ns, size) from a stat, so a file that changed
+is re-read and everything derived from it (hash, line count) recomputed.
+File bytes live in one process-wide LRU with a byte cap; the small derived
+values outlive evicted bytes for as long as the file is unchanged.
+"""
+import hashlib
+import json
+import logging
+import os
+import stat
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    """What is known about one file at one (mtime_ns, size)."""
+    key: Tuple[int, int]
+    data: Optional[bytes] = None
+    sha256: Optional[str] = None
+    blob_id: Optional[str] = None
+    lines: Optional[int] = None
+
+
+class _ContentCache:
+    """LRU of file entries keyed by absolute path, capped by cached bytes."""
+
+    def __init__(self, max_bytes: int, max_file_bytes: int, max_entries: int = 200_000):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # The entries that hold bytes, least recently used first
+        self._loaded: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cached_bytes(self) -> int:
+        return self._bytes
+
+    def entry(self, path: str) -> Optional[_Entry]:
+        """Current entry for the file, or None if it cannot be stat'ed."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.key == key:
+                self._entries.move_to_end(path)
+                if entry.data is not None:
+                    self._loaded.move_to_end(path)
+                return entry
+            if entry is not None:
+                self._unload(path, entry)
+            entry = self._entries[path] = _Entry(key=key)
+            while len(self._entries) > self.max_entries:
+                old_path, old = self._entries.popitem(last=False)
+                self._unload(old_path, old)
+            return entry
+
+    def data(self, path: str, entry: _Entry) -> Optional[bytes]:
+        """File bytes for the entry, read from disk on a miss."""
+        if entry.data is not None:
+            self.hits += 1
+            return entry.data
+
+        self.misses += 1
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        if len(data) <= self.max_file_bytes:
+            with self._lock:
+                if entry.data is None and self._entries.get(path) is entry:
+                    entry.data = data
+                    self._loaded[path] = entry
+                    self._bytes += len(data)
+                    self._evict()
+        return data
+
+    def _unload(self, path: str, entry: _Entry) -> None:
+        if entry.data is not None:
+            self._bytes -= len(entry.data)
+            entry.data = None
+            self._loaded.pop(path, None)
+
+    def _evict(self) -> None:
+        """Drop the bytes of least recently used files until under the cap."""
+        while self._bytes > self.max_bytes and self._loaded:
+            _, entry = self._loaded.popitem(last=False)
+            self._bytes -= len(entry.data)
+            entry.data = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._loaded.clear()
+            self._bytes = 0
+
+
+class FileSnapshot:
+    """
+    Cached, change-aware view of the files under one clone.
+
+    Paths may be relative to the root or absolute. Every read returns None
+    (or "" for hashes, 0 for line counts) when the file is missing or
+    unreadable, like the helpers it replaces.
+    """
+
+    def __init__(self, root: str, cache: Optional[_ContentCache] = None):
+        self.root = root
+        self._cache = cache or get_content_cache()
+
+    def _path(self, path: str) -> str:
+        return os.path.join(self.root, path)
+
+    def size(self, path: str) -> Optional[int]:
+        entry = self._cache.entry(self._path(path))
+        return entry.key[1] if entry else None
+
+    def read_bytes(self, path: str) -> Optional[bytes]:
+        full_path = self._path(path)
+        entry = self._cache.entry(full_path)
+        if entry is None:
+            return None
+        return self._cache.data(full_path, entry)
+
+    def read_text(self, path: str, errors: str = "ignore") -> Optional[str]:
+        """Decoded UTF-8 with universal newlines, as ``open(path, "r")`` reads it."""
+        data = self.read_bytes(path)
+        if data is None:
+            return None
+        try:
+            text = data.decode("utf-8", errors=errors)
+        except UnicodeDecodeError:
+            return None
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+
+    def read_json(self, path: str) -> Optional[Any]:
+        """Parsed JSON, or None if missing, not UTF-8 or invalid."""
+        text = self.read_text(path, errors="strict")
+        if text is None:
+            return None
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
+
+    def sha256(self, path: str) -> str:
+        full_path = self._path(path)
+        entry = self._cache.entry(full_path)
+        if entry is None:
+            return ""
+        if entry.sha256 is None:
+            data = self._cache.data(full_path, entry)
+            if data is None:
+                return ""
+            entry.sha256 = hashlib.sha256(data).hexdigest()
+        return entry.sha256
+
+    def git_blob_id(self, path: str) -> str:
+        """The object ID git would give the file's bytes (``git hash-object``, no filters)."""
+        full_path = self._path(path)
+        entry = self._cache.entry(full_path)
+        if entry is None:
+            return ""
+        if entry.blob_id is None:
+            data = self._cache.data(full_path, entry)
+            if data is None:
+                return ""
+            entry.blob_id = git_blob_id(data)
+        return entry.blob_id
+
+    def line_count(self, path: str) -> int:
+        """Lines as counted by iterating the file in text mode."""
+        entry = self._cache.entry(self._path(path))
+        if entry is None:
+            return 0
+        if entry.lines is None:
+            text = self.read_text(path)
+            if text is None:
+                return 0
+            entry.lines = text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+        return entry.lines
+
+    def path_kind(self, path: str) -> str:
+        """"dir", "file" or "" for a missing path."""
+        try:
+            mode = os.stat(self._path(path)).st_mode
+        except OSError:
+            return ""
+        return "dir" if stat.S_ISDIR(mode) else "file"
+
+    def input_fingerprint(
+        self,
+        version: int,
+        files: Iterable[str] = (),
+        paths: Iterable[str] = (),
+        **values: Any,
+    ) -> str:
+        """
+        Short hash of the content of ``files``, the kinds of ``paths`` and any
+        extra JSON-serialisable ``values``, for skipping work whose inputs
+        have not changed since the last run.
+        """
+        values.update(
+            version=version,
+            files=[self.git_blob_id(filename) for filename in files],
+            paths=[self.path_kind(path) for path in paths],
+        )
+        encoded = json.dumps(values, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def git_blob_id(data: bytes) -> str:
+    """SHA-1 of a git blob header plus the content."""
+    digest = hashlib.sha1(b"blob %d\0" % len(data))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+# Singleton instance
+_content_cache: Optional[_ContentCache] = None
+
+
+def get_content_cache() -> _ContentCache:
+    """Get or create the process-wide file content cache."""
+    global _content_cache
+    if _content_cache is None:
+        _content_cache = _ContentCache(
+            max_bytes=settings.file_snapshot_max_bytes,
+            max_file_bytes=settings.file_snapshot_max_file_bytes,
+        )
+    return _content_cache
+
+
+def get_file_snapshot(root: str) -> FileSnapshot:
+    """Snapshot of a clone, backed by the shared content cache."""
+    return FileSnapshot(root)
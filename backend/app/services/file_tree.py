@@ -0,0 +1,177 @@
+"""
+File tree.
+
+Builds the explorer tree for a project from the same listing the scanners
+use (the git index, or a parallel scandir walk outside git), so nothing is
+stat'ed per entry just to sort it. Trees are cached per clone and HEAD
+commit SHA: every change the app makes to a clone is committed, so an
+unchanged SHA means an unchanged tree.
+
+A tree is kept as a directory index, which lets callers expand one
+directory at a time and page through large directories.
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AbstractSet, Dict, List, Optional, Tuple
+
+from app.services.file_walker import FileWalker
+
+logger = logging.getLogger(__name__)
+
+# Extensions shown in the explorer
+TREE_EXTENSIONS = frozenset({
+    'php', 'blade', 'js', 'ts', 'vue', 'jsx', 'tsx', 'css', 'scss',
+    'json', 'yaml', 'yml', 'md', 'env', 'sql',
+})
+# Directories never shown, besides hidden ones
+TREE_SKIP_DIRS = frozenset({'node_modules', 'vendor', '__pycache__'})
+FILE_TREE_CACHE_SIZE = 64
+
+
+@dataclass
+class FileTree:
+    """Explorer tree of one clone at one commit."""
+    sha: Optional[str]
+    # Directory path ("" for the root) -> sorted (name, path, is_directory)
+    directories: Dict[str, List[Tuple[str, str, bool]]]
+
+    def has_directory(self, path: str) -> bool:
+        return path in self.directories
+
+    def nodes(
+        self,
+        path: str = "",
+        depth: Optional[int] = None,
+        indexed_paths: AbstractSet[str] = frozenset(),
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        FileNode dicts for the entries of a directory.
+
+        Directories below ``depth`` levels are returned with ``children``
+        set to None, to be expanded with a later call. ``offset`` and
+        ``limit`` page through the entries of ``path`` itself.
+        """
+        entries = self.directories.get(path, [])
+        end = None if limit is None else offset + limit
+        return [
+            self._node(entry, depth, indexed_paths)
+            for entry in entries[offset:end]
+        ]
+
+    def _node(
+        self,
+        entry: Tuple[str, str, bool],
+        depth: Optional[int],
+        indexed_paths: AbstractSet[str],
+    ) -> dict:
+        name, path, is_directory = entry
+        if not is_directory:
+            return {"name": name, "path": path, "type": "file", "indexed": path in indexed_paths}
+
+        children = None
+        if depth is None or depth > 1:
+            child_depth = None if depth is None else depth - 1
+            children = [self._node(child, child_depth, indexed_paths) for child in self.directories[path]]
+        return {"name": name, "path": path, "type": "directory", "children": children, "indexed": False}
+
+
+def _shown_file(relative_path: str) -> bool:
+    name = relative_path.rsplit("/", 1)[-1]
+    if name.startswith('.') or '.' not in name:
+        return False
+    return name.rsplit('.', 1)[-1].lower() in TREE_EXTENSIONS
+
+
+def _skipped_dir(relative_dir: str) -> bool:
+    name = relative_dir.rsplit("/", 1)[-1]
+    return name.startswith('.') or name in TREE_SKIP_DIRS
+
+
+def build_file_tree(clone_path: str, sha: Optional[str] = None) -> FileTree:
+    """Walk the clone and index its shown files by directory."""
+    walker = FileWalker(clone_path, skip_dir=_skipped_dir)
+    children: Dict[str, Dict[str, bool]] = {"": {}}
+
+    for walked in walker.walk(include=_shown_file):
+        parent = ""
+        parts = walked.relative_path.split("/")
+        for part in parts[:-1]:
+            path = f"{parent}/{part}" if parent else part
+            children[parent][part] = True
+            children.setdefault(path, {})
+            parent = path
+        children[parent][parts[-1]] = False
+
+    directories = {}
+    for directory, entries in children.items():
+        prefix = f"{directory}/" if directory else ""
+        # Directories first, then case-insensitive by name
+        directories[directory] = [
+            (name, prefix + name, is_directory)
+            for name, is_directory in sorted(entries.items(), key=lambda item: (not item[1], item[0].lower()))
+        ]
+    return FileTree(sha=sha, directories=directories)
+
+
+def head_sha(clone_path: str) -> Optional[str]:
+    """HEAD commit SHA of the clone, or None outside git or before the first commit."""
+    if not os.path.exists(os.path.join(clone_path, ".git")):
+        return None
+    try:
+        from git import Repo
+
+        return Repo(clone_path).head.commit.hexsha
+    except Exception as e:
+        logger.debug(f"[FILE_TREE] No HEAD commit for {clone_path}: {e}")
+        return None
+
+
+class _FileTreeCache:
+    """LRU of built trees keyed by (clone path, commit SHA)."""
+
+    def __init__(self, max_size: int = FILE_TREE_CACHE_SIZE):
+        self.max_size = max_size
+        self._trees: "OrderedDict[Tuple[str, str], FileTree]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[FileTree]:
+        with self._lock:
+            tree = self._trees.get(key)
+            if tree is not None:
+                self._trees.move_to_end(key)
+            return tree
+
+    def put(self, key: Tuple[str, str], tree: FileTree) -> None:
+        with self._lock:
+            self._trees[key] = tree
+            self._trees.move_to_end(key)
+            while len(self._trees) > self.max_size:
+                self._trees.popitem(last=False)
+
+
+_tree_cache = _FileTreeCache()
+
+
+def load_file_tree(clone_path: str) -> FileTree:
+    """
+    Cached tree for the clone's current commit.
+
+    Blocking: call it from a worker thread. Clones without a commit are
+    walked on every call.
+    """
+    sha = head_sha(clone_path)
+    if sha is None:
+        return build_file_tree(clone_path)
+
+    key = (clone_path, sha)
+    tree = _tree_cache.get(key)
+    if tree is None:
+        tree = build_file_tree(clone_path, sha)
+        _tree_cache.put(key, tree)
+        logger.info(f"[FILE_TREE] Built tree for {clone_path} at {sha[:8]}: {len(tree.directories)} directories")
+    return tree
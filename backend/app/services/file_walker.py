@@ -0,0 +1,202 @@
+"""
+File walker.
+
+Lists the files of a clone for the scanners. In a git work tree the list
+comes from the index (``git ls-files --cached --others --exclude-standard``),
+so trees matched by .gitignore are never walked at all. Outside git the tree
+is read with ``os.scandir``, one directory level at a time across a thread
+pool, using each DirEntry's type information instead of extra stats.
+
+The same ``git ls-files`` call reports the blob ID of every tracked file.
+Files whose working copy is clean keep that ID, so callers only hash
+untracked or modified files.
+
+Stats, hashing and line counting for the listed files fan out to the same
+pool, which matters most when clones live on network storage.
+"""
+import logging
+import os
+import re
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# One ``git ls-files --stage`` record for a tracked file
+_STAGE_RECORD = re.compile(r"([0-7]{6}) ([0-9a-f]{40,64}) ([0-3])\t(.*)", re.DOTALL)
+
+
+@dataclass
+class WalkedFile:
+    """A regular file found under the walk root."""
+    relative_path: str  # Relative to the root, "/"-separated
+    path: str  # Absolute path
+    size: int
+    mtime: float
+    # Git blob ID from the index when the file is tracked and unmodified
+    blob_id: Optional[str] = None
+
+
+class FileWalker:
+    """
+    Parallel listing of the files under a clone.
+
+    ``skip_dir`` receives a directory's path relative to the root and returns
+    True to leave it (and everything under it) out. ``include`` receives a
+    file's relative path and decides whether it is returned at all, before
+    the file is stat'ed.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        skip_dir: Optional[Callable[[str], bool]] = None,
+        max_workers: Optional[int] = None,
+        use_git: bool = True,
+    ):
+        self.root = os.path.abspath(root)
+        self.skip_dir = skip_dir or (lambda relative_dir: False)
+        self.max_workers = max_workers or settings.scan_walker_workers
+        self.use_git = use_git
+        self.skipped_dirs = 0
+        self.from_git_index = False
+        self._skip_cache: Dict[str, bool] = {}
+        self._blob_ids: Dict[str, str] = {}
+
+    # =========================================================================
+    # LISTING
+    # =========================================================================
+
+    def walk(self, include: Optional[Callable[[str], bool]] = None) -> List[WalkedFile]:
+        """Regular files under the root, sorted by relative path."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            paths = self._list_from_git_index()
+            if paths is None:
+                paths = self._list_with_scandir(pool)
+            else:
+                paths = [p for p in paths if not self._in_skipped_dir(p)]
+
+            if include is not None:
+                paths = [p for p in paths if include(p)]
+            walked = pool.map(self._stat, sorted(paths))
+            return [w for w in walked if w is not None]
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        """Apply fn to every item on the walker's thread pool, keeping order."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(fn, items))
+
+    def _stat(self, relative_path: str) -> Optional[WalkedFile]:
+        path = os.path.join(self.root, relative_path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            # Deleted since listing, outside a sparse checkout, broken link
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return WalkedFile(
+            relative_path=relative_path,
+            path=path,
+            size=st.st_size,
+            mtime=st.st_mtime,
+            blob_id=self._blob_ids.get(relative_path),
+        )
+
+    def _list_from_git_index(self) -> Optional[List[str]]:
+        """Tracked plus untracked, non-ignored files, or None outside git."""
+        if not self.use_git or not os.path.exists(os.path.join(self.root, ".git")):
+            return None
+        try:
+            from git import Repo
+
+            git = Repo(self.root).git
+            # Tracked files come as "<mode> <blob> <stage>\t<path>", untracked as "<path>"
+            listed = git.ls_files(
+                "-z", "--stage", "--cached", "--others", "--exclude-standard",
+                strip_newline_in_stdout=False,
+            )
+            modified = git.ls_files("-z", "--modified", strip_newline_in_stdout=False)
+        except Exception as e:
+            logger.warning(f"[FILE_WALKER] git ls-files failed for {self.root}, walking instead: {e}")
+            return None
+
+        self.from_git_index = True
+        # Unmerged files appear once per stage
+        paths: Dict[str, None] = {}
+        for record in listed.split("\0"):
+            if not record:
+                continue
+            staged = _STAGE_RECORD.match(record)
+            if staged is None:
+                paths[record] = None
+                continue
+            mode, blob_id, stage, path = staged.groups()
+            paths[path] = None
+            # Symlinks and submodules are not blobs of the file's content,
+            # and unmerged files have no stage 0 entry
+            if mode in ("100644", "100755") and stage == "0":
+                self._blob_ids[path] = blob_id
+
+        # Changed in the work tree since it was staged: the index ID is stale
+        for path in modified.split("\0"):
+            self._blob_ids.pop(path, None)
+
+        return list(paths)
+
+    def _list_with_scandir(self, pool: ThreadPoolExecutor) -> List[str]:
+        """Breadth-first scandir, listing each level's directories in parallel."""
+        files: List[str] = []
+        level = [""]
+        while level:
+            next_level: List[str] = []
+            for sub_files, sub_dirs in pool.map(self._scan_dir, level):
+                files.extend(sub_files)
+                for relative_dir in sub_dirs:
+                    if self._in_skipped_dir(relative_dir + "/"):
+                        continue
+                    next_level.append(relative_dir)
+            level = next_level
+        return files
+
+    def _scan_dir(self, relative_dir: str) -> Tuple[List[str], List[str]]:
+        """Files and subdirectories of one directory, as relative paths."""
+        files: List[str] = []
+        dirs: List[str] = []
+        prefix = relative_dir + "/" if relative_dir else ""
+        try:
+            with os.scandir(os.path.join(self.root, relative_dir)) as entries:
+                for entry in entries:
+                    try:
+                        # Like os.walk, symlinked directories are not followed
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.append(prefix + entry.name)
+                        else:
+                            files.append(prefix + entry.name)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"[FILE_WALKER] Cannot list {relative_dir or '.'}: {e}")
+        return files, dirs
+
+    def _in_skipped_dir(self, relative_path: str) -> bool:
+        """Whether any directory above the path is skipped."""
+        parts = relative_path.split("/")[:-1]
+        current = ""
+        for part in parts:
+            current = f"{current}/{part}" if current else part
+            skipped = self._skip_cache.get(current)
+            if skipped is None:
+                skipped = self._skip_cache[current] = bool(self.skip_dir(current))
+                if skipped:
+                    self.skipped_dirs += 1
+            if skipped:
+                return True
+        return False
@@ -3,14 +3,21 @@ Health Checker Service
 
 Checks project health and production readiness.
 Identifies security, performance, architecture, and code quality issues.
+
+Each category check declares the files, paths, stack keys and file stat
+keys it reads. Results are stored with a fingerprint of those inputs, and
+a later check given the previous result reuses every category whose
+inputs are unchanged.
 """
 import os
-import json
 import re
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from app.services.file_snapshot import FileSnapshot, get_file_snapshot
+from app.services.issue_store import issue_signature
+
 
 class Severity(Enum):
     CRITICAL = "critical"
@@ -31,6 +38,11 @@ class Issue:
     suggestion: Optional[str] = None
     auto_fixable: bool = False
 
+    @property
+    def signature(self) -> str:
+        """Stable key of the issue across scans (file, line, category and title)."""
+        return issue_signature(self.to_dict())
+
     def to_dict(self) -> dict:
         """Convert to dictionary."""
         return {
@@ -44,30 +56,107 @@ class Issue:
             "auto_fixable": self.auto_fixable,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "Issue":
+        """Create from dictionary."""
+        return cls(
+            category=data["category"],
+            severity=Severity(data["severity"]),
+            title=data["title"],
+            description=data["description"],
+            file_path=data.get("file_path"),
+            line_number=data.get("line_number"),
+            suggestion=data.get("suggestion"),
+            auto_fixable=data.get("auto_fixable", False),
+        )
+
+
+@dataclass(frozen=True)
+class CheckInputs:
+    """Everything a category check reads."""
+
+    files: Tuple[str, ...] = ()  # File contents
+    paths: Tuple[str, ...] = ()  # Whether files or directories exist
+    stack: Tuple[str, ...] = ()  # Top-level stack keys
+    file_stats: Tuple[str, ...] = ()  # Top-level file_stats keys
+
 
 class HealthChecker:
     """Check project health and production readiness."""
 
-    def __init__(self, project_path: str, stack: dict, file_stats: dict):
+    # Bump when any check's logic changes, so stored results are recomputed
+    CHECKS_VERSION = 1
+
+    CHECK_INPUTS: Dict[str, CheckInputs] = {
+        "architecture": CheckInputs(file_stats=("by_category",)),
+        "security": CheckInputs(
+            files=(".gitignore", ".env.example", "app/Http/Kernel.php", "bootstrap/app.php",
+                   "routes/web.php", "routes/api.php"),
+            stack=("backend",),
+        ),
+        "performance": CheckInputs(stack=("backend", "cache", "queue"), file_stats=("by_category",)),
+        "code_quality": CheckInputs(files=("composer.json",), stack=("backend", "frontend")),
+        "error_handling": CheckInputs(
+            files=("composer.json", "bootstrap/app.php"),
+            paths=("app/Exceptions/Handler.php",),
+        ),
+        "logging": CheckInputs(files=("config/logging.php",), stack=("backend",)),
+        "testing": CheckInputs(stack=("testing",), file_stats=("by_category", "by_type")),
+        "documentation": CheckInputs(
+            files=("composer.json",),
+            paths=("README.md", "readme.md", "README", "docs/api.md", "docs/api", "openapi.yaml",
+                   "openapi.json", "swagger.json", "swagger.yaml", "CONTRIBUTING.md"),
+        ),
+        "ai_readiness": CheckInputs(stack=("frontend",), file_stats=("total_lines", "by_category")),
+    }
+
+    def __init__(
+        self,
+        project_path: str,
+        stack: dict,
+        file_stats: dict,
+        snapshot: Optional[FileSnapshot] = None,
+        previous: Optional[dict] = None,
+    ):
         self.path = project_path
+        self.snapshot = snapshot or get_file_snapshot(project_path)
         self.stack = stack or {}
         self.file_stats = file_stats or {}
+        self.previous = previous or {}
         self.issues: List[Issue] = []
+        self.recomputed: List[str] = []
 
     def check(self) -> Dict[str, Any]:
-        """Run all health checks."""
-        categories = {
-            "architecture": self._check_architecture(),
-            "security": self._check_security(),
-            "performance": self._check_performance(),
-            "code_quality": self._check_code_quality(),
-            "error_handling": self._check_error_handling(),
-            "logging": self._check_logging(),
-            "testing": self._check_testing(),
-            "documentation": self._check_documentation(),
-            "ai_readiness": self._check_ai_readiness(),
+        """Run all health checks, reusing categories whose inputs are unchanged."""
+        checks: Dict[str, Callable[[], Dict[str, Any]]] = {
+            "architecture": self._check_architecture,
+            "security": self._check_security,
+            "performance": self._check_performance,
+            "code_quality": self._check_code_quality,
+            "error_handling": self._check_error_handling,
+            "logging": self._check_logging,
+            "testing": self._check_testing,
+            "documentation": self._check_documentation,
+            "ai_readiness": self._check_ai_readiness,
         }
 
+        previous_categories = self.previous.get("categories") or {}
+        previous_issues: Dict[str, List[Issue]] = {}
+        for key in ("critical_issues", "warnings", "info"):
+            for data in self.previous.get(key) or []:
+                previous_issues.setdefault(data["category"], []).append(Issue.from_dict(data))
+
+        categories = {}
+        for name, run in checks.items():
+            fingerprint = self._fingerprint(self.CHECK_INPUTS[name])
+            cached = previous_categories.get(name)
+            if cached and cached.get("inputs") == fingerprint:
+                self.issues.extend(previous_issues.get(name, []))
+                categories[name] = cached
+            else:
+                categories[name] = {**run(), "inputs": fingerprint}
+                self.recomputed.append(name)
+
         # Calculate overall score
         total_score = sum(c["score"] for c in categories.values())
         overall_score = total_score / len(categories)
@@ -744,27 +833,23 @@ class HealthChecker:
 
     # ========== Helpers ==========
 
+    def _fingerprint(self, inputs: CheckInputs) -> str:
+        """Hash of the current values of a check's inputs."""
+        return self.snapshot.input_fingerprint(
+            self.CHECKS_VERSION,
+            inputs.files,
+            inputs.paths,
+            stack=[self.stack.get(key) for key in inputs.stack],
+            file_stats=[self.file_stats.get(key) for key in inputs.file_stats],
+        )
+
     def _read_file(self, filename: str) -> Optional[str]:
         """Read a text file."""
-        filepath = os.path.join(self.path, filename)
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                    return f.read()
-            except Exception:
-                return None
-        return None
+        return self.snapshot.read_text(filename)
 
     def _read_json(self, filename: str) -> Optional[dict]:
         """Read and parse a JSON file."""
-        filepath = os.path.join(self.path, filename)
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                return None
-        return None
+        return self.snapshot.read_json(filename)
 
     def _file_exists(self, filename: str) -> bool:
         """Check if a file exists."""
@@ -15,6 +15,7 @@ from sqlalchemy import select
 
 from app.models.models import Project, ProjectStatus, IndexedFile
 from app.services.scanner import LaravelScanner, ScannerError, FileInfo
+from app.services.file_snapshot import get_file_snapshot
 from app.services.parsers.php_parser import PHPParser
 from app.services.parsers.blade_parser import BladeParser
 from app.services.chunker import Chunker, chunk_file
@@ -185,7 +186,7 @@ class ProjectIndexer:
 
         try:
             scanner = LaravelScanner(project_path)
-            scan_result = scanner.scan()
+            scan_result = await asyncio.to_thread(scanner.scan)
 
             progress.total_files = scan_result.stats.total_files
             self._update_progress(progress)
@@ -200,6 +201,7 @@ class ProjectIndexer:
         file_path: str,
         file_type: str,
         project_path: str,
+        source_code: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Parse a file and extract structure.
@@ -208,18 +210,20 @@ class ProjectIndexer:
             file_path: Relative path to the file
             file_type: Type of file (php, blade, etc.)
             project_path: Base path of the project
+            source_code: Already-read content, to avoid reading the file again
 
         Returns:
             Parsed data dictionary
         """
-        full_path = os.path.join(project_path, file_path)
+        if source_code is None:
+            source_code = self._read_file_content(file_path, project_path)
 
         try:
             if file_type == "php":
-                result = self.php_parser.parse_file(full_path)
+                result = self.php_parser.parse(source_code)
                 return result.to_dict()
             elif file_type == "blade":
-                result = self.blade_parser.parse_file(full_path)
+                result = self.blade_parser.parse(source_code)
                 return result.to_dict()
             else:
                 return {}
@@ -229,13 +233,9 @@ class ProjectIndexer:
             return {"errors": [str(e)]}
 
     def _read_file_content(self, file_path: str, project_path: str) -> str:
-        """Read file content."""
-        full_path = os.path.join(project_path, file_path)
-        try:
-            with open(full_path, "r", encoding="utf-8", errors="replace") as f:
-                return f.read()
-        except Exception:
-            return ""
+        """Read file content through the clone's shared snapshot."""
+        content = get_file_snapshot(project_path).read_text(file_path, errors="replace")
+        return content if content is not None else ""
 
     async def _process_files(
         self,
@@ -284,6 +284,7 @@ class ProjectIndexer:
                 file_info.path,
                 file_info.type,
                 project_path,
+                source_code=source_code,
             )
 
             # Chunk the file
@@ -0,0 +1,103 @@
+"""
+Project Issue Store.
+
+Scan issues are keyed by a (file, line, rule) signature. Storing a scan's
+issues upserts the rows found again, and removes every other issue of the
+project in one statement. A found-again issue keeps the status the user
+gave it, except that one marked fixed is reopened: the scan shows it is
+still there.
+Every scan path (the scan job worker, the clone-and-index task and
+ProjectScanner) writes issues through ``store_issues``.
+"""
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable
+
+from sqlalchemy import String, all_, bindparam, case, delete, or_
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import IssueStatus, ProjectIssue, generate_uuid
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT, well under PostgreSQL's 32767 bind parameters
+ISSUE_INSERT_BATCH_SIZE = 1000
+# Columns refreshed when a re-scan finds an issue again; created_at is
+# kept and status is handled separately
+ISSUE_UPSERT_COLUMNS = ("category", "severity", "title", "description", "suggestion", "auto_fixable", "updated_at")
+
+
+def issue_signature(issue_data: Dict[str, Any]) -> str:
+    """Stable key of an issue: its file, line and the rule that raised it."""
+    rule = issue_data.get("rule") or f"{issue_data.get('category')}:{issue_data.get('title')}"
+    line = issue_data.get("line_number")
+    key = f"{issue_data.get('file_path') or ''}\0{'' if line is None else line}\0{rule}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+async def store_issues(db: AsyncSession, project_id: str, issues: Iterable[Dict[str, Any]]) -> int:
+    """
+    Replace a project's issues with ``issues`` and return how many were written.
+
+    Issues with the same signature are written once. The caller commits.
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    now = datetime.utcnow()
+    total = 0
+    for issue_data in issues:
+        total += 1
+        signature = issue_data.get("signature") or issue_signature(issue_data)
+        if signature in rows:
+            continue
+        rows[signature] = {
+            "id": generate_uuid(),
+            "project_id": project_id,
+            "category": issue_data.get("category"),
+            "severity": issue_data.get("severity"),
+            "title": issue_data.get("title"),
+            "description": issue_data.get("description"),
+            "file_path": issue_data.get("file_path"),
+            "line_number": issue_data.get("line_number"),
+            "suggestion": issue_data.get("suggestion"),
+            "auto_fixable": issue_data.get("auto_fixable", False),
+            "signature": signature,
+            "status": IssueStatus.OPEN.value,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    # Drop issues not found again, including unsigned ones
+    await db.execute(
+        delete(ProjectIssue).where(
+            ProjectIssue.project_id == project_id,
+            or_(
+                ProjectIssue.signature.is_(None),
+                ProjectIssue.signature != all_(
+                    bindparam("signatures", list(rows), type_=ARRAY(String))
+                ),
+            ),
+        )
+    )
+
+    values = list(rows.values())
+    for start in range(0, len(values), ISSUE_INSERT_BATCH_SIZE):
+        stmt = pg_insert(ProjectIssue).values(values[start:start + ISSUE_INSERT_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProjectIssue.project_id, ProjectIssue.signature],
+            set_={
+                **{column: stmt.excluded[column] for column in ISSUE_UPSERT_COLUMNS},
+                "status": case(
+                    (ProjectIssue.status == IssueStatus.FIXED.value, IssueStatus.OPEN.value),
+                    else_=ProjectIssue.status,
+                ),
+            },
+        )
+        await db.execute(stmt)
+
+    logger.info(
+        f"[ISSUE_STORE] Stored {len(values)} issues for project {project_id} "
+        f"({total - len(values)} duplicates dropped)"
+    )
+    return len(values)
@@ -0,0 +1,303 @@
+"""
+Chat Job Runner.
+
+Chat pipelines run as background jobs instead of inside the SSE response,
+so a client disconnect, a proxy timeout or a slow reader never stops them.
+Each job is recorded in ``chat_jobs`` and writes its events to the chat
+event log; HTTP responses only subscribe to that log.
+
+Concurrency is bounded three ways: a pool size for the whole worker, and
+per-user and per-project limits. Jobs that cannot start yet wait in FIFO
+order, and a job blocked by its user's limit does not hold up others.
+Queued jobs survive a restart and are picked up again on startup.
+
+A conversation has at most one queued or running job: ``submit`` reserves
+it before its first await, and a unique partial index on chat_jobs holds
+the same rule across worker processes.
+"""
+import asyncio
+import logging
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import AsyncGenerator, Callable, Deque, Dict, Optional
+from uuid import uuid4
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.events import error as error_event, job_queued
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.models.models import ChatJob, ChatJobStatus
+from app.services.event_log import EventLog, get_chat_event_log
+
+logger = logging.getLogger(__name__)
+
+# Builds the SSE event stream for a job, given a session owned by the runner
+JobHandler = Callable[[AsyncSession, ChatJob], AsyncGenerator[str, None]]
+
+
+class ChatJobConflict(Exception):
+    """Raised by submit when the conversation already has a queued or running job."""
+
+
+class ChatJobRunner:
+    """Runs chat pipelines in the background within concurrency limits."""
+
+    def __init__(
+        self,
+        pool_size: int = 8,
+        max_per_user: int = 2,
+        max_per_project: int = 2,
+        stale_after_seconds: int = 3600,
+        session_factory=async_session_factory,
+        event_log: Optional[EventLog] = None,
+    ):
+        self.pool_size = pool_size
+        self.max_per_user = max_per_user
+        self.max_per_project = max_per_project
+        self.stale_after_seconds = stale_after_seconds
+        self.session_factory = session_factory
+        self._event_log = event_log
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._pending: Deque[ChatJob] = deque()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._user_counts: Counter = Counter()
+        self._project_counts: Counter = Counter()
+        # Conversation -> job id, for queued and running jobs
+        self._conversations: Dict[str, str] = {}
+
+    @property
+    def event_log(self) -> EventLog:
+        return self._event_log or get_chat_event_log()
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Register the pipeline that runs jobs of this kind."""
+        self._handlers[kind] = handler
+
+    def is_active(self, conversation_id: str) -> bool:
+        """Whether a job for this conversation is queued or running here."""
+        return conversation_id in self._conversations
+
+    @property
+    def running_count(self) -> int:
+        return len(self._running)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    # =========================================================================
+    # SUBMISSION & SCHEDULING
+    # =========================================================================
+
+    async def submit(
+        self,
+        user_id: str,
+        project_id: str,
+        conversation_id: str,
+        kind: str,
+        payload: dict,
+    ) -> ChatJob:
+        """
+        Record a job, start a new event-log run for it and schedule it.
+
+        Raises ChatJobConflict if the conversation already has a queued or
+        running job, here or in another worker.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for chat job kind '{kind}'")
+        if conversation_id in self._conversations:
+            raise ChatJobConflict(conversation_id)
+
+        job = ChatJob(
+            id=str(uuid4()),
+            user_id=user_id,
+            project_id=project_id,
+            conversation_id=conversation_id,
+            kind=kind,
+            status=ChatJobStatus.QUEUED.value,
+            payload=payload,
+            created_at=datetime.utcnow(),
+        )
+        # Reserve the conversation before the first await, so a concurrent
+        # submit for it fails the check above
+        self._conversations[conversation_id] = job.id
+        try:
+            async with self.session_factory() as db:
+                db.add(job)
+                try:
+                    await db.commit()
+                except IntegrityError:
+                    # Another worker has a queued or running job for it
+                    await db.rollback()
+                    raise ChatJobConflict(conversation_id)
+
+            await self.event_log.begin(conversation_id)
+        except BaseException:
+            del self._conversations[conversation_id]
+            raise
+
+        await self._enqueue(job)
+        logger.info(f"[JOB_RUNNER] Submitted job={job.id} kind={kind} conversation={conversation_id}")
+        return job
+
+    async def _enqueue(self, job: ChatJob) -> None:
+        self._pending.append(job)
+        self._conversations[job.conversation_id] = job.id
+        self._dispatch()
+
+        if job in self._pending:
+            position = self._pending.index(job) + 1
+            await self.event_log.append(job.conversation_id, job_queued(job.id, position))
+
+    def _can_start(self, job: ChatJob) -> bool:
+        return (
+            len(self._running) < self.pool_size
+            and self._user_counts[job.user_id] < self.max_per_user
+            and self._project_counts[job.project_id] < self.max_per_project
+        )
+
+    def _dispatch(self) -> None:
+        """Start every pending job that fits, oldest first."""
+        for job in list(self._pending):
+            if len(self._running) >= self.pool_size:
+                return
+            if self._can_start(job):
+                self._pending.remove(job)
+                self._user_counts[job.user_id] += 1
+                self._project_counts[job.project_id] += 1
+                self._running[job.id] = asyncio.create_task(self._run(job))
+
+    def _release(self, job: ChatJob) -> None:
+        self._running.pop(job.id, None)
+        self._user_counts[job.user_id] -= 1
+        self._project_counts[job.project_id] -= 1
+        if self._conversations.get(job.conversation_id) == job.id:
+            del self._conversations[job.conversation_id]
+
+    # =========================================================================
+    # EXECUTION
+    # =========================================================================
+
+    async def _claim(self, job: ChatJob) -> bool:
+        """Move the job from queued to running; False if another worker has it."""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(ChatJob)
+                .where(ChatJob.id == job.id, ChatJob.status == ChatJobStatus.QUEUED.value)
+                .values(status=ChatJobStatus.RUNNING.value, started_at=datetime.utcnow())
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def _finish(self, job: ChatJob, status: ChatJobStatus, error: Optional[str] = None) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                update(ChatJob)
+                .where(ChatJob.id == job.id)
+                .values(status=status.value, error=error, finished_at=datetime.utcnow())
+            )
+            await db.commit()
+
+    async def _run(self, job: ChatJob) -> None:
+        status, error = ChatJobStatus.COMPLETED, None
+        claimed = False
+        try:
+            claimed = await self._claim(job)
+            if not claimed:
+                logger.info(f"[JOB_RUNNER] Job {job.id} already claimed elsewhere, skipping")
+                return
+
+            handler = self._handlers[job.kind]
+            async with self.session_factory() as db:
+                try:
+                    async for event_str in handler(db, job):
+                        await self.event_log.append(job.conversation_id, event_str)
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+
+        except asyncio.CancelledError:
+            status, error = ChatJobStatus.INTERRUPTED, "Worker stopped before the job finished"
+            logger.warning(f"[JOB_RUNNER] Job {job.id} interrupted")
+        except Exception as e:
+            status, error = ChatJobStatus.FAILED, str(e)
+            logger.exception(f"[JOB_RUNNER] Job {job.id} failed: {e}")
+            await self.event_log.append(job.conversation_id, error_event(str(e)))
+        finally:
+            self._release(job)
+            if claimed:
+                try:
+                    await self._finish(job, status, error)
+                    await self.event_log.end(job.conversation_id)
+                except Exception as e:
+                    logger.warning(f"[JOB_RUNNER] Could not record outcome of job {job.id}: {e}")
+            self._dispatch()
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    async def start(self) -> None:
+        """
+        Pick up queued jobs left over from a previous process.
+
+        Jobs still marked running for longer than ``stale_after_seconds``
+        lost their worker and are marked interrupted.
+        """
+        stale_before = datetime.utcnow() - timedelta(seconds=self.stale_after_seconds)
+        async with self.session_factory() as db:
+            await db.execute(
+                update(ChatJob)
+                .where(ChatJob.status == ChatJobStatus.RUNNING.value, ChatJob.started_at < stale_before)
+                .values(
+                    status=ChatJobStatus.INTERRUPTED.value,
+                    error="Worker stopped before the job finished",
+                    finished_at=datetime.utcnow(),
+                )
+            )
+            await db.commit()
+
+            result = await db.execute(
+                select(ChatJob)
+                .where(ChatJob.status == ChatJobStatus.QUEUED.value)
+                .order_by(ChatJob.created_at)
+            )
+            queued = [job for job in result.scalars().all() if job.kind in self._handlers]
+
+        known = set(self._running) | {job.id for job in self._pending}
+        for job in queued:
+            if job.id not in known:
+                await self._enqueue(job)
+        if queued:
+            logger.info(f"[JOB_RUNNER] Resumed {len(queued)} queued job(s)")
+
+    async def shutdown(self) -> None:
+        """Cancel running jobs (recorded as interrupted); queued jobs stay queued."""
+        tasks = list(self._running.values())
+        self._pending.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Singleton instance
+_chat_job_runner: Optional[ChatJobRunner] = None
+
+
+def get_chat_job_runner() -> ChatJobRunner:
+    """Get or create the chat job runner."""
+    global _chat_job_runner
+    if _chat_job_runner is None:
+        _chat_job_runner = ChatJobRunner(
+            pool_size=settings.chat_job_pool_size,
+            max_per_user=settings.chat_job_max_per_user,
+            max_per_project=settings.chat_job_max_per_project,
+            stale_after_seconds=settings.chat_job_stale_after_seconds,
+        )
+    return _chat_job_runner
@@ -0,0 +1,206 @@
+"""
+Plan Approval Backends.
+
+Interactive chat pauses after planning until the user approves, modifies or
+rejects the plan. The waiting pipeline and the approve-plan request may run
+in different workers, so the pending state and the wake-up signal go through
+a backend:
+
+- InMemoryPlanApprovalBackend: single process (development, tests)
+- RedisPlanApprovalBackend: Redis keys + pub/sub, shared by all workers
+"""
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional, Dict
+
+from app.core.config import settings
+
+try:
+    import redis.asyncio as aioredis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PlanDecision:
+    """The user's decision on a plan."""
+    approved: bool = True
+    modified_plan: Optional[dict] = None
+    rejection_reason: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "approved": self.approved,
+            "modified_plan": self.modified_plan,
+            "rejection_reason": self.rejection_reason,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PlanDecision":
+        return cls(
+            approved=data.get("approved", True),
+            modified_plan=data.get("modified_plan"),
+            rejection_reason=data.get("rejection_reason"),
+        )
+
+
+class PlanApprovalBackend(ABC):
+    """
+    Delivers plan decisions to the pipeline waiting for them.
+
+    Lifecycle per approval: ``open`` before the plan is shown, ``wait`` for
+    the decision, ``close`` when done. ``submit`` may come from any worker
+    and is rejected when nothing is waiting on that key.
+    """
+
+    @abstractmethod
+    async def open(self, approval_id: str) -> None:
+        """Mark a plan as awaiting a decision."""
+
+    @abstractmethod
+    async def submit(self, approval_id: str, decision: PlanDecision) -> bool:
+        """Deliver a decision. Returns False if no plan is awaiting one."""
+
+    @abstractmethod
+    async def wait(self, approval_id: str, timeout: float) -> Optional[PlanDecision]:
+        """Wait for the decision, or None on timeout."""
+
+    @abstractmethod
+    async def close(self, approval_id: str) -> None:
+        """Forget the pending approval."""
+
+
+# =============================================================================
+# IN-MEMORY BACKEND
+# =============================================================================
+
+class InMemoryPlanApprovalBackend(PlanApprovalBackend):
+    """Futures keyed by approval id; only works within one process."""
+
+    def __init__(self):
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def open(self, approval_id: str) -> None:
+        self._pending[approval_id] = asyncio.get_running_loop().create_future()
+
+    async def submit(self, approval_id: str, decision: PlanDecision) -> bool:
+        future = self._pending.get(approval_id)
+        if future is None or future.done():
+            return False
+        future.set_result(decision)
+        return True
+
+    async def wait(self, approval_id: str, timeout: float) -> Optional[PlanDecision]:
+        future = self._pending.get(approval_id)
+        if future is None:
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self, approval_id: str) -> None:
+        self._pending.pop(approval_id, None)
+
+
+# =============================================================================
+# REDIS BACKEND
+# =============================================================================
+
+class RedisPlanApprovalBackend(PlanApprovalBackend):
+    """
+    Pending flag and decision stored in Redis, wake-up via pub/sub.
+
+    The decision is also written to a key, so a waiter that subscribes
+    after the publish still sees it.
+    """
+
+    KEY_PREFIX = "plan_approval"
+
+    def __init__(self, redis_url: str, ttl_seconds: int = 600):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("redis package is required for the Redis plan approval backend")
+        self.redis = aioredis.from_url(redis_url, decode_responses=True)
+        self.ttl_seconds = ttl_seconds
+
+    def _pending_key(self, approval_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{approval_id}:pending"
+
+    def _decision_key(self, approval_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{approval_id}:decision"
+
+    def _channel(self, approval_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{approval_id}:channel"
+
+    async def open(self, approval_id: str) -> None:
+        await self.redis.delete(self._decision_key(approval_id))
+        await self.redis.set(self._pending_key(approval_id), "1", ex=self.ttl_seconds)
+
+    async def submit(self, approval_id: str, decision: PlanDecision) -> bool:
+        if not await self.redis.exists(self._pending_key(approval_id)):
+            return False
+
+        payload = json.dumps(decision.to_dict())
+        # First decision wins
+        stored = await self.redis.set(self._decision_key(approval_id), payload, ex=self.ttl_seconds, nx=True)
+        if not stored:
+            return False
+
+        await self.redis.publish(self._channel(approval_id), payload)
+        return True
+
+    async def wait(self, approval_id: str, timeout: float) -> Optional[PlanDecision]:
+        pubsub = self.redis.pubsub()
+        try:
+            await pubsub.subscribe(self._channel(approval_id))
+
+            # Decision submitted before we subscribed
+            stored = await self.redis.get(self._decision_key(approval_id))
+            if stored:
+                return PlanDecision.from_dict(json.loads(stored))
+
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+                if message and message.get("type") == "message":
+                    return PlanDecision.from_dict(json.loads(message["data"]))
+        finally:
+            try:
+                await pubsub.unsubscribe()
+                await pubsub.close()
+            except Exception as e:
+                logger.debug(f"[PLAN_APPROVAL] Pub/sub cleanup failed: {e}")
+
+    async def close(self, approval_id: str) -> None:
+        await self.redis.delete(self._pending_key(approval_id), self._decision_key(approval_id))
+
+
+# Singleton instance
+_plan_approval_backend: Optional[PlanApprovalBackend] = None
+
+
+def get_plan_approval_backend() -> PlanApprovalBackend:
+    """Get or create the configured plan approval backend."""
+    global _plan_approval_backend
+    if _plan_approval_backend is None:
+        if settings.plan_approval_backend == "redis":
+            _plan_approval_backend = RedisPlanApprovalBackend(
+                settings.redis_url,
+                ttl_seconds=settings.plan_approval_ttl_seconds,
+            )
+        else:
+            _plan_approval_backend = InMemoryPlanApprovalBackend()
+        logger.info(f"[PLAN_APPROVAL] Using {type(_plan_approval_backend).__name__}")
+    return _plan_approval_backend
@@ -14,8 +14,6 @@ Scans all project files and directories for:
 """
 import logging
 import os
-import re
-import json
 import asyncio
 from pathlib import Path
 from datetime import datetime
@@ -25,12 +23,16 @@ from enum import Enum
 from concurrent.futures import ThreadPoolExecutor
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from app.models.models import Project, ProjectIssue, IndexedFile
+from app.models.models import Project
 from app.services.stack_detector import StackDetector
 from app.services.file_scanner import FileScanner
 from app.services.health_checker import HealthChecker
+from app.services.file_snapshot import get_file_snapshot
+from app.services.file_walker import FileWalker
+from app.services.scan_rules import RuleEngine, ScanRule
+from app.services.scan_columns import ScanColumns, ScanColumnsBuilder
+from app.services.issue_store import store_issues
 
 logger = logging.getLogger(__name__)
 
@@ -81,14 +83,14 @@ class ScanProgress:
 
 @dataclass
 class FileInfo:
-    """Information about a scanned file."""
+    """A file handed to the code checks; built only for files they apply to."""
     path: str
     relative_path: str
     size: int
     lines: int
     language: str
     category: str
-    last_modified: datetime
+    last_modified: Optional[datetime] = None
     has_issues: bool = False
     issues: List[Dict] = field(default_factory=list)
 
@@ -111,6 +113,7 @@ class ScanResult:
 
     # Stack detection
     stack: Dict[str, Any] = field(default_factory=dict)
+    stack_fingerprint: Optional[str] = None
 
     # Health score
     health_score: float = 0.0
@@ -190,6 +193,17 @@ class ProjectScanner:
         ],
     }
 
+    # Literals one of which every line matching a category's patterns contains;
+    # lines without any are never run through the regexes
+    SECURITY_LITERALS = {
+        'hardcoded_secret': ('password', 'secret', 'api_key', 'apikey', 'token', 'auth', '_key'),
+        'sql_injection': ('whereraw', 'db::raw', 'selectraw'),
+        'xss': ('{!!', 'echo'),
+        'file_inclusion': ('include', 'require'),
+        'command_injection': ('exec', 'system', 'passthru', '`'),
+        'insecure_config': ('app_debug', 'app_env'),
+    }
+
     # Code quality patterns
     QUALITY_PATTERNS = {
         'long_method': (r'(?:function|public function|private function|protected function)\s+\w+[^}]+\{', 50),
@@ -202,11 +216,20 @@ class ProjectScanner:
         'console_log': r'console\.(?:log|debug|info)\s*\(',
     }
 
+    # Languages each family of checks applies to
+    SECURITY_LANGUAGES = frozenset({'php', 'blade', 'javascript', 'typescript', 'env'})
+    QUALITY_LANGUAGES = frozenset({'php', 'javascript', 'typescript', 'blade'})
+
+    _rule_engine: Optional[RuleEngine] = None
+
     def __init__(self, db: AsyncSession, project: Project):
         self.db = db
         self.project = project
+        self.snapshot = get_file_snapshot(project.clone_path or "")
         self.progress = ScanProgress()
         self.result: Optional[ScanResult] = None
+        # Per-file results of the last scan, as columns
+        self.files: Optional[ScanColumns] = None
         self._executor = ThreadPoolExecutor(max_workers=4)
         self._progress_callback = None
 
@@ -274,13 +297,9 @@ class ProjectScanner:
             await self._update_progress(ScanPhase.DETECTING_STACK, 0.4, "Detecting technology stack...")
             await self._detect_stack(clone_path)
 
-            # Phase 4: Security check
-            await self._update_progress(ScanPhase.CHECKING_SECURITY, 0.55, "Checking for security issues...")
-            await self._check_security(clone_path, files)
-
-            # Phase 5: Quality check
-            await self._update_progress(ScanPhase.CHECKING_QUALITY, 0.7, "Analyzing code quality...")
-            await self._check_quality(clone_path, files)
+            # Phase 4-5: Security and quality checks (one pass per file)
+            await self._update_progress(ScanPhase.CHECKING_SECURITY, 0.55, "Checking security and code quality...")
+            await self._check_code(clone_path, files)
 
             # Phase 6: Dependency analysis
             await self._update_progress(ScanPhase.ANALYZING_DEPENDENCIES, 0.85, "Analyzing dependencies...")
@@ -299,12 +318,14 @@ class ProjectScanner:
             # Update project
             self.project.health_score = self.result.health_score
             self.project.stack = self.result.stack
+            self.project.stack_fingerprint = self.result.stack_fingerprint
             self.project.file_stats = {
                 "total_files": self.result.total_files,
                 "total_lines": self.result.total_lines,
                 "by_language": self.result.files_by_language,
                 "by_category": self.result.files_by_category,
             }
+            self.project.scan_columns = files.to_bytes()
             self.project.scanned_at = datetime.utcnow()
             await self.db.commit()
 
@@ -320,78 +341,55 @@ class ProjectScanner:
             await self._update_progress(ScanPhase.FAILED, 0, f"Scan failed: {str(e)}")
             raise
 
-    async def _scan_files(self, base_path: str) -> List[FileInfo]:
+    async def _scan_files(self, base_path: str) -> ScanColumns:
         """Scan all files in the project."""
-        files = []
-        total_lines = 0
-        total_size = 0
-
-        for root, dirs, filenames in os.walk(base_path):
-            # Skip directories
-            dirs[:] = [d for d in dirs if d not in self.SKIP_DIRECTORIES]
-
-            for filename in filenames:
-                file_path = os.path.join(root, filename)
-                relative_path = os.path.relpath(file_path, base_path)
-
-                # Check extension
-                ext = os.path.splitext(filename)[1].lower()
-                if ext not in self.SCANNABLE_EXTENSIONS:
-                    continue
-
-                try:
-                    stat = os.stat(file_path)
-                    size = stat.st_size
-                    modified = datetime.fromtimestamp(stat.st_mtime)
-
-                    # Count lines
-                    lines = 0
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            lines = sum(1 for _ in f)
-                    except:
-                        pass
-
-                    # Determine language and category
-                    language = self._get_language(filename, ext)
-                    category = self._get_category(relative_path, language)
-
-                    file_info = FileInfo(
-                        path=file_path,
-                        relative_path=relative_path,
-                        size=size,
-                        lines=lines,
-                        language=language,
-                        category=category,
-                        last_modified=modified,
-                    )
-                    files.append(file_info)
-
-                    total_lines += lines
-                    total_size += size
-
-                    # Update language stats
-                    self.result.files_by_language[language] = \
-                        self.result.files_by_language.get(language, 0) + 1
-
-                    # Update category stats
-                    self.result.files_by_category[category] = \
-                        self.result.files_by_category.get(category, 0) + 1
-
-                except Exception as e:
-                    logger.warning(f"[SCANNER] Failed to scan {file_path}: {e}")
-                    continue
-
-            # Update progress
-            self.progress.files_scanned = len(files)
+        loop = asyncio.get_running_loop()
+        files = await loop.run_in_executor(self._executor, self._collect_files, base_path)
+
+        self.result.files_by_language = files.count_by("language")
+        self.result.files_by_category = files.count_by("category")
 
+        self.progress.files_scanned = len(files)
         self.result.total_files = len(files)
-        self.result.total_lines = total_lines
-        self.result.total_size_bytes = total_size
+        self.result.total_lines = files.total("lines")
+        self.result.total_size_bytes = files.total("size")
         self.progress.total_files = len(files)
 
+        self.files = files
         return files
 
+    def _collect_files(self, base_path: str) -> ScanColumns:
+        """List scannable files and count their lines on the walker's pool."""
+        walker = FileWalker(
+            base_path,
+            skip_dir=lambda relative_dir: relative_dir.rsplit('/', 1)[-1] in self.SKIP_DIRECTORIES,
+        )
+        walked = walker.walk(
+            include=lambda relative_path: os.path.splitext(relative_path)[1].lower() in self.SCANNABLE_EXTENSIONS,
+        )
+        line_counts = walker.map(self.snapshot.line_count, [entry.path for entry in walked])
+
+        files = ScanColumnsBuilder(("language", "category", "top_dir"))
+        for entry, lines in zip(walked, line_counts):
+            filename = os.path.basename(entry.relative_path)
+            ext = os.path.splitext(filename)[1].lower()
+
+            # Determine language and category
+            language = self._get_language(filename, ext)
+            category = self._get_category(entry.relative_path, language)
+            top_dir = entry.relative_path.split('/', 1)[0] if '/' in entry.relative_path else '.'
+
+            files.append(
+                entry.relative_path,
+                entry.size,
+                lines,
+                language=language,
+                category=category,
+                top_dir=top_dir,
+            )
+
+        return files.build()
+
     def _get_language(self, filename: str, ext: str) -> str:
         """Determine file language."""
         language_map = {
@@ -485,7 +483,7 @@ class ProjectScanner:
 
         return 'other'
 
-    async def _analyze_structure(self, base_path: str, files: List[FileInfo]):
+    async def _analyze_structure(self, base_path: str, files: ScanColumns):
         """Analyze project structure."""
         structure = {
             "has_src_directory": os.path.exists(os.path.join(base_path, 'src')),
@@ -504,15 +502,11 @@ class ProjectScanner:
                 os.path.exists(os.path.join(base_path, 'LICENSE')),
                 os.path.exists(os.path.join(base_path, 'LICENSE.md')),
             ]),
-            "directories": {},
+            # Files per top-level directory
+            "directories": files.count_by("top_dir"),
             "patterns_detected": [],
         }
 
-        # Count files per directory
-        for f in files:
-            dir_name = os.path.dirname(f.relative_path).split(os.sep)[0] if os.sep in f.relative_path else '.'
-            structure["directories"][dir_name] = structure["directories"].get(dir_name, 0) + 1
-
         # Detect patterns
         if structure["has_app_directory"]:
             structure["patterns_detected"].append("Laravel MVC")
@@ -527,116 +521,125 @@ class ProjectScanner:
 
     async def _detect_stack(self, base_path: str):
         """Detect technology stack."""
-        detector = StackDetector(base_path)
-        stack = detector.detect()
-        self.result.stack = stack
+        detector = StackDetector(
+            base_path,
+            snapshot=self.snapshot,
+            previous=self.project.stack,
+            previous_fingerprint=self.project.stack_fingerprint,
+        )
+        self.result.stack = detector.detect()
+        self.result.stack_fingerprint = detector.fingerprint
+
+    @classmethod
+    def rule_engine(cls) -> RuleEngine:
+        """Security and quality rules, compiled once per process."""
+        if cls._rule_engine is None:
+            cls._rule_engine = RuleEngine(cls._build_rules())
+        return cls._rule_engine
+
+    @classmethod
+    def _build_rules(cls) -> List[ScanRule]:
+        """Turn SECURITY_PATTERNS and QUALITY_PATTERNS into scan rules."""
+        rules = []
+        for category, patterns in cls.SECURITY_PATTERNS.items():
+            label = category.replace('_', ' ')
+            severity = IssueSeverity.CRITICAL if category in ['hardcoded_secret', 'sql_injection'] \
+                else IssueSeverity.WARNING
+            for index, (pattern, description) in enumerate(patterns):
+                rules.append(ScanRule(
+                    id=f"security.{category}.{index}",
+                    pattern=pattern,
+                    category=IssueCategory.SECURITY.value,
+                    severity=severity.value,
+                    title=f"Security: {label.title()}",
+                    description=description,
+                    suggestion=f"Review and fix the {label} issue",
+                    languages=cls.SECURITY_LANGUAGES,
+                    literals=cls.SECURITY_LITERALS.get(category, ()),
+                    ignore_case=True,
+                ))
+
+        quality = [
+            ("todo_fixme", cls.QUALITY_PATTERNS['todo_fixme'], ('todo', 'fixme', 'hack', 'xxx', 'bug'),
+             IssueSeverity.INFO, "TODO/FIXME comment found", "Found TODO or FIXME comment",
+             "Address the TODO/FIXME or create a ticket", False),
+            ("debug_statement",
+             f"(?:{cls.QUALITY_PATTERNS['var_dump']})|(?:{cls.QUALITY_PATTERNS['console_log']})",
+             ('var_dump', 'print_r', 'dd', 'console.'),
+             IssueSeverity.WARNING, "Debug statement found",
+             "Debug statement should be removed before production", "Remove debug statements", True),
+            ("empty_catch", cls.QUALITY_PATTERNS['empty_catch'], ('catch',),
+             IssueSeverity.WARNING, "Empty catch block", "Empty catch blocks hide errors",
+             "Add error handling or logging in catch block", False),
+        ]
+        for rule_id, pattern, literals, severity, title, description, suggestion, auto_fixable in quality:
+            rules.append(ScanRule(
+                id=f"quality.{rule_id}",
+                pattern=pattern,
+                category=IssueCategory.CODE_QUALITY.value,
+                severity=severity.value,
+                title=title,
+                description=description,
+                suggestion=suggestion,
+                languages=cls.QUALITY_LANGUAGES,
+                literals=literals,
+                auto_fixable=auto_fixable,
+            ))
+        return rules
+
+    async def _check_code(self, base_path: str, files: ScanColumns):
+        """Check security and code quality issues, reading each file once."""
+        engine = self.rule_engine()
+        checked = self.QUALITY_LANGUAGES.union(*(rule.languages for rule in engine.rules))
+        file_infos = [
+            FileInfo(
+                path=os.path.join(base_path, row["path"]),
+                relative_path=row["path"],
+                size=row["size"],
+                lines=row["lines"],
+                language=row["language"],
+                category=row["category"],
+            )
+            for row in files.rows(files.isin("language", checked).nonzero()[0])
+        ]
+        loop = asyncio.get_running_loop()
+        issues = await loop.run_in_executor(self._executor, self._evaluate_rules, file_infos)
+        self.result.issues.extend(issues)
+
+    def _evaluate_rules(self, files: List[FileInfo]) -> List[Dict]:
+        """Run every rule over each file in a single pass."""
+        engine = self.rule_engine()
+        issues = []
 
-    async def _check_security(self, base_path: str, files: List[FileInfo]):
-        """Check for security issues."""
         for file_info in files:
-            if file_info.language not in ['php', 'blade', 'javascript', 'typescript', 'env']:
+            # Check file length (potential god class)
+            if file_info.language in self.QUALITY_LANGUAGES and file_info.lines > 500:
+                issues.append({
+                    "category": IssueCategory.ARCHITECTURE.value,
+                    "severity": IssueSeverity.WARNING.value,
+                    "title": "Large file detected",
+                    "description": f"File has {file_info.lines} lines, consider splitting",
+                    "file_path": file_info.relative_path,
+                    "line_number": None,
+                    "suggestion": "Consider breaking down into smaller classes/modules",
+                    "auto_fixable": False,
+                })
+
+            if not engine.applies_to(file_info.language):
                 continue
 
-            try:
-                with open(file_info.path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    lines = content.split('\n')
-
-                for category, patterns in self.SECURITY_PATTERNS.items():
-                    for pattern, description in patterns:
-                        for i, line in enumerate(lines, 1):
-                            if re.search(pattern, line, re.IGNORECASE):
-                                issue = {
-                                    "category": IssueCategory.SECURITY.value,
-                                    "severity": IssueSeverity.CRITICAL.value if category in ['hardcoded_secret',
-                                                                                             'sql_injection'] else IssueSeverity.WARNING.value,
-                                    "title": f"Security: {category.replace('_', ' ').title()}",
-                                    "description": description,
-                                    "file_path": file_info.relative_path,
-                                    "line_number": i,
-                                    "suggestion": f"Review and fix the {category.replace('_', ' ')} issue",
-                                    "auto_fixable": False,
-                                }
-                                self.result.issues.append(issue)
-                                file_info.has_issues = True
-                                file_info.issues.append(issue)
-
-            except Exception as e:
-                logger.warning(f"[SCANNER] Security check failed for {file_info.path}: {e}")
-
-    async def _check_quality(self, base_path: str, files: List[FileInfo]):
-        """Check code quality issues."""
-        for file_info in files:
-            if file_info.language not in ['php', 'javascript', 'typescript', 'blade']:
+            content = self.snapshot.read_text(file_info.path)
+            if content is None:
+                logger.warning(f"[SCANNER] Code check failed for {file_info.path}: unreadable")
                 continue
 
-            try:
-                with open(file_info.path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    lines = content.split('\n')
-
-                # Check for TODO/FIXME
-                for i, line in enumerate(lines, 1):
-                    if re.search(self.QUALITY_PATTERNS['todo_fixme'], line):
-                        issue = {
-                            "category": IssueCategory.CODE_QUALITY.value,
-                            "severity": IssueSeverity.INFO.value,
-                            "title": "TODO/FIXME comment found",
-                            "description": f"Found TODO or FIXME comment",
-                            "file_path": file_info.relative_path,
-                            "line_number": i,
-                            "suggestion": "Address the TODO/FIXME or create a ticket",
-                            "auto_fixable": False,
-                        }
-                        self.result.issues.append(issue)
-
-                # Check for debug statements
-                for i, line in enumerate(lines, 1):
-                    if re.search(self.QUALITY_PATTERNS['var_dump'], line) or \
-                            re.search(self.QUALITY_PATTERNS['console_log'], line):
-                        issue = {
-                            "category": IssueCategory.CODE_QUALITY.value,
-                            "severity": IssueSeverity.WARNING.value,
-                            "title": "Debug statement found",
-                            "description": "Debug statement should be removed before production",
-                            "file_path": file_info.relative_path,
-                            "line_number": i,
-                            "suggestion": "Remove debug statements",
-                            "auto_fixable": True,
-                        }
-                        self.result.issues.append(issue)
-
-                # Check for empty catch blocks
-                for i, line in enumerate(lines, 1):
-                    if re.search(self.QUALITY_PATTERNS['empty_catch'], line):
-                        issue = {
-                            "category": IssueCategory.CODE_QUALITY.value,
-                            "severity": IssueSeverity.WARNING.value,
-                            "title": "Empty catch block",
-                            "description": "Empty catch blocks hide errors",
-                            "file_path": file_info.relative_path,
-                            "line_number": i,
-                            "suggestion": "Add error handling or logging in catch block",
-                            "auto_fixable": False,
-                        }
-                        self.result.issues.append(issue)
-
-                # Check file length (potential god class)
-                if file_info.lines > 500:
-                    issue = {
-                        "category": IssueCategory.ARCHITECTURE.value,
-                        "severity": IssueSeverity.WARNING.value,
-                        "title": "Large file detected",
-                        "description": f"File has {file_info.lines} lines, consider splitting",
-                        "file_path": file_info.relative_path,
-                        "line_number": None,
-                        "suggestion": "Consider breaking down into smaller classes/modules",
-                        "auto_fixable": False,
-                    }
-                    self.result.issues.append(issue)
+            for match in engine.scan(content, file_info.language):
+                issue = match.rule.to_issue(file_info.relative_path, match.line_number)
+                issues.append(issue)
+                file_info.has_issues = True
+                file_info.issues.append(issue)
 
-            except Exception as e:
-                logger.warning(f"[SCANNER] Quality check failed for {file_info.path}: {e}")
+        return issues
 
     async def _analyze_dependencies(self, base_path: str):
         """Analyze project dependencies."""
@@ -648,28 +651,24 @@ class ProjectScanner:
         }
 
         # Parse composer.json
-        composer_path = os.path.join(base_path, 'composer.json')
-        if os.path.exists(composer_path):
+        composer = self.snapshot.read_json(os.path.join(base_path, 'composer.json'))
+        if composer is not None:
             try:
-                with open(composer_path, 'r') as f:
-                    composer = json.load(f)
-                    dependencies["php"] = {
-                        "require": composer.get("require", {}),
-                        "require-dev": composer.get("require-dev", {}),
-                    }
+                dependencies["php"] = {
+                    "require": composer.get("require", {}),
+                    "require-dev": composer.get("require-dev", {}),
+                }
             except Exception as e:
                 logger.warning(f"[SCANNER] Failed to parse composer.json: {e}")
 
         # Parse package.json
-        package_path = os.path.join(base_path, 'package.json')
-        if os.path.exists(package_path):
+        package = self.snapshot.read_json(os.path.join(base_path, 'package.json'))
+        if package is not None:
             try:
-                with open(package_path, 'r') as f:
-                    package = json.load(f)
-                    dependencies["npm"] = {
-                        "dependencies": package.get("dependencies", {}),
-                        "devDependencies": package.get("devDependencies", {}),
-                    }
+                dependencies["npm"] = {
+                    "dependencies": package.get("dependencies", {}),
+                    "devDependencies": package.get("devDependencies", {}),
+                }
             except Exception as e:
                 logger.warning(f"[SCANNER] Failed to parse package.json: {e}")
 
@@ -730,28 +729,6 @@ class ProjectScanner:
         await self._store_issues()
 
     async def _store_issues(self):
-        """Store discovered issues in database."""
-        # Clear existing issues
-        stmt = select(ProjectIssue).where(ProjectIssue.project_id == self.project.id)
-        result = await self.db.execute(stmt)
-        existing = result.scalars().all()
-        for issue in existing:
-            await self.db.delete(issue)
-
-        # Add new issues
-        for issue_data in self.result.issues:
-            issue = ProjectIssue(
-                project_id=str(self.project.id),
-                category=issue_data.get("category"),
-                severity=issue_data.get("severity"),
-                title=issue_data.get("title"),
-                description=issue_data.get("description"),
-                file_path=issue_data.get("file_path"),
-                line_number=issue_data.get("line_number"),
-                suggestion=issue_data.get("suggestion"),
-                auto_fixable=issue_data.get("auto_fixable", False),
-                status="open",
-            )
-            self.db.add(issue)
-
-        await self.db.commit()
\ No newline at end of file
+        """Store discovered issues in database, upserting by signature."""
+        await store_issues(self.db, str(self.project.id), self.result.issues)
+        await self.db.commit()
@@ -0,0 +1,135 @@
+"""
+Response memoisation for deterministic Claude calls.
+
+Temperature-0 structured calls (intent analysis, validation) are often
+repeated with byte-identical prompts: a user re-sending a message after a
+network drop, pipeline retries, or test suites. This module keeps a small
+in-process TTL store keyed by a hash of (model, system, messages, schema)
+so duplicates are answered without another API round trip.
+"""
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Any, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseMemo:
+    """
+    Bounded LRU store of Claude responses with a per-entry TTL.
+
+    Entries expire after ``ttl_seconds``; when ``max_entries`` is reached the
+    least recently used entry is evicted.
+    """
+
+    def __init__(self, ttl_seconds: int = 600, max_entries: int = 512):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system: Optional[str],
+        messages: list[dict],
+        schema: Optional[dict] = None,
+    ) -> str:
+        """Hash everything that determines a deterministic response."""
+        payload = json.dumps(
+            {"model": model, "system": system, "messages": messages, "schema": schema},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a live entry, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, content = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return content
+
+    def set(self, key: str, content: str) -> None:
+        """Store a response, evicting the least recently used entries if full."""
+        if not content:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, content)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(
+        self,
+        model: Any,
+        system: Optional[str],
+        messages: list[dict],
+        schema: Optional[dict] = None,
+    ) -> None:
+        """
+        Drop a memoised response, e.g. one the caller could not parse.
+
+        Lets a retry with the same prompt reach the API instead of replaying
+        the rejected response.
+        """
+        model_id = model.value if hasattr(model, "value") else str(model)
+        self._entries.pop(self.make_key(model_id, system, messages, schema), None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict:
+        """Get memo statistics."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Singleton instance, shared by every ClaudeService in the process
+_response_memo: Optional[ResponseMemo] = None
+
+
+def get_response_memo() -> ResponseMemo:
+    """Get or create the process-wide response memo."""
+    global _response_memo
+    if _response_memo is None:
+        _response_memo = ResponseMemo(
+            ttl_seconds=settings.claude_memo_ttl_seconds,
+            max_entries=settings.claude_memo_max_entries,
+        )
+    return _response_memo
@@ -0,0 +1,292 @@
+"""
+Columnar scan results.
+
+A scan describes tens of thousands of files with the same few fields, so
+instead of one object or dict per file the results are kept as columns:
+
+- relative paths packed into one UTF-8 buffer plus an offsets array; a
+  file's row number is its path ID
+- NumPy arrays for sizes and line counts
+- small-integer codes for categorical fields (language, category, ...),
+  with one list of labels per column
+
+Group-by counts and sums, the largest files and histograms are computed
+over whole columns with NumPy, and ``to_bytes`` packs everything into one
+compressed buffer for the database.
+"""
+import json
+import struct
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+# Leading bytes of to_bytes(); bump the version when the layout changes
+MAGIC = b"SCOL"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sBI")  # magic, version, JSON header length
+
+# Numeric columns and their dtypes
+NUMERIC_COLUMNS = {"size": np.int64, "lines": np.int32}
+
+# Bucket edges used when a histogram is asked for without edges
+SIZE_EDGES = (0, 1024, 10 * 1024, 100 * 1024, 1024 * 1024)
+LINE_EDGES = (0, 50, 100, 250, 500, 1000, 2500)
+
+
+def _code_dtype(label_count: int) -> np.dtype:
+    """Smallest unsigned dtype that holds every code of a column."""
+    if label_count <= 1 << 8:
+        return np.dtype(np.uint8)
+    if label_count <= 1 << 16:
+        return np.dtype(np.uint16)
+    return np.dtype(np.uint32)
+
+
+class ScanColumnsBuilder:
+    """Appends files to compact arrays while a scan walks the tree."""
+
+    def __init__(self, categorical: Sequence[str]):
+        self.categorical = tuple(categorical)
+        self._paths: List[bytes] = []
+        self._sizes = array("q")
+        self._lines = array("q")
+        self._codes = {name: array("I") for name in self.categorical}
+        # Label -> code, in first-seen order
+        self._labels: Dict[str, Dict[Optional[str], int]] = {name: {} for name in self.categorical}
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def append(self, path: str, size: int, lines: int, **values: Optional[str]) -> int:
+        """Add a file and return its path ID."""
+        self._paths.append(path.encode("utf-8"))
+        self._sizes.append(size)
+        self._lines.append(lines)
+        for name in self.categorical:
+            labels = self._labels[name]
+            value = values.get(name)
+            code = labels.get(value)
+            if code is None:
+                code = labels[value] = len(labels)
+            self._codes[name].append(code)
+        return len(self._paths) - 1
+
+    def build(self) -> "ScanColumns":
+        lengths = np.fromiter(map(len, self._paths), dtype=np.int64, count=len(self._paths))
+        codes = {}
+        for name in self.categorical:
+            dtype = _code_dtype(len(self._labels[name]))
+            codes[name] = np.frombuffer(self._codes[name], dtype=np.uint32).astype(dtype)
+        return ScanColumns(
+            path_data=b"".join(self._paths),
+            path_offsets=_offsets(lengths),
+            columns={
+                "size": np.frombuffer(self._sizes, dtype=np.int64).astype(NUMERIC_COLUMNS["size"]),
+                "lines": np.frombuffer(self._lines, dtype=np.int64).astype(NUMERIC_COLUMNS["lines"]),
+            },
+            codes=codes,
+            labels={name: list(self._labels[name]) for name in self.categorical},
+        )
+
+
+def _offsets(lengths: np.ndarray) -> np.ndarray:
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+class ScanColumns:
+    """Per-file scan results as columns, indexed by path ID."""
+
+    def __init__(
+        self,
+        path_data: bytes,
+        path_offsets: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        codes: Dict[str, np.ndarray],
+        labels: Dict[str, List[Optional[str]]],
+    ):
+        self._path_data = path_data
+        self._path_offsets = path_offsets
+        self.columns = columns
+        self.codes = codes
+        self.labels = labels
+
+    def __len__(self) -> int:
+        return len(self._path_offsets) - 1
+
+    @property
+    def categorical(self) -> List[str]:
+        return list(self.codes)
+
+    # =========================================================================
+    # ROWS
+    # =========================================================================
+
+    def path(self, path_id: int) -> str:
+        start, end = self._path_offsets[path_id], self._path_offsets[path_id + 1]
+        return self._path_data[start:end].decode("utf-8")
+
+    def paths(self) -> List[str]:
+        return [self.path(path_id) for path_id in range(len(self))]
+
+    def value(self, name: str, path_id: int) -> Optional[str]:
+        """Label of a categorical column for one file."""
+        return self.labels[name][self.codes[name][path_id]]
+
+    def row(self, path_id: int) -> Dict[str, Any]:
+        row: Dict[str, Any] = {"path": self.path(path_id)}
+        for name, values in self.columns.items():
+            row[name] = int(values[path_id])
+        for name in self.codes:
+            row[name] = self.value(name, path_id)
+        return row
+
+    def rows(self, path_ids: Optional[Iterable[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Files as dicts, built one at a time."""
+        for path_id in range(len(self)) if path_ids is None else path_ids:
+            yield self.row(int(path_id))
+
+    def isin(self, name: str, values: Iterable[Optional[str]]) -> np.ndarray:
+        """Boolean mask of files whose ``name`` label is one of ``values``."""
+        wanted = set(values)
+        selected = [code for code, label in enumerate(self.labels[name]) if label in wanted]
+        return np.isin(self.codes[name], np.asarray(selected, dtype=self.codes[name].dtype))
+
+    # =========================================================================
+    # AGGREGATES
+    # =========================================================================
+
+    def total(self, column: str) -> int:
+        return int(self.columns[column].sum(dtype=np.int64))
+
+    def count_by(self, name: str) -> Dict[str, int]:
+        """Number of files per label, in first-seen order; files without a label are left out."""
+        counts = np.bincount(self.codes[name], minlength=len(self.labels[name]))
+        return {
+            label: int(count)
+            for label, count in zip(self.labels[name], counts)
+            if label is not None and count
+        }
+
+    def sum_by(self, name: str, column: str) -> Dict[str, int]:
+        """Sum of a numeric column per label, for labels that have files."""
+        counts = np.bincount(self.codes[name], minlength=len(self.labels[name]))
+        sums = np.bincount(
+            self.codes[name],
+            weights=self.columns[column].astype(np.float64),
+            minlength=len(self.labels[name]),
+        )
+        return {
+            label: int(total)
+            for label, total, count in zip(self.labels[name], sums, counts)
+            if label is not None and count
+        }
+
+    def largest(self, n: int = 20, by: str = "lines") -> List[Dict[str, Any]]:
+        """
+        The n files with the highest ``by``, highest first.
+
+        Ties keep scan order, like a stable sort of every file would.
+        """
+        values = self.columns[by]
+        if n <= 0 or not len(values):
+            return []
+        if len(values) > n:
+            # Everything tied with the n-th largest value is a candidate
+            threshold = np.partition(values, len(values) - n)[len(values) - n]
+            candidates = np.flatnonzero(values >= threshold)
+        else:
+            candidates = np.arange(len(values))
+        order = candidates[np.argsort(-values[candidates].astype(np.int64), kind="stable")][:n]
+        return list(self.rows(order))
+
+    def histogram(self, column: str, edges: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """
+        File counts per bucket of a numeric column.
+
+        Bucket i holds values in [edges[i], edges[i + 1]); the last one is
+        open-ended and reported with ``max`` None.
+        """
+        if edges is None:
+            edges = SIZE_EDGES if column == "size" else LINE_EDGES
+        bounds = np.asarray(edges, dtype=np.int64)
+        buckets = np.searchsorted(bounds, self.columns[column], side="right") - 1
+        counts = np.bincount(buckets[buckets >= 0], minlength=len(bounds))
+        return [
+            {
+                "min": int(bounds[i]),
+                "max": int(bounds[i + 1]) if i + 1 < len(bounds) else None,
+                "count": int(counts[i]),
+            }
+            for i in range(len(bounds))
+        ]
+
+    def summary(self, top: int = 20, by: str = "lines") -> Dict[str, Any]:
+        """Totals, per-label counts and line sums, the largest files and histograms."""
+        return {
+            "total_files": len(self),
+            "total_lines": self.total("lines"),
+            "total_size_bytes": self.total("size"),
+            "counts": {name: self.count_by(name) for name in self.codes},
+            "lines": {name: self.sum_by(name, "lines") for name in self.codes},
+            "largest": self.largest(top, by=by),
+            "size_histogram": self.histogram("size"),
+            "line_histogram": self.histogram("lines"),
+        }
+
+    # =========================================================================
+    # SERIALISATION
+    # =========================================================================
+
+    def to_bytes(self) -> bytes:
+        """
+        Compact binary form: a small JSON header (labels and dtypes) followed
+        by the zlib-compressed columns. Path lengths are stored instead of
+        offsets.
+        """
+        lengths = np.diff(self._path_offsets).astype(np.uint32)
+        arrays = [lengths]
+        arrays.extend(self.columns[name] for name in NUMERIC_COLUMNS)
+        arrays.extend(self.codes.values())
+        header = json.dumps({
+            "count": len(self),
+            "path_bytes": len(self._path_data),
+            "labels": self.labels,
+            "code_dtypes": {name: codes.dtype.str for name, codes in self.codes.items()},
+        }).encode("utf-8")
+        body = self._path_data + b"".join(a.astype(a.dtype.newbyteorder("<")).tobytes() for a in arrays)
+        return _HEADER.pack(MAGIC, FORMAT_VERSION, len(header)) + header + zlib.compress(body, 6)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ScanColumns":
+        magic, version, header_length = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported scan columns format: {magic!r} v{version}")
+        start = _HEADER.size
+        header = json.loads(data[start:start + header_length])
+        body = memoryview(zlib.decompress(data[start + header_length:]))
+        count = header["count"]
+
+        position = header["path_bytes"]
+        path_data = bytes(body[:position])
+
+        def take(dtype) -> np.ndarray:
+            nonlocal position
+            dtype = np.dtype(dtype).newbyteorder("<")
+            values = np.frombuffer(body, dtype=dtype, count=count, offset=position)
+            position += dtype.itemsize * count
+            return values.astype(dtype.newbyteorder("="))
+
+        lengths = take(np.uint32)
+        columns = {name: take(dtype) for name, dtype in NUMERIC_COLUMNS.items()}
+        codes = {name: take(dtype) for name, dtype in header["code_dtypes"].items()}
+        return cls(
+            path_data=path_data,
+            path_offsets=_offsets(lengths.astype(np.int64)),
+            columns=columns,
+            codes=codes,
+            labels=header["labels"],
+        )
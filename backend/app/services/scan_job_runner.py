@@ -0,0 +1,625 @@
+"""
+Scan Job Runner.
+
+Project scans run in a pool of worker processes instead of the API's event
+loop, so their file I/O and regex work never stalls other requests. Each
+scan is recorded in ``scan_jobs`` and writes its progress to the scan event
+log, which clients follow over SSE instead of polling the scan status.
+
+Workers only compute (stack, file stats, structure, health check and AI
+context) and report progress through a queue; the runner stores the
+results on the project from the API process. At most ``max_per_host``
+scans run at once on a host, counted over the running jobs of every API
+process there; scans beyond that wait in FIFO order, and a project never
+has two scans queued or running. Cancelling a running scan sets a flag the
+worker checks between phases and every few hundred files.
+
+A running job holds a lease that its API process renews every third of
+``lease_seconds``. Jobs whose lease ran out lost their process and are
+marked interrupted by whichever process notices first.
+"""
+import asyncio
+import logging
+import multiprocessing
+import queue
+import socket
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, AsyncGenerator, Callable, Deque, Dict, Optional, Set
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import aliased
+
+from app.agents.events import complete, error as error_event, job_queued, progress_update
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.models.models import Project, ProjectStatus, ScanJob, ScanJobStatus, generate_uuid
+from app.services.ai_context_generator import AIContextGenerator
+from app.services.event_log import EventLog, get_scan_event_log
+from app.services.file_scanner import FileScanner
+from app.services.file_snapshot import get_file_snapshot
+from app.services.health_checker import HealthChecker
+from app.services.issue_store import store_issues
+from app.services.sse_multiplexer import HEARTBEAT
+from app.services.stack_detector import StackDetector
+
+logger = logging.getLogger(__name__)
+
+# How long one wait on the progress queue blocks before checking the worker
+PROGRESS_WAIT_SECONDS = 0.5
+# How long a job waits before trying again when its host is at max_per_host
+CLAIM_RETRY_SECONDS = 2.0
+# Phases after which the project shows as analyzing rather than scanning
+ANALYZING_PHASES = frozenset({"health_check", "ai_context", "saving"})
+
+# Runs a scan: (clone_path, previous results, progress queue, cancel flag) -> results
+ScanFunction = Callable[[str, Optional[dict], Any, Any], Dict[str, Any]]
+
+
+class ScanCancelled(Exception):
+    """Raised in a worker when its scan has been cancelled."""
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+def run_scan(
+    clone_path: str,
+    previous: Optional[dict],
+    progress: Any,
+    cancel: Any,
+) -> Dict[str, Any]:
+    """
+    Scan a clone. Runs in a worker process.
+
+    ``previous`` holds the project's stored stack, stack fingerprint and
+    health check, which are reused where their inputs are unchanged.
+    ``progress`` receives (phase, percent, message) tuples; ``cancel`` is an
+    Event checked every time progress is reported. The file snapshot cache
+    lives in the worker, so it stays warm across scans run by the same
+    process.
+    """
+    previous = previous or {}
+    def report(phase: str, percent: int, message: str) -> None:
+        if cancel.is_set():
+            raise ScanCancelled()
+        progress.put((phase, percent, message))
+
+    report("detecting_stack", 5, "Detecting technology stack...")
+    snapshot = get_file_snapshot(clone_path)
+    stack_detector = StackDetector(
+        clone_path,
+        snapshot=snapshot,
+        previous=previous.get("stack"),
+        previous_fingerprint=previous.get("stack_fingerprint"),
+    )
+    stack = stack_detector.detect()
+
+    report("scanning_files", 15, "Scanning files...")
+    file_scanner = FileScanner(clone_path, snapshot=snapshot)
+    file_stats = file_scanner.scan(
+        progress_callback=lambda count, message: report("scanning_files", 15, message),
+    )
+    structure = file_scanner.get_structure_analysis()
+    report("scanning_files", 50, f"Scanned {file_stats.get('total_files', 0)} files")
+
+    report("health_check", 60, "Running health checks...")
+    health_checker = HealthChecker(
+        clone_path, stack, file_stats, snapshot=snapshot, previous=previous.get("health_check"),
+    )
+    health_check = health_checker.check()
+
+    report("ai_context", 80, "Generating AI context...")
+    ai_context = AIContextGenerator(clone_path, stack, file_stats, structure, snapshot=snapshot).generate()
+
+    return {
+        "stack": stack,
+        "stack_fingerprint": stack_detector.fingerprint,
+        "stack_reused": stack_detector.reused,
+        "file_stats": file_stats,
+        "file_columns": file_scanner.columns.to_bytes(),
+        "structure": structure,
+        "health_check": health_check,
+        "health_recomputed": health_checker.recomputed,
+        "issues": [{**issue.to_dict(), "signature": issue.signature} for issue in health_checker.get_issues()],
+        "ai_context": ai_context,
+    }
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+class ScanJobRunner:
+    """Runs project scans in worker processes within a per-host limit."""
+
+    def __init__(
+        self,
+        max_per_host: int = 2,
+        lease_seconds: int = 60,
+        session_factory=async_session_factory,
+        event_log: Optional[EventLog] = None,
+        use_processes: bool = True,
+        scan_fn: ScanFunction = run_scan,
+    ):
+        self.max_per_host = max_per_host
+        self.lease_seconds = lease_seconds
+        self.session_factory = session_factory
+        self._event_log = event_log
+        self.use_processes = use_processes
+        self.scan_fn = scan_fn
+        self.host = socket.gethostname()
+
+        self._executor: Optional[Executor] = None
+        self._manager = None
+        self._pending: Deque[ScanJob] = deque()
+        self._running: Dict[str, asyncio.Task] = {}
+        # Jobs this process has claimed and holds the lease of
+        self._claimed: Set[str] = set()
+        self._lease_task: Optional[asyncio.Task] = None
+        # Project -> job id, for queued and running jobs
+        self._projects: Dict[str, str] = {}
+        self._cancel_flags: Dict[str, Any] = {}
+        self._cancelled: Set[str] = set()
+
+    @property
+    def event_log(self) -> EventLog:
+        return self._event_log or get_scan_event_log()
+
+    def is_active(self, project_id: str) -> bool:
+        """Whether a scan of this project is queued or running here."""
+        return project_id in self._projects
+
+    @property
+    def running_count(self) -> int:
+        return len(self._running)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                # The API process runs an event loop and threads, which fork does not copy safely
+                context = multiprocessing.get_context("spawn")
+                self._manager = context.Manager()
+                self._executor = ProcessPoolExecutor(max_workers=self.max_per_host, mp_context=context)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_per_host, thread_name_prefix="scan")
+        return self._executor
+
+    def _channels(self):
+        """A progress queue and a cancel flag the worker can use."""
+        self._pool()
+        if self._manager is not None:
+            return self._manager.Queue(), self._manager.Event()
+        return queue.Queue(), threading.Event()
+
+    # =========================================================================
+    # SUBMISSION & SCHEDULING
+    # =========================================================================
+
+    async def submit(self, user_id: str, project_id: str) -> ScanJob:
+        """Record a scan job, start its event-log run and schedule it."""
+        job = ScanJob(
+            id=generate_uuid(),
+            user_id=user_id,
+            project_id=project_id,
+            status=ScanJobStatus.QUEUED.value,
+            progress=0,
+            message="Starting scan...",
+            created_at=datetime.utcnow(),
+        )
+        async with self.session_factory() as db:
+            db.add(job)
+            await db.commit()
+
+        await self.event_log.begin(job.id)
+        await self._enqueue(job)
+        logger.info(f"[SCAN_JOBS] Submitted job={job.id} project={project_id}")
+        return job
+
+    async def _enqueue(self, job: ScanJob) -> None:
+        self._pending.append(job)
+        self._projects[job.project_id] = job.id
+        self._dispatch()
+
+        if job in self._pending:
+            position = self._pending.index(job) + 1
+            await self.event_log.append(job.id, job_queued(job.id, position))
+
+    def _dispatch(self) -> None:
+        """Start pending jobs, oldest first, while worker slots are free."""
+        while self._pending and len(self._running) < self.max_per_host:
+            job = self._pending.popleft()
+            self._running[job.id] = asyncio.create_task(self._run(job))
+
+    def _release(self, job: ScanJob) -> None:
+        self._running.pop(job.id, None)
+        self._claimed.discard(job.id)
+        self._cancelled.discard(job.id)
+        if self._projects.get(job.project_id) == job.id:
+            del self._projects[job.project_id]
+
+    async def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job; False if this runner does not have it.
+
+        A running scan stops at its next progress report.
+        """
+        for job in self._pending:
+            if job.id == job_id:
+                self._pending.remove(job)
+                self._release(job)
+                await self._cancel_queued(job)
+                return True
+
+        if job_id not in self._running:
+            return False
+        # A job still waiting for a slot on this host stops in _claim
+        self._cancelled.add(job_id)
+        flag = self._cancel_flags.get(job_id)
+        if flag is not None:
+            flag.set()
+        logger.info(f"[SCAN_JOBS] Cancelling running job {job_id}")
+        return True
+
+    # =========================================================================
+    # EXECUTION
+    # =========================================================================
+
+    async def _cancel_queued(self, job: ScanJob) -> None:
+        await self._finish(job, ScanJobStatus.CANCELLED)
+        await self._reset_project(job, ProjectStatus.READY, "Scan cancelled")
+        await self.event_log.append(job.id, complete(success=False, error="Scan cancelled"))
+        await self.event_log.end(job.id)
+        logger.info(f"[SCAN_JOBS] Cancelled queued job {job.id}")
+
+    async def _claim(self, job: ScanJob) -> bool:
+        """
+        Move the job from queued to running once this host has a free slot.
+
+        False if another worker has it or it was cancelled while waiting.
+        """
+        running = aliased(ScanJob)
+        while job.id not in self._cancelled:
+            now = datetime.utcnow()
+            running_here = (
+                select(func.count())
+                .select_from(running)
+                .where(
+                    running.status == ScanJobStatus.RUNNING.value,
+                    running.host == self.host,
+                    running.heartbeat_at >= now - timedelta(seconds=self.lease_seconds),
+                )
+                .scalar_subquery()
+            )
+            async with self.session_factory() as db:
+                # One claim at a time per host, so the count stays true until commit
+                await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(self.host))))
+                result = await db.execute(
+                    update(ScanJob)
+                    .where(
+                        ScanJob.id == job.id,
+                        ScanJob.status == ScanJobStatus.QUEUED.value,
+                        running_here < self.max_per_host,
+                    )
+                    .values(status=ScanJobStatus.RUNNING.value, host=self.host, started_at=now, heartbeat_at=now)
+                )
+                claimed = result.rowcount == 1
+                if not claimed:
+                    state = (await db.execute(select(ScanJob.status).where(ScanJob.id == job.id))).scalar()
+                await db.commit()
+
+            if claimed:
+                self._claimed.add(job.id)
+                return True
+            if state != ScanJobStatus.QUEUED.value:
+                return False
+            await asyncio.sleep(CLAIM_RETRY_SECONDS)
+        return False
+
+    async def _finish(self, job: ScanJob, status: ScanJobStatus, error: Optional[str] = None) -> None:
+        values = {"status": status.value, "error": error, "finished_at": datetime.utcnow()}
+        if status == ScanJobStatus.COMPLETED:
+            values.update(progress=100, message="Scan complete")
+        async with self.session_factory() as db:
+            await db.execute(update(ScanJob).where(ScanJob.id == job.id).values(**values))
+            await db.commit()
+
+    async def _reset_project(
+        self,
+        job: ScanJob,
+        project_status: ProjectStatus,
+        message: str,
+        error: Optional[str] = None,
+    ) -> None:
+        """Take the project out of the scanning state after a scan that did not complete."""
+        async with self.session_factory() as db:
+            await db.execute(
+                update(Project)
+                .where(Project.id == job.project_id)
+                .values(status=project_status.value, scan_progress=0, scan_message=message, error_message=error)
+            )
+            await db.commit()
+
+    async def _report(self, job: ScanJob, phase: str, percent: int, message: str, persist: bool) -> None:
+        """Stream a progress update; ``persist`` also records it on the job and project."""
+        await self.event_log.append(job.id, progress_update(phase, percent, message))
+        if not persist:
+            return
+        project_status = ProjectStatus.ANALYZING if phase in ANALYZING_PHASES else ProjectStatus.SCANNING
+        async with self.session_factory() as db:
+            await db.execute(
+                update(ScanJob).where(ScanJob.id == job.id).values(progress=percent, message=message)
+            )
+            await db.execute(
+                update(Project)
+                .where(Project.id == job.project_id)
+                .values(status=project_status.value, scan_progress=percent, scan_message=message)
+            )
+            await db.commit()
+
+    async def _execute(self, job: ScanJob, clone_path: str, previous: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the scan in the pool, relaying its progress until it returns."""
+        if job.id in self._cancelled:
+            raise ScanCancelled()
+
+        progress, cancel = self._channels()
+        self._cancel_flags[job.id] = cancel
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pool(), self.scan_fn, clone_path, previous, progress, cancel)
+        last_percent = None
+        try:
+            while True:
+                try:
+                    reported = await asyncio.to_thread(progress.get, True, PROGRESS_WAIT_SECONDS)
+                except queue.Empty:
+                    if future.done():
+                        break
+                    continue
+                phase, percent, message = reported
+                # Per-file messages only go to the stream; phase changes are recorded
+                await self._report(job, phase, percent, message, persist=percent != last_percent)
+                last_percent = percent
+            return await future
+        finally:
+            self._cancel_flags.pop(job.id, None)
+            if not future.done():
+                cancel.set()
+
+    async def _store_result(self, job: ScanJob, result: Dict[str, Any]) -> None:
+        """Write the scan results to the project and upsert its issues."""
+        async with self.session_factory() as db:
+            project = (await db.execute(select(Project).where(Project.id == job.project_id))).scalar_one()
+
+            stack = result["stack"]
+            project.stack = stack
+            project.stack_fingerprint = result["stack_fingerprint"]
+            backend = stack.get("backend", {})
+            if backend.get("framework") == "laravel":
+                project.laravel_version = backend.get("version")
+                project.php_version = backend.get("php_version")
+
+            project.file_stats = result["file_stats"]
+            project.scan_columns = result["file_columns"]
+            project.structure = result["structure"]
+            project.health_score = result["health_check"].get("score")
+            project.health_check = result["health_check"]
+            project.ai_context = result["ai_context"]
+
+            await store_issues(db, job.project_id, result["issues"])
+
+            project.scan_progress = 100
+            project.scan_message = "Scan complete"
+            project.scanned_at = datetime.utcnow()
+            project.status = ProjectStatus.READY.value
+            project.error_message = None
+            await db.commit()
+
+    async def _run(self, job: ScanJob) -> None:
+        status, error = ScanJobStatus.COMPLETED, None
+        claimed = False
+        try:
+            claimed = await self._claim(job)
+            if not claimed:
+                if job.id in self._cancelled:
+                    await self._cancel_queued(job)
+                else:
+                    logger.info(f"[SCAN_JOBS] Job {job.id} already claimed elsewhere, skipping")
+                return
+
+            async with self.session_factory() as db:
+                result = await db.execute(select(Project).where(Project.id == job.project_id))
+                project = result.scalar_one_or_none()
+                if project is None or not project.clone_path:
+                    raise ValueError("Project has not been cloned yet")
+                clone_path = project.clone_path
+                previous = {
+                    "stack": project.stack,
+                    "stack_fingerprint": project.stack_fingerprint,
+                    "health_check": project.health_check,
+                }
+
+            logger.info(f"[SCAN_JOBS] Running job={job.id} project={job.project_id} on {self.host}")
+            scan = await self._execute(job, clone_path, previous)
+
+            await self._report(job, "saving", 90, "Saving results...", persist=True)
+            await self._store_result(job, scan)
+            await self.event_log.append(job.id, complete(
+                success=True,
+                summary={
+                    "health_score": scan["health_check"].get("score"),
+                    "total_files": scan["file_stats"].get("total_files", 0),
+                    "issues": len(scan["issues"]),
+                    "stack_reused": scan["stack_reused"],
+                    "health_recomputed": scan["health_recomputed"],
+                },
+            ))
+            logger.info(f"[SCAN_JOBS] Job {job.id} completed")
+
+        except ScanCancelled:
+            status = ScanJobStatus.CANCELLED
+            logger.info(f"[SCAN_JOBS] Job {job.id} cancelled")
+            await self._reset_project(job, ProjectStatus.READY, "Scan cancelled")
+            await self.event_log.append(job.id, complete(success=False, error="Scan cancelled"))
+        except asyncio.CancelledError:
+            status, error = ScanJobStatus.INTERRUPTED, "Worker stopped before the scan finished"
+            logger.warning(f"[SCAN_JOBS] Job {job.id} interrupted")
+        except Exception as e:
+            status, error = ScanJobStatus.FAILED, str(e)
+            logger.exception(f"[SCAN_JOBS] Job {job.id} failed: {e}")
+            await self._reset_project(job, ProjectStatus.ERROR, "Scan failed", f"Scan failed: {e}")
+            await self.event_log.append(job.id, error_event(str(e)))
+        finally:
+            self._release(job)
+            if claimed:
+                try:
+                    await self._finish(job, status, error)
+                    await self.event_log.end(job.id)
+                except Exception as e:
+                    logger.warning(f"[SCAN_JOBS] Could not record outcome of job {job.id}: {e}")
+            self._dispatch()
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    async def _renew_leases(self) -> None:
+        if not self._claimed:
+            return
+        async with self.session_factory() as db:
+            await db.execute(
+                update(ScanJob)
+                .where(ScanJob.id.in_(list(self._claimed)), ScanJob.status == ScanJobStatus.RUNNING.value)
+                .values(heartbeat_at=datetime.utcnow())
+            )
+            await db.commit()
+
+    async def _interrupt_expired(self) -> int:
+        """
+        Mark running jobs whose lease ran out as interrupted, on any host.
+
+        Their projects are moved out of the scanning state so they can be
+        scanned again. Jobs from before leases existed expire by start time.
+        """
+        now = datetime.utcnow()
+        expired_before = now - timedelta(seconds=self.lease_seconds)
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(ScanJob)
+                .where(
+                    ScanJob.status == ScanJobStatus.RUNNING.value,
+                    func.coalesce(ScanJob.heartbeat_at, ScanJob.started_at) < expired_before,
+                )
+                .values(
+                    status=ScanJobStatus.INTERRUPTED.value,
+                    error="Worker stopped before the scan finished",
+                    finished_at=now,
+                )
+                .returning(ScanJob.project_id)
+            )
+            interrupted = [row[0] for row in result.all()]
+            if interrupted:
+                await db.execute(
+                    update(Project)
+                    .where(
+                        Project.id.in_(interrupted),
+                        Project.status.in_([ProjectStatus.SCANNING.value, ProjectStatus.ANALYZING.value]),
+                    )
+                    .values(
+                        status=ProjectStatus.ERROR.value,
+                        scan_progress=0,
+                        error_message="Scan interrupted, start it again",
+                    )
+                )
+            await db.commit()
+        if interrupted:
+            logger.info(f"[SCAN_JOBS] Interrupted {len(interrupted)} job(s) whose lease ran out")
+        return len(interrupted)
+
+    async def _keep_leases(self) -> None:
+        """Renew this process's leases and settle expired ones until shutdown."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self._renew_leases()
+                await self._interrupt_expired()
+            except Exception as e:
+                logger.warning(f"[SCAN_JOBS] Could not renew scan leases: {e}")
+
+    async def start(self) -> None:
+        """
+        Settle jobs left over from stopped processes, resume queued ones and
+        start renewing leases.
+
+        A restart only interrupts jobs whose lease ran out, so scans of
+        other API processes on the same host keep running.
+        """
+        await self._interrupt_expired()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(ScanJob)
+                .where(ScanJob.status == ScanJobStatus.QUEUED.value)
+                .order_by(ScanJob.created_at)
+            )
+            queued = result.scalars().all()
+
+        for job in queued:
+            if not self.is_active(job.project_id):
+                await self._enqueue(job)
+        if queued:
+            logger.info(f"[SCAN_JOBS] Resumed {len(queued)} queued job(s)")
+        if self._lease_task is None:
+            self._lease_task = asyncio.create_task(self._keep_leases())
+
+    async def shutdown(self) -> None:
+        """Stop running scans (recorded as interrupted); queued jobs stay queued."""
+        if self._lease_task is not None:
+            self._lease_task.cancel()
+            self._lease_task = None
+        self._pending.clear()
+        for flag in self._cancel_flags.values():
+            flag.set()
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+
+async def tail_scan_events(job_id: str, last_event_id: int = 0) -> AsyncGenerator[bytes, None]:
+    """Yield a scan job's logged events after ``last_event_id`` until it ends."""
+    batches = get_scan_event_log().subscribe_batches(
+        job_id,
+        after_id=last_event_id,
+        idle_timeout=settings.chat_sse_heartbeat_seconds,
+    )
+    async for batch in batches:
+        yield ("".join(event.to_sse() for event in batch) if batch else HEARTBEAT).encode()
+
+
+# Singleton instance
+_scan_job_runner: Optional[ScanJobRunner] = None
+
+
+def get_scan_job_runner() -> ScanJobRunner:
+    """Get or create the scan job runner."""
+    global _scan_job_runner
+    if _scan_job_runner is None:
+        _scan_job_runner = ScanJobRunner(
+            max_per_host=settings.scan_job_max_per_host,
+            lease_seconds=settings.scan_job_lease_seconds,
+        )
+    return _scan_job_runner
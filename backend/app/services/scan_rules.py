@@ -0,0 +1,183 @@
+"""
+Scan rule engine.
+
+Evaluates every line-based security and quality rule against a file in a
+single pass. Each rule names literals, one of which appears in any line it
+can match; the engine finds those literals in the lowercased content with
+``str.find`` and only runs a rule's regex on the lines that contain one.
+Rules without literals are found with one combined alternation of their
+patterns instead.
+
+Rules are matched per line, exactly as if each pattern were run over each
+line on its own, and every match reports the rule and the line.
+"""
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Set, Tuple
+
+_NEWLINE = re.compile("\n")
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    """A line-based check and the issue it reports."""
+    id: str
+    pattern: str
+    category: str
+    severity: str
+    title: str
+    description: str
+    suggestion: str
+    languages: FrozenSet[str]
+    # Lowercase substrings, at least one of which is in every matching line
+    literals: Tuple[str, ...] = ()
+    ignore_case: bool = False
+    auto_fixable: bool = False
+
+    def compile(self) -> Pattern:
+        return re.compile(self.pattern, re.IGNORECASE if self.ignore_case else 0)
+
+    def to_issue(self, file_path: str, line_number: int) -> Dict:
+        """Issue dict in the shape ProjectScanner stores."""
+        return {
+            "category": self.category,
+            "severity": self.severity,
+            "title": self.title,
+            "description": self.description,
+            "file_path": file_path,
+            "line_number": line_number,
+            "suggestion": self.suggestion,
+            "auto_fixable": self.auto_fixable,
+            "rule": self.id,
+        }
+
+
+@dataclass(frozen=True)
+class RuleMatch:
+    """A rule that matched, with the line it matched on."""
+    rule: ScanRule
+    line_number: int
+    line: str
+
+
+@dataclass
+class _LanguagePlan:
+    """Rules for one language, arranged for a single pass."""
+    rules: List[ScanRule]
+    patterns: List[Pattern]
+    # literal -> indexes of the rules it can trigger
+    literals: List[Tuple[str, Tuple[int, ...]]]
+    # Combined pattern and indexes for rules without literals
+    unfiltered: Optional[Pattern]
+    unfiltered_ids: Tuple[int, ...]
+
+
+class RuleEngine:
+    """Single-pass evaluation of many ScanRules."""
+
+    def __init__(self, rules: Iterable[ScanRule]):
+        self.rules: List[ScanRule] = list(rules)
+        self._compiled: Dict[str, Pattern] = {rule.id: rule.compile() for rule in self.rules}
+        self._plans: Dict[str, Optional[_LanguagePlan]] = {}
+
+    def _plan(self, language: str) -> Optional[_LanguagePlan]:
+        """Prefilter plan for a language, built on first use."""
+        if language in self._plans:
+            return self._plans[language]
+
+        rules = [rule for rule in self.rules if language in rule.languages]
+        plan = None
+        if rules:
+            by_literal: Dict[str, List[int]] = defaultdict(list)
+            unfiltered_ids = []
+            for index, rule in enumerate(rules):
+                if rule.literals:
+                    for literal in rule.literals:
+                        by_literal[literal.lower()].append(index)
+                else:
+                    unfiltered_ids.append(index)
+
+            unfiltered = None
+            if unfiltered_ids:
+                unfiltered = re.compile("|".join(
+                    f"(?i:{rules[i].pattern})" if rules[i].ignore_case else f"(?:{rules[i].pattern})"
+                    for i in unfiltered_ids
+                ))
+            plan = _LanguagePlan(
+                rules=rules,
+                patterns=[self._compiled[rule.id] for rule in rules],
+                literals=[(literal, tuple(ids)) for literal, ids in by_literal.items()],
+                unfiltered=unfiltered,
+                unfiltered_ids=tuple(unfiltered_ids),
+            )
+        self._plans[language] = plan
+        return plan
+
+    def applies_to(self, language: str) -> bool:
+        return self._plan(language) is not None
+
+    def scan(self, content: str, language: str) -> List[RuleMatch]:
+        """All (rule, line) matches in the content, in line order."""
+        plan = self._plan(language)
+        if plan is None or not content:
+            return []
+
+        # Line index -> rules worth running on it
+        candidates: Dict[int, Set[int]] = defaultdict(set)
+        newlines: Optional[List[int]] = None
+
+        # Lowercasing never adds or removes newlines, so line indexes agree
+        lowered = content.lower()
+        for literal, rule_ids in plan.literals:
+            pos = lowered.find(literal)
+            if pos == -1:
+                continue
+            if newlines is None:
+                newlines = [m.start() for m in _NEWLINE.finditer(lowered)]
+            while pos != -1:
+                line_index = bisect_left(newlines, pos)
+                candidates[line_index].update(rule_ids)
+                # One hit per line is enough
+                if line_index >= len(newlines):
+                    break
+                pos = lowered.find(literal, newlines[line_index] + 1)
+
+        if plan.unfiltered is not None:
+            self._unfiltered_candidates(content, plan, candidates)
+
+        if not candidates:
+            return []
+
+        lines = content.split("\n")
+        matches: List[RuleMatch] = []
+        for line_index in sorted(candidates):
+            line = lines[line_index]
+            for rule_index in sorted(candidates[line_index]):
+                if plan.patterns[rule_index].search(line):
+                    matches.append(RuleMatch(rule=plan.rules[rule_index], line_number=line_index + 1, line=line))
+        return matches
+
+    @staticmethod
+    def _unfiltered_candidates(content: str, plan: _LanguagePlan, candidates: Dict[int, Set[int]]) -> None:
+        """Mark lines where the combined pattern of literal-less rules matches."""
+        search = plan.unfiltered.search
+        pos = 0
+        line_index = 0
+        counted_to = 0
+        while pos <= len(content):
+            # The combined pattern may match across lines, so it only says
+            # where the next candidate line starts
+            found = search(content, pos)
+            if found is None:
+                return
+            start = content.rfind("\n", 0, found.start()) + 1
+            line_index += content.count("\n", counted_to, start)
+            counted_to = start
+            candidates[line_index].update(plan.unfiltered_ids)
+
+            end = content.find("\n", found.start())
+            if end == -1:
+                return
+            pos = end + 1
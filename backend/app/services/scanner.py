@@ -2,12 +2,14 @@
 Laravel project scanner service.
 Scans Laravel project directories and returns file information.
 """
-import os
-import hashlib
 import logging
 from pathlib import Path
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
+
+from app.services.file_snapshot import FileSnapshot, get_file_snapshot
+from app.services.file_walker import FileWalker, WalkedFile
+from app.services.scan_columns import ScanColumns, ScanColumnsBuilder
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +44,25 @@ INCLUDED_EXTENSIONS = {
     ".env.example",
 }
 
+# ScanStats fields counted from the type and laravel_type columns
+TYPE_STATS = {
+    "php": "php_files",
+    "blade": "blade_files",
+    "vue": "vue_files",
+    "javascript": "js_files",
+    "typescript": "ts_files",
+    "json": "json_files",
+}
+LARAVEL_TYPE_STATS = {
+    "controller": "controllers",
+    "model": "models",
+    "migration": "migrations",
+    "view": "views",
+    "route": "routes",
+    "test": "tests",
+    "config": "config_files",
+}
+
 # Laravel type detection patterns
 LARAVEL_TYPE_PATTERNS = {
     "controller": [
@@ -153,7 +174,7 @@ class FileInfo:
     type: str  # File extension type (php, vue, js, etc.)
     size: int
     laravel_type: str  # Laravel specific type (controller, model, etc.)
-    hash: str  # File content hash for change detection
+    hash: str  # Git blob ID of the content, for change detection
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -181,6 +202,18 @@ class ScanStats:
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
+    @classmethod
+    def from_columns(cls, columns: ScanColumns) -> "ScanStats":
+        """Count files per type and Laravel type over the scan columns."""
+        stats = cls(total_files=len(columns), total_size_bytes=columns.total("size"))
+        for file_type, count in columns.count_by("type").items():
+            if file_type in TYPE_STATS:
+                setattr(stats, TYPE_STATS[file_type], count)
+        for laravel_type, count in columns.count_by("laravel_type").items():
+            if laravel_type in LARAVEL_TYPE_STATS:
+                setattr(stats, LARAVEL_TYPE_STATS[laravel_type], count)
+        return stats
+
 
 @dataclass
 class ScanResult:
@@ -189,6 +222,8 @@ class ScanResult:
     stats: ScanStats
     laravel_version: Optional[str] = None
     php_version: Optional[str] = None
+    # Path, size, type and laravel_type of every file, as columns
+    columns: Optional[ScanColumns] = field(default=None, repr=False)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -207,12 +242,13 @@ class ScannerError(Exception):
 class LaravelScanner:
     """Scanner for Laravel projects."""
 
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, snapshot: Optional[FileSnapshot] = None):
         """
         Initialize the scanner.
 
         Args:
             project_path: Path to the Laravel project root
+            snapshot: Shared file snapshot of the clone (optional)
         """
         logger.info(f"[SCANNER] Initializing LaravelScanner for {project_path}")
         self.project_path = Path(project_path)
@@ -225,6 +261,7 @@ class LaravelScanner:
             logger.error(f"[SCANNER] Project path is not a directory: {project_path}")
             raise ScannerError(f"Project path is not a directory: {project_path}")
 
+        self.snapshot = snapshot or get_file_snapshot(project_path)
         logger.debug(f"[SCANNER] LaravelScanner initialized successfully")
 
     def _should_exclude_dir(self, dir_path: Path) -> bool:
@@ -301,24 +338,20 @@ class LaravelScanner:
         return "other"
 
     def _compute_file_hash(self, file_path: Path) -> str:
-        """Compute SHA256 hash of file content."""
-        try:
-            with open(file_path, "rb") as f:
-                return hashlib.sha256(f.read()).hexdigest()
-        except Exception:
-            return ""
+        """Compute the git blob ID of file content."""
+        return self.snapshot.git_blob_id(str(file_path))
+
+    def _file_hash(self, entry: WalkedFile) -> str:
+        """Blob ID from the git index for clean tracked files, else hash the content."""
+        return entry.blob_id or self._compute_file_hash(Path(entry.path))
 
     def _detect_laravel_version(self) -> Optional[str]:
         """Detect Laravel version from composer.json or composer.lock."""
         logger.debug(f"[SCANNER] Detecting Laravel version")
-        composer_json = self.project_path / "composer.json"
+        data = self.snapshot.read_json("composer.json")
 
-        if composer_json.exists():
+        if data is not None:
             try:
-                import json
-                with open(composer_json, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
                 # Check require section
                 require = data.get("require", {})
                 if "laravel/framework" in require:
@@ -337,14 +370,10 @@ class LaravelScanner:
     def _detect_php_version(self) -> Optional[str]:
         """Detect PHP version from composer.json."""
         logger.debug(f"[SCANNER] Detecting PHP version")
-        composer_json = self.project_path / "composer.json"
+        data = self.snapshot.read_json("composer.json")
 
-        if composer_json.exists():
+        if data is not None:
             try:
-                import json
-                with open(composer_json, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
                 require = data.get("require", {})
                 if "php" in require:
                     version = require["php"]
@@ -367,81 +396,46 @@ class LaravelScanner:
         """
         logger.info(f"[SCANNER] Starting scan of {self.project_path}")
         files: List[FileInfo] = []
-        stats = ScanStats()
-        skipped_dirs = 0
-
-        for root, dirs, filenames in os.walk(self.project_path):
-            current_path = Path(root)
-
-            # Filter out excluded directories
-            original_dir_count = len(dirs)
-            dirs[:] = [
-                d for d in dirs
-                if not self._should_exclude_dir(current_path / d)
-            ]
-            skipped_dirs += original_dir_count - len(dirs)
-
-            for filename in filenames:
-                file_path = current_path / filename
-
-                if not self._should_include_file(file_path):
-                    continue
-
-                try:
-                    file_size = file_path.stat().st_size
-                    file_type = self._get_file_type(file_path)
-                    laravel_type = self._get_laravel_type(file_path)
-                    file_hash = self._compute_file_hash(file_path)
-
-                    relative_path = str(file_path.relative_to(self.project_path))
-
-                    file_info = FileInfo(
-                        path=relative_path,
-                        type=file_type,
-                        size=file_size,
-                        laravel_type=laravel_type,
-                        hash=file_hash,
-                    )
-                    files.append(file_info)
-
-                    # Update statistics
-                    stats.total_files += 1
-                    stats.total_size_bytes += file_size
-
-                    # Type-specific counts
-                    if file_type == "php":
-                        stats.php_files += 1
-                    elif file_type == "blade":
-                        stats.blade_files += 1
-                    elif file_type == "vue":
-                        stats.vue_files += 1
-                    elif file_type == "javascript":
-                        stats.js_files += 1
-                    elif file_type == "typescript":
-                        stats.ts_files += 1
-                    elif file_type == "json":
-                        stats.json_files += 1
-
-                    # Laravel type counts
-                    if laravel_type == "controller":
-                        stats.controllers += 1
-                    elif laravel_type == "model":
-                        stats.models += 1
-                    elif laravel_type == "migration":
-                        stats.migrations += 1
-                    elif laravel_type == "view":
-                        stats.views += 1
-                    elif laravel_type == "route":
-                        stats.routes += 1
-                    elif laravel_type == "test":
-                        stats.tests += 1
-                    elif laravel_type == "config":
-                        stats.config_files += 1
-
-                except Exception as e:
-                    # Skip files that can't be read
-                    logger.warning(f"[SCANNER] Failed to process file {file_path}: {str(e)}")
-                    continue
+        columns = ScanColumnsBuilder(("type", "laravel_type"))
+
+        # List files (git index or parallel scandir), then hash what git
+        # has no clean blob ID for on the pool
+        walker = FileWalker(
+            str(self.project_path),
+            skip_dir=lambda relative_dir: self._should_exclude_dir(self.project_path / relative_dir),
+        )
+        walked = walker.walk(include=lambda relative_path: self._should_include_file(Path(relative_path)))
+        hashes = walker.map(self._file_hash, walked)
+        skipped_dirs = walker.skipped_dirs
+        from_index = sum(1 for entry in walked if entry.blob_id)
+        logger.info(f"[SCANNER] File hashes: {from_index} from git index, {len(walked) - from_index} computed")
+
+        for entry, file_hash in zip(walked, hashes):
+            file_path = self.project_path / entry.relative_path
+
+            try:
+                file_size = entry.size
+                file_type = self._get_file_type(file_path)
+                laravel_type = self._get_laravel_type(file_path)
+                relative_path = entry.relative_path
+
+                file_info = FileInfo(
+                    path=relative_path,
+                    type=file_type,
+                    size=file_size,
+                    laravel_type=laravel_type,
+                    hash=file_hash,
+                )
+                files.append(file_info)
+                columns.append(relative_path, file_size, 0, type=file_type, laravel_type=laravel_type)
+
+            except Exception as e:
+                # Skip files that can't be read
+                logger.warning(f"[SCANNER] Failed to process file {file_path}: {str(e)}")
+                continue
+
+        file_columns = columns.build()
+        stats = ScanStats.from_columns(file_columns)
 
         # Detect versions
         laravel_version = self._detect_laravel_version()
@@ -457,6 +451,7 @@ class LaravelScanner:
             stats=stats,
             laravel_version=laravel_version,
             php_version=php_version,
+            columns=file_columns,
         )
 
 
@@ -0,0 +1,72 @@
+"""
+SSE Multiplexer.
+
+Forwards events from a pipeline's queue until the pipeline task finishes,
+without polling: the queue and the task are awaited together, so the
+stream wakes exactly when there is something to send or the work is done.
+Events that arrive together are handed out as one batch so the caller can
+write them in a single chunk.
+"""
+import asyncio
+from typing import Any, AsyncIterator, List, Optional
+
+# SSE comment line; ignored by clients, keeps proxies from closing idle streams
+HEARTBEAT = ": keepalive\n\n"
+
+DEFAULT_MAX_BATCH = 64
+
+
+def _drain(queue: asyncio.Queue, batch: List[Any], max_batch: Optional[int]) -> List[Any]:
+    """Move whatever is already queued into ``batch`` (up to max_batch)."""
+    while max_batch is None or len(batch) < max_batch:
+        try:
+            batch.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    return batch
+
+
+async def multiplex(
+    queue: asyncio.Queue,
+    task: asyncio.Future,
+    heartbeat_interval: Optional[float] = None,
+    max_batch: int = DEFAULT_MAX_BATCH,
+) -> AsyncIterator[List[Any]]:
+    """
+    Yield batches of queued items until ``task`` completes and the queue is empty.
+
+    An empty batch means nothing happened for ``heartbeat_interval`` seconds
+    (only when an interval is given); the caller decides what to send.
+    The task's result or exception is left for the caller to await.
+    """
+    getter: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if getter is None:
+                getter = asyncio.ensure_future(queue.get())
+
+            done, _ = await asyncio.wait(
+                {getter, task},
+                timeout=heartbeat_interval,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            if getter in done:
+                batch = _drain(queue, [getter.result()], max_batch)
+                getter = None
+                yield batch
+                continue
+
+            if task in done:
+                getter.cancel()
+                getter = None
+                # Everything the task queued before finishing, in one go
+                batch = _drain(queue, [], None)
+                if batch:
+                    yield batch
+                return
+
+            yield []
+    finally:
+        if getter is not None and not getter.done():
+            getter.cancel()
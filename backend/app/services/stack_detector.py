@@ -3,22 +3,63 @@ Stack Detector Service
 
 Detects project technology stack from configuration files.
 Identifies backend/frontend frameworks, databases, caching, queues, etc.
+
+Detection only reads a fixed set of manifests and config files and checks
+whether a few paths exist. A fingerprint of those inputs is stored with
+the result, and a later detection given the previous result and its
+fingerprint returns it unchanged while the inputs are the same.
 """
 import os
-import json
 import re
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+from app.services.file_snapshot import FileSnapshot, get_file_snapshot
+
 
 class StackDetector:
     """Detect project stack from files."""
 
-    def __init__(self, project_path: str):
+    # Bump when detection logic changes, so stored results are recomputed
+    DETECTION_VERSION = 1
+
+    # Files whose content detection reads
+    INPUT_FILES = (
+        "composer.json", "package.json", "requirements.txt", "Gemfile",
+        ".env.example", ".env", "config/database.php",
+        "docker-compose.yml", "docker-compose.yaml",
+    )
+    # Paths whose existence detection checks
+    INPUT_PATHS = (
+        "manage.py", "resources/views", "phpunit.xml", "phpunit.xml.dist",
+        ".github/workflows", ".gitlab-ci.yml", "Jenkinsfile", ".circleci", ".travis.yml",
+        "bitbucket-pipelines.yml", "Dockerfile", "k8s", "kubernetes.yml", ".forge",
+        "vapor.yml", "vercel.json", "netlify.toml", "Procfile", "fly.toml",
+    )
+
+    def __init__(
+        self,
+        project_path: str,
+        snapshot: Optional[FileSnapshot] = None,
+        previous: Optional[Dict[str, Any]] = None,
+        previous_fingerprint: Optional[str] = None,
+    ):
         self.path = project_path
+        self.snapshot = snapshot or get_file_snapshot(project_path)
+        self.previous = previous
+        self.previous_fingerprint = previous_fingerprint
+        # Set by detect(): fingerprint of the inputs, and whether the previous result was returned
+        self.fingerprint: Optional[str] = None
+        self.reused = False
 
     def detect(self) -> Dict[str, Any]:
-        """Run full stack detection."""
+        """Run full stack detection, unless the previous result's inputs are unchanged."""
+        self.fingerprint = self._fingerprint()
+        if self.previous and self.previous_fingerprint == self.fingerprint:
+            self.reused = True
+            return self.previous
+
+        self.reused = False
         return {
             "backend": self._detect_backend(),
             "frontend": self._detect_frontend(),
@@ -495,27 +536,17 @@ class StackDetector:
 
     # ========== Helpers ==========
 
+    def _fingerprint(self) -> str:
+        """Hash of the current content of INPUT_FILES and kinds of INPUT_PATHS."""
+        return self.snapshot.input_fingerprint(self.DETECTION_VERSION, self.INPUT_FILES, self.INPUT_PATHS)
+
     def _read_json(self, filename: str) -> Optional[dict]:
         """Read and parse a JSON file."""
-        filepath = os.path.join(self.path, filename)
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                return None
-        return None
+        return self.snapshot.read_json(filename)
 
     def _read_file(self, filename: str) -> Optional[str]:
         """Read a text file."""
-        filepath = os.path.join(self.path, filename)
-        if os.path.exists(filepath):
-            try:
-                with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                    return f.read()
-            except Exception:
-                return None
-        return None
+        return self.snapshot.read_text(filename)
 
     def _file_exists(self, filename: str) -> bool:
         """Check if a file exists."""
@@ -1,6 +1,7 @@
 """
 Laravel AI - FastAPI Application Entry Point
 """
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -18,10 +19,13 @@ from app.api import (
     teams,
     github_data,
 )
+from app.agents.conversation_summary import load_encoding
 from app.api.github_app import router as github_app_router
 from app.api.ui_designer import router as ui_designer_router
 from app.core.config import settings
 from app.core.logging import setup_logging, RequestLoggingMiddleware
+from app.services.job_runner import get_chat_job_runner
+from app.services.scan_job_runner import get_scan_job_runner
 
 # Setup logging
 setup_logging()
@@ -32,8 +36,22 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     logger.info("Starting Laravel AI Backend...")
+    # The tokenizer may download its BPE file; never let a request do that
+    await asyncio.to_thread(load_encoding)
+    job_runner = get_chat_job_runner()
+    try:
+        await job_runner.start()
+    except Exception as e:
+        logger.warning(f"Could not resume queued chat jobs: {e}")
+    scan_runner = get_scan_job_runner()
+    try:
+        await scan_runner.start()
+    except Exception as e:
+        logger.warning(f"Could not resume queued scan jobs: {e}")
     yield
     logger.info("Shutting down Laravel AI Backend...")
+    await job_runner.shutdown()
+    await scan_runner.shutdown()
 
 
 # Create FastAPI app
@@ -0,0 +1,161 @@
+"""
+Tests for conversation summary token accounting.
+
+Covers:
+- Memoised token counts
+- Priority eviction in truncate_to_budget
+- Linear-ish work when trimming long conversations
+"""
+import pytest
+
+from app.agents import conversation_summary
+from app.agents.conversation_summary import ConversationSummary, RecentMessage, count_tokens
+
+
+class WordEncoding:
+    """Stand-in tokenizer: one token per whitespace-separated word."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.calls += 1
+        return text.split()
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    fake = WordEncoding()
+    monkeypatch.setattr(conversation_summary, "_get_encoding", lambda: fake)
+    count_tokens.cache_clear()
+    yield fake
+    count_tokens.cache_clear()
+
+
+def long_summary(n: int) -> ConversationSummary:
+    summary = ConversationSummary()
+    for i in range(n):
+        summary.completed_tasks.append(f"task {i} " * 10)
+        summary.decisions.append(f"decision {i} " * 10)
+        summary.known_files.append(f"app/Models/Model{i}.php")
+        summary.known_classes.append(f"Class{i}")
+    summary.history_summary = "earlier " * 300
+    return summary
+
+
+# =============================================================================
+# TOKEN COUNTING
+# =============================================================================
+
+class TestCountTokens:
+    """count_tokens uses the tokenizer and memoises per string."""
+
+    def test_counts_with_tokenizer(self, encoding):
+        assert count_tokens("one two three") == 3
+        assert count_tokens("") == 0
+
+    def test_repeated_strings_are_not_re_encoded(self, encoding):
+        for _ in range(5):
+            count_tokens("same text every time")
+
+        assert encoding.calls == 1
+
+    def test_falls_back_to_length_without_tokenizer(self, monkeypatch):
+        monkeypatch.setattr(conversation_summary, "_get_encoding", lambda: None)
+        count_tokens.cache_clear()
+
+        assert count_tokens("x" * 40) == 40 // conversation_summary.CHARS_PER_TOKEN
+        count_tokens.cache_clear()
+
+    @pytest.mark.asyncio
+    async def test_event_loop_never_loads_tokenizer(self, monkeypatch):
+        monkeypatch.setattr(conversation_summary, "_encoding_loaded", False)
+        monkeypatch.setattr(conversation_summary, "_encoding", None)
+        monkeypatch.setattr(conversation_summary, "load_encoding", lambda: pytest.fail("loaded on the loop"))
+        count_tokens.cache_clear()
+
+        assert count_tokens("x" * 40) == 40 // conversation_summary.CHARS_PER_TOKEN
+        count_tokens.cache_clear()
+
+    def test_loading_drops_estimates(self, monkeypatch):
+        fake = WordEncoding()
+        monkeypatch.setattr(conversation_summary, "_encoding_loaded", False)
+        monkeypatch.setattr(conversation_summary, "_encoding", None)
+        monkeypatch.setattr(conversation_summary.tiktoken, "get_encoding", lambda name: fake)
+        monkeypatch.setattr(conversation_summary, "_get_encoding", lambda: conversation_summary._encoding)
+        count_tokens.cache_clear()
+        assert count_tokens("a b") == 0
+
+        assert conversation_summary.load_encoding() is fake
+        assert count_tokens("a b") == 2
+        count_tokens.cache_clear()
+
+    def test_message_and_summary_use_tokenizer(self, encoding):
+        message = RecentMessage(role="user", content="add a login page")
+        summary = ConversationSummary(current_task="add login")
+
+        assert message.estimate_tokens() == len(message.to_prompt_text().split())
+        assert summary.estimate_tokens() == len(summary.to_prompt_text().split())
+        assert summary.last_token_count == summary.estimate_tokens()
+
+
+# =============================================================================
+# TRUNCATION
+# =============================================================================
+
+class TestTruncateToBudget:
+    """Priority eviction against a running total."""
+
+    def test_fits_budget_after_truncation(self, encoding):
+        summary = long_summary(50)
+        budget = summary.estimate_tokens() // 2
+
+        summary.truncate_to_budget(budget)
+
+        assert summary.estimate_tokens() <= budget
+
+    def test_completed_tasks_go_first(self, encoding):
+        summary = long_summary(8)
+        decisions = list(summary.decisions)
+        over = summary.estimate_tokens() - 5
+
+        summary.truncate_to_budget(over)
+
+        # A small overshoot is absorbed by old completed tasks alone
+        assert len(summary.completed_tasks) < 8
+        assert summary.decisions == decisions
+        assert summary.completed_tasks[-1] == "task 7 " * 10
+
+    def test_minimums_are_kept_when_budget_is_unreachable(self, encoding):
+        summary = long_summary(30)
+
+        summary.truncate_to_budget(1)
+
+        assert len(summary.completed_tasks) == 3
+        assert len(summary.known_classes) == 5
+        assert len(summary.known_files) == 10
+        assert len(summary.decisions) == 3
+        assert len(summary.history_summary) == 200
+
+    def test_within_budget_is_untouched(self, encoding):
+        summary = long_summary(3)
+        before = summary.to_prompt_text()
+
+        summary.truncate_to_budget(10_000)
+
+        assert summary.to_prompt_text() == before
+
+    def test_long_history_renders_only_a_few_times(self, encoding):
+        summary = long_summary(2000)
+        renders = []
+        original = ConversationSummary.to_prompt_text
+
+        def counting(self, *args, **kwargs):
+            renders.append(1)
+            return original(self, *args, **kwargs)
+
+        summary.to_prompt_text = counting.__get__(summary)
+        summary.truncate_to_budget(200)
+
+        # One render per eviction batch, not one per removed item
+        assert len(renders) < 10
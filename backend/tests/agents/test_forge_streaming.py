@@ -0,0 +1,178 @@
+"""
+Tests for Forge streaming helpers.
+
+Covers:
+- Incremental decoding of the JSON "content" string in CodeBuffer
+- Decoding a ~100 KB generated file streamed in token-sized chunks
+- A micro-benchmark of CodeBuffer on ~100 KB outputs (slow; reports only,
+  run with ``-m slow -s`` to see the timing)
+"""
+import json
+import random
+import time
+
+import pytest
+
+from app.agents.forge_streaming import CodeBuffer
+
+
+PHP = (
+    "<?php\n\nnamespace App\\Services;\n\n"
+    "class Greeter\n{\n"
+    "    public function greet(string $name): string\n    {\n"
+    "        return \"Héllo, {$name} — ✓ 🚀\\t/\";\n"
+    "    }\n}\n"
+)
+
+
+def decode_in_chunks(payload: str, sizes) -> tuple:
+    """Feed payload to a CodeBuffer in chunks of the given sizes."""
+    buffer = CodeBuffer()
+    segments = []
+    i = 0
+    for size in sizes:
+        if i >= len(payload):
+            break
+        segments.extend(buffer.add_chunk(payload[i:i + size]))
+        i += size
+    if i < len(payload):
+        segments.extend(buffer.add_chunk(payload[i:]))
+    return buffer, segments
+
+
+def random_sizes(seed: int, upper: int = 12):
+    rng = random.Random(seed)
+    while True:
+        yield rng.randint(1, upper)
+
+
+# =============================================================================
+# DECODING TESTS
+# =============================================================================
+
+class TestCodeBuffer:
+    """CodeBuffer output matches json.loads for any chunking."""
+
+    @pytest.mark.parametrize("ensure_ascii", [False, True])
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_json_loads_for_random_chunking(self, ensure_ascii, seed):
+        payload = json.dumps({"reasoning": "x", "content": PHP, "notes": "y"}, ensure_ascii=ensure_ascii)
+
+        buffer, segments = decode_in_chunks(payload, random_sizes(seed))
+
+        assert "".join(segments) == PHP
+        assert buffer.get_full_content() == PHP
+        assert buffer.done
+
+    def test_unicode_escape_split_across_chunks(self):
+        payload = '{"content": "a\\u00e9b"}'
+        split = payload.index("00e9")
+
+        buffer, segments = decode_in_chunks(payload, [split, 100])
+
+        assert segments == ["a", "éb"]
+
+    def test_surrogate_pair_split_across_chunks(self):
+        payload = '{"content": "\\ud83d\\ude80!"}'
+        split = payload.index("\\ude80")
+
+        buffer, segments = decode_in_chunks(payload, [split, 100])
+
+        assert "".join(segments) == "🚀!"
+        # The high surrogate is never emitted on its own
+        assert all("\ud83d" not in segment for segment in segments)
+
+    def test_lone_surrogate_is_kept_like_json_loads(self):
+        payload = '{"content": "\\ud83dx"}'
+
+        buffer, segments = decode_in_chunks(payload, [len(payload)])
+
+        assert buffer.get_full_content() == json.loads(payload)["content"]
+
+    def test_all_short_escapes(self):
+        payload = json.dumps({"content": "\"\\/\b\f\n\r\t"}).replace("/", "\\/")
+
+        buffer, _ = decode_in_chunks(payload, random_sizes(1, upper=2))
+
+        assert buffer.get_full_content() == json.loads(payload)["content"]
+
+    def test_invalid_escape_is_tolerated(self):
+        payload = '{"content": "a\\qb\\u12G4c\\nd"}'
+
+        buffer, _ = decode_in_chunks(payload, [len(payload)])
+
+        assert buffer.get_full_content() == "aqbu12G4c\nd"
+
+    def test_content_key_split_across_chunks(self):
+        payload = json.dumps({"content": "abc"})
+
+        buffer, segments = decode_in_chunks(payload, [1] * len(payload))
+
+        assert "".join(segments) == "abc"
+
+    def test_text_after_content_is_ignored(self):
+        payload = json.dumps({"content": "abc", "other": {"content": "nested"}})
+
+        buffer, _ = decode_in_chunks(payload, [4] * len(payload))
+
+        assert buffer.get_full_content() == "abc"
+
+    def test_reset_clears_state(self):
+        buffer, _ = decode_in_chunks(json.dumps({"content": "abc"}), [3] * 10)
+
+        buffer.reset()
+        buffer.add_chunk(json.dumps({"content": "xyz"}))
+
+        assert buffer.get_full_content() == "xyz"
+
+
+# =============================================================================
+# LARGE OUTPUT
+# =============================================================================
+
+class TestCodeBufferLargeOutput:
+    """Decoding a ~100 KB file streamed in token-sized chunks."""
+
+    def test_100kb_output(self):
+        content = (PHP * (100_000 // len(PHP) + 1))[:100_000]
+        payload = json.dumps({"content": content})
+        chunks = [payload[i:i + 16] for i in range(0, len(payload), 16)]
+
+        buffer = CodeBuffer()
+        for chunk in chunks:
+            buffer.add_chunk(chunk)
+
+        assert buffer.get_full_content() == content
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+@pytest.mark.slow
+class TestCodeBufferBenchmark:
+    """Micro-benchmark: decoding ~100 KB outputs streamed in token-sized chunks."""
+
+    ROUNDS = 20
+
+    def test_100kb_output(self, record_property):
+        content = (PHP * (100_000 // len(PHP) + 1))[:100_000]
+        payload = json.dumps({"content": content})
+        chunks = [payload[i:i + 16] for i in range(0, len(payload), 16)]
+
+        timings = []
+        for _ in range(self.ROUNDS):
+            started = time.perf_counter()
+            buffer = CodeBuffer()
+            for chunk in chunks:
+                buffer.add_chunk(chunk)
+            timings.append(time.perf_counter() - started)
+            assert buffer.get_full_content() == content
+
+        # Reported, never asserted: wall-clock bounds are flaky on shared CI
+        best_ms = min(timings) * 1000
+        record_property("codebuffer_ms_per_100kb", round(best_ms, 2))
+        print(
+            f"\nCodeBuffer: {len(payload) / 1024:.0f} KB in {len(chunks)} chunks, "
+            f"best {best_ms:.1f} ms of {self.ROUNDS} rounds"
+        )
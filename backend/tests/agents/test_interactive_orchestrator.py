@@ -0,0 +1,206 @@
+"""
+Tests for the InteractiveOrchestrator.
+
+Covers:
+- Live forwarding of Forge code tokens as step_code_chunk events
+- Streaming fixes
+- Fast-mode pacing
+"""
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.agents.context_retriever import RetrievedContext
+from app.agents.events import content_digest
+from app.agents.executor import ExecutionResult
+from app.agents.interactive_orchestrator import InteractiveOrchestrator
+from app.agents.planner import PlanStep
+from app.services.claude import ClaudeModel
+
+
+GENERATED = "<?php\n\nclass Foo\n{\n    public function bar(): string\n    {\n        return \"baz\";\n    }\n}\n"
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+def make_streaming_claude(content: str, pieces: int = 4):
+    """Claude mock whose stream yields the JSON response in several pieces."""
+    mock = MagicMock()
+    mock.tracker = None
+    payload = json.dumps({"content": content})
+    size = len(payload) // pieces + 1
+    calls = []
+
+    async def stream_cached(*args, **kwargs):
+        calls.append(kwargs)
+        if kwargs.get("request_type") == "reasoning":
+            yield json.dumps({"task_understanding": "Create Foo"})
+            return
+        for i in range(0, len(payload), size):
+            yield payload[i:i + size]
+
+    mock.stream_cached = stream_cached
+    mock.stream_calls = calls
+    mock.chat_async = AsyncMock(return_value='{"passes": true, "issues": []}')
+    return mock
+
+
+def parse_events(raw_events):
+    events = []
+    for raw in raw_events:
+        lines = raw.strip().split("\n")
+        event_type = lines[0].replace("event: ", "")
+        data = json.loads(lines[1].replace("data: ", ""))
+        events.append((event_type, data))
+    return events
+
+
+@pytest.fixture
+def orchestrator_factory():
+    def build(claude):
+        raw_events = []
+        orchestrator = InteractiveOrchestrator(
+            db=MagicMock(),
+            event_callback=raw_events.append,
+            claude_service=claude,
+        )
+        return orchestrator, raw_events
+    return build
+
+
+def make_context():
+    return RetrievedContext(chunks=[])
+
+
+# =============================================================================
+# STREAMING TESTS
+# =============================================================================
+
+class TestLiveCodeStreaming:
+    """Code is forwarded as the model generates it, not replayed afterwards."""
+
+    @pytest.mark.asyncio
+    async def test_step_forwards_live_chunks_then_full_content(self, orchestrator_factory):
+        claude = make_streaming_claude(GENERATED)
+        orchestrator, raw_events = orchestrator_factory(claude)
+        step = PlanStep(order=1, action="create", file="app/Services/Foo.php", description="Create Foo")
+
+        result = await orchestrator._execute_step_streaming(
+            step_index=0,
+            step=step,
+            context=make_context(),
+            previous_results=[],
+            current_content=None,
+            project_context="",
+            model=ClaudeModel.HAIKU,
+        )
+
+        assert result.success
+        assert result.content == GENERATED
+
+        chunks = [d for t, d in parse_events(raw_events) if t == "step_code_chunk"]
+        live = [c for c in chunks if not c["done"]]
+        assert len(live) > 1
+        assert "".join(c["chunk"] for c in live) == GENERATED
+        assert chunks[-1]["done"] is True
+        # The file was fully streamed, so the done event only references it
+        assert "content" not in chunks[-1]
+        assert chunks[-1]["content_hash"] == content_digest(GENERATED)
+        # The routed model reaches every streamed call
+        assert {c["model"] for c in claude.stream_calls} == {ClaudeModel.HAIKU}
+
+    @pytest.mark.asyncio
+    async def test_failed_step_returns_error_result(self, orchestrator_factory):
+        orchestrator, raw_events = orchestrator_factory(make_streaming_claude(GENERATED))
+        step = PlanStep(order=1, action="modify", file="app/Missing.php", description="Edit")
+
+        result = await orchestrator._execute_step_streaming(
+            0, step, make_context(), [], None, "", ClaudeModel.SONNET,
+        )
+
+        assert not result.success
+        assert "not found" in result.error
+        assert not [t for t, _ in parse_events(raw_events) if t == "step_code_chunk"]
+
+    @pytest.mark.asyncio
+    async def test_fix_streams_replacement_content(self, orchestrator_factory):
+        orchestrator, raw_events = orchestrator_factory(make_streaming_claude(GENERATED))
+        broken = ExecutionResult(file="app/Services/Foo.php", action="create", content="<?php class Foo {")
+
+        fixed = await orchestrator._fix_execution_streaming(
+            step_index=2,
+            exec_result=broken,
+            issues=["Syntax error"],
+            context=make_context(),
+            model=ClaudeModel.SONNET,
+        )
+
+        assert fixed.content == GENERATED
+        chunks = [d for t, d in parse_events(raw_events) if t == "step_code_chunk"]
+        assert all(c["step_index"] == 2 for c in chunks)
+        assert chunks[-1]["done"] and chunks[-1]["content_hash"] == content_digest(GENERATED)
+
+    @pytest.mark.asyncio
+    async def test_done_event_embeds_content_that_differs_from_stream(self, orchestrator_factory):
+        orchestrator, raw_events = orchestrator_factory(make_streaming_claude(GENERATED))
+
+        # e.g. Forge's self-verification replaced the streamed draft
+        await orchestrator._emit_code_done(0, "app/Foo.php", GENERATED, "create", streamed="<?php draft")
+
+        (_, done), = parse_events(raw_events)
+        assert done["content"] == GENERATED
+        assert "content_hash" not in done
+
+
+# =============================================================================
+# PACING TESTS
+# =============================================================================
+
+class TestPacing:
+    """Cosmetic delays are skipped in fast mode."""
+
+    @pytest.mark.asyncio
+    async def test_fast_mode_emits_thinking_without_sleeping(self, orchestrator_factory):
+        from app.agents.agent_identity import NOVA
+
+        orchestrator, raw_events = orchestrator_factory(make_streaming_claude(GENERATED))
+        orchestrator.fast_mode = True
+
+        with patch("app.agents.interactive_orchestrator.asyncio.sleep", new=AsyncMock()) as sleep:
+            await orchestrator._emit_thinking_sequence(NOVA, "intent", count=3)
+
+        sleep.assert_not_awaited()
+        assert [t for t, _ in parse_events(raw_events)] == ["agent_thinking"] * 3
+
+    @pytest.mark.asyncio
+    async def test_paced_mode_keeps_delays(self, orchestrator_factory):
+        from app.agents.agent_identity import NOVA
+
+        orchestrator, _ = orchestrator_factory(make_streaming_claude(GENERATED))
+        orchestrator.fast_mode = False
+
+        with patch("app.agents.interactive_orchestrator.asyncio.sleep", new=AsyncMock()) as sleep:
+            await orchestrator._emit_thinking_sequence(NOVA, "intent", count=3, delay=0.8)
+
+        assert sleep.await_count == 3
+
+    def test_fast_mode_defaults_to_config(self):
+        from app.agents.config import AgentConfig
+
+        orchestrator = InteractiveOrchestrator(
+            db=MagicMock(),
+            claude_service=make_streaming_claude(GENERATED),
+            config=AgentConfig(FAST_MODE=True),
+        )
+        assert orchestrator.fast_mode is True
+
+        orchestrator = InteractiveOrchestrator(
+            db=MagicMock(),
+            claude_service=make_streaming_claude(GENERATED),
+            config=AgentConfig(FAST_MODE=True),
+            fast_mode=False,
+        )
+        assert orchestrator.fast_mode is False
@@ -0,0 +1,205 @@
+"""
+Tests for the per-project Laravel profile.
+
+Covers:
+- Analyzer cache keyed by content hash
+- Profile build, reuse and rebuild on a new index version
+- Loading the persisted profile without re-analysis
+- Project context sent as a cacheable prompt prefix
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.agents import forge_laravel
+from app.agents.forge_laravel import LaravelContextEnhancer, LaravelFileType
+from app.agents.laravel_profile import LaravelProfileStore, PROFILE_KEY, profile_version
+from app.services.claude import prefixed_user_message
+
+
+USER_MODEL = """<?php
+namespace App\\Models;
+
+class User extends Model
+{
+    protected $fillable = ['name', 'email'];
+
+    public function posts()
+    {
+        return $this->hasMany(Post::class);
+    }
+}
+"""
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture(autouse=True)
+def clear_file_info_cache():
+    forge_laravel._file_info_cache.clear()
+    yield
+    forge_laravel._file_info_cache.clear()
+
+
+def make_project(**overrides):
+    data = dict(
+        id="project-1",
+        repo_full_name="acme/shop",
+        stack={"backend": {"framework": "laravel", "version": "11.x"}},
+        health_score=82.0,
+        ai_context={},
+        last_indexed_at=datetime(2026, 1, 1, 12, 0),
+        scanned_at=datetime(2026, 1, 1, 11, 0),
+        indexed_files_count=42,
+    )
+    data.update(overrides)
+    return SimpleNamespace(**data)
+
+
+def make_db(rows):
+    db = MagicMock()
+    result = MagicMock()
+    result.all = MagicMock(return_value=rows)
+    db.execute = AsyncMock(return_value=result)
+    db.commit = AsyncMock()
+    db.rollback = AsyncMock()
+    return db
+
+
+def make_store(sessions=None):
+    """Profile store whose own sessions are recorded in ``sessions``."""
+    sessions = [] if sessions is None else sessions
+
+    @asynccontextmanager
+    async def factory():
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.commit = AsyncMock()
+        sessions.append(session)
+        yield session
+
+    return LaravelProfileStore(session_factory=factory)
+
+
+# =============================================================================
+# ANALYSIS CACHE TESTS
+# =============================================================================
+
+class TestAnalysisCache:
+    """Tests for LaravelContextEnhancer.analyze_file caching."""
+
+    def test_unchanged_content_is_analyzed_once(self):
+        enhancer = LaravelContextEnhancer()
+        path = "app/Models/User.php"
+
+        with patch.object(
+            enhancer.model_analyzer, "extract_relationships",
+            wraps=enhancer.model_analyzer.extract_relationships,
+        ) as extract:
+            first = enhancer.analyze_file(LaravelFileType.MODEL, path, USER_MODEL)
+            second = enhancer.analyze_file(LaravelFileType.MODEL, path, USER_MODEL)
+            enhancer.analyze_file(LaravelFileType.MODEL, path, USER_MODEL + "\n// changed")
+
+        assert first is second
+        assert first["relationships"][0]["related_model"] == "Post"
+        assert extract.call_count == 2
+
+
+# =============================================================================
+# PROFILE STORE TESTS
+# =============================================================================
+
+class TestProfileStore:
+    """Tests for LaravelProfileStore."""
+
+    @pytest.mark.asyncio
+    async def test_builds_and_persists_profile(self):
+        project = make_project()
+        db = make_db([("app/Models/User.php", USER_MODEL), ("routes/web.php", "")])
+        sessions = []
+
+        profile = await make_store(sessions).load(db, project)
+
+        assert profile.version == profile_version(project)
+        assert "laravel 11.x" in profile.project_context
+        assert "- User (users): hasMany Post" in profile.project_context
+        assert [a["path"] for a in profile.file_analyses] == ["app/Models/User.php"]
+        # Persisted in the store's own session; the caller's is left alone
+        [session] = sessions
+        [call] = session.execute.await_args_list
+        assert call.args[0].compile().params["ai_context"][PROFILE_KEY]["version"] == profile.version
+        session.commit.assert_awaited_once()
+        db.commit.assert_not_awaited()
+        db.rollback.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_persist_failure_keeps_profile(self):
+        project = make_project()
+        db = make_db([("app/Models/User.php", USER_MODEL)])
+
+        @asynccontextmanager
+        async def broken_factory():
+            raise RuntimeError("database down")
+            yield
+
+        profile = await LaravelProfileStore(session_factory=broken_factory).load(db, project)
+
+        assert "- User (users)" in profile.project_context
+        db.rollback.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_reuses_profile_until_reindexed(self):
+        project = make_project()
+        db = make_db([("app/Models/User.php", USER_MODEL)])
+        store = make_store()
+
+        first = await store.load(db, project)
+        second = await store.load(db, project)
+        assert second is first
+        assert db.execute.await_count == 1
+
+        project.last_indexed_at = datetime(2026, 1, 2, 12, 0)
+        third = await store.load(db, project)
+        assert third is not first
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_persisted_profile_skips_reanalysis(self):
+        project = make_project()
+        built = await make_store().load(make_db([("app/Models/User.php", USER_MODEL)]), project)
+        forge_laravel._file_info_cache.clear()
+
+        # A fresh process: no in-memory profile, persisted copy is current
+        project = make_project(ai_context={PROFILE_KEY: built.to_dict()})
+        db = make_db([])
+        profile = await make_store().load(db, project)
+
+        db.execute.assert_not_awaited()
+        assert "- User (users)" in profile.project_context
+        # Analyses are seeded back into the analyzer cache
+        enhancer = LaravelContextEnhancer()
+        with patch.object(enhancer.model_analyzer, "extract_relationships") as extract:
+            enhancer.analyze_file(LaravelFileType.MODEL, "app/Models/User.php", USER_MODEL)
+        extract.assert_not_called()
+
+
+# =============================================================================
+# PROMPT PREFIX TESTS
+# =============================================================================
+
+class TestPromptPrefix:
+    """Tests for the cacheable project context prefix."""
+
+    def test_prefix_block_is_cache_marked(self):
+        message = prefixed_user_message("<project_context>x</project_context>", "request")
+
+        assert message["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert message["content"][1] == {"type": "text", "text": "request"}
+
+    def test_no_prefix_sends_plain_message(self):
+        assert prefixed_user_message(None, "request") == {"role": "user", "content": "request"}
@@ -0,0 +1,120 @@
+"""
+Tests for the model router.
+
+Covers:
+- Intent routing from request wording
+- Planning routing from intent complexity
+- Execution routing from file type and diff size
+- Escalation after failed validation
+- Routing disabled and per-agent ceilings
+"""
+import pytest
+
+from app.agents.config import AgentConfig
+from app.agents.executor import ExecutionResult
+from app.agents.intent_analyzer import Intent
+from app.agents.model_router import ModelRouter, FORGE, NOVA
+from app.agents.planner import PlanStep
+from app.services.claude import ClaudeModel
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def router():
+    """Router with routing enabled and Opus ceilings everywhere."""
+    router = ModelRouter(AgentConfig(ENABLE_MODEL_ROUTING=True))
+    router.ceilings = {agent: ClaudeModel.OPUS for agent in router.ceilings}
+    return router
+
+
+def make_intent(**overrides) -> Intent:
+    data = dict(task_type="feature", task_type_confidence=0.9, scope="single_file")
+    data.update(overrides)
+    return Intent(**data)
+
+
+# =============================================================================
+# ROUTING TESTS
+# =============================================================================
+
+class TestModelRouting:
+    """Tests for per-agent routing decisions."""
+
+    def test_trivial_request_uses_haiku(self, router):
+        """Short trivial requests don't pay for a large model."""
+        assert router.route_intent("Add a fillable field 'phone' to User") == ClaudeModel.HAIKU
+
+    def test_complex_request_uses_opus(self, router):
+        """Requests touching payments or architecture go to Opus."""
+        assert router.route_intent("Redesign the billing flow for subscriptions") == ClaudeModel.OPUS
+
+    def test_planning_follows_intent_complexity(self, router):
+        """Single-file intents plan on Haiku, cross-domain migrations on Opus."""
+        assert router.route_planning(make_intent()) == ClaudeModel.HAIKU
+        complex_intent = make_intent(
+            scope="cross_domain",
+            requires_migration=True,
+            domains_affected=["models", "controllers", "services"],
+        )
+        assert router.route_planning(complex_intent) == ClaudeModel.OPUS
+
+    def test_execution_uses_file_type_and_size(self, router):
+        """Small migrations use Haiku; large service modifications use Opus."""
+        migration = PlanStep(
+            order=1,
+            action="create",
+            file="database/migrations/2024_01_01_000000_add_phone_to_users.php",
+            description="Add phone column",
+            estimated_lines=20,
+        )
+        service = PlanStep(
+            order=2,
+            action="modify",
+            file="app/Services/BillingService.php",
+            description="Rework invoicing",
+            estimated_lines=250,
+        )
+
+        assert router.route_execution(migration) == ClaudeModel.HAIKU
+        assert router.route_execution(service, current_content="x\n" * 700) == ClaudeModel.OPUS
+
+    def test_validation_uses_diff_size(self, router):
+        """A tiny change in a simple file is reviewed by Haiku."""
+        result = ExecutionResult(
+            file="app/Http/Requests/StoreUserRequest.php",
+            action="modify",
+            content="<?php",
+            diff="--- a\n+++ b\n-    'name' => 'required',\n+    'name' => 'required|max:255',\n",
+        )
+        assert router.route_validation([result]) == ClaudeModel.HAIKU
+
+    def test_fix_escalates_after_failed_validation(self, router):
+        """Each failed validation moves Forge fixes up one tier."""
+        result = ExecutionResult(file="app/Services/UserService.php", action="modify", content="<?php")
+
+        assert router.route_fix(result) == ClaudeModel.SONNET
+        router.record_failed_validation()
+        assert router.route_fix(result) == ClaudeModel.OPUS
+        router.record_failed_validation()
+        assert router.route_fix(result) == ClaudeModel.OPUS  # Capped at the ceiling
+
+        stats = router.get_stats()[FORGE]
+        assert stats["escalations"] == 2
+        assert stats["calls"] == {ClaudeModel.SONNET.value: 1, ClaudeModel.OPUS.value: 2}
+
+    def test_ceiling_caps_routing(self, router):
+        """Routing never exceeds the agent's configured model."""
+        router.ceilings[NOVA] = ClaudeModel.SONNET
+        assert router.route_intent("Redesign the billing flow for subscriptions") == ClaudeModel.SONNET
+
+    def test_disabled_routing_keeps_fixed_models(self):
+        """With routing disabled every agent gets its previous fixed model."""
+        router = ModelRouter(AgentConfig(ENABLE_MODEL_ROUTING=False))
+        step = PlanStep(order=1, action="delete", file="app/Models/Old.php", description="Remove")
+
+        assert router.route_execution(step) == ClaudeModel.SONNET
+        router.record_failed_validation()
+        assert router.get_stats()[FORGE]["escalations"] == 0
@@ -208,6 +208,18 @@ class TestPipelineMetrics:
         assert data["success"] is True
         assert data["final_score"] == 90
 
+    def test_routing_stats_in_dict(self):
+        """Test model routing stats are reported per agent."""
+        from app.agents.config import AgentConfig
+        from app.agents.model_router import ModelRouter
+
+        metrics = PipelineMetrics(request_id="test_123")
+        router = ModelRouter(AgentConfig(ENABLE_MODEL_ROUTING=True), stats=metrics.routing)
+        router.route_intent("Fix the typo in the welcome page title")
+
+        data = metrics.to_dict()
+        assert sum(data["routing"]["nova"]["calls"].values()) == 1
+
 
 class TestAgentMetrics:
     """Tests for individual agent metrics."""
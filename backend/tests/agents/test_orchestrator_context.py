@@ -0,0 +1,192 @@
+"""
+Tests for conversation context loading.
+
+Covers:
+- One projected query for summary plus recent history
+- The cross-request summary cache and its refresh on persist
+- Orchestrators reusing a preloaded context
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.agents import orchestrator_context
+from app.agents.conversation_summary import ConversationSummary
+from app.agents.orchestrator_context import ConversationContext, ConversationContextManager
+
+
+STAMP = datetime(2026, 10, 18, 12, 0, 0)
+
+
+def row(role=None, content=None, has_code_changes=False, minutes=0, summary_data=None, updated_at=STAMP):
+    return SimpleNamespace(
+        project_id="project-1",
+        updated_at=updated_at,
+        summary_data=summary_data,
+        role=role,
+        content=content,
+        has_code_changes=has_code_changes,
+        created_at=STAMP + timedelta(minutes=minutes) if role else None,
+    )
+
+
+def make_db(*results):
+    """Session whose execute() returns the given row lists in order."""
+    db = MagicMock()
+    db.commit = AsyncMock()
+    db.rollback = AsyncMock()
+    db.execute = AsyncMock(side_effect=[MagicMock(all=MagicMock(return_value=rows)) for rows in results])
+    return db
+
+
+def compiled_sql(db, call_index=0) -> str:
+    stmt = db.execute.await_args_list[call_index].args[0]
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture(autouse=True)
+def fresh_summary_cache(monkeypatch):
+    monkeypatch.setattr(orchestrator_context, "_summary_cache", orchestrator_context._SummaryCache())
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+class TestLoadContext:
+    """load_context fetches summary and history in one lean query."""
+
+    @pytest.mark.asyncio
+    async def test_single_projected_query(self):
+        summary = ConversationSummary(current_task="Add login")
+        db = make_db([
+            row("assistant", "done", True, minutes=1, summary_data=summary.to_json()),
+            row("user", "add login", False, minutes=0, summary_data=summary.to_json()),
+        ])
+
+        context = await ConversationContextManager(db).load_context("conv-1")
+
+        assert db.execute.await_count == 1
+        sql = compiled_sql(db)
+        assert "LATERAL" in sql
+        assert "substr(messages.content, %(substr_1)s, %(substr_2)s)" in sql
+        # code_changes is only inspected in SQL, never shipped
+        assert "messages.code_changes AS code_changes" not in sql
+
+        assert [h["role"] for h in context.history] == ["user", "assistant"]
+        assert context.history[1]["has_code_changes"] is True
+        assert context.summary.current_task == "Add login"
+        assert context.summary.project_id == "project-1"
+
+    @pytest.mark.asyncio
+    async def test_conversation_without_messages(self):
+        db = make_db([row()])
+
+        context = await ConversationContextManager(db).load_context("conv-1")
+
+        assert context.history == []
+        assert context.project_id == "project-1"
+
+    @pytest.mark.asyncio
+    async def test_agents_reuse_the_loaded_context(self):
+        db = make_db([row("user", "hello", summary_data=ConversationSummary().to_json())])
+        manager = ConversationContextManager(db)
+        await manager.load_context("conv-1")
+
+        summary, recent = await manager.get_context_for_agents("conv-1")
+        await manager.load_or_create("conv-1")
+
+        assert db.execute.await_count == 1
+        assert [m.content for m in recent] == ["hello"]
+
+    @pytest.mark.asyncio
+    async def test_primed_manager_does_not_query(self):
+        db = make_db()
+        context = ConversationContext(
+            conversation_id="conv-1",
+            history=[{"role": "user", "content": "hi", "has_code_changes": False, "created_at": None}],
+        )
+
+        _, recent = await ConversationContextManager(db, context=context).get_context_for_agents("conv-1")
+
+        db.execute.assert_not_awaited()
+        assert recent[0].content == "hi"
+
+
+# =============================================================================
+# SUMMARY CACHE
+# =============================================================================
+
+class TestSummaryCache:
+    """Parsed summaries are shared across requests until the row changes."""
+
+    @pytest.mark.asyncio
+    async def test_current_cache_skips_summary_column(self):
+        stored = ConversationSummary(current_task="Cached task").to_json()
+        first = make_db([row("user", "a", summary_data=stored)])
+        await ConversationContextManager(first).load_context("conv-1")
+
+        # Same updated_at: the database sends NULL instead of summary_data
+        second = make_db([row("user", "a", summary_data=None)])
+        context = await ConversationContextManager(second).load_context("conv-1")
+
+        assert "CASE WHEN" in compiled_sql(second)
+        assert context.summary.current_task == "Cached task"
+
+    @pytest.mark.asyncio
+    async def test_requests_get_independent_copies(self):
+        stored = ConversationSummary().to_json()
+        await ConversationContextManager(make_db([row(summary_data=stored)])).load_context("conv-1")
+
+        one = await ConversationContextManager(make_db([row()])).load_context("conv-1")
+        one.summary.set_current_task("only in this request")
+        two = await ConversationContextManager(make_db([row()])).load_context("conv-1")
+
+        assert two.summary.current_task is None
+
+    @pytest.mark.asyncio
+    async def test_changed_row_is_reparsed(self):
+        old = ConversationSummary(current_task="old").to_json()
+        new = ConversationSummary(current_task="new").to_json()
+        await ConversationContextManager(make_db([row(summary_data=old)])).load_context("conv-1")
+
+        later = STAMP + timedelta(seconds=5)
+        context = await ConversationContextManager(
+            make_db([row(summary_data=new, updated_at=later)])
+        ).load_context("conv-1")
+
+        assert context.summary.current_task == "new"
+
+    @pytest.mark.asyncio
+    async def test_persist_refreshes_cache(self):
+        db = make_db([row(summary_data=ConversationSummary().to_json())], [])
+        manager = ConversationContextManager(db)
+        summary = await manager.load_or_create("conv-1")
+        summary.set_current_task("persisted task")
+
+        await manager.persist("conv-1", summary)
+
+        stmt = db.execute.await_args_list[1].args[0]
+        written_at = stmt.compile().params["updated_at"]
+        assert orchestrator_context._summary_cache.stamp("conv-1") == written_at
+
+        context = await ConversationContextManager(
+            make_db([row(summary_data=None, updated_at=written_at)])
+        ).load_context("conv-1")
+        assert context.summary.current_task == "persisted task"
+
+    @pytest.mark.asyncio
+    async def test_failed_persist_invalidates_cache(self):
+        db = make_db([row(summary_data=ConversationSummary().to_json())])
+        loaded = MagicMock(all=MagicMock(return_value=[row(summary_data=ConversationSummary().to_json())]))
+        db.execute = AsyncMock(side_effect=[loaded, RuntimeError("db down")])
+        manager = ConversationContextManager(db)
+        summary = await manager.load_or_create("conv-1")
+
+        await manager.persist("conv-1", summary)
+
+        db.rollback.assert_awaited_once()
+        assert orchestrator_context._summary_cache.stamp("conv-1") is None
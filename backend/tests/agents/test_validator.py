@@ -25,6 +25,12 @@ from app.agents.validator import (
     categorize_issue,
     generate_issue_signature,
     extract_patterns_from_context,
+    check_blade_directives,
+    extract_use_statements,
+    ProjectSymbolTable,
+    SyntaxChecker,
+    ValidationTier,
+    group_issues_by_result,
 )
 from app.agents.executor import ExecutionResult
 from app.agents.context_retriever import RetrievedContext, CodeChunk
@@ -820,6 +826,185 @@ Step 3: No security issues found.
         assert any("parse" in i.message.lower() for i in validation.issues)
 
 
+# =============================================================================
+# LOCAL VALIDATION TIERS
+# =============================================================================
+
+class TestLocalValidationTiers:
+    """Tests for the tier 0 (syntax) and tier 1 (symbols) checks."""
+
+    @pytest.fixture
+    def intent(self):
+        return Intent(task_type="feature", task_type_confidence=0.9, domains_affected=["users"])
+
+    def test_blade_forelse_empty_and_inline_section(self):
+        """@empty inside @forelse and two-argument @section are not blocks."""
+        content = """@section('title', 'Users')
+@section('content')
+    @forelse($users as $user)
+        {{ $user->email }} or admin@example.com
+    @empty
+        <p>None</p>
+    @endforelse
+    @php($count = 1)
+@endsection
+"""
+        assert check_blade_directives(content) == []
+
+    def test_blade_mismatched_directive(self):
+        """A closer that skips an open block reports the unclosed block."""
+        content = "@if($a)\n@foreach($items as $item)\n@endif\n"
+        problems = check_blade_directives(content)
+        assert len(problems) == 1
+        assert problems[0][0] == 2
+        assert "@foreach" in problems[0][1]
+
+    def test_blade_ignores_comments(self):
+        """Directives inside Blade comments are ignored."""
+        assert check_blade_directives("{{-- @if($x) --}}\n<div></div>") == []
+
+    def test_syntax_checker_reports_line(self):
+        """tree-sitter errors are reported with their line number."""
+        content = "<?php\nclass A\n{\n    public function f()\n    {\n        return 1\n    }\n}\n"
+        issues = SyntaxChecker().check(create_execution_result(content=content))
+        assert len(issues) == 1
+        assert issues[0].line == 6
+        assert issues[0].category == IssueCategory.SYNTAX.value
+
+    def test_syntax_checker_valid_php(self):
+        """Valid PHP produces no syntax issues."""
+        issues = SyntaxChecker().check(create_execution_result())
+        assert issues == []
+
+    def test_extract_use_statements_group(self):
+        """Group imports are expanded and function imports skipped."""
+        content = "<?php\nuse App\\Models\\{User, Post as P};\nuse function App\\helper;\n"
+        assert extract_use_statements(content) == [
+            (2, "App\\Models\\User"),
+            (2, "App\\Models\\Post"),
+        ]
+
+    def test_symbol_table_from_paths(self):
+        """PSR-4 paths map to class names and their namespaces."""
+        table = ProjectSymbolTable.from_file_paths([
+            "app/Models/User.php",
+            "resources/views/welcome.blade.php",
+        ])
+        assert table.resolves("App\\Models\\User")
+        assert table.resolves("App\\Models")
+        assert table.covers("App\\Models\\Post")
+        assert not table.covers("Illuminate\\Support\\Str")
+
+    @pytest.mark.asyncio
+    async def test_syntax_failure_skips_llm(self, validator, mock_claude, intent):
+        """Tier 0 failures return without calling the LLM."""
+        result = create_execution_result(
+            content="<?php\nnamespace App\\Services;\n\nclass UserService {\n    public $a = \n}\n"
+        )
+
+        validation = await validator.validate(
+            user_input="Create a UserService",
+            intent=intent,
+            results=[result],
+            context=RetrievedContext(),
+        )
+
+        assert validation.approved is False
+        assert validation.tier == ValidationTier.SYNTAX.value
+        mock_claude.chat_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unresolved_import_kept_out_of_llm(self, validator, mock_claude, intent):
+        """Files with unresolved project imports are not sent to the LLM."""
+        mock_claude.chat_async.return_value = create_validation_response(approved=True, score=95)
+        broken = create_execution_result(
+            file="app/Services/UserService.php",
+            content="<?php\nnamespace App\\Services;\n\nuse App\\Models\\Ghost;\n\nclass UserService {}",
+        )
+        clean = create_execution_result(
+            file="app/Services/PostService.php",
+            content="<?php\nnamespace App\\Services;\n\nuse App\\Models\\User;\n\nclass PostService {}",
+        )
+        table = ProjectSymbolTable.from_file_paths(["app/Models/User.php"])
+
+        validation = await validator.validate(
+            user_input="Create services",
+            intent=intent,
+            results=[broken, clean],
+            context=RetrievedContext(),
+            symbol_table=table,
+        )
+
+        assert validation.approved is False
+        assert [i.file for i in validation.errors] == ["app/Services/UserService.php"]
+        prompt = mock_claude.chat_async.call_args.kwargs["messages"][0]["content"]
+        assert "PostService.php" in prompt
+        assert "UserService.php" not in prompt
+
+    @pytest.mark.asyncio
+    async def test_unchanged_files_reuse_cached_verdicts(self, validator, mock_claude, intent):
+        """Only files whose content changed are sent back to the LLM."""
+        user = create_execution_result(
+            file="app/Services/UserService.php",
+            content="<?php\nnamespace App\\Services;\n\nclass UserService {}",
+        )
+        post = create_execution_result(
+            file="app/Services/PostService.php",
+            content="<?php\nnamespace App\\Services;\n\nclass PostService {}",
+        )
+        mock_claude.chat_async.return_value = create_validation_response(
+            approved=False,
+            score=60,
+            issues=[{"severity": "error", "file": "app/Services/UserService.php", "message": "Missing method"}],
+        )
+        first = await validator.validate(
+            user_input="Create services", intent=intent, results=[user, post], context=RetrievedContext(),
+        )
+        assert first.approved is False
+
+        # Fix only UserService; PostService keeps its verdict
+        fixed = create_execution_result(
+            file="app/Services/UserService.php",
+            content="<?php\nnamespace App\\Services;\n\nclass UserService {\n    public function find() {}\n}",
+        )
+        mock_claude.chat_async.return_value = create_validation_response(approved=True, score=92)
+        second = await validator.validate(
+            user_input="Create services", intent=intent, results=[fixed, post], context=RetrievedContext(),
+        )
+
+        assert second.approved is True
+        assert second.score == 92
+        prompt = mock_claude.chat_async.call_args.kwargs["messages"][0]["content"]
+        assert "UserService.php" in prompt
+        assert "PostService.php" not in prompt
+
+        # Nothing changed: no LLM call at all
+        mock_claude.chat_async.reset_mock()
+        third = await validator.validate(
+            user_input="Create services", intent=intent, results=[fixed, post], context=RetrievedContext(),
+        )
+        assert third.approved is True
+        mock_claude.chat_async.assert_not_called()
+
+    def test_group_issues_by_result(self):
+        """Issues map to results by exact or suffix path; the rest are unmatched."""
+        results = [
+            create_execution_result(file="app/Services/UserService.php"),
+            create_execution_result(file="app/Models/User.php"),
+        ]
+        issues = [
+            ValidationIssue(severity="error", file="./App/Models/User.php", message="a"),
+            ValidationIssue(severity="error", file="UserService.php", message="b"),
+            ValidationIssue(severity="error", file="", message="c"),
+        ]
+
+        grouped, unmatched = group_issues_by_result(issues, results)
+
+        assert [i.message for i in grouped[1]] == ["a"]
+        assert [i.message for i in grouped[0]] == ["b"]
+        assert [i.message for i in unmatched] == ["c"]
+
+
 # =============================================================================
 # EDGE CASE TESTS
 # =============================================================================
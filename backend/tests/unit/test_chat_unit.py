@@ -39,6 +39,24 @@ class TestSSEEventFormatting:
         assert parsed["key"] == "value"
         assert parsed["number"] == 42
 
+    def test_encoding_matches_stdlib_json(self, monkeypatch):
+        """Events decode the same with or without orjson."""
+        from app.agents import events
+
+        data = {"text": "Héllo ✓", 1: [None, True, 2.5], "nested": {"a": "b"}}
+        fast = events.encode_sse("agent_message", data)
+        monkeypatch.setattr(events, "ORJSON_AVAILABLE", False)
+        slow = events.encode_sse("agent_message", data)
+
+        assert fast.startswith("event: agent_message\ndata: ")
+        assert json.loads(fast.split("data: ", 1)[1]) == json.loads(slow.split("data: ", 1)[1])
+
+    def test_oversized_int_falls_back_to_stdlib(self):
+        """Values orjson rejects still encode."""
+        from app.agents.events import encode_json
+
+        assert json.loads(encode_json({"n": 2 ** 70})) == {"n": 2 ** 70}
+
 
 class TestEventTypes:
     """Unit tests for SSE event type constants."""
@@ -0,0 +1,116 @@
+"""
+Unit tests for the chat event log.
+
+Tests ID assignment, bounded retention, replay after a Last-Event-ID and
+following a run that is still in progress.
+"""
+import asyncio
+
+import pytest
+
+from app.services.event_log import InMemoryEventLog, LoggedEvent, parse_last_event_id
+
+
+async def collect(log, key, after_id=0):
+    return [e async for e in log.subscribe(key, after_id=after_id)]
+
+
+class TestInMemoryEventLog:
+    """Unit tests for the in-memory event log."""
+
+    @pytest.mark.asyncio
+    async def test_ids_increase_across_runs(self):
+        log = InMemoryEventLog()
+        await log.begin("conv-1")
+        assert await log.append("conv-1", "a") == 1
+        assert await log.append("conv-1", "b") == 2
+        await log.end("conv-1")
+
+        await log.begin("conv-1")
+        assert await log.append("conv-1", "c") == 3
+
+        events, ended = await log.read("conv-1", 0)
+        # The new run replaces the previous one's events
+        assert [e.data for e in events] == ["c"]
+        assert ended is False
+
+    @pytest.mark.asyncio
+    async def test_log_is_bounded(self):
+        log = InMemoryEventLog(max_events=3)
+        await log.begin("conv-1")
+        for i in range(5):
+            await log.append("conv-1", str(i))
+
+        events, _ = await log.read("conv-1", 0)
+        assert [e.id for e in events] == [3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_replay_after_last_event_id(self):
+        log = InMemoryEventLog()
+        await log.begin("conv-1")
+        for data in ("a", "b", "c"):
+            await log.append("conv-1", data)
+        await log.end("conv-1")
+
+        assert [e.data for e in await collect(log, "conv-1", after_id=1)] == ["b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_subscriber_follows_running_stream(self):
+        log = InMemoryEventLog()
+        await log.begin("conv-1")
+        await log.append("conv-1", "a")
+
+        reader = asyncio.create_task(collect(log, "conv-1"))
+        await asyncio.sleep(0)
+        await log.append("conv-1", "b")
+        await log.end("conv-1")
+
+        assert [e.data for e in await asyncio.wait_for(reader, timeout=1.0)] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("after_id", [0, 1])
+    async def test_subscriber_waits_on_reused_key(self, after_id):
+        """A reader between begin() and the first append() suspends instead of spinning."""
+        log = InMemoryEventLog()
+        await log.begin("conv-1")
+        await log.append("conv-1", "old-a")
+        await log.append("conv-1", "old-b")
+        await log.end("conv-1")
+
+        await log.begin("conv-1")
+        reader = asyncio.create_task(collect(log, "conv-1", after_id=after_id))
+        await asyncio.sleep(0.01)
+        await log.append("conv-1", "new")
+        await log.end("conv-1")
+
+        assert [e.data for e in await asyncio.wait_for(reader, timeout=1.0)] == ["new"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_key_ends_immediately(self):
+        log = InMemoryEventLog()
+
+        assert await log.exists("missing") is False
+        assert await collect(log, "missing") == []
+
+    @pytest.mark.asyncio
+    async def test_finished_runs_expire(self):
+        log = InMemoryEventLog(ttl_seconds=0)
+        await log.begin("conv-1")
+        await log.end("conv-1")
+
+        await log.begin("conv-2")
+
+        assert await log.exists("conv-1") is False
+        assert await log.exists("conv-2") is True
+
+    def test_sse_has_id_line(self):
+        event = LoggedEvent(id=7, data='event: connected\ndata: {}\n\n')
+
+        assert event.to_sse() == 'id: 7\nevent: connected\ndata: {}\n\n'
+
+    def test_parse_last_event_id(self):
+        assert parse_last_event_id("12") == 12
+        assert parse_last_event_id(None) == 0
+        assert parse_last_event_id("garbage") == 0
+        assert parse_last_event_id("-4") == 0
+
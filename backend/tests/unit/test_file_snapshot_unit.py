@@ -0,0 +1,180 @@
+"""
+Unit tests for the shared file snapshot.
+
+Tests that repeated reads of a clone come from memory, that changed files
+are re-read, that the byte cap is respected, and that stack detection,
+file scanning and health checks share one read of each file.
+"""
+import os
+from unittest.mock import patch
+
+import pytest
+
+from app.services import file_snapshot
+from app.services.file_snapshot import FileSnapshot, _ContentCache
+from app.services.file_scanner import FileScanner
+from app.services.health_checker import HealthChecker
+from app.services.scanner import LaravelScanner
+from app.services.stack_detector import StackDetector
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = _ContentCache(max_bytes=1024 * 1024, max_file_bytes=64 * 1024)
+    monkeypatch.setattr(file_snapshot, "_content_cache", fresh)
+    return fresh
+
+
+def touch(path, content: str, mtime_ns: int):
+    path.write_text(content, newline="")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestFileSnapshot:
+    """Unit tests for FileSnapshot."""
+
+    def test_repeated_reads_hit_memory(self, cache, tmp_path):
+        (tmp_path / "composer.json").write_text('{"require": {"php": "^8.2"}}')
+        snapshot = FileSnapshot(str(tmp_path))
+
+        with patch("builtins.open", wraps=open) as opened:
+            for _ in range(3):
+                assert snapshot.read_json("composer.json") == {"require": {"php": "^8.2"}}
+            snapshot.sha256("composer.json")
+
+        assert opened.call_count == 1
+        assert cache.hits == 3
+
+    def test_changed_file_is_reread(self, cache, tmp_path):
+        path = tmp_path / "a.php"
+        touch(path, "one\n", 1_000_000_000)
+        snapshot = FileSnapshot(str(tmp_path))
+        first_hash = snapshot.sha256("a.php")
+        assert snapshot.line_count("a.php") == 1
+
+        # Same size, new mtime
+        touch(path, "two\n", 2_000_000_000)
+        assert snapshot.read_text("a.php") == "two\n"
+        assert snapshot.sha256("a.php") != first_hash
+
+        # New size, same mtime
+        touch(path, "two\nthree\n", 2_000_000_000)
+        assert snapshot.line_count("a.php") == 2
+
+    def test_missing_and_invalid_files(self, cache, tmp_path):
+        (tmp_path / "bad.json").write_text("{not json")
+        (tmp_path / "latin1.json").write_bytes(b'{"a": "\xe9"}')
+        (tmp_path / "dir").mkdir()
+        snapshot = FileSnapshot(str(tmp_path))
+
+        assert snapshot.read_text("missing.txt") is None
+        assert snapshot.read_json("bad.json") is None
+        assert snapshot.read_json("latin1.json") is None
+        assert snapshot.read_text("dir") is None
+        assert snapshot.sha256("missing.txt") == ""
+        assert snapshot.line_count("missing.txt") == 0
+
+    @pytest.mark.parametrize("content", [
+        "", "a", "a\n", "a\nb", "a\r\nb\r\n", "a\rb\r", "\n\n", "x\r\n\ry",
+    ])
+    def test_line_count_matches_text_mode(self, cache, tmp_path, content):
+        path = tmp_path / "f.txt"
+        path.write_bytes(content.encode())
+
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            expected = sum(1 for _ in f)
+
+        assert FileSnapshot(str(tmp_path)).line_count("f.txt") == expected
+
+    def test_input_fingerprint_tracks_inputs(self, cache, tmp_path):
+        touch(tmp_path / "composer.json", "{}", 1_000_000_000)
+        snapshot = FileSnapshot(str(tmp_path))
+
+        def fingerprint(version=1, **values):
+            return snapshot.input_fingerprint(version, ["composer.json"], ["app"], **values)
+
+        first = fingerprint()
+        assert snapshot.path_kind("app") == ""
+        assert fingerprint() == first
+        assert fingerprint(version=2) != first
+        assert fingerprint(stack=["10.x"]) != first
+
+        (tmp_path / "app").mkdir()
+        assert snapshot.path_kind("app") == "dir"
+        second = fingerprint()
+        assert second != first
+
+        touch(tmp_path / "composer.json", "[]", 2_000_000_000)
+        assert fingerprint() != second
+
+    def test_byte_cap_evicts_least_recently_used(self, monkeypatch, tmp_path):
+        cache = _ContentCache(max_bytes=250, max_file_bytes=200)
+        monkeypatch.setattr(file_snapshot, "_content_cache", cache)
+        for name in "abc":
+            (tmp_path / name).write_text(name * 100)
+        (tmp_path / "big").write_text("x" * 300)
+        snapshot = FileSnapshot(str(tmp_path))
+
+        for name in ["a", "b", "a", "c", "big"]:
+            snapshot.read_bytes(name)
+
+        assert cache.cached_bytes <= 250
+        cached = {os.path.basename(p) for p, e in cache._entries.items() if e.data is not None}
+        # b was least recently used; big is over the per-file cap
+        assert cached == {"a", "c"}
+        # Derived values survive eviction of the bytes
+        snapshot.sha256("b")
+        assert cache._entries[str(tmp_path / "b")].sha256 is not None
+
+    def test_reading_far_past_the_cap(self, monkeypatch, tmp_path):
+        cache = _ContentCache(max_bytes=1000, max_file_bytes=200)
+        monkeypatch.setattr(file_snapshot, "_content_cache", cache)
+        names = [f"f{i:04d}" for i in range(2000)]
+        for name in names:
+            (tmp_path / name).write_text("x" * 100)
+        snapshot = FileSnapshot(str(tmp_path))
+
+        for name in names:
+            snapshot.read_bytes(name)
+        # Reading an old file again makes it the most recent
+        snapshot.read_bytes(names[0])
+
+        assert cache.cached_bytes == 1000
+        # Only files holding bytes are tracked for eviction
+        assert list(cache._loaded) == [str(tmp_path / name) for name in names[-9:] + names[:1]]
+        assert all(e.data is None for p, e in cache._entries.items() if p not in cache._loaded)
+        assert len(cache._entries) == 2000
+
+
+class TestSharedSnapshot:
+    """Onboarding services share one read per file."""
+
+    def make_project(self, tmp_path):
+        (tmp_path / "composer.json").write_text(
+            '{"require": {"php": "^8.2", "laravel/framework": "^11.0"}}'
+        )
+        (tmp_path / "package.json").write_text('{"devDependencies": {"vite": "^5.0"}}')
+        (tmp_path / ".env.example").write_text("APP_DEBUG=false\nDB_CONNECTION=mysql\n")
+        models = tmp_path / "app" / "Models"
+        models.mkdir(parents=True)
+        (models / "User.php").write_text("<?php\nclass User extends Model\n{\n}\n")
+
+    def test_each_file_read_once(self, cache, tmp_path):
+        self.make_project(tmp_path)
+        path = str(tmp_path)
+        opened_paths = []
+        real_open = open
+
+        def tracking_open(file, *args, **kwargs):
+            opened_paths.append(os.path.relpath(str(file), path))
+            return real_open(file, *args, **kwargs)
+
+        with patch("builtins.open", tracking_open):
+            LaravelScanner(path).scan()
+            stack = StackDetector(path).detect()
+            file_stats = FileScanner(path).scan()
+            HealthChecker(path, stack, file_stats).check()
+
+        assert stack["backend"]["framework"] == "laravel"
+        assert file_stats["total_lines"] > 0
+        assert len(opened_paths) == len(set(opened_paths))
@@ -0,0 +1,228 @@
+"""
+Unit tests for the project file tree.
+
+Tests that the directory index matches the recursive listing the endpoint
+used to build, that trees are cached per commit, and that the endpoint
+serves lazy expansion, pagination and 304 revalidation.
+"""
+import os
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException, Response
+from git import Repo
+from starlette.requests import Request
+
+from app.api.projects import get_project_files
+from app.services import file_tree
+from app.services.file_tree import build_file_tree, load_file_tree
+
+
+FILES = [
+    "app/Models/User.php",
+    "app/Http/Controllers/UserController.php",
+    "app/Http/Kernel.php",
+    "config/app.php",
+    "routes/web.php",
+    "resources/views/Welcome.blade.php",
+    "resources/js/app.ts",
+    "README.md",
+    "composer.json",
+    "artisan",
+    "public/favicon.ico",
+    ".env",
+    ".github/workflows/ci.yml",
+    "vendor/laravel/Foo.php",
+    "node_modules/vue/index.js",
+]
+
+
+def make_tree(root):
+    for relative_path in FILES:
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x\n")
+
+
+def legacy_tree(dir_path, relative_base=""):
+    """The recursive os.listdir tree the endpoint used to build."""
+    items = []
+    entries = sorted(os.listdir(dir_path), key=lambda x: (not os.path.isdir(os.path.join(dir_path, x)), x.lower()))
+    for entry in entries:
+        if entry.startswith('.') or entry in ['node_modules', 'vendor', '__pycache__', '.git']:
+            continue
+        full_path = os.path.join(dir_path, entry)
+        relative_path = os.path.join(relative_base, entry) if relative_base else entry
+        if os.path.isdir(full_path):
+            children = legacy_tree(full_path, relative_path)
+            if children:
+                items.append({"name": entry, "path": relative_path, "type": "directory",
+                              "children": children, "indexed": False})
+        else:
+            ext = entry.split('.')[-1].lower() if '.' in entry else ''
+            if ext in file_tree.TREE_EXTENSIONS:
+                items.append({"name": entry, "path": relative_path, "type": "file", "indexed": False})
+    return items
+
+
+def commit_all(root, message="init"):
+    repo = Repo.init(root)
+    repo.git.add("-A")
+    repo.git.commit("-m", message, "--no-gpg-sign", env={
+        "GIT_AUTHOR_NAME": "t", "GIT_AUTHOR_EMAIL": "t@example.com",
+        "GIT_COMMITTER_NAME": "t", "GIT_COMMITTER_EMAIL": "t@example.com",
+    })
+    return repo
+
+
+@pytest.fixture(autouse=True)
+def fresh_tree_cache(monkeypatch):
+    monkeypatch.setattr(file_tree, "_tree_cache", file_tree._FileTreeCache())
+
+
+# =============================================================================
+# TREE
+# =============================================================================
+
+class TestFileTree:
+    """Unit tests for build_file_tree and FileTree."""
+
+    def test_matches_recursive_listing(self, tmp_path):
+        make_tree(tmp_path)
+
+        assert build_file_tree(str(tmp_path)).nodes() == legacy_tree(str(tmp_path))
+
+    def test_lazy_expansion(self, tmp_path):
+        make_tree(tmp_path)
+        tree = build_file_tree(str(tmp_path))
+
+        top = tree.nodes(depth=1)
+        app = next(n for n in top if n["name"] == "app")
+        assert app["children"] is None
+
+        http = tree.nodes("app/Http", depth=1)
+        assert [(n["name"], n["type"]) for n in http] == [("Controllers", "directory"), ("Kernel.php", "file")]
+        assert http[0]["children"] is None
+        assert not tree.has_directory("vendor")
+
+    def test_pagination_and_indexed_flags(self, tmp_path):
+        make_tree(tmp_path)
+        tree = build_file_tree(str(tmp_path))
+        everything = [n["name"] for n in tree.nodes(depth=1)]
+
+        page = tree.nodes(depth=1, offset=2, limit=3)
+        assert [n["name"] for n in page] == everything[2:5]
+
+        [kernel] = [n for n in tree.nodes("app/Http", indexed_paths={"app/Http/Kernel.php"}) if n["type"] == "file"]
+        assert kernel["indexed"] is True
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class TestLoadFileTree:
+    """Trees are cached per clone and commit."""
+
+    def test_cached_until_new_commit(self, tmp_path):
+        make_tree(tmp_path)
+        repo = commit_all(tmp_path)
+
+        with patch.object(file_tree, "build_file_tree", wraps=build_file_tree) as build:
+            first = load_file_tree(str(tmp_path))
+            again = load_file_tree(str(tmp_path))
+            assert build.call_count == 1
+            assert again is first
+            assert first.sha == repo.head.commit.hexsha
+
+            (tmp_path / "app/Models/Post.php").write_text("x\n")
+            commit_all(tmp_path, "add post")
+            updated = load_file_tree(str(tmp_path))
+
+        assert build.call_count == 2
+        assert "app/Models/Post.php" in {n["path"] for n in updated.nodes("app/Models")}
+
+    def test_without_git_is_not_cached(self, tmp_path):
+        make_tree(tmp_path)
+
+        with patch.object(file_tree, "build_file_tree", wraps=build_file_tree) as build:
+            assert load_file_tree(str(tmp_path)).sha is None
+            load_file_tree(str(tmp_path))
+
+        assert build.call_count == 2
+
+
+# =============================================================================
+# ENDPOINT
+# =============================================================================
+
+def make_request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "query_string": b""})
+
+
+def make_db(project, indexed_paths=()):
+    project_result = MagicMock(scalar_one_or_none=MagicMock(return_value=project))
+    indexed_result = MagicMock(fetchall=MagicMock(return_value=[(p,) for p in indexed_paths]))
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=[project_result, indexed_result])
+    return db
+
+
+class TestGetProjectFilesEndpoint:
+    """GET /projects/{id}/files with lazy expansion and ETags."""
+
+    async def call(self, project, if_none_match=None, **params):
+        response = Response()
+        params = {"path": None, "depth": None, "offset": 0, "limit": None, **params}
+        result = await get_project_files(
+            project_id="p1",
+            request=make_request(if_none_match),
+            response=response,
+            db=make_db(project, indexed_paths=["app/Http/Kernel.php"]),
+            current_user=SimpleNamespace(id="u1"),
+            **params,
+        )
+        return result, response
+
+    @pytest.mark.asyncio
+    async def test_etag_and_not_modified(self, tmp_path):
+        make_tree(tmp_path)
+        repo = commit_all(tmp_path)
+        project = SimpleNamespace(clone_path=str(tmp_path), last_indexed_at=datetime(2026, 10, 18))
+
+        nodes, response = await self.call(project, path="app/Http", depth=1)
+        etag = response.headers["etag"]
+
+        assert repo.head.commit.hexsha in etag
+        assert [n["name"] for n in nodes] == ["Controllers", "Kernel.php"]
+        assert nodes[1]["indexed"] is True
+
+        not_modified, _ = await self.call(project, if_none_match=f"W/{etag}")
+        assert isinstance(not_modified, Response)
+        assert not_modified.status_code == 304
+        assert not_modified.headers["etag"] == etag
+
+    @pytest.mark.asyncio
+    async def test_reindex_changes_etag(self, tmp_path):
+        make_tree(tmp_path)
+        commit_all(tmp_path)
+        project = SimpleNamespace(clone_path=str(tmp_path), last_indexed_at=datetime(2026, 10, 18))
+        _, before = await self.call(project, depth=1)
+
+        project.last_indexed_at = datetime(2026, 10, 19)
+        _, after = await self.call(project, depth=1, if_none_match=before.headers["etag"])
+
+        assert after.headers["etag"] != before.headers["etag"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_directory(self, tmp_path):
+        make_tree(tmp_path)
+        project = SimpleNamespace(clone_path=str(tmp_path), last_indexed_at=None)
+
+        with pytest.raises(HTTPException) as exc:
+            await self.call(project, path="vendor")
+
+        assert exc.value.status_code == 404
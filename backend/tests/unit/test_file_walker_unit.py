@@ -0,0 +1,193 @@
+"""
+Unit tests for the parallel file walker.
+
+Tests that git work trees are listed from the index without walking
+ignored directories, that clean tracked files take their blob IDs from the
+index, that the scandir fallback finds what os.walk finds, and that both
+scanners produce the same results through the walker.
+"""
+import os
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from git import Repo
+
+from app.services import file_snapshot
+from app.services.file_snapshot import _ContentCache
+from app.services.file_walker import FileWalker
+from app.services.project_scanner import ProjectScanner, ScanResult
+from app.services.scanner import LaravelScanner
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    monkeypatch.setattr(file_snapshot, "_content_cache", _ContentCache(max_bytes=1 << 20, max_file_bytes=1 << 16))
+
+
+def make_tree(root):
+    files = {
+        "composer.json": '{"require": {"php": "^8.2"}}',
+        "app/Models/User.php": "<?php\nclass User {}\n",
+        "app/Http/Controllers/UserController.php": "<?php\n// controller\n",
+        "resources/views/home.blade.php": "<div>{{ $x }}</div>\n",
+        "vendor/laravel/framework/Foo.php": "<?php\n",
+        "storage/logs/laravel.log": "log\n",
+        "build/cache/big.js": "x\n",
+        "notes.txt": "notes\n",
+    }
+    for relative_path, content in files.items():
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return files
+
+
+def skip_vendor(relative_dir):
+    return relative_dir.rsplit("/", 1)[-1] in {"vendor", "storage", ".git"}
+
+
+class TestFileWalker:
+    """Unit tests for FileWalker."""
+
+    def test_scandir_matches_os_walk(self, tmp_path):
+        make_tree(tmp_path)
+        expected = set()
+        for root, dirs, filenames in os.walk(tmp_path):
+            dirs[:] = [d for d in dirs if d not in {"vendor", "storage"}]
+            for filename in filenames:
+                expected.add(os.path.relpath(os.path.join(root, filename), tmp_path))
+
+        walker = FileWalker(str(tmp_path), skip_dir=skip_vendor)
+        walked = walker.walk()
+
+        assert not walker.from_git_index
+        assert {w.relative_path for w in walked} == expected
+        assert walker.skipped_dirs == 2
+        user = next(w for w in walked if w.relative_path == "app/Models/User.php")
+        assert user.size == len("<?php\nclass User {}\n")
+        assert user.path == str(tmp_path / "app/Models/User.php")
+
+    def test_include_filters_before_stat(self, tmp_path):
+        make_tree(tmp_path)
+
+        walked = FileWalker(str(tmp_path), skip_dir=skip_vendor).walk(include=lambda p: p.endswith(".php"))
+
+        assert [w.relative_path for w in walked] == [
+            "app/Http/Controllers/UserController.php",
+            "app/Models/User.php",
+            "resources/views/home.blade.php",
+        ]
+
+    def test_git_index_skips_ignored_trees_without_walking(self, tmp_path):
+        make_tree(tmp_path)
+        (tmp_path / ".gitignore").write_text("/build/\n*.log\n")
+        repo = Repo.init(tmp_path)
+        repo.index.add(["composer.json", "app/Models/User.php"])
+        repo.index.write()
+
+        with patch("os.scandir", wraps=os.scandir) as scandir:
+            walker = FileWalker(str(tmp_path), skip_dir=skip_vendor)
+            paths = {w.relative_path for w in walker.walk()}
+
+        assert walker.from_git_index
+        scandir.assert_not_called()
+        # Tracked and untracked files, but nothing ignored or skipped
+        assert "app/Models/User.php" in paths
+        assert "app/Http/Controllers/UserController.php" in paths
+        assert not any(p.startswith(("build/", "vendor/", "storage/")) for p in paths)
+        assert not any(p.startswith(".git/") for p in paths)
+
+    def test_git_index_drops_files_missing_from_disk(self, tmp_path):
+        make_tree(tmp_path)
+        repo = Repo.init(tmp_path)
+        repo.index.add(["composer.json", "app/Models/User.php"])
+        repo.index.write()
+        (tmp_path / "app/Models/User.php").unlink()
+
+        paths = {w.relative_path for w in FileWalker(str(tmp_path), skip_dir=skip_vendor).walk()}
+
+        assert "app/Models/User.php" not in paths
+        assert "composer.json" in paths
+
+    def test_blob_ids_for_clean_tracked_files_only(self, tmp_path):
+        make_tree(tmp_path)
+        repo = Repo.init(tmp_path)
+        repo.index.add(["composer.json", "app/Models/User.php"])
+        repo.index.write()
+        (tmp_path / "app/Models/User.php").write_text("<?php\nclass User extends Model {}\n")
+
+        walked = {w.relative_path: w for w in FileWalker(str(tmp_path), skip_dir=skip_vendor).walk()}
+
+        assert walked["composer.json"].blob_id == repo.git.hash_object("composer.json")
+        # Modified since staged, and untracked
+        assert walked["app/Models/User.php"].blob_id is None
+        assert walked["notes.txt"].blob_id is None
+
+    def test_map_keeps_order(self, tmp_path):
+        walker = FileWalker(str(tmp_path), max_workers=4)
+
+        assert walker.map(lambda x: x * 2, range(100)) == [x * 2 for x in range(100)]
+
+
+class TestScannersUseWalker:
+    """Scanner output through the walker."""
+
+    def test_laravel_scanner(self, tmp_path):
+        files = make_tree(tmp_path)
+
+        result = LaravelScanner(str(tmp_path)).scan()
+
+        by_path = {f.path: f for f in result.files}
+        assert set(by_path) == {
+            "composer.json",
+            "app/Models/User.php",
+            "app/Http/Controllers/UserController.php",
+            "resources/views/home.blade.php",
+        }
+        user = by_path["app/Models/User.php"]
+        assert user.hash == Repo.init(tmp_path).git.hash_object("app/Models/User.php")
+        assert user.size == len(files["app/Models/User.php"])
+        assert result.stats.php_files == 2
+        assert result.stats.blade_files == 1
+
+    def test_laravel_scanner_reads_only_files_git_cannot_vouch_for(self, tmp_path):
+        make_tree(tmp_path)
+        repo = Repo.init(tmp_path)
+        repo.index.add(["app/Models/User.php", "app/Http/Controllers/UserController.php"])
+        repo.index.write()
+        (tmp_path / "app/Http/Controllers/UserController.php").write_text("<?php\n// changed\n")
+        opened = []
+        real_open = open
+
+        def tracking_open(file, *args, **kwargs):
+            opened.append(os.path.relpath(str(file), tmp_path))
+            return real_open(file, *args, **kwargs)
+
+        with patch("builtins.open", tracking_open):
+            result = LaravelScanner(str(tmp_path)).scan()
+
+        hashes = {f.path: f.hash for f in result.files}
+        assert "app/Models/User.php" not in opened
+        assert "app/Http/Controllers/UserController.php" in opened
+        for path, file_hash in hashes.items():
+            assert file_hash == repo.git.hash_object(path)
+
+    @pytest.mark.asyncio
+    async def test_project_scanner(self, tmp_path):
+        make_tree(tmp_path)
+        scanner = ProjectScanner(db=MagicMock(), project=MagicMock(clone_path=str(tmp_path)))
+        scanner.result = ScanResult(project_id="p1", scan_id="s1", started_at=datetime.utcnow())
+
+        files = await scanner._scan_files(str(tmp_path))
+
+        assert set(files.paths()) == {
+            "composer.json",
+            "app/Models/User.php",
+            "app/Http/Controllers/UserController.php",
+            "resources/views/home.blade.php",
+            "notes.txt",
+        }
+        assert scanner.result.total_lines == sum(f["lines"] for f in files.rows())
+        assert files.row(files.paths().index("app/Models/User.php"))["lines"] == 2
+        assert files.value("top_dir", files.paths().index("composer.json")) == "."
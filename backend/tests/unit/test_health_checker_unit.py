@@ -0,0 +1,142 @@
+"""
+Unit tests for incremental health checks.
+
+Tests that category results are reused while their declared inputs are
+unchanged, that a change only recomputes the categories reading it, and
+that every check's declared inputs cover what it actually reads.
+"""
+import json
+
+import pytest
+
+from app.services import file_snapshot
+from app.services.file_snapshot import _ContentCache
+from app.services.health_checker import HealthChecker
+
+
+STACK = {
+    "backend": {"framework": "laravel", "packages": {"sanctum": True}},
+    "frontend": {"framework": "vue", "typescript": False},
+    "cache": "redis",
+    "queue": "sync",
+    "testing": {"pest": False},
+}
+FILE_STATS = {
+    "total_lines": 5000,
+    "by_category": {"controllers": 12, "models": 8, "services": 0, "tests": 3},
+    "by_type": {"php": {"count": 40, "lines": 4000}},
+}
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    monkeypatch.setattr(file_snapshot, "_content_cache", _ContentCache(max_bytes=1 << 20, max_file_bytes=1 << 16))
+
+
+@pytest.fixture
+def project(tmp_path):
+    files = {
+        "composer.json": json.dumps({"require": {"laravel/framework": "^11.0"}, "require-dev": {}}),
+        ".gitignore": "/vendor\n",
+        ".env.example": "APP_DEBUG=true\n",
+        "bootstrap/app.php": "<?php\n->withMiddleware()\n",
+        "routes/api.php": "<?php\nRoute::get('/users');\n",
+        "config/logging.php": "<?php\nreturn ['default' => 'stack'];\n",
+        "README.md": "# App\n",
+    }
+    for relative_path, content in files.items():
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path
+
+
+def run(path, stack=STACK, file_stats=FILE_STATS, previous=None):
+    checker = HealthChecker(str(path), json.loads(json.dumps(stack)), json.loads(json.dumps(file_stats)),
+                            previous=previous)
+    return checker, checker.check()
+
+
+class TestIncrementalHealthCheck:
+    """Category results are memoised against their inputs."""
+
+    def test_unchanged_inputs_reuse_everything(self, project):
+        first_checker, first = run(project)
+        checker, second = run(project, previous=json.loads(json.dumps(first)))
+
+        assert len(first_checker.recomputed) == len(HealthChecker.CHECK_INPUTS)
+        assert checker.recomputed == []
+        assert second == first
+        # Same issues; reused ones come back grouped by severity within a category
+        key = lambda i: (i["category"], i["title"])
+        assert sorted((i.to_dict() for i in checker.get_issues()), key=key) == \
+            sorted((i.to_dict() for i in first_checker.get_issues()), key=key)
+
+    def test_file_change_recomputes_only_its_readers(self, project):
+        _, first = run(project)
+        (project / ".env.example").write_text("APP_DEBUG=false\n")
+
+        checker, second = run(project, previous=first)
+
+        assert checker.recomputed == ["security"]
+        assert second["categories"]["security"]["score"] > first["categories"]["security"]["score"]
+        titles = {i["title"] for i in second["warnings"]}
+        assert "Debug mode enabled in .env.example" not in titles
+
+    def test_composer_change_recomputes_its_readers(self, project):
+        _, first = run(project)
+        (project / "composer.json").write_text(json.dumps({"require-dev": {"larastan/larastan": "^2"}}))
+
+        checker, _ = run(project, previous=first)
+
+        assert checker.recomputed == ["code_quality", "error_handling", "documentation"]
+
+    def test_stats_and_paths_are_inputs(self, project):
+        _, first = run(project)
+        stats = {**FILE_STATS, "total_lines": 150000}
+        (project / "CONTRIBUTING.md").write_text("PRs welcome\n")
+
+        checker, _ = run(project, file_stats=stats, previous=first)
+
+        assert checker.recomputed == ["documentation", "ai_readiness"]
+
+    def test_version_bump_recomputes(self, project, monkeypatch):
+        _, first = run(project)
+        monkeypatch.setattr(HealthChecker, "CHECKS_VERSION", HealthChecker.CHECKS_VERSION + 1)
+
+        checker, _ = run(project, previous=first)
+
+        assert len(checker.recomputed) == len(HealthChecker.CHECK_INPUTS)
+
+    def test_declared_inputs_cover_reads(self, project):
+        """Every file, path and key a check touches is in its CheckInputs."""
+
+        class Recording(dict):
+            def __init__(self, data, seen):
+                super().__init__(data)
+                self.seen = seen
+
+            def get(self, key, default=None):
+                self.seen.add(key)
+                return super().get(key, default)
+
+            def __getitem__(self, key):
+                self.seen.add(key)
+                return super().__getitem__(key)
+
+        for name, inputs in HealthChecker.CHECK_INPUTS.items():
+            checker = HealthChecker(str(project), {}, {})
+            files, paths, stack_keys, stats_keys = set(), set(), set(), set()
+            checker.stack = Recording(STACK, stack_keys)
+            checker.file_stats = Recording(FILE_STATS, stats_keys)
+            checker._read_file = lambda f, _r=checker._read_file: files.add(f) or _r(f)
+            checker._read_json = lambda f, _r=checker._read_json: files.add(f) or _r(f)
+            checker._file_exists = lambda f, _r=checker._file_exists: paths.add(f) or _r(f)
+            checker._dir_exists = lambda f, _r=checker._dir_exists: paths.add(f) or _r(f)
+
+            getattr(checker, f"_check_{name}")()
+
+            assert files <= set(inputs.files), name
+            assert paths <= set(inputs.paths), name
+            assert stack_keys <= set(inputs.stack), name
+            assert stats_keys <= set(inputs.file_stats), name
@@ -0,0 +1,143 @@
+"""
+Unit tests for scan issue persistence.
+
+Tests that issues are stored as batched upserts keyed by their
+(file, line, rule) signature, that superseded issues are removed in a
+single DELETE, and that health check issues carry the same signature.
+"""
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import issue_store
+from app.services.health_checker import Issue, Severity
+from app.services.issue_store import issue_signature, store_issues
+from app.services.project_scanner import ProjectScanner, ScanResult
+
+
+def make_issue(file_path="app/Http/Controllers/UserController.php", line=10, rule="debug-dd", **extra):
+    return {
+        "category": "code_quality",
+        "severity": "warning",
+        "title": "Debug statement",
+        "description": "dd() left in code",
+        "file_path": file_path,
+        "line_number": line,
+        "suggestion": "Remove it",
+        "auto_fixable": False,
+        "rule": rule,
+        **extra,
+    }
+
+
+def make_scanner(issues, tmp_path):
+    db = MagicMock()
+    db.execute = AsyncMock()
+    db.commit = AsyncMock()
+    scanner = ProjectScanner(db, MagicMock(id="p1", clone_path=str(tmp_path)))
+    scanner.result = ScanResult(project_id="p1", scan_id="s1", started_at=datetime.utcnow(), issues=issues)
+    return scanner, db
+
+
+def compiled(stmt):
+    return stmt.compile(dialect=postgresql.dialect())
+
+
+class TestIssueSignature:
+    """Signatures identify an issue across scans."""
+
+    def test_stable_and_distinct(self):
+        sig = issue_signature(make_issue())
+
+        assert sig == issue_signature(make_issue(severity="critical", title="Other"))
+        assert len(sig) == 40
+        assert sig != issue_signature(make_issue(line=11))
+        assert sig != issue_signature(make_issue(rule="xss-raw"))
+        assert sig != issue_signature(make_issue(file_path="routes/web.php"))
+
+    def test_without_rule_uses_category_and_title(self):
+        a = make_issue(file_path=None, line=None, rule=None)
+        b = make_issue(file_path=None, line=None, rule=None, title="Missing README")
+
+        assert issue_signature(a) != issue_signature(b)
+
+    def test_health_issue_signature(self):
+        issue = Issue(category="security", severity=Severity.CRITICAL, title="Debug mode enabled",
+                      description="d", file_path=".env")
+
+        assert issue.signature == issue_signature(issue.to_dict())
+        assert issue.signature != Issue(category="security", severity=Severity.CRITICAL,
+                                        title="Debug mode enabled", description="d").signature
+
+
+class TestStoreIssues:
+    """_store_issues issues one DELETE, batched upserts and one commit."""
+
+    @pytest.mark.asyncio
+    async def test_delete_then_upsert(self, tmp_path):
+        issues = [make_issue(), make_issue(), make_issue(line=20)]
+        scanner, db = make_scanner(issues, tmp_path)
+
+        await scanner._store_issues()
+
+        delete_stmt, insert_stmt = (c.args[0] for c in db.execute.await_args_list)
+        db.commit.assert_awaited_once()
+
+        sql = str(compiled(delete_stmt))
+        assert sql.startswith("DELETE FROM project_issues")
+        assert "signature IS NULL" in sql
+        assert "!= ALL" in sql
+        signatures = compiled(delete_stmt).params["signatures"]
+        assert sorted(signatures) == sorted({issue_signature(i) for i in issues})
+
+        insert = compiled(insert_stmt)
+        sql = str(insert)
+        assert "ON CONFLICT (project_id, signature) DO UPDATE" in sql
+        assert "status = excluded.status" not in sql
+        # Fixed issues found again are reopened; ignored ones stay ignored
+        assert "status = CASE WHEN (project_issues.status = %(status_1)s) THEN %(param_1)s" in sql
+        assert "ELSE project_issues.status END" in sql
+        assert (insert.params["status_1"], insert.params["param_1"]) == ("fixed", "open")
+        assert "created_at = excluded.created_at" not in sql
+        assert "severity = excluded.severity" in sql
+        # Duplicates are dropped before insert
+        assert sum(1 for k in insert.params if k.startswith("signature_m")) == 2
+
+    @pytest.mark.asyncio
+    async def test_batches_large_scans(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(issue_store, "ISSUE_INSERT_BATCH_SIZE", 2)
+        scanner, db = make_scanner([make_issue(line=n) for n in range(5)], tmp_path)
+
+        await scanner._store_issues()
+
+        # One DELETE plus three INSERT batches
+        assert db.execute.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_no_issues_clears_project(self, tmp_path):
+        scanner, db = make_scanner([], tmp_path)
+
+        await scanner._store_issues()
+
+        [call] = db.execute.await_args_list
+        assert compiled(call.args[0]).params["signatures"] == []
+        db.commit.assert_awaited_once()
+
+
+class TestStoreIssuesHelper:
+    """store_issues is shared by every scan path and leaves the commit to the caller."""
+
+    @pytest.mark.asyncio
+    async def test_uses_given_signature(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+        db.commit = AsyncMock()
+
+        stored = await store_issues(db, "p1", [make_issue(signature="a" * 40), make_issue(signature="a" * 40)])
+
+        assert stored == 1
+        db.commit.assert_not_awaited()
+        delete_stmt = db.execute.await_args_list[0].args[0]
+        assert compiled(delete_stmt).params["signatures"] == ["a" * 40]
@@ -0,0 +1,244 @@
+"""
+Unit tests for the chat job runner.
+
+Tests that pipelines outlive the HTTP response, that pool, per-user and
+per-project limits hold, and that job outcomes are recorded.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models.models import ChatJobStatus
+from app.services.event_log import InMemoryEventLog
+from app.services.job_runner import ChatJobConflict, ChatJobRunner
+
+
+def make_session_factory(sessions):
+    """Session factory whose sessions record executed statements."""
+    @asynccontextmanager
+    async def factory():
+        session = MagicMock()
+        session.commit = AsyncMock()
+        session.rollback = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock(rowcount=1))
+        sessions.append(session)
+        yield session
+    return factory
+
+
+def make_runner(**kwargs):
+    sessions = []
+    log = InMemoryEventLog()
+    runner = ChatJobRunner(session_factory=make_session_factory(sessions), event_log=log, **kwargs)
+    return runner, log, sessions
+
+
+def recorded_statuses(sessions):
+    """Status values written by UPDATE statements, in order."""
+    statuses = []
+    for session in sessions:
+        for call in session.execute.await_args_list:
+            params = call.args[0].compile().params
+            # Skip the queued -> running claim, which also filters on status
+            if "status" in params and "status_1" not in params:
+                statuses.append(params["status"])
+    return statuses
+
+
+async def submit(runner, conversation_id, user_id="user-1", project_id="project-1", kind="test"):
+    return await runner.submit(user_id, project_id, conversation_id, kind, {"message": "hi"})
+
+
+async def wait_idle(runner):
+    while runner.running_count or runner.pending_count:
+        await asyncio.gather(*list(runner._running.values()), return_exceptions=True)
+
+
+class TestChatJobRunner:
+    """Unit tests for ChatJobRunner."""
+
+    @pytest.mark.asyncio
+    async def test_job_events_go_to_the_event_log(self):
+        runner, log, sessions = make_runner()
+
+        async def handler(db, job):
+            yield f"event: connected\ndata: {job.payload['message']}\n\n"
+            yield "event: complete\ndata: {}\n\n"
+
+        runner.register("test", handler)
+        await submit(runner, "conv-1")
+        await wait_idle(runner)
+
+        events, ended = await log.read("conv-1", 0)
+        assert [e.data.split("\n")[0] for e in events] == ["event: connected", "event: complete"]
+        assert ended is True
+        assert recorded_statuses(sessions)[-1] == ChatJobStatus.COMPLETED.value
+        assert not runner.is_active("conv-1")
+
+    @pytest.mark.asyncio
+    async def test_unknown_kind_is_rejected(self):
+        runner, _, _ = make_runner()
+
+        with pytest.raises(ValueError):
+            await submit(runner, "conv-1", kind="missing")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submits_for_one_conversation_conflict(self):
+        runner, log, sessions = make_runner()
+        ran = []
+
+        async def handler(db, job):
+            ran.append(job.id)
+            yield "event: complete\ndata: {}\n\n"
+
+        async def yield_once():
+            await asyncio.sleep(0)
+
+        @asynccontextmanager
+        async def factory():
+            # Commits yield, like a real database round trip
+            session = MagicMock(rollback=AsyncMock())
+            session.commit = AsyncMock(side_effect=yield_once)
+            session.execute = AsyncMock(return_value=MagicMock(rowcount=1))
+            yield session
+
+        runner.session_factory = factory
+        runner.register("test", handler)
+        results = await asyncio.gather(
+            submit(runner, "conv-1"), submit(runner, "conv-1"), return_exceptions=True
+        )
+        await wait_idle(runner)
+
+        assert [type(r) for r in results].count(ChatJobConflict) == 1
+        assert len(ran) == 1
+        # The conversation is free again once its job is done
+        await submit(runner, "conv-1")
+        await wait_idle(runner)
+        assert len(ran) == 2
+
+    @pytest.mark.asyncio
+    async def test_active_job_in_another_worker_conflicts(self):
+        runner, log, _ = make_runner()
+        runner.register("test", lambda db, job: None)
+
+        @asynccontextmanager
+        async def factory():
+            session = MagicMock(rollback=AsyncMock())
+            session.commit = AsyncMock(side_effect=IntegrityError("INSERT", {}, Exception("duplicate key")))
+            yield session
+
+        runner.session_factory = factory
+        with pytest.raises(ChatJobConflict):
+            await submit(runner, "conv-1")
+
+        assert not runner.is_active("conv-1")
+        assert runner.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_per_user_limit_queues_extra_jobs(self):
+        runner, log, _ = make_runner(pool_size=4, max_per_user=1, max_per_project=4)
+        release = asyncio.Event()
+        started = []
+
+        async def handler(db, job):
+            started.append(job.conversation_id)
+            await release.wait()
+            yield "event: complete\ndata: {}\n\n"
+
+        runner.register("test", handler)
+        await submit(runner, "conv-1", user_id="alice")
+        await submit(runner, "conv-2", user_id="alice")
+        await submit(runner, "conv-3", user_id="bob")
+        await asyncio.sleep(0.01)
+
+        # alice's second job waits; bob is not held up behind it
+        assert started == ["conv-1", "conv-3"]
+        assert runner.pending_count == 1
+        queued, _ = await log.read("conv-2", 0)
+        assert queued[0].data.startswith("event: job_queued")
+
+        release.set()
+        await wait_idle(runner)
+        assert started == ["conv-1", "conv-3", "conv-2"]
+
+    @pytest.mark.asyncio
+    async def test_pool_size_caps_running_jobs(self):
+        runner, _, _ = make_runner(pool_size=2, max_per_user=10, max_per_project=10)
+        release = asyncio.Event()
+        peak = 0
+
+        async def handler(db, job):
+            nonlocal peak
+            peak = max(peak, runner.running_count)
+            await release.wait()
+            yield "event: complete\ndata: {}\n\n"
+
+        runner.register("test", handler)
+        for i in range(5):
+            await submit(runner, f"conv-{i}", user_id=f"user-{i}")
+        await asyncio.sleep(0.01)
+
+        assert runner.running_count == 2
+        release.set()
+        await wait_idle(runner)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_job_is_recorded_and_reported(self):
+        runner, log, sessions = make_runner()
+
+        async def handler(db, job):
+            yield "event: connected\ndata: {}\n\n"
+            raise RuntimeError("pipeline exploded")
+
+        runner.register("test", handler)
+        await submit(runner, "conv-1")
+        await wait_idle(runner)
+
+        events, ended = await log.read("conv-1", 0)
+        assert events[-1].data.startswith("event: error")
+        assert ended is True
+        assert recorded_statuses(sessions)[-1] == ChatJobStatus.FAILED.value
+
+    @pytest.mark.asyncio
+    async def test_shutdown_marks_running_jobs_interrupted(self):
+        runner, log, sessions = make_runner()
+
+        async def handler(db, job):
+            await asyncio.Event().wait()
+            yield "never"
+
+        runner.register("test", handler)
+        await submit(runner, "conv-1")
+        await asyncio.sleep(0.01)
+
+        await runner.shutdown()
+
+        assert runner.running_count == 0
+        assert recorded_statuses(sessions)[-1] == ChatJobStatus.INTERRUPTED.value
+        assert (await log.read("conv-1", 0))[1] is True
+
+    @pytest.mark.asyncio
+    async def test_job_claimed_elsewhere_is_skipped(self):
+        runner, log, sessions = make_runner()
+        ran = []
+
+        async def handler(db, job):
+            ran.append(job.id)
+            yield "event: complete\ndata: {}\n\n"
+
+        @asynccontextmanager
+        async def factory():
+            session = MagicMock(commit=AsyncMock(), rollback=AsyncMock())
+            session.execute = AsyncMock(return_value=MagicMock(rowcount=0))
+            yield session
+
+        runner.session_factory = factory
+        runner.register("test", handler)
+        await submit(runner, "conv-1")
+        await wait_idle(runner)
+
+        assert ran == []
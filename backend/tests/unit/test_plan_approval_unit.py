@@ -0,0 +1,100 @@
+"""
+Unit tests for plan approval backends.
+
+Tests decision delivery through the in-memory backend and the
+orchestrator's use of the backend instead of process-local state.
+"""
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.plan_approval import InMemoryPlanApprovalBackend, PlanDecision
+
+
+class TestInMemoryPlanApprovalBackend:
+    """Unit tests for the in-memory backend."""
+
+    @pytest.mark.asyncio
+    async def test_submit_without_pending_plan_is_rejected(self):
+        backend = InMemoryPlanApprovalBackend()
+
+        assert await backend.submit("conv-1", PlanDecision()) is False
+
+    @pytest.mark.asyncio
+    async def test_decision_submitted_before_wait_is_delivered(self):
+        backend = InMemoryPlanApprovalBackend()
+        await backend.open("conv-1")
+
+        assert await backend.submit("conv-1", PlanDecision(approved=False, rejection_reason="no")) is True
+        decision = await backend.wait("conv-1", timeout=1.0)
+
+        assert decision.approved is False
+        assert decision.rejection_reason == "no"
+
+    @pytest.mark.asyncio
+    async def test_waiter_is_woken_by_submit(self):
+        backend = InMemoryPlanApprovalBackend()
+        await backend.open("conv-1")
+
+        waiter = asyncio.create_task(backend.wait("conv-1", timeout=5.0))
+        await asyncio.sleep(0)
+        await backend.submit("conv-1", PlanDecision(modified_plan={"steps": []}))
+
+        assert (await waiter).modified_plan == {"steps": []}
+
+    @pytest.mark.asyncio
+    async def test_only_first_decision_counts(self):
+        backend = InMemoryPlanApprovalBackend()
+        await backend.open("conv-1")
+
+        assert await backend.submit("conv-1", PlanDecision(approved=True)) is True
+        assert await backend.submit("conv-1", PlanDecision(approved=False)) is False
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out(self):
+        backend = InMemoryPlanApprovalBackend()
+        await backend.open("conv-1")
+
+        assert await backend.wait("conv-1", timeout=0.01) is None
+
+    @pytest.mark.asyncio
+    async def test_closed_approval_rejects_submit(self):
+        backend = InMemoryPlanApprovalBackend()
+        await backend.open("conv-1")
+        await backend.close("conv-1")
+
+        assert await backend.submit("conv-1", PlanDecision()) is False
+
+    def test_decision_round_trip(self):
+        decision = PlanDecision(approved=False, modified_plan={"summary": "s"}, rejection_reason="r")
+
+        assert PlanDecision.from_dict(decision.to_dict()) == decision
+
+
+class TestOrchestratorApproval:
+    """The orchestrator receives decisions through the backend."""
+
+    @pytest.mark.asyncio
+    async def test_approve_plan_goes_through_backend(self):
+        from app.agents.interactive_orchestrator import InteractiveOrchestrator
+
+        backend = InMemoryPlanApprovalBackend()
+        orchestrator = InteractiveOrchestrator(
+            db=MagicMock(),
+            claude_service=MagicMock(tracker=None),
+            approval_id="conv-1",
+            approval_backend=backend,
+        )
+        await backend.open("conv-1")
+
+        await orchestrator.approve_plan(
+            approved=True,
+            modified_plan={"summary": "Edited", "steps": [{"action": "create", "file": "a.php"}]},
+        )
+        decision = await backend.wait("conv-1", timeout=1.0)
+        orchestrator._apply_plan_decision(decision)
+
+        assert orchestrator.plan_approval.modified is True
+        assert orchestrator.plan_approval.plan.summary == "Edited"
+        assert orchestrator.plan_approval.plan.steps[0].file == "a.php"
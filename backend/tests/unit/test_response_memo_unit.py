@@ -0,0 +1,116 @@
+"""
+Unit tests for Claude response memoisation.
+
+Tests the TTL/LRU memo store and its use under ClaudeService.chat_async.
+"""
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from app.services.response_memo import ResponseMemo
+
+
+def _mock_response(text: str) -> MagicMock:
+    response = MagicMock()
+    response.content = [MagicMock(text=text)]
+    response.usage = MagicMock(
+        input_tokens=100,
+        output_tokens=20,
+        cache_creation_input_tokens=0,
+        cache_read_input_tokens=0,
+    )
+    return response
+
+
+class TestResponseMemo:
+    """Unit tests for the memo store."""
+
+    def test_key_covers_all_inputs(self):
+        """Any change in model, system, messages or schema changes the key."""
+        messages = [{"role": "user", "content": "hi"}]
+        key = ResponseMemo.make_key("m", "sys", messages)
+
+        assert key == ResponseMemo.make_key("m", "sys", [{"role": "user", "content": "hi"}])
+        assert key != ResponseMemo.make_key("other", "sys", messages)
+        assert key != ResponseMemo.make_key("m", "sys2", messages)
+        assert key != ResponseMemo.make_key("m", "sys", [{"role": "user", "content": "hey"}])
+        assert key != ResponseMemo.make_key("m", "sys", messages, schema={"type": "object"})
+
+    def test_entries_expire(self):
+        """Entries are not returned after their TTL."""
+        memo = ResponseMemo(ttl_seconds=10)
+
+        with patch("app.services.response_memo.time.monotonic", return_value=100.0):
+            memo.set("k", "value")
+            assert memo.get("k") == "value"
+
+        with patch("app.services.response_memo.time.monotonic", return_value=111.0):
+            assert memo.get("k") is None
+        assert len(memo) == 0
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted when full."""
+        memo = ResponseMemo(max_entries=2)
+        memo.set("a", "1")
+        memo.set("b", "2")
+        memo.get("a")
+        memo.set("c", "3")
+
+        assert memo.get("b") is None
+        assert memo.get("a") == "1"
+        assert memo.get_stats()["evictions"] == 1
+
+    def test_discard(self):
+        """Discarded responses are no longer served."""
+        memo = ResponseMemo()
+        messages = [{"role": "user", "content": "hi"}]
+        memo.set(memo.make_key("m", "sys", messages), "bad")
+
+        memo.discard("m", "sys", messages)
+
+        assert len(memo) == 0
+
+
+class TestChatAsyncMemoisation:
+    """Unit tests for memoisation under ClaudeService.chat_async."""
+
+    @pytest.fixture
+    def service(self):
+        from app.services.claude import ClaudeService
+
+        memo = ResponseMemo()
+        with patch("app.services.claude.get_response_memo", return_value=memo):
+            service = ClaudeService(api_key="test-key")
+            service.async_client = MagicMock()
+            service.async_client.messages.create = AsyncMock(return_value=_mock_response('{"ok": true}'))
+            yield service
+
+    @pytest.mark.asyncio
+    async def test_temperature_zero_is_memoised(self, service):
+        """Identical temperature-0 calls reach the API once."""
+        messages = [{"role": "user", "content": "classify"}]
+
+        first = await service.chat_async(model="m", messages=messages, system="sys", temperature=0)
+        second = await service.chat_async(model="m", messages=messages, system="sys", temperature=0)
+
+        assert first == second == '{"ok": true}'
+        assert service.async_client.messages.create.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_sampling_calls_not_memoised(self, service):
+        """Calls with temperature > 0 are not memoised by default."""
+        messages = [{"role": "user", "content": "write"}]
+
+        await service.chat_async(model="m", messages=messages, temperature=0.7)
+        await service.chat_async(model="m", messages=messages, temperature=0.7)
+
+        assert service.async_client.messages.create.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_opt_out(self, service):
+        """memoize=False bypasses the memo for temperature-0 calls."""
+        messages = [{"role": "user", "content": "classify"}]
+
+        await service.chat_async(model="m", messages=messages, temperature=0)
+        await service.chat_async(model="m", messages=messages, temperature=0, memoize=False)
+
+        assert service.async_client.messages.create.call_count == 2
@@ -0,0 +1,154 @@
+"""
+Unit tests for columnar scan results.
+
+Tests that group-bys, the largest files and histograms over ScanColumns
+match the same computations over per-file dicts, that the binary form
+round-trips, and that FileScanner reports the same summary as before.
+"""
+import random
+from collections import Counter, defaultdict
+
+import pytest
+
+from app.services.file_scanner import FileScanner
+from app.services.scan_columns import ScanColumns, ScanColumnsBuilder
+
+
+def make_rows(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "path": f"app/Dir{i % 7}/File{i}.php",
+            "size": rng.randint(0, 2_000_000),
+            # Few distinct values so ties are common
+            "lines": rng.choice([0, 10, 120, 600, 600, 3000]),
+            "type": rng.choice(["php", "blade", "vue"]),
+            "category": rng.choice([None, "models", "controllers"]),
+        }
+        for i in range(count)
+    ]
+
+
+def build(rows):
+    builder = ScanColumnsBuilder(("type", "category"))
+    for row in rows:
+        builder.append(row["path"], row["size"], row["lines"], type=row["type"], category=row["category"])
+    return builder.build()
+
+
+class TestScanColumns:
+    """Vectorised aggregates agree with per-row Python."""
+
+    def test_rows_round_trip(self):
+        rows = make_rows(200)
+        columns = build(rows)
+
+        assert len(columns) == 200
+        assert list(columns.rows()) == [
+            {"path": r["path"], "size": r["size"], "lines": r["lines"], "type": r["type"], "category": r["category"]}
+            for r in rows
+        ]
+        assert columns.codes["type"].dtype.itemsize == 1
+
+    def test_group_by(self):
+        rows = make_rows(500)
+        columns = build(rows)
+        lines = defaultdict(int)
+        for r in rows:
+            lines[r["type"]] += r["lines"]
+
+        assert columns.count_by("type") == dict(Counter(r["type"] for r in rows))
+        assert columns.count_by("category") == dict(Counter(r["category"] for r in rows if r["category"]))
+        assert list(columns.count_by("type")) == list(dict.fromkeys(r["type"] for r in rows))
+        assert columns.sum_by("type", "lines") == dict(lines)
+        assert columns.total("size") == sum(r["size"] for r in rows)
+
+    @pytest.mark.parametrize("by", ["lines", "size"])
+    def test_largest_matches_stable_sort(self, by):
+        rows = make_rows(500)
+        columns = build(rows)
+
+        for n in (1, 20, 499, 500, 600):
+            expected = sorted(rows, key=lambda r: r[by], reverse=True)[:n]
+            assert [f["path"] for f in columns.largest(n, by=by)] == [r["path"] for r in expected]
+
+    def test_histogram(self):
+        rows = make_rows(300)
+        columns = build(rows)
+
+        buckets = columns.histogram("lines", edges=[0, 100, 1000])
+
+        assert buckets == [
+            {"min": 0, "max": 100, "count": sum(1 for r in rows if r["lines"] < 100)},
+            {"min": 100, "max": 1000, "count": sum(1 for r in rows if 100 <= r["lines"] < 1000)},
+            {"min": 1000, "max": None, "count": sum(1 for r in rows if r["lines"] >= 1000)},
+        ]
+        assert sum(b["count"] for b in columns.histogram("size")) == len(rows)
+
+    def test_isin(self):
+        rows = make_rows(100)
+        columns = build(rows)
+
+        mask = columns.isin("category", {"models", None})
+
+        assert mask.tolist() == [r["category"] in ("models", None) for r in rows]
+
+    def test_bytes_round_trip(self):
+        rows = make_rows(300)
+        rows[0]["path"] = "resources/views/ümlaut.blade.php"
+        columns = build(rows)
+
+        data = columns.to_bytes()
+        restored = ScanColumns.from_bytes(data)
+
+        assert list(restored.rows()) == list(columns.rows())
+        assert restored.summary() == columns.summary()
+        with pytest.raises(ValueError):
+            ScanColumns.from_bytes(b"XXXX" + data[4:])
+
+    def test_empty(self):
+        columns = ScanColumnsBuilder(("type",)).build()
+
+        assert columns.largest(20) == []
+        assert columns.count_by("type") == {}
+        assert len(ScanColumns.from_bytes(columns.to_bytes())) == 0
+
+
+class TestFileScannerColumns:
+    """FileScanner's summary is computed from its columns."""
+
+    def test_summary(self, tmp_path):
+        files = {
+            "app/Models/User.php": "<?php\n" * 30,
+            "app/Models/Post.php": "<?php\n" * 30,
+            "app/Http/Controllers/HomeController.php": "<?php\n" * 80,
+            "resources/views/home.blade.php": "<div>\n" * 5,
+            "resources/js/app.js": "x\n" * 12,
+            "notes.md": "# notes\n",
+        }
+        for relative_path, content in files.items():
+            path = tmp_path / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+        scanner = FileScanner(str(tmp_path))
+        stats = scanner.scan()
+
+        assert stats["total_files"] == 6
+        assert stats["total_lines"] == 158
+        assert stats["by_type"]["php"] == {"count": 3, "lines": 140}
+        assert stats["by_category"]["models"] == 2
+        assert scanner.categories == stats["by_category"]
+        top = stats["largest_files"][0]
+        assert top == {
+            "path": "app/Http/Controllers/HomeController.php",
+            "type": "php",
+            "lines": 80,
+            "category": "controllers",
+            "size": len(files["app/Http/Controllers/HomeController.php"]),
+        }
+        # Ties keep walk order
+        tied = [f["path"] for f in stats["largest_files"] if f["lines"] == 30]
+        walk_order = [p for p in scanner.columns.paths() if p.startswith("app/Models/")]
+        assert tied == walk_order
+
@@ -0,0 +1,354 @@
+"""
+Unit tests for the scan job runner.
+
+Tests that scans run off the event loop with their progress streamed to
+the scan event log, that the per-host limit queues extra scans, and that
+cancellation and failures are recorded.
+"""
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.models import ScanJobStatus
+from app.services.event_log import InMemoryEventLog
+from app.services.scan_columns import ScanColumns
+from app.services import scan_job_runner
+from app.services.scan_job_runner import ScanCancelled, ScanJobRunner, run_scan
+
+
+def make_session_factory(sessions, project):
+    """Session factory whose sessions record executed statements."""
+    @asynccontextmanager
+    async def factory():
+        session = MagicMock()
+        session.commit = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock(
+            rowcount=1,
+            scalar_one_or_none=MagicMock(return_value=project),
+            scalar_one=MagicMock(return_value=project),
+        ))
+        sessions.append(session)
+        yield session
+    return factory
+
+
+def make_runner(scan_fn, **kwargs):
+    sessions = []
+    log = InMemoryEventLog()
+    project = SimpleNamespace(clone_path="/clones/app", stack=None, stack_fingerprint=None, health_check=None)
+    runner = ScanJobRunner(
+        session_factory=make_session_factory(sessions, project),
+        event_log=log,
+        use_processes=False,
+        scan_fn=scan_fn,
+        **kwargs,
+    )
+    return runner, log, sessions, project
+
+
+def job_statuses(sessions):
+    """Status values written to scan_jobs by UPDATE statements, in order."""
+    statuses = []
+    for session in sessions:
+        for call in session.execute.await_args_list:
+            stmt = call.args[0]
+            if getattr(stmt, "table", None) is None or stmt.table.name != "scan_jobs":
+                continue
+            params = stmt.compile().params
+            if "status" in params and "status_1" not in params:
+                statuses.append(params["status"])
+    return statuses
+
+
+def event_types(events):
+    return [e.data.split("\n")[0].removeprefix("event: ") for e in events]
+
+
+def fake_result(issues=()):
+    return {
+        "stack": {"backend": {"framework": "laravel", "version": "11.0", "php_version": "8.3"}},
+        "stack_fingerprint": "abc123",
+        "stack_reused": False,
+        "file_stats": {"total_files": 3},
+        "file_columns": b"columns",
+        "structure": {},
+        "health_check": {"score": 80},
+        "health_recomputed": [],
+        "issues": list(issues),
+        "ai_context": {"summary": "app"},
+    }
+
+
+def quick_scan(clone_path, previous, progress, cancel):
+    progress.put(("detecting_stack", 5, "Detecting technology stack..."))
+    progress.put(("scanning_files", 15, "Scanned 100 files..."))
+    progress.put(("scanning_files", 15, "Scanned 200 files..."))
+    return fake_result([{
+        "category": "security", "severity": "critical", "title": "Debug mode", "description": "d",
+        "file_path": ".env", "line_number": None, "suggestion": None, "auto_fixable": False,
+        "signature": "d" * 40,
+    }])
+
+
+def cancellable_scan(clone_path, previous, progress, cancel):
+    """Module level, so a spawned worker process can load it."""
+    progress.put(("detecting_stack", 5, "Detecting technology stack..."))
+    cancel.wait(10)
+    raise ScanCancelled()
+
+
+async def wait_idle(runner):
+    while runner.running_count or runner.pending_count:
+        await asyncio.gather(*list(runner._running.values()), return_exceptions=True)
+
+
+class TestScanJobRunner:
+    """Unit tests for ScanJobRunner."""
+
+    @pytest.mark.asyncio
+    async def test_progress_and_results(self):
+        runner, log, sessions, project = make_runner(quick_scan)
+
+        job = await runner.submit("user-1", "project-1")
+        assert runner.is_active("project-1")
+        await wait_idle(runner)
+
+        events, ended = await log.read(job.id, 0)
+        assert ended is True
+        assert event_types(events) == ["progress_update"] * 4 + ["complete"]
+        assert json.loads(events[-1].data.split("data: ", 1)[1])["success"] is True
+        assert job_statuses(sessions)[-1] == ScanJobStatus.COMPLETED.value
+        assert not runner.is_active("project-1")
+
+        assert project.laravel_version == "11.0"
+        assert project.stack_fingerprint == "abc123"
+        assert project.scan_columns == b"columns"
+        assert project.health_score == 80
+        assert project.status == "ready"
+        upserts = [
+            call.args[0] for s in sessions for call in s.execute.await_args_list
+            if getattr(call.args[0], "table", None) is not None
+            and call.args[0].table.name == "project_issues"
+            and call.args[0].is_insert
+        ]
+        [upsert] = upserts
+        params = upsert.compile(dialect=postgresql.dialect()).params
+        assert params["title_m0"] == "Debug mode"
+        assert params["signature_m0"] == "d" * 40
+        assert not any(s.add_all.called for s in sessions)
+
+    @pytest.mark.asyncio
+    async def test_per_file_messages_are_not_persisted(self):
+        runner, _, sessions, _ = make_runner(quick_scan)
+
+        await runner.submit("user-1", "project-1")
+        await wait_idle(runner)
+
+        progress_writes = [
+            call.args[0].compile().params["progress"]
+            for s in sessions for call in s.execute.await_args_list
+            if getattr(call.args[0], "table", None) is not None
+            and call.args[0].table.name == "scan_jobs"
+            and "progress" in call.args[0].compile().params
+            and "status" not in call.args[0].compile().params
+        ]
+        # One write per percent change: 5, 15, then saving at 90
+        assert progress_writes == [5, 15, 90]
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit_queues_extra_scans(self):
+        started = []
+
+        def slow_scan(clone_path, previous, progress, cancel):
+            started.append(time.monotonic())
+            time.sleep(0.05)
+            return fake_result()
+
+        runner, log, _, _ = make_runner(slow_scan, max_per_host=1)
+        await runner.submit("user-1", "project-1")
+        second = await runner.submit("user-1", "project-2")
+
+        assert runner.running_count == 1
+        assert runner.pending_count == 1
+        queued, _ = await log.read(second.id, 0)
+        assert event_types(queued) == ["job_queued"]
+
+        await wait_idle(runner)
+        assert len(started) == 2
+        assert started[1] - started[0] >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_scan(self):
+        def endless_scan(clone_path, previous, progress, cancel):
+            from app.services.scan_job_runner import ScanCancelled
+
+            while True:
+                if cancel.is_set():
+                    raise ScanCancelled()
+                progress.put(("scanning_files", 15, "Scanning files..."))
+                time.sleep(0.01)
+
+        runner, log, sessions, _ = make_runner(endless_scan)
+        job = await runner.submit("user-1", "project-1")
+        await asyncio.sleep(0.05)
+
+        assert await runner.cancel(job.id) is True
+        await wait_idle(runner)
+
+        events, ended = await log.read(job.id, 0)
+        assert ended is True
+        assert event_types(events)[-1] == "complete"
+        assert job_statuses(sessions)[-1] == ScanJobStatus.CANCELLED.value
+        assert not runner.is_active("project-1")
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_scan(self):
+        runner, log, sessions, _ = make_runner(lambda *args: time.sleep(0.05) or fake_result(), max_per_host=1)
+        await runner.submit("user-1", "project-1")
+        queued = await runner.submit("user-1", "project-2")
+
+        assert await runner.cancel(queued.id) is True
+        assert await runner.cancel("unknown") is False
+        assert not runner.is_active("project-2")
+        assert ScanJobStatus.CANCELLED.value in job_statuses(sessions)
+        await wait_idle(runner)
+
+    @pytest.mark.asyncio
+    async def test_waits_for_a_free_slot_on_the_host(self, monkeypatch):
+        monkeypatch.setattr(scan_job_runner, "CLAIM_RETRY_SECONDS", 0.01)
+        runner, log, sessions, project = make_runner(quick_scan)
+        claims = []
+        factory = runner.session_factory
+
+        @asynccontextmanager
+        async def host_full_twice():
+            async with factory() as session:
+                default = session.execute.return_value
+                # The job is still queued when a claim misses
+                default.scalar = MagicMock(return_value="queued")
+
+                async def execute(stmt, *args, **kwargs):
+                    if "heartbeat_at" in stmt.compile().params:
+                        claims.append(stmt)
+                        if len(claims) <= 2:
+                            return MagicMock(rowcount=0)
+                    return default
+
+                session.execute = AsyncMock(side_effect=execute)
+                yield session
+
+        runner.session_factory = host_full_twice
+        await runner.submit("user-1", "project-1")
+        await wait_idle(runner)
+
+        assert len(claims) == 3
+        assert job_statuses(sessions)[-1] == ScanJobStatus.COMPLETED.value
+
+    @pytest.mark.asyncio
+    async def test_cancel_while_waiting_for_a_slot(self, monkeypatch):
+        monkeypatch.setattr(scan_job_runner, "CLAIM_RETRY_SECONDS", 0.01)
+        ran = []
+        runner, log, sessions, _ = make_runner(lambda *args: ran.append(args) or fake_result())
+        factory = runner.session_factory
+
+        @asynccontextmanager
+        async def host_full():
+            async with factory() as session:
+                session.execute.return_value.rowcount = 0
+                session.execute.return_value.scalar = MagicMock(return_value="queued")
+                yield session
+
+        runner.session_factory = host_full
+        job = await runner.submit("user-1", "project-1")
+        await asyncio.sleep(0.03)
+
+        assert await runner.cancel(job.id) is True
+        await wait_idle(runner)
+
+        assert ran == []
+        assert job_statuses(sessions)[-1] == ScanJobStatus.CANCELLED.value
+        assert (await log.read(job.id, 0))[1] is True
+
+    @pytest.mark.asyncio
+    async def test_failure_is_recorded(self):
+        def broken_scan(clone_path, previous, progress, cancel):
+            raise RuntimeError("disk gone")
+
+        runner, log, sessions, _ = make_runner(broken_scan)
+        job = await runner.submit("user-1", "project-1")
+        await wait_idle(runner)
+
+        events, _ = await log.read(job.id, 0)
+        assert event_types(events)[-1] == "error"
+        assert job_statuses(sessions)[-1] == ScanJobStatus.FAILED.value
+
+
+class TestRunScan:
+    """run_scan computes everything the runner stores."""
+
+    def test_scans_a_clone(self, tmp_path):
+        (tmp_path / "composer.json").write_text(json.dumps({"require": {"laravel/framework": "^11.0"}}))
+        (tmp_path / "app/Models").mkdir(parents=True)
+        (tmp_path / "app/Models/User.php").write_text("<?php\nclass User {}\n")
+        progress = []
+        cancel = SimpleNamespace(is_set=lambda: False)
+
+        result = run_scan(str(tmp_path), None, SimpleNamespace(put=progress.append), cancel)
+
+        assert result["stack"]["backend"]["framework"] == "laravel"
+        assert result["file_stats"]["total_files"] >= 2
+        assert len(ScanColumns.from_bytes(result["file_columns"])) == result["file_stats"]["total_files"]
+        assert "score" in result["health_check"]
+        assert [p[1] for p in progress] == sorted(p[1] for p in progress)
+        assert all(set(i) >= {"category", "severity", "title", "signature"} for i in result["issues"])
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_process(self, tmp_path):
+        (tmp_path / "composer.json").write_text(json.dumps({"require": {"laravel/framework": "^11.0"}}))
+        sessions = []
+        project = SimpleNamespace(clone_path=str(tmp_path), stack=None, stack_fingerprint=None, health_check=None)
+        runner = ScanJobRunner(
+            max_per_host=1,
+            session_factory=make_session_factory(sessions, project),
+            event_log=InMemoryEventLog(),
+        )
+        try:
+            await runner.submit("user-1", "project-1")
+            await wait_idle(runner)
+        finally:
+            await runner.shutdown()
+
+        assert job_statuses(sessions)[-1] == ScanJobStatus.COMPLETED.value
+        assert project.stack["backend"]["framework"] == "laravel"
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_cancel_reaches_worker_process(self):
+        sessions = []
+        log = InMemoryEventLog()
+        project = SimpleNamespace(clone_path="/clones/app", stack=None, stack_fingerprint=None, health_check=None)
+        runner = ScanJobRunner(
+            max_per_host=1,
+            session_factory=make_session_factory(sessions, project),
+            event_log=log,
+            scan_fn=cancellable_scan,
+        )
+        try:
+            job = await runner.submit("user-1", "project-1")
+            while not (await log.read(job.id, 0))[0]:
+                await asyncio.sleep(0.05)
+            assert await runner.cancel(job.id) is True
+            await wait_idle(runner)
+        finally:
+            await runner.shutdown()
+
+        events, ended = await log.read(job.id, 0)
+        assert event_types(events) == ["progress_update", "complete"]
+        assert job_statuses(sessions)[-1] == ScanJobStatus.CANCELLED.value
@@ -0,0 +1,144 @@
+"""
+Unit tests for the scan rule engine.
+
+Tests that the single-pass engine reports exactly what running every
+pattern over every line would, and that ProjectScanner reads each file
+once for both security and quality checks.
+"""
+import random
+import re
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.project_scanner import FileInfo, ProjectScanner
+from app.services.scan_rules import RuleEngine, ScanRule
+
+
+SAMPLE_LINES = [
+    "<?php",
+    "namespace App\\Http\\Controllers;",
+    "    public function index(Request $request)",
+    "    {",
+    "        $users = User::where('active', 1)->get();",
+    "        $rows = DB::raw('select * from users where id = ' . $id);",
+    "        $q->whereRaw(\"name = $name\");",
+    "        $password = 'supersecretvalue';",
+    "        // TODO: paginate",
+    "        // todo lowercase is not a TODO rule hit",
+    "        dd($users);",
+    "        var_dump ($request);",
+    "        console.log('debug');",
+    "        try { $x(); } catch (Exception $e) {}",
+    "        exec('ls ' . $dir);",
+    "        $out = `ls $dir`;",
+    "        {!! $user->bio !!}",
+    "        echo $_GET['q'];",
+    "        include($file);",
+    "APP_DEBUG=true",
+    "        $address = $this->addresses->first();",
+    "        return view('users.index', compact('users'));",
+    "    }",
+    "        $token = \"Bearer abcdefghijkl\";",
+    "        $s = 'Ünïcödé İstanbul ǅ';",
+    "",
+]
+
+
+def brute_force(rules, content):
+    """Every pattern over every line, the way the scanner used to do it."""
+    found = []
+    for i, line in enumerate(content.split("\n"), 1):
+        for rule in rules:
+            if re.search(rule.pattern, line, re.IGNORECASE if rule.ignore_case else 0):
+                found.append((i, rule.id))
+    return found
+
+
+def engine_result(engine, content, language="php"):
+    return [(m.line_number, m.rule.id) for m in engine.scan(content, language)]
+
+
+@pytest.fixture
+def php_rules():
+    return [r for r in ProjectScanner.rule_engine().rules if "php" in r.languages]
+
+
+class TestRuleEngine:
+    """Unit tests for RuleEngine."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_brute_force(self, php_rules, seed):
+        rng = random.Random(seed)
+        content = "\n".join(rng.choice(SAMPLE_LINES) for _ in range(300))
+
+        assert engine_result(ProjectScanner.rule_engine(), content) == brute_force(php_rules, content)
+
+    def test_reports_rule_and_line(self):
+        content = "a\n        // TODO: paginate\nb"
+
+        [match] = ProjectScanner.rule_engine().scan(content, "php")
+
+        assert match.rule.id == "quality.todo_fixme"
+        assert match.line_number == 2
+        assert match.line == "        // TODO: paginate"
+
+    def test_several_rules_on_one_line(self):
+        content = "exec('rm ' . $x); // TODO remove"
+
+        ids = {m.rule.id for m in ProjectScanner.rule_engine().scan(content, "php")}
+
+        assert ids == {"security.command_injection.0", "quality.todo_fixme"}
+
+    def test_language_filter(self):
+        engine = ProjectScanner.rule_engine()
+
+        assert engine.scan("{!! $x !!}", "markdown") == []
+        assert not engine.applies_to("markdown")
+        # env files only get security rules
+        assert engine_result(engine, "APP_DEBUG=true // TODO", "env") == [(1, "security.insecure_config.0")]
+
+    def test_rules_without_literals_use_combined_pattern(self):
+        rules = [
+            ScanRule(id="multi", pattern=r"open\([^)]*\$", category="c", severity="s", title="t",
+                     description="d", suggestion="s", languages=frozenset({"php"})),
+            ScanRule(id="num", pattern=r"\b\d{4,}\b", category="c", severity="s", title="t",
+                     description="d", suggestion="s", languages=frozenset({"php"})),
+        ]
+        # The first line opens a match that only completes two lines later
+        content = "open(\nfoo 12345\n$x)\nopen($y)"
+
+        assert engine_result(RuleEngine(rules), content) == brute_force(rules, content)
+
+
+class TestProjectScannerChecks:
+    """ProjectScanner runs all checks in one pass per file."""
+
+    def make_files(self, tmp_path):
+        php = tmp_path / "UserController.php"
+        php.write_text("<?php\n// TODO: fix\n$q->whereRaw(\"id = $id\");\n" + "x\n" * 600)
+        md = tmp_path / "README.md"
+        md.write_text("TODO: docs\n")
+        return [
+            FileInfo(path=str(php), relative_path="UserController.php", size=0, lines=603,
+                     language="php", category="controllers", last_modified=None),
+            FileInfo(path=str(md), relative_path="README.md", size=0, lines=1,
+                     language="markdown", category="other", last_modified=None),
+        ]
+
+    def test_issues_from_one_read(self, tmp_path):
+        files = self.make_files(tmp_path)
+        scanner = ProjectScanner(db=MagicMock(), project=MagicMock(clone_path=str(tmp_path)))
+
+        with patch("builtins.open", wraps=open) as opened:
+            issues = scanner._evaluate_rules(files)
+
+        assert opened.call_count == 1
+        assert [(i["title"], i["line_number"], i.get("rule")) for i in issues] == [
+            ("Large file detected", None, None),
+            ("TODO/FIXME comment found", 2, "quality.todo_fixme"),
+            ("Security: Sql Injection", 3, "security.sql_injection.0"),
+        ]
+        assert files[0].has_issues
+        assert not files[1].has_issues
+
@@ -0,0 +1,126 @@
+"""
+Unit tests for the SSE multiplexer.
+
+Tests that streams wake on events and on task completion rather than on a
+timer, that bursts are coalesced, and that heartbeats only fire when idle.
+"""
+import asyncio
+
+import pytest
+
+from app.services.sse_multiplexer import multiplex
+
+
+async def collect(queue, task, **kwargs):
+    return [batch async for batch in multiplex(queue, task, **kwargs)]
+
+
+class TestMultiplex:
+    """Unit tests for multiplex()."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_coalesced_into_one_batch(self):
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def work():
+            for i in range(5):
+                queue.put_nowait(i)
+            await asyncio.sleep(0.01)
+
+        batches = await collect(queue, asyncio.create_task(work()))
+
+        assert batches == [[0, 1, 2, 3, 4]]
+
+    @pytest.mark.asyncio
+    async def test_batches_respect_max_batch(self):
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(5):
+            queue.put_nowait(i)
+
+        release = asyncio.Event()
+        task = asyncio.create_task(release.wait())
+        stream = multiplex(queue, task, max_batch=2)
+
+        assert await stream.__anext__() == [0, 1]
+        assert await stream.__anext__() == [2, 3]
+        release.set()
+        assert [b async for b in stream] == [[4]]
+
+    @pytest.mark.asyncio
+    async def test_events_queued_at_completion_are_not_lost(self):
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def work():
+            queue.put_nowait("last")
+            return "result"
+
+        task = asyncio.create_task(work())
+        batches = await collect(queue, task)
+
+        assert batches == [["last"]]
+        assert await task == "result"
+
+    @pytest.mark.asyncio
+    async def test_completion_ends_stream_without_timer(self):
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(asyncio.sleep(0.01))
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        # A 10s heartbeat must not delay noticing that the task is done
+        batches = await collect(queue, task, heartbeat_interval=10.0)
+
+        assert batches == []
+        assert loop.time() - started < 1.0
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_only_when_idle(self):
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            queue.put_nowait("event")
+            await asyncio.sleep(0.01)
+
+        batches = await collect(queue, asyncio.create_task(work()), heartbeat_interval=0.02)
+
+        assert ["event"] in batches
+        assert [] in batches[:batches.index(["event"])]
+
+    @pytest.mark.asyncio
+    async def test_task_exception_is_left_to_caller(self):
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def work():
+            raise ValueError("boom")
+
+        task = asyncio.create_task(work())
+        assert await collect(queue, task) == []
+
+        with pytest.raises(ValueError):
+            await task
+
+
+class TestTailHeartbeat:
+    """The HTTP tail sends keepalives only while the log is idle."""
+
+    @pytest.mark.asyncio
+    async def test_tail_sends_heartbeat_then_batched_events(self, monkeypatch):
+        from app.api import chat
+        from app.services.event_log import InMemoryEventLog
+        from app.services.sse_multiplexer import HEARTBEAT
+
+        log = InMemoryEventLog()
+        monkeypatch.setattr(chat, "get_chat_event_log", lambda: log)
+        monkeypatch.setattr(chat.settings, "chat_sse_heartbeat_seconds", 0.02)
+        await log.begin("conv-1")
+
+        tail = chat.tail_event_log("conv-1")
+        assert await tail.__anext__() == HEARTBEAT.encode()
+
+        await log.append("conv-1", "event: a\ndata: {}\n\n")
+        await log.append("conv-1", "event: b\ndata: {}\n\n")
+        await log.end("conv-1")
+
+        chunks = [c async for c in tail]
+        assert chunks == [b"id: 1\nevent: a\ndata: {}\n\nid: 2\nevent: b\ndata: {}\n\n"]
@@ -0,0 +1,107 @@
+"""
+Unit tests for memoised stack detection.
+
+Tests that a detection given the previous result and fingerprint returns
+it while the manifest inputs are unchanged, that any input change
+recomputes, and that the declared inputs cover everything detection reads.
+"""
+import json
+
+import pytest
+
+from app.services import file_snapshot
+from app.services.file_snapshot import _ContentCache
+from app.services.stack_detector import StackDetector
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    monkeypatch.setattr(file_snapshot, "_content_cache", _ContentCache(max_bytes=1 << 20, max_file_bytes=1 << 16))
+
+
+@pytest.fixture
+def project(tmp_path):
+    files = {
+        "composer.json": json.dumps({
+            "require": {"php": "^8.2", "laravel/framework": "^11.0", "laravel/sanctum": "^4.0"},
+            "require-dev": {"pestphp/pest": "^2.0"},
+        }),
+        "package.json": json.dumps({"devDependencies": {"vue": "^3.4", "vite": "^5.0", "tailwindcss": "^3"}}),
+        ".env.example": "DB_CONNECTION=pgsql\nCACHE_STORE=redis\nQUEUE_CONNECTION=redis\n",
+        "config/database.php": "<?php\nreturn ['default' => env('DB_CONNECTION', 'pgsql')];\n",
+        "phpunit.xml": "<phpunit/>\n",
+        "Dockerfile": "FROM php:8.3\n",
+    }
+    for relative_path, content in files.items():
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path
+
+
+def detect(path, previous=None, previous_fingerprint=None):
+    detector = StackDetector(str(path), previous=previous, previous_fingerprint=previous_fingerprint)
+    return detector, detector.detect()
+
+
+class TestMemoisedStackDetection:
+    """Detection results are reused against a fingerprint of their inputs."""
+
+    def test_unchanged_inputs_reuse_result(self, project, monkeypatch):
+        first_detector, first = detect(project)
+        assert first_detector.reused is False
+        assert first["backend"]["framework"] == "laravel"
+
+        monkeypatch.setattr(StackDetector, "_detect_backend", lambda self: pytest.fail("re-detected"))
+        detector, second = detect(project, previous=first, previous_fingerprint=first_detector.fingerprint)
+
+        assert detector.reused is True
+        assert detector.fingerprint == first_detector.fingerprint
+        assert second == first
+
+    def test_manifest_change_recomputes(self, project):
+        first_detector, first = detect(project)
+        (project / "package.json").write_text(json.dumps({"dependencies": {"react": "^18.2"}}))
+
+        detector, second = detect(project, previous=first, previous_fingerprint=first_detector.fingerprint)
+
+        assert detector.reused is False
+        assert second["frontend"]["framework"] == "react"
+
+    def test_path_change_recomputes(self, project):
+        first_detector, first = detect(project)
+        assert first["ci_cd"]["github_actions"] is False
+        (project / ".github/workflows").mkdir(parents=True)
+
+        detector, second = detect(project, previous=first, previous_fingerprint=first_detector.fingerprint)
+
+        assert detector.reused is False
+        assert second["ci_cd"]["github_actions"] is True
+
+    def test_version_bump_or_missing_fingerprint_recomputes(self, project, monkeypatch):
+        first_detector, first = detect(project)
+
+        assert detect(project, previous=first, previous_fingerprint=None)[0].reused is False
+        monkeypatch.setattr(StackDetector, "DETECTION_VERSION", StackDetector.DETECTION_VERSION + 1)
+        assert detect(project, previous=first, previous_fingerprint=first_detector.fingerprint)[0].reused is False
+
+    def test_declared_inputs_cover_reads(self, project):
+        """Every file detection reads or probes is in INPUT_FILES or INPUT_PATHS."""
+        detector = StackDetector(str(project))
+        files, paths = set(), set()
+        detector._read_file = lambda f, _r=detector._read_file: files.add(f) or _r(f)
+        detector._read_json = lambda f, _r=detector._read_json: files.add(f) or _r(f)
+        detector._file_exists = lambda f, _r=detector._file_exists: paths.add(f) or _r(f)
+        detector._dir_exists = lambda f, _r=detector._dir_exists: paths.add(f) or _r(f)
+
+        detector.detect()
+        # Take the non-Laravel backend and Blade-only frontend branches too
+        (project / "composer.json").unlink()
+        (project / "package.json").unlink()
+        (project / "requirements.txt").write_text("django==5.0\n")
+        (project / "manage.py").write_text("")
+        detector.detect()
+
+        assert files <= set(StackDetector.INPUT_FILES)
+        # An input file's hash already changes when it appears or disappears
+        assert paths <= set(StackDetector.INPUT_PATHS) | set(StackDetector.INPUT_FILES)
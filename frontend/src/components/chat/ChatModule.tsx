@@ -24,6 +24,7 @@ import {Prism as SyntaxHighlighter} from 'react-syntax-highlighter';
 import {oneDark} from 'react-syntax-highlighter/dist/esm/styles/prism';
 
 import {chatApi, getErrorMessage} from '@/lib/api';
+import {sha256Hex} from '@/lib/utils';
 import type {
     AgentThinkingState,
     AgentType,
@@ -110,6 +111,9 @@ export const ChatModule = forwardRef<ChatModuleRef, ChatModuleProps>(function Ch
     const messagesEndRef = useRef<HTMLDivElement>(null);
     const inputRef = useRef<HTMLTextAreaElement>(null);
     const abortControllerRef = useRef<AbortController | null>(null);
+    // Code received per step, and the final results from the complete event
+    const streamedCodeRef = useRef<Map<number, string>>(new Map());
+    const finalResultsRef = useRef<any[] | null>(null);
 
     const conversationKey = `conversation_${projectId}`;
     const processingStateKey = `chat_processing_${projectId}`;
@@ -142,9 +146,33 @@ export const ChatModule = forwardRef<ChatModuleRef, ChatModuleProps>(function Ch
         setCurrentThinking(null);
         setStreamingFiles(new Map());
         setCompletedArtifacts([]);
+        streamedCodeRef.current = new Map();
+        finalResultsRef.current = null;
         itemIdRef.current = 0;
     }, []);
 
+    // Swap artifacts whose streamed code could not be verified for the full
+    // content from the complete event
+    const repairArtifacts = useCallback(() => {
+        const results = finalResultsRef.current;
+        if (!results) return;
+        setCompletedArtifacts(artifacts => artifacts.map(artifact => {
+            if (!artifact.incomplete) return artifact;
+            const full = results.find((r: any) => r.file === artifact.file && r.content);
+            if (!full) return artifact;
+            return {...artifact, content: full.content, lines_changed: full.content.split('\n').length, incomplete: false};
+        }));
+    }, []);
+
+    const verifyStreamedCode = useCallback(async (file: string, streamed: string, contentHash: string) => {
+        // A reconnect can miss chunks the event log no longer holds
+        if (await sha256Hex(streamed) === contentHash) return;
+        setCompletedArtifacts(artifacts => artifacts.map(artifact =>
+            artifact.file === file && artifact.content === streamed ? {...artifact, incomplete: true} : artifact
+        ));
+        repairArtifacts();
+    }, [repairArtifacts]);
+
     const scrollToBottom = useCallback(() => {
         messagesEndRef.current?.scrollIntoView({behavior: 'smooth'});
     }, []);
@@ -323,37 +351,49 @@ export const ChatModule = forwardRef<ChatModuleRef, ChatModuleProps>(function Ch
                     addChatItem({type: 'plan_step', timestamp, agent: 'blueprint', step: data.step});
                 }
                 break;
-            case 'step_code_chunk':
-                setStreamingFiles(prev => {
-                    const next = new Map(prev);
-                    const existing = next.get(data.step_index) || {
-                        stepIndex: data.step_index,
-                        file: data.file,
-                        content: '',
-                        totalLength: data.total_length || 0,
-                        done: false,
-                        action: data.action || 'create'
-                    };
-                    if (data.done) {
+            case 'step_code_chunk': {
+                const streamed = (streamedCodeRef.current.get(data.step_index) || '') + (data.chunk || '');
+                if (data.done) {
+                    streamedCodeRef.current.delete(data.step_index);
+                    const finalContent = data.content || streamed;
+                    setStreamingFiles(prev => {
+                        const next = new Map(prev);
                         next.delete(data.step_index);
-                        const finalContent = data.content || existing.content;
-                        setCompletedArtifacts(artifacts => [...artifacts, {
+                        return next;
+                    });
+                    setCompletedArtifacts(artifacts => [...artifacts, {
+                        file: data.file,
+                        action: data.action || 'create',
+                        success: true,
+                        content: finalContent,
+                        lines_changed: finalContent.split('\n').length
+                    }]);
+                    // Without content the done event only vouches for the chunks by hash
+                    if (!data.content && data.content_hash) {
+                        void verifyStreamedCode(data.file, streamed, data.content_hash);
+                    }
+                } else {
+                    streamedCodeRef.current.set(data.step_index, streamed);
+                    setStreamingFiles(prev => {
+                        const next = new Map(prev);
+                        const existing = next.get(data.step_index) || {
+                            stepIndex: data.step_index,
                             file: data.file,
-                            action: data.action || 'create',
-                            success: true,
-                            content: finalContent,
-                            lines_changed: finalContent.split('\n').length
-                        }]);
-                    } else {
+                            content: '',
+                            totalLength: data.total_length || 0,
+                            done: false,
+                            action: data.action || 'create'
+                        };
                         next.set(data.step_index, {
                             ...existing,
-                            content: existing.content + (data.chunk || ''),
+                            content: streamed,
                             totalLength: data.total_length || existing.totalLength
                         });
-                    }
-                    return next;
-                });
+                        return next;
+                    });
+                }
                 break;
+            }
             case 'step_started':
                 setCurrentThinking({
                     agent: AGENT_CONFIG.forge,
@@ -416,7 +456,7 @@ export const ChatModule = forwardRef<ChatModuleRef, ChatModuleProps>(function Ch
                 });
                 break;
         }
-    }, [addChatItem]);
+    }, [addChatItem, verifyStreamedCode]);
 
     const handleEvent = useCallback((event: InteractiveEvent) => {
         const {event: eventType, data} = event;
@@ -450,6 +490,10 @@ export const ChatModule = forwardRef<ChatModuleRef, ChatModuleProps>(function Ch
                 setAwaitingPlanApproval(false);
                 setCurrentPlan(null);
                 saveProcessingState(false, null);
+                if (data.execution_results) {
+                    finalResultsRef.current = data.execution_results;
+                    repairArtifacts();
+                }
                 if (data.answer || data.success !== undefined) {
                     setMessages(prev => [...prev, {
                         id: `msg-${Date.now()}`,
@@ -484,7 +528,7 @@ export const ChatModule = forwardRef<ChatModuleRef, ChatModuleProps>(function Ch
                 setError(data.message || 'An error occurred');
                 break;
         }
-    }, [processAgentEvent, onConversationChange, conversationKey, saveProcessingState]);
+    }, [processAgentEvent, onConversationChange, conversationKey, saveProcessingState, repairArtifacts]);
 
     const sendMessage = useCallback(async (messageText?: string) => {
         const text = messageText || input.trim();
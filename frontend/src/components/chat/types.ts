@@ -89,6 +89,7 @@ export interface ExecutionResult {
     original_content?: string;
     error?: string;
     lines_changed?: number;
+    incomplete?: boolean;  // Streamed chunks did not match the final content hash
 }
 
 // ============== VALIDATION TYPES ==============
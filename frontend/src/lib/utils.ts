@@ -22,4 +22,10 @@ export function truncate(str: string, length: number): string {
 }
 
 // Sleep utility for debugging
-export const sleep = (ms: number) => new Promise((r) => setTimeout(r, ms));
\ No newline at end of file
+export const sleep = (ms: number) => new Promise((r) => setTimeout(r, ms));
+// SHA-256 hex digest of a string's UTF-8 bytes; null where Web Crypto is unavailable (non-secure origins)
+export async function sha256Hex(text: string): Promise<string | null> {
+    if (typeof crypto === 'undefined' || !crypto.subtle) return null;
+    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(text));
+    return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, '0')).join('');
+}